@@ -0,0 +1,311 @@
+"""
+Fábrica de cidades sintéticas para testes de escala (1k–1M nós).
+
+Ao contrário do GrafoDemo (30 nós fixos), gera redes de tamanho arbitrário
+a partir de uma semente, sempre com o mesmo resultado para a mesma semente:
+- grelha: quarteirões regulares (ruas em 4 direções)
+- radial: anéis concêntricos ligados por avenidas radiais
+- planar aleatória: grelha perturbada, com ruas removidas e diagonais
+
+Os nomes seguem os do GrafoDemo para o GestorTransito reconhecer as zonas:
+- "Centro_<i>" no núcleo da cidade (congestionamento de hora de ponta)
+- "Parque_Tec_<i>" e "Aeroporto_<i>" (zonas comerciais)
+- "Bairro_<i>" nas restantes zonas de recolha
+- "Recarga_<i>" e "Posto_<i>" (postos preferencialmente na periferia)
+
+Uso:
+    grafo = CidadeSintetica.criar("grelha", 10_000, semente=1)
+    CidadeSintetica.criar_frota(gestor, semente=1)
+    pedidos = CidadeSintetica.gerar_pedidos(grafo, duracao_min=120, semente=1)
+"""
+
+import math
+import random
+from typing import List, Optional, Tuple
+from modelo.grafo import Grafo, No, TipoNo
+from modelo.pedidos import Pedido, EstadoPedido
+from modelo.veiculos import VeiculoEletrico, VeiculoCombustao, EstadoVeiculo
+
+# Tamanhos usados para parametrizar testes e benchmarks de escala
+TAMANHOS = (1_000, 10_000, 100_000, 1_000_000)
+
+TIPOS_CIDADE = ("grelha", "radial", "planar")
+
+
+class CidadeSintetica:
+
+    # Proporções por omissão (cidade real: poucas estações por zona de recolha)
+    PROPORCAO_RECARGA = 0.05
+    PROPORCAO_POSTOS = 0.02
+    PROPORCAO_COMERCIAL = 0.05
+    RAIO_CENTRO = 0.2  # fração do raio da cidade considerada "centro"
+
+    # ==========================================================
+    # Geradores de rede
+    # ==========================================================
+
+    @staticmethod
+    def criar(tipo: str, n_nos: int, semente: int = 0, **opcoes) -> Grafo:
+        """Cria uma cidade do tipo indicado: grelha, radial ou planar."""
+        geradores = {
+            "grelha": CidadeSintetica.grelha,
+            "radial": CidadeSintetica.radial,
+            "planar": CidadeSintetica.planar_aleatoria,
+        }
+        if tipo not in geradores:
+            raise ValueError(f"Tipo de cidade desconhecido: {tipo}. Use um de {TIPOS_CIDADE}")
+        return geradores[tipo](n_nos, semente=semente, **opcoes)
+
+    @staticmethod
+    def grelha(n_nos: int, semente: int = 0, espacamento_km: float = 0.5) -> Grafo:
+        """Grelha ~quadrada com n_nos cruzamentos, cada um ligado aos 4 vizinhos."""
+        linhas, colunas = CidadeSintetica._dimensoes(n_nos)
+        pontos = [(c * espacamento_km, l * espacamento_km)
+                  for l in range(linhas) for c in range(colunas)][:n_nos]
+
+        ligacoes = []
+        for i in range(len(pontos)):
+            l, c = divmod(i, colunas)
+            if c + 1 < colunas and i + 1 < n_nos:
+                ligacoes.append((i, i + 1))
+            if i + colunas < n_nos:
+                ligacoes.append((i, i + colunas))
+
+        return CidadeSintetica._montar(pontos, ligacoes, random.Random(semente))
+
+    @staticmethod
+    def radial(n_nos: int, semente: int = 0, espacamento_km: float = 0.5) -> Grafo:
+        """Praça central, anéis concêntricos e avenidas radiais."""
+        raios = max(6, int(math.sqrt(n_nos)))
+        pontos = [(0.0, 0.0)]
+        ligacoes = []
+
+        anel = 0
+        while len(pontos) < n_nos:
+            anel += 1
+            distancia = anel * espacamento_km
+            inicio_anel = len(pontos)
+            for s in range(raios):
+                if len(pontos) >= n_nos:
+                    break
+                angulo = 2 * math.pi * s / raios
+                pontos.append((distancia * math.cos(angulo), distancia * math.sin(angulo)))
+                i = len(pontos) - 1
+                # Avenida radial: liga ao mesmo raio do anel anterior (ou à praça)
+                ligacoes.append((i - raios if anel > 1 else 0, i))
+                if s > 0:
+                    ligacoes.append((i - 1, i))
+            # Fecha o anel se ficou completo
+            if len(pontos) - inicio_anel == raios:
+                ligacoes.append((len(pontos) - 1, inicio_anel))
+
+        return CidadeSintetica._montar(pontos, ligacoes, random.Random(semente))
+
+    @staticmethod
+    def planar_aleatoria(n_nos: int, semente: int = 0, espacamento_km: float = 0.5,
+                         prob_remover: float = 0.2, prob_diagonal: float = 0.3) -> Grafo:
+        """
+        Grelha com cruzamentos deslocados, ruas verticais removidas ao acaso e
+        diagonais (uma por quarteirão, para manter a rede planar).
+
+        As ruas horizontais e a primeira coluna nunca são removidas, o que
+        garante que a rede é conexa.
+        """
+        rng = random.Random(semente)
+        linhas, colunas = CidadeSintetica._dimensoes(n_nos)
+        desvio = 0.35 * espacamento_km
+
+        pontos = []
+        for i in range(n_nos):
+            l, c = divmod(i, colunas)
+            pontos.append((c * espacamento_km + rng.uniform(-desvio, desvio),
+                           l * espacamento_km + rng.uniform(-desvio, desvio)))
+
+        ligacoes = []
+        for i in range(n_nos):
+            l, c = divmod(i, colunas)
+            tem_direita = c + 1 < colunas and i + 1 < n_nos
+            tem_cima = i + colunas < n_nos
+            if tem_direita:
+                ligacoes.append((i, i + 1))
+            if tem_cima and (c == 0 or rng.random() >= prob_remover):
+                ligacoes.append((i, i + colunas))
+            if tem_direita and i + colunas + 1 < n_nos and rng.random() < prob_diagonal:
+                ligacoes.append((i, i + colunas + 1))
+
+        return CidadeSintetica._montar(pontos, ligacoes, rng)
+
+    @staticmethod
+    def _dimensoes(n_nos: int) -> Tuple[int, int]:
+        if n_nos < 4:
+            raise ValueError(f"Uma cidade sintética precisa de pelo menos 4 nós, recebido: {n_nos}")
+        colunas = math.ceil(math.sqrt(n_nos))
+        return math.ceil(n_nos / colunas), colunas
+
+    # ==========================================================
+    # Zonas, nomes e velocidades
+    # ==========================================================
+
+    @staticmethod
+    def _montar(pontos: List[Tuple[float, float]], ligacoes: List[Tuple[int, int]],
+                rng: random.Random) -> Grafo:
+        """Classifica os nós, atribui nomes reconhecidos pelo GestorTransito e cria as arestas."""
+        n = len(pontos)
+        cx = sum(x for x, _ in pontos) / n
+        cy = sum(y for _, y in pontos) / n
+        raio = [math.hypot(x - cx, y - cy) for x, y in pontos]
+        raio_cidade = max(raio) or 1.0
+
+        # Postos nas entradas/saídas da cidade (metade exterior), estações em qualquer lado
+        n_postos = max(1, round(n * CidadeSintetica.PROPORCAO_POSTOS))
+        n_recarga = max(1, round(n * CidadeSintetica.PROPORCAO_RECARGA))
+        periferia = [i for i in range(n) if raio[i] > 0.5 * raio_cidade]
+        postos = set(rng.sample(periferia, min(n_postos, len(periferia))))
+        restantes = [i for i in range(n) if i not in postos]
+        recargas = set(rng.sample(restantes, min(n_recarga, len(restantes))))
+
+        nomes = []
+        tipos = []
+        for i in range(n):
+            if i in postos:
+                nome, tipo = f"Posto_{i}", TipoNo.POSTO_ABASTECIMENTO
+            elif i in recargas:
+                nome, tipo = f"Recarga_{i}", TipoNo.ESTACAO_RECARGA
+            elif raio[i] <= CidadeSintetica.RAIO_CENTRO * raio_cidade:
+                nome, tipo = f"Centro_{i}", TipoNo.RECOLHA_PASSAGEIROS
+            elif rng.random() < CidadeSintetica.PROPORCAO_COMERCIAL:
+                prefixo = "Aeroporto" if raio[i] > 0.8 * raio_cidade else "Parque_Tec"
+                nome, tipo = f"{prefixo}_{i}", TipoNo.RECOLHA_PASSAGEIROS
+            else:
+                nome, tipo = f"Bairro_{i}", TipoNo.RECOLHA_PASSAGEIROS
+            nomes.append(nome)
+            tipos.append(tipo)
+
+        g = Grafo()
+        for i, (x, y) in enumerate(pontos):
+            g.adiciona_no(No(nomes[i], round(x, 3), round(y, 3), tipos[i]))
+
+        for a, b in ligacoes:
+            (xa, ya), (xb, yb) = pontos[a], pontos[b]
+            dist_km = round(max(0.05, math.hypot(xa - xb, ya - yb)), 3)
+
+            # Mesmas velocidades do GrafoDemo: centro 20 km/h, periferia 50 km/h, resto 30 km/h
+            if raio[a] > 0.8 * raio_cidade and raio[b] > 0.8 * raio_cidade:
+                velocidade_kmh = 50
+            elif nomes[a].startswith("Centro") or nomes[b].startswith("Centro"):
+                velocidade_kmh = 20
+            else:
+                velocidade_kmh = 30
+
+            g.adiciona_aresta(nomes[a], nomes[b], dist_km, (dist_km / velocidade_kmh) * 60)
+
+        return g
+
+    # ==========================================================
+    # Frota e pedidos
+    # ==========================================================
+
+    @staticmethod
+    def zonas_recolha(grafo: Grafo) -> List[str]:
+        return [no_id for no_id, no in grafo.nos.items() if no.tipo == TipoNo.RECOLHA_PASSAGEIROS]
+
+    @staticmethod
+    def criar_frota(gestor, n_veiculos: Optional[int] = None, veiculos_por_no: float = 0.02,
+                    fracao_eletricos: float = 0.5, semente: int = 0) -> list:
+        """
+        Adiciona ao gestor uma frota proporcional ao tamanho da cidade.
+
+        Args:
+            gestor: GestorFrota com o grafo da cidade
+            n_veiculos: Número de veículos (por omissão: veiculos_por_no × nós, mínimo 4)
+            fracao_eletricos: Fração de veículos elétricos
+
+        Returns:
+            Veículos criados
+        """
+        rng = random.Random(semente)
+        zonas = CidadeSintetica.zonas_recolha(gestor.grafo)
+        if n_veiculos is None:
+            n_veiculos = max(4, round(len(gestor.grafo.nos) * veiculos_por_no))
+        n_eletricos = round(n_veiculos * fracao_eletricos)
+
+        veiculos = []
+        for i in range(n_veiculos):
+            comum = dict(
+                posicao=rng.choice(zonas),
+                capacidade_passageiros=4,
+                estado=EstadoVeiculo.DISPONIVEL,
+                km_total=0,
+                km_sem_passageiros=0,
+                indice_rota=0,
+                id_pedido_atual=None,
+                tempo_ocupado_ate=0,
+                rota=[],
+            )
+            if i < n_eletricos:
+                v = VeiculoEletrico(
+                    id_veiculo=f"E{i + 1}", autonomia_km=80, autonomiaMax_km=80, custo_km=0.10,
+                    tempo_recarregamento_min=30, capacidade_bateria_kWh=60, consumo_kWh_km=0.15,
+                    **comum
+                )
+            else:
+                v = VeiculoCombustao(
+                    id_veiculo=f"C{i + 1 - n_eletricos}", autonomia_km=120, autonomiaMax_km=120,
+                    custo_km=0.20, tempo_reabastecimento_min=10, emissao_CO2_km=0.12,
+                    **comum
+                )
+            gestor.adicionar_veiculo(v)
+            veiculos.append(v)
+
+        return veiculos
+
+    @staticmethod
+    def gerar_pedidos(grafo: Grafo, n_pedidos: Optional[int] = None, duracao_min: int = 120,
+                      pedidos_por_no: float = 0.05, prob_centro: float = 0.4,
+                      semente: int = 0) -> List[Pedido]:
+        """
+        Fluxo de pedidos ordenado por instante, com hotspots no centro.
+
+        Args:
+            n_pedidos: Número de pedidos (por omissão: pedidos_por_no × nós, mínimo 10)
+            prob_centro: Probabilidade de a origem ser uma zona "Centro_*"
+        """
+        rng = random.Random(semente)
+        zonas = CidadeSintetica.zonas_recolha(grafo)
+        centro = [z for z in zonas if z.startswith("Centro")] or zonas
+        if n_pedidos is None:
+            n_pedidos = max(10, round(len(grafo.nos) * pedidos_por_no))
+
+        instantes = sorted(rng.randrange(duracao_min) for _ in range(n_pedidos))
+        pedidos = []
+        for i, instante in enumerate(instantes):
+            origem = rng.choice(centro if rng.random() < prob_centro else zonas)
+            destino = rng.choice(zonas)
+            while destino == origem:
+                destino = rng.choice(zonas)
+
+            pedidos.append(Pedido(
+                id_pedido=f"P{i + 1}",
+                posicao_inicial=origem,
+                posicao_destino=destino,
+                passageiros=rng.choices((1, 2, 3, 4), weights=(55, 25, 12, 8))[0],
+                instante_pedido=instante,
+                prioridade=rng.randint(0, 3),
+                pref_ambiental=rng.choices(("qualquer", "eletrico", "combustao"), weights=(60, 25, 15))[0],
+                estado=EstadoPedido.PENDENTE,
+                veiculo_atribuido=None,
+                tempo_max_espera=rng.randint(15, 30),
+            ))
+
+        return pedidos
+
+    @staticmethod
+    def pares_aleatorios(grafo: Grafo, n_pares: int, semente: int = 0) -> List[Tuple[str, str]]:
+        """Pares (origem, destino) distintos de zonas de recolha, para cenários de procura."""
+        rng = random.Random(semente)
+        zonas = CidadeSintetica.zonas_recolha(grafo)
+        pares = []
+        while len(pares) < n_pares:
+            origem, destino = rng.sample(zonas, 2)
+            pares.append((origem, destino))
+        return pares
@@ -0,0 +1,448 @@
+"""
+Importador de redes viárias reais (extratos locais OSM XML ou GeoJSON).
+
+Lê o ficheiro em streaming (iterparse / uma linha de cada vez) e guarda só o
+necessário para a rede: listas de nós das vias e coordenadas dos nós usados.
+
+Passos:
+1. Vias (highway=*) com velocidade (maxspeed ou valor típico da classe) e sentido
+2. Simplificação: só ficam cruzamentos e extremos; cadeias de nós de grau 2
+   passam a uma única aresta com a soma das distâncias e tempos
+3. Fica apenas a maior componente fortemente conexa (todos os nós alcançáveis)
+4. amenity=charging_station → ESTACAO_RECARGA, amenity=fuel → POSTO_ABASTECIMENTO,
+   ligados ao cruzamento mais próximo
+
+As coordenadas são projetadas em km (projeção equiretangular local), que é a
+unidade que dist_euclidiana e as heurísticas esperam.
+
+Uso:
+    grafo = ImportadorRede.importar("zona.osm")
+    grafo = ImportadorRede.importar("zona.geojsonl", compacto=True)
+"""
+
+import bz2
+import gzip
+import json
+import math
+import re
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+from modelo.grafo import Grafo, No, Aresta, TipoNo
+
+# Velocidade típica (km/h) por classe de via, quando não há maxspeed
+VELOCIDADES_HIGHWAY = {
+    "motorway": 100, "motorway_link": 60,
+    "trunk": 80, "trunk_link": 50,
+    "primary": 60, "primary_link": 40,
+    "secondary": 50, "secondary_link": 40,
+    "tertiary": 40, "tertiary_link": 30,
+    "unclassified": 40, "residential": 30,
+    "living_street": 10, "service": 20, "road": 30,
+}
+
+AMENIDADES = {
+    "charging_station": TipoNo.ESTACAO_RECARGA,
+    "fuel": TipoNo.POSTO_ABASTECIMENTO,
+}
+
+# Ligação de uma estação/posto à rede (acesso a baixa velocidade)
+VELOCIDADE_ACESSO_KMH = 20
+
+KM_POR_GRAU_LAT = 110.574
+KM_POR_GRAU_LON_EQUADOR = 111.320
+
+
+def _abrir(caminho: str, modo: str = "rb"):
+    """Abre ficheiros simples ou comprimidos (.gz, .bz2)."""
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, modo)
+    if caminho.endswith(".bz2"):
+        return bz2.open(caminho, modo)
+    return open(caminho, modo)
+
+
+def velocidade_via(tags: Dict[str, str]) -> Optional[float]:
+    """Velocidade (km/h) de uma via, ou None se não for uma via para veículos."""
+    classe = tags.get("highway")
+    if classe not in VELOCIDADES_HIGHWAY:
+        return None
+    if tags.get("access") in ("no", "private") or tags.get("motor_vehicle") == "no":
+        return None
+
+    maxspeed = tags.get("maxspeed", "")
+    numero = re.match(r"\s*(\d+(?:\.\d+)?)", maxspeed)
+    if numero:
+        velocidade = float(numero.group(1))
+        if "mph" in maxspeed:
+            velocidade *= 1.609
+        if velocidade > 0:
+            return velocidade
+    return float(VELOCIDADES_HIGHWAY[classe])
+
+
+def sentido_via(tags: Dict[str, str]) -> int:
+    """1 = só no sentido dos nós, -1 = só no sentido inverso, 0 = dois sentidos."""
+    oneway = tags.get("oneway", "")
+    if oneway in ("yes", "true", "1"):
+        return 1
+    if oneway == "-1":
+        return -1
+    if oneway == "no":
+        return 0
+    if tags.get("junction") in ("roundabout", "circular") or tags.get("highway") == "motorway":
+        return 1
+    return 0
+
+
+class _ConstrutorRede:
+    """
+    Acumula vias e amenidades (com nós identificados por uma chave qualquer)
+    e produz o Grafo simplificado.
+    """
+
+    def __init__(self):
+        # (nós da via, velocidade, sentido)
+        self.vias: List[Tuple[list, float, int]] = []
+        # (chave, tipo, coordenadas (lon, lat) ou lista de chaves a resolver)
+        self.amenidades: List[Tuple[str, TipoNo, object]] = []
+        self.coordenadas: Dict[Hashable, Tuple[float, float]] = {}
+
+    def adicionar_via(self, nos: list, velocidade: float, sentido: int):
+        if len(nos) >= 2:
+            self.vias.append((nos, velocidade, sentido))
+
+    def adicionar_amenidade(self, chave: str, tipo: TipoNo, posicao):
+        self.amenidades.append((chave, tipo, posicao))
+
+    def nos_necessarios(self) -> set:
+        necessarios = set()
+        for nos, _, _ in self.vias:
+            necessarios.update(nos)
+        for _, _, posicao in self.amenidades:
+            if isinstance(posicao, list):
+                necessarios.update(posicao)
+        return necessarios
+
+    # ==========================================================
+    # Construção do grafo
+    # ==========================================================
+
+    def construir(self, prefixo: str = "osm_") -> Grafo:
+        if not self.vias or not self.coordenadas:
+            raise ValueError("O ficheiro não contém vias transitáveis (highway=*)")
+
+        # Projeção local em km, centrada no primeiro nó
+        lon0, lat0 = next(iter(self.coordenadas.values()))
+        km_lon = KM_POR_GRAU_LON_EQUADOR * math.cos(math.radians(lat0))
+
+        def projetar(lon: float, lat: float) -> Tuple[float, float]:
+            return (lon - lon0) * km_lon, (lat - lat0) * KM_POR_GRAU_LAT
+
+        # Nós que ficam: extremos de vias e nós partilhados (ou repetidos) entre vias
+        usos: Dict[Hashable, int] = {}
+        for nos, _, _ in self.vias:
+            for no in nos:
+                usos[no] = usos.get(no, 0) + 1
+        mantidos = set()
+        for nos, _, _ in self.vias:
+            mantidos.add(nos[0])
+            mantidos.add(nos[-1])
+        mantidos.update(no for no, n in usos.items() if n > 1)
+        del usos
+
+        # Arestas simplificadas (origem, destino) → (distância, tempo), fica a mais rápida
+        arestas: Dict[Tuple[Hashable, Hashable], Tuple[float, float]] = {}
+
+        def registar(u, v, dist_km, tempo_min):
+            if u == v:
+                return
+            atual = arestas.get((u, v))
+            if atual is None or tempo_min < atual[1]:
+                arestas[(u, v)] = (dist_km, tempo_min)
+
+        for nos, velocidade, sentido in self.vias:
+            nos = [no for no in nos if no in self.coordenadas]
+            if len(nos) < 2:
+                continue
+            inicio = nos[0]
+            dist_km = tempo_min = 0.0
+            x_ant, y_ant = projetar(*self.coordenadas[inicio])
+            for no in nos[1:]:
+                x, y = projetar(*self.coordenadas[no])
+                troco = math.hypot(x - x_ant, y - y_ant)
+                dist_km += troco
+                tempo_min += troco / velocidade * 60
+                x_ant, y_ant = x, y
+                if no in mantidos:
+                    if sentido >= 0:
+                        registar(inicio, no, dist_km, tempo_min)
+                    if sentido <= 0:
+                        registar(no, inicio, dist_km, tempo_min)
+                    inicio = no
+                    dist_km = tempo_min = 0.0
+        self.vias = []
+
+        componente = self._maior_componente(arestas)
+        if not componente:
+            raise ValueError("A rede importada não tem nenhuma ligação entre cruzamentos")
+
+        g = Grafo()
+        for no in (no for no in self.coordenadas if no in componente):
+            x, y = projetar(*self.coordenadas[no])
+            g.adiciona_no(No(f"{prefixo}{no}", round(x, 5), round(y, 5), TipoNo.RECOLHA_PASSAGEIROS))
+        for (u, v), (dist_km, tempo_min) in arestas.items():
+            if u in componente and v in componente:
+                g.regista_aresta(f"{prefixo}{u}", Aresta(f"{prefixo}{v}", round(max(dist_km, 0.001), 4),
+                                                        round(tempo_min, 4)))
+
+        self._ligar_amenidades(g, projetar)
+        return g
+
+    @staticmethod
+    def _maior_componente(arestas) -> set:
+        """Maior componente fortemente conexa (Kosaraju iterativo)."""
+        sucessores: Dict[Hashable, List[Hashable]] = {}
+        predecessores: Dict[Hashable, List[Hashable]] = {}
+        for u, v in arestas:
+            sucessores.setdefault(u, []).append(v)
+            predecessores.setdefault(v, []).append(u)
+            sucessores.setdefault(v, [])
+            predecessores.setdefault(u, [])
+
+        # 1ª passagem: ordem de fim de visita
+        ordem = []
+        visitados = set()
+        for raiz in sucessores:
+            if raiz in visitados:
+                continue
+            visitados.add(raiz)
+            pilha = [(raiz, iter(sucessores[raiz]))]
+            while pilha:
+                no, filhos = pilha[-1]
+                for filho in filhos:
+                    if filho not in visitados:
+                        visitados.add(filho)
+                        pilha.append((filho, iter(sucessores[filho])))
+                        break
+                else:
+                    pilha.pop()
+                    ordem.append(no)
+
+        # 2ª passagem no grafo transposto, por ordem inversa
+        atribuidos = set()
+        maior: set = set()
+        for raiz in reversed(ordem):
+            if raiz in atribuidos:
+                continue
+            componente = {raiz}
+            atribuidos.add(raiz)
+            pilha = [raiz]
+            while pilha:
+                no = pilha.pop()
+                for anterior in predecessores[no]:
+                    if anterior not in atribuidos:
+                        atribuidos.add(anterior)
+                        componente.add(anterior)
+                        pilha.append(anterior)
+            if len(componente) > len(maior):
+                maior = componente
+        return maior
+
+    def _ligar_amenidades(self, g: Grafo, projetar):
+        """Liga cada estação/posto ao cruzamento mais próximo (grelha de células de 0.5 km)."""
+        if not self.amenidades:
+            return
+        celula = 0.5
+        grelha: Dict[Tuple[int, int], List[No]] = {}
+        for no in g.nos.values():
+            grelha.setdefault((int(no.posicaox // celula), int(no.posicaoy // celula)), []).append(no)
+
+        for chave, tipo, posicao in self.amenidades:
+            if isinstance(posicao, list):
+                pontos = [self.coordenadas[p] for p in posicao if p in self.coordenadas]
+                if not pontos:
+                    continue
+                posicao = (sum(p[0] for p in pontos) / len(pontos), sum(p[1] for p in pontos) / len(pontos))
+            x, y = projetar(*posicao)
+            cx, cy = int(x // celula), int(y // celula)
+
+            # Procura em anéis de células até encontrar um nó (máx. ~2 km)
+            mais_proximo, melhor = None, math.inf
+            for raio in range(5):
+                for i in range(cx - raio, cx + raio + 1):
+                    for j in range(cy - raio, cy + raio + 1):
+                        if max(abs(i - cx), abs(j - cy)) != raio:
+                            continue
+                        for no in grelha.get((i, j), ()):
+                            d = math.hypot(no.posicaox - x, no.posicaoy - y)
+                            if d < melhor:
+                                mais_proximo, melhor = no, d
+                if mais_proximo is not None and melhor <= raio * celula:
+                    break
+            if mais_proximo is None:
+                continue
+
+            prefixo = "Recarga" if tipo == TipoNo.ESTACAO_RECARGA else "Posto"
+            id_no = f"{prefixo}_{chave}"
+            if id_no in g.nos:
+                continue
+            g.adiciona_no(No(id_no, round(x, 5), round(y, 5), tipo))
+            dist_km = round(max(melhor, 0.001), 4)
+            g.adiciona_aresta(id_no, mais_proximo.id_no, dist_km, round(dist_km / VELOCIDADE_ACESSO_KMH * 60, 4))
+
+
+class ImportadorRede:
+
+    @staticmethod
+    def importar(caminho: str, compacto: bool = False):
+        """
+        Importa um extrato local, escolhendo o formato pela extensão:
+        .osm/.xml (OSM XML) ou .geojson/.geojsonl/.geojsons/.json (GeoJSON),
+        opcionalmente comprimidos com .gz/.bz2.
+
+        Args:
+            compacto: Se True devolve um GrafoCompacto (CSR)
+        """
+        nome = caminho.lower()
+        for sufixo in (".gz", ".bz2"):
+            if nome.endswith(sufixo):
+                nome = nome[:-len(sufixo)]
+
+        if nome.endswith((".osm", ".xml")):
+            g = ImportadorRede.importar_osm_xml(caminho)
+        elif nome.endswith((".geojson", ".geojsonl", ".geojsons", ".json", ".ndjson")):
+            g = ImportadorRede.importar_geojson(caminho)
+        elif nome.endswith(".pbf"):
+            raise ValueError("Formato PBF não suportado: converta para OSM XML (ex: osmium cat zona.osm.pbf -o zona.osm)")
+        else:
+            raise ValueError(f"Formato de ficheiro desconhecido: {caminho}")
+
+        return g.compactar() if compacto else g
+
+    # ==========================================================
+    # OSM XML
+    # ==========================================================
+
+    @staticmethod
+    def _elementos_osm(caminho: str) -> Iterator[ET.Element]:
+        """Percorre node/way do ficheiro, libertando cada elemento depois de usado."""
+        with _abrir(caminho) as f:
+            contexto = ET.iterparse(f, events=("start", "end"))
+            _, raiz = next(contexto)
+            for evento, elem in contexto:
+                if evento != "end" or elem.tag not in ("node", "way", "relation"):
+                    continue
+                if elem.tag != "relation":
+                    yield elem
+                elem.clear()
+                raiz.clear()
+
+    @staticmethod
+    def importar_osm_xml(caminho: str) -> Grafo:
+        """
+        Duas passagens pelo ficheiro:
+        1. vias e amenidades (as coordenadas dos nós ainda não são guardadas)
+        2. coordenadas apenas dos nós usados pelas vias/amenidades
+        """
+        construtor = _ConstrutorRede()
+
+        for elem in ImportadorRede._elementos_osm(caminho):
+            tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+            tipo_amenidade = AMENIDADES.get(tags.get("amenity"))
+            if elem.tag == "node":
+                if tipo_amenidade is not None:
+                    construtor.adicionar_amenidade(
+                        elem.get("id"), tipo_amenidade, (float(elem.get("lon")), float(elem.get("lat"))))
+                continue
+
+            refs = array("q", (int(nd.get("ref")) for nd in elem.iter("nd")))
+            if tipo_amenidade is not None:
+                construtor.adicionar_amenidade(f"w{elem.get('id')}", tipo_amenidade, list(refs))
+            velocidade = velocidade_via(tags)
+            if velocidade is not None:
+                construtor.adicionar_via(refs, velocidade, sentido_via(tags))
+
+        necessarios = construtor.nos_necessarios()
+        for elem in ImportadorRede._elementos_osm(caminho):
+            if elem.tag == "node":
+                id_no = int(elem.get("id"))
+                if id_no in necessarios:
+                    construtor.coordenadas[id_no] = (float(elem.get("lon")), float(elem.get("lat")))
+
+        return construtor.construir(prefixo="osm_")
+
+    # ==========================================================
+    # GeoJSON
+    # ==========================================================
+
+    @staticmethod
+    def _features_geojson(caminho: str) -> Iterator[dict]:
+        """
+        Features de um ficheiro GeoJSON.
+
+        GeoJSON por linhas (uma Feature por linha, RFC 8142) é lido em streaming;
+        uma FeatureCollection num único documento tem de ser carregada de uma vez.
+        """
+        with _abrir(caminho, "rt") as f:
+            primeira = f.readline()
+            try:
+                documento = json.loads(primeira.strip().lstrip("\x1e"))
+                por_linhas = documento.get("type") == "Feature"
+            except json.JSONDecodeError:
+                por_linhas = False
+
+            if por_linhas:
+                yield documento
+                for linha in f:
+                    linha = linha.strip().lstrip("\x1e")
+                    if linha:
+                        yield json.loads(linha)
+            else:
+                documento = json.loads(primeira + f.read())
+                yield from documento.get("features", [])
+
+    @staticmethod
+    def importar_geojson(caminho: str) -> Grafo:
+        """
+        LineString/MultiLineString com propriedades OSM (highway, maxspeed, oneway)
+        e Point/Polygon com amenity. Nós são identificados pelas coordenadas
+        (arredondadas a 7 casas): vias que partilham um ponto ficam ligadas.
+        """
+        construtor = _ConstrutorRede()
+        chaves: Dict[Tuple[float, float], int] = {}
+
+        def chave(ponto) -> int:
+            lon, lat = round(ponto[0], 7), round(ponto[1], 7)
+            k = chaves.get((lon, lat))
+            if k is None:
+                k = chaves[(lon, lat)] = len(chaves)
+                construtor.coordenadas[k] = (lon, lat)
+            return k
+
+        for n, feature in enumerate(ImportadorRede._features_geojson(caminho)):
+            geometria = feature.get("geometry") or {}
+            tags = {k: str(v) for k, v in (feature.get("properties") or {}).items() if v is not None}
+            tipo_geom = geometria.get("type")
+            coords = geometria.get("coordinates")
+
+            tipo_amenidade = AMENIDADES.get(tags.get("amenity"))
+            if tipo_amenidade is not None:
+                if tipo_geom == "Point":
+                    posicao = (coords[0], coords[1])
+                elif tipo_geom == "Polygon":
+                    posicao = (sum(p[0] for p in coords[0]) / len(coords[0]),
+                               sum(p[1] for p in coords[0]) / len(coords[0]))
+                else:
+                    continue
+                construtor.adicionar_amenidade(str(feature.get("id", f"f{n}")), tipo_amenidade, posicao)
+                continue
+
+            velocidade = velocidade_via(tags)
+            if velocidade is None:
+                continue
+            linhas = [coords] if tipo_geom == "LineString" else coords if tipo_geom == "MultiLineString" else []
+            for linha in linhas:
+                construtor.adicionar_via(array("q", (chave(p) for p in linha)), velocidade, sentido_via(tags))
+
+        return construtor.construir(prefixo="geo_")
@@ -5,11 +5,15 @@ entre dois nós do grafo.
 
 import heapq
 from .uteis import dist_euclidiana, heuristica_avancada
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from modelo.grafo import Grafo
+from modelo.grafo_compacto import GrafoCompacto
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
 
 def a_star_search(grafo: Grafo, start_id: str, goal_id: str, 
-                  veiculo=None, tempo_atual=0, usar_heuristica_avancada=True) -> Tuple[float, List[str]]:
+                  veiculo=None, tempo_atual=0, usar_heuristica_avancada=True,
+                  heuristica: Optional[Callable[[str, str], float]] = None,
+                  estatisticas: Optional[EstatisticasProcura] = None) -> Tuple[float, List[str]]:
     """
     Algoritmo A* com opção de heurística avançada.
     
@@ -20,6 +24,8 @@ def a_star_search(grafo: Grafo, start_id: str, goal_id: str,
         veiculo: (Opcional) Veículo para considerar autonomia
         tempo_atual: (Opcional) Tempo atual para estimar trânsito
         usar_heuristica_avancada: Se True, usa heurística que considera autonomia e trânsito
+        heuristica: (Opcional) Função h(no, destino) a usar em vez das anteriores (ex: Landmarks.heuristica)
+        estatisticas: (Opcional) EstatisticasProcura onde registar o esforço da procura
     
     Returns:
         (custo_total, caminho)
@@ -27,13 +33,26 @@ def a_star_search(grafo: Grafo, start_id: str, goal_id: str,
     if start_id == goal_id:
         return 0.0, [start_id]
 
+    # Grafo CSR: procura sobre os arrays (a heurística continua a receber ids)
+    if isinstance(grafo, GrafoCompacto):
+        if heuristica is None:
+            if usar_heuristica_avancada and veiculo is not None:
+                heuristica = lambda no_id, objetivo: heuristica_avancada(grafo, veiculo, no_id, objetivo, tempo_atual)
+            else:
+                heuristica = lambda no_id, objetivo: dist_euclidiana(grafo.nos[no_id], grafo.nos[objetivo])
+        return a_star_search_compacto(grafo, start_id, goal_id, heuristica, estatisticas)
+
     open_set = []
     heapq.heappush(open_set, (0.0, start_id))
     came_from: Dict[str, Optional[str]] = {start_id: None}
     g_score: Dict[str, float] = {start_id: 0.0}
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
 
     while open_set:
         _, current = heapq.heappop(open_set)
+        if estatisticas is not None:
+            estatisticas.pops += 1
         
         if current == goal_id:
             path = []
@@ -42,9 +61,13 @@ def a_star_search(grafo: Grafo, start_id: str, goal_id: str,
                 current = came_from[current]
             return g_score[goal_id], list(reversed(path))
 
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(g_score))
         for aresta in grafo.vizinhos(current):
             no_destino = aresta.no_destino
             custo = aresta.tempo_real()  # Considera trânsito
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
 
             # Ignora arestas bloqueadas
             if custo == float('inf'):
@@ -57,7 +80,9 @@ def a_star_search(grafo: Grafo, start_id: str, goal_id: str,
                 g_score[no_destino] = tentative_g
                 
                 # Escolha de heurística
-                if usar_heuristica_avancada and veiculo is not None:
+                if heuristica is not None:
+                    h = heuristica(no_destino, goal_id)
+                elif usar_heuristica_avancada and veiculo is not None:
                     h = heuristica_avancada(grafo, veiculo, no_destino, goal_id, tempo_atual)
                 else:
                     # Heurística simples (euclidiana)
@@ -65,5 +90,66 @@ def a_star_search(grafo: Grafo, start_id: str, goal_id: str,
                 
                 f = tentative_g + h
                 heapq.heappush(open_set, (f, no_destino))
+                if estatisticas is not None:
+                    estatisticas.registar_push(len(open_set))
+
+    return float('inf'), []
+
+
+def a_star_search_compacto(grafo: GrafoCompacto, start_id: str, goal_id: str,
+                           heuristica: Callable[[str, str], float],
+                           estatisticas: Optional[EstatisticasProcura] = None) -> Tuple[float, List[str]]:
+    """
+    A* sobre a representação CSR (como uniform_cost_search_compacto): índices
+    inteiros e arrays, sem criar objetos Aresta por relaxação.
+    """
+    if start_id == goal_id:
+        return 0.0, [start_id]
+
+    inicio = grafo.indice[start_id]
+    objetivo = grafo.indice[goal_id]
+    ids = grafo.ids
+    offsets, destinos = grafo.offsets, grafo.destinos
+    tempos, congestion, bloqueadas = grafo.tempos, grafo.congestion, grafo.bloqueadas
+
+    open_set = [(0.0, 0.0, inicio)]
+    came_from: Dict[int, int] = {inicio: -1}
+    g_score: Dict[int, float] = {inicio: 0.0}
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
+
+    while open_set:
+        _, g, current = heapq.heappop(open_set)
+        if estatisticas is not None:
+            estatisticas.pops += 1
+
+        if current == objetivo:
+            path = []
+            while current != -1:
+                path.append(ids[current])
+                current = came_from[current]
+            return g, list(reversed(path))
+
+        # Entrada desatualizada na heap
+        if g > g_score[current]:
+            continue
+
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(g_score))
+        for e in range(offsets[current], offsets[current + 1]):
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
+            if bloqueadas[e]:
+                continue
+
+            no_destino = destinos[e]
+            tentative_g = g + tempos[e] * congestion[e]
+            if no_destino not in g_score or tentative_g < g_score[no_destino]:
+                came_from[no_destino] = current
+                g_score[no_destino] = tentative_g
+                f = tentative_g + heuristica(ids[no_destino], goal_id)
+                heapq.heappush(open_set, (f, tentative_g, no_destino))
+                if estatisticas is not None:
+                    estatisticas.registar_push(len(open_set))
 
-    return float('inf'), []
\ No newline at end of file
+    return float('inf'), []
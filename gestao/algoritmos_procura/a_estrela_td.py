@@ -0,0 +1,140 @@
+"""
+A* dependente do tempo (time-dependent).
+
+O custo de cada aresta é avaliado no instante em que o veículo lá chega, com
+os factores horários do GestorTransito. Uma viagem de 90 minutos que entra na
+hora de ponta fica mais cara a meio do caminho, em vez de usar o snapshot de
+aresta.congestion tirado à partida.
+
+Modelo de travessia (FIFO): o factor altera a velocidade na aresta; se a hora
+muda durante a travessia, o resto da aresta é percorrido ao novo ritmo. Sair
+mais tarde nunca faz chegar mais cedo, por isso o A* por instante de chegada
+continua correto.
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+from gestao.transito_dinamico import GestorTransito
+from gestao.algoritmos_procura.uteis import dist_euclidiana
+
+
+class PerfilTransito:
+    """
+    Tabela (aresta, hora) → factor, pré-calculada a partir do GestorTransito.
+
+    Bloqueios não fazem parte do perfil: usa-se o estado atual de aresta.blocked.
+    """
+
+    def __init__(self, transito: GestorTransito):
+        self.transito = transito
+        self.grafo = transito.grafo
+        self.factores: Dict[Tuple[str, str], Tuple[float, ...]] = transito.tabela_factores()
+
+        # Limite inferior min/unidade euclidiana (para a heurística)
+        self.razao_minima = self._calcular_razao_minima()
+
+    def _calcular_razao_minima(self) -> float:
+        razao = math.inf
+        for no_origem, arestas in self.grafo.adjacentes.items():
+            for aresta in arestas:
+                d = dist_euclidiana(self.grafo.nos[no_origem], self.grafo.nos[aresta.no_destino])
+                if d > 0:
+                    factor_min = min(self.factores[(no_origem, aresta.no_destino)])
+                    razao = min(razao, aresta.tempoViagem_min * factor_min / d)
+        return razao if razao != math.inf else 0.0
+
+    def hora(self, instante_min: float) -> int:
+        """Hora do dia no minuto de simulação indicado (hora_inicial lida no momento: pode ser reconfigurada)."""
+        return (self.transito.hora_inicial + int(instante_min // 60)) % 24
+
+    def tempo_travessia(self, no_origem: str, aresta, instante_min: float) -> float:
+        """
+        Minutos para percorrer a aresta entrando nela em instante_min.
+
+        Returns:
+            inf se a aresta estiver bloqueada
+        """
+        if aresta.blocked:
+            return math.inf
+
+        factores = self.factores.get((no_origem, aresta.no_destino))
+        if factores is None:  # aresta criada depois do perfil
+            return aresta.tempo_real()
+
+        tempo_base = aresta.tempoViagem_min
+        if tempo_base <= 0:
+            return 0.0
+
+        t = instante_min
+        por_percorrer = 1.0  # fração da aresta
+        while True:
+            duracao = tempo_base * factores[self.hora(t)]
+            fim_hora = (t // 60 + 1) * 60
+            if t + por_percorrer * duracao <= fim_hora:
+                return t + por_percorrer * duracao - instante_min
+            por_percorrer -= (fim_hora - t) / duracao
+            t = fim_hora
+
+    def heuristica(self, no_atual_id: str, no_destino_id: str) -> float:
+        """Limite inferior do tempo restante (admissível a qualquer hora)."""
+        return self.razao_minima * dist_euclidiana(self.grafo.nos[no_atual_id], self.grafo.nos[no_destino_id])
+
+
+def a_star_tempo_dependente(perfil: PerfilTransito, start_id: str, goal_id: str, instante_partida: float = 0,
+                            heuristica: Optional[Callable[[str, str], float]] = None) -> Tuple[float, List[str]]:
+    """
+    A* em que g(n) é o instante de chegada a n.
+
+    Args:
+        perfil: Perfil horário do trânsito (inclui o grafo)
+        start_id: Nó de origem
+        goal_id: Nó de destino
+        instante_partida: Minuto de simulação da partida
+        heuristica: (Opcional) h(no, destino) admissível com qualquer factor
+                    (ex: Landmarks.heuristica); por omissão usa perfil.heuristica
+
+    Returns:
+        (duracao_total_min, caminho)
+    """
+    if start_id == goal_id:
+        return 0.0, [start_id]
+
+    grafo = perfil.grafo
+    h = heuristica or perfil.heuristica
+
+    chegada: Dict[str, float] = {start_id: instante_partida}
+    came_from: Dict[str, Optional[str]] = {start_id: None}
+    fechados = set()
+    open_set = [(h(start_id, goal_id), start_id)]
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if current in fechados:
+            continue
+        fechados.add(current)
+
+        if current == goal_id:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = came_from[current]
+            return chegada[goal_id] - instante_partida, list(reversed(path))
+
+        t_atual = chegada[current]
+        for aresta in grafo.vizinhos(current):
+            no_destino = aresta.no_destino
+            if no_destino in fechados:
+                continue
+
+            custo = perfil.tempo_travessia(current, aresta, t_atual)
+            if custo == math.inf:  # Ignora arestas bloqueadas
+                continue
+
+            t_chegada = t_atual + custo
+            if t_chegada < chegada.get(no_destino, math.inf):
+                chegada[no_destino] = t_chegada
+                came_from[no_destino] = current
+                heapq.heappush(open_set, (t_chegada - instante_partida + h(no_destino, goal_id), no_destino))
+
+    return float('inf'), []
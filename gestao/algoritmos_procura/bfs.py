@@ -1,26 +1,38 @@
 from collections import deque
-from typing import List
+from typing import List, Optional
 from modelo.grafo import Grafo
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
 
 # Procura em largura (BFS) entre dois nós do grafo.
-def bfs(grafo: Grafo, start_id: str, goal_id: str) -> List[str]:
+def bfs(grafo: Grafo, start_id: str, goal_id: str,
+        estatisticas: Optional[EstatisticasProcura] = None) -> List[str]:
     if start_id not in grafo.nos or goal_id not in grafo.nos:
         raise ValueError("Nó inicial ou final não existe no grafo.")
 
     visitados = set()
     fila = deque([(start_id, [start_id])])  # (nó atual, caminho até aqui)
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
 
     while fila:
         atual, caminho = fila.popleft()
+        if estatisticas is not None:
+            estatisticas.pops += 1
         if atual == goal_id:
             return caminho  # devolve caminho completo
 
         visitados.add(atual)
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(visitados))
         for aresta in grafo.vizinhos(atual):
             vizinho = aresta.no_destino
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
             if vizinho not in visitados:
                 fila.append((vizinho, caminho + [vizinho]))
                 visitados.add(vizinho)
+                if estatisticas is not None:
+                    estatisticas.registar_push(len(fila))
 
     return []  # nenhum caminho encontrado
 
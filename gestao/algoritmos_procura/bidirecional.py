@@ -0,0 +1,207 @@
+"""
+Implementação do Dijkstra bidirecional.
+Procura em simultâneo a partir da origem (sentido das arestas) e do destino
+(sentido inverso) e junta as duas frentes quando já não é possível melhorar.
+
+Assume que cada aresta u→v tem a reversa v→u (como Grafo.adiciona_aresta garante),
+mas o custo usado na procura inversa é sempre o da aresta u→v.
+"""
+
+import heapq
+from typing import Dict, List, Tuple, Optional
+from modelo.grafo import Grafo
+from modelo.grafo_compacto import GrafoCompacto
+
+
+def bidirectional_search(grafo: Grafo, start_id: str, goal_id: str) -> Tuple[float, List[str]]:
+    """
+    Dijkstra bidirecional sobre tempo_real() (considera trânsito e bloqueios).
+
+    Critério de paragem: termina quando topo(frente) + topo(trás) >= melhor custo
+    encontrado até agora; nesse ponto nenhum caminho por expandir pode ser melhor.
+
+    Returns:
+        (custo_total_min, caminho)
+    """
+    if start_id == goal_id:
+        return 0.0, [start_id]
+
+    # Grafo CSR: procura sobre os arrays
+    if isinstance(grafo, GrafoCompacto):
+        return bidirectional_search_compacto(grafo, start_id, goal_id)
+
+    inf = float('inf')
+
+    dist_frente: Dict[str, float] = {start_id: 0.0}
+    dist_tras: Dict[str, float] = {goal_id: 0.0}
+    anterior: Dict[str, Optional[str]] = {start_id: None}   # frente: predecessor
+    seguinte: Dict[str, Optional[str]] = {goal_id: None}    # trás: sucessor
+
+    fila_frente = [(0.0, start_id)]
+    fila_tras = [(0.0, goal_id)]
+    fechados_frente = set()
+    fechados_tras = set()
+
+    melhor_custo = inf
+    no_encontro: Optional[str] = None
+
+    while fila_frente and fila_tras:
+        if fila_frente[0][0] + fila_tras[0][0] >= melhor_custo:
+            break
+
+        # Expande a frente com menor custo no topo
+        if fila_frente[0][0] <= fila_tras[0][0]:
+            custo, atual = heapq.heappop(fila_frente)
+            if atual in fechados_frente:
+                continue
+            fechados_frente.add(atual)
+
+            for aresta in grafo.vizinhos(atual):
+                custo_aresta = aresta.tempo_real()
+                if custo_aresta == inf:  # Ignora arestas bloqueadas
+                    continue
+
+                vizinho = aresta.no_destino
+                novo_custo = custo + custo_aresta
+                if novo_custo < dist_frente.get(vizinho, inf):
+                    dist_frente[vizinho] = novo_custo
+                    anterior[vizinho] = atual
+                    heapq.heappush(fila_frente, (novo_custo, vizinho))
+
+                    if vizinho in dist_tras and novo_custo + dist_tras[vizinho] < melhor_custo:
+                        melhor_custo = novo_custo + dist_tras[vizinho]
+                        no_encontro = vizinho
+        else:
+            custo, atual = heapq.heappop(fila_tras)
+            if atual in fechados_tras:
+                continue
+            fechados_tras.add(atual)
+
+            for aresta_reversa in grafo.vizinhos(atual):
+                vizinho = aresta_reversa.no_destino
+                try:
+                    custo_aresta = grafo.get_aresta(vizinho, atual).tempo_real()
+                except ValueError:
+                    continue
+                if custo_aresta == inf:
+                    continue
+
+                novo_custo = custo + custo_aresta
+                if novo_custo < dist_tras.get(vizinho, inf):
+                    dist_tras[vizinho] = novo_custo
+                    seguinte[vizinho] = atual
+                    heapq.heappush(fila_tras, (novo_custo, vizinho))
+
+                    if vizinho in dist_frente and novo_custo + dist_frente[vizinho] < melhor_custo:
+                        melhor_custo = novo_custo + dist_frente[vizinho]
+                        no_encontro = vizinho
+
+    if no_encontro is None:
+        return inf, []
+
+    # Reconstrução: origem → nó de encontro → destino
+    caminho = []
+    no = no_encontro
+    while no is not None:
+        caminho.append(no)
+        no = anterior[no]
+    caminho.reverse()
+
+    no = seguinte[no_encontro]
+    while no is not None:
+        caminho.append(no)
+        no = seguinte[no]
+
+    return melhor_custo, caminho
+
+
+def bidirectional_search_compacto(grafo: GrafoCompacto, start_id: str, goal_id: str) -> Tuple[float, List[str]]:
+    """
+    Dijkstra bidirecional sobre a representação CSR: índices inteiros e arrays.
+    A procura inversa obtém a aresta vizinho→atual de grafo.arestas_reversas().
+    """
+    if start_id == goal_id:
+        return 0.0, [start_id]
+
+    inf = float('inf')
+    inicio = grafo.indice[start_id]
+    objetivo = grafo.indice[goal_id]
+    offsets, destinos = grafo.offsets, grafo.destinos
+    tempos, congestion, bloqueadas = grafo.tempos, grafo.congestion, grafo.bloqueadas
+    reversas = grafo.arestas_reversas()
+
+    dist_frente: Dict[int, float] = {inicio: 0.0}
+    dist_tras: Dict[int, float] = {objetivo: 0.0}
+    anterior: Dict[int, int] = {inicio: -1}
+    seguinte: Dict[int, int] = {objetivo: -1}
+
+    fila_frente = [(0.0, inicio)]
+    fila_tras = [(0.0, objetivo)]
+    fechados_frente = set()
+    fechados_tras = set()
+
+    melhor_custo = inf
+    no_encontro = -1
+
+    while fila_frente and fila_tras:
+        if fila_frente[0][0] + fila_tras[0][0] >= melhor_custo:
+            break
+
+        if fila_frente[0][0] <= fila_tras[0][0]:
+            custo, atual = heapq.heappop(fila_frente)
+            if atual in fechados_frente:
+                continue
+            fechados_frente.add(atual)
+
+            for e in range(offsets[atual], offsets[atual + 1]):
+                if bloqueadas[e]:
+                    continue
+
+                vizinho = destinos[e]
+                novo_custo = custo + tempos[e] * congestion[e]
+                if novo_custo < dist_frente.get(vizinho, inf):
+                    dist_frente[vizinho] = novo_custo
+                    anterior[vizinho] = atual
+                    heapq.heappush(fila_frente, (novo_custo, vizinho))
+
+                    if vizinho in dist_tras and novo_custo + dist_tras[vizinho] < melhor_custo:
+                        melhor_custo = novo_custo + dist_tras[vizinho]
+                        no_encontro = vizinho
+        else:
+            custo, atual = heapq.heappop(fila_tras)
+            if atual in fechados_tras:
+                continue
+            fechados_tras.add(atual)
+
+            for e_reversa in range(offsets[atual], offsets[atual + 1]):
+                vizinho = destinos[e_reversa]
+                e = reversas[e_reversa]
+                if e < 0 or bloqueadas[e]:
+                    continue
+
+                novo_custo = custo + tempos[e] * congestion[e]
+                if novo_custo < dist_tras.get(vizinho, inf):
+                    dist_tras[vizinho] = novo_custo
+                    seguinte[vizinho] = atual
+                    heapq.heappush(fila_tras, (novo_custo, vizinho))
+
+                    if vizinho in dist_frente and novo_custo + dist_frente[vizinho] < melhor_custo:
+                        melhor_custo = novo_custo + dist_frente[vizinho]
+                        no_encontro = vizinho
+
+    if no_encontro == -1:
+        return inf, []
+
+    caminho = []
+    no = no_encontro
+    while no != -1:
+        caminho.append(no)
+        no = anterior[no]
+    caminho.reverse()
+
+    no = seguinte[no_encontro]
+    while no != -1:
+        caminho.append(no)
+        no = seguinte[no]
+
+    return melhor_custo, [grafo.ids[i] for i in caminho]
@@ -1,16 +1,22 @@
-from typing import List
+from typing import List, Optional
 from modelo.grafo import Grafo
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
 
 # Procura em profundidade (DFS) no grafo. - Retorna o caminho encontrado (não necessariamente o mais curto).
-def dfs(grafo: Grafo, start_id: str, goal_id: str) -> List[str]:
+def dfs(grafo: Grafo, start_id: str, goal_id: str,
+        estatisticas: Optional[EstatisticasProcura] = None) -> List[str]:
     if start_id not in grafo.nos or goal_id not in grafo.nos:
         raise ValueError("Nó inicial ou final não existe no grafo.")
 
     visitados = set()
     pilha = [(start_id, [start_id])]  # (nó atual, caminho até aqui)
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
 
     while pilha:
         atual, caminho = pilha.pop()
+        if estatisticas is not None:
+            estatisticas.pops += 1
         if atual == goal_id:
             return caminho
 
@@ -18,12 +24,18 @@ def dfs(grafo: Grafo, start_id: str, goal_id: str) -> List[str]:
             continue
             
         visitados.add(atual)
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(visitados))
         
         vizinhos = list(grafo.vizinhos(atual))
         for aresta in reversed(vizinhos):
             vizinho = aresta.no_destino
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
             if vizinho not in visitados:
                 
                 pilha.append((vizinho, caminho + [vizinho]))
+                if estatisticas is not None:
+                    estatisticas.registar_push(len(pilha))
 
     return []  
\ No newline at end of file
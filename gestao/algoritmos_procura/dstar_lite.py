@@ -0,0 +1,177 @@
+"""
+D* Lite (Koenig & Likhachev) para replaneamento incremental.
+
+A procura é feita do destino para a origem e o estado (g, rhs, fila) é
+mantido entre chamadas. Quando arestas são bloqueadas, desbloqueadas ou mudam
+de congestionamento, só os nós afetados voltam à fila; o veículo pode ainda
+avançar (a origem muda) sem reiniciar a procura.
+
+Ao contrário de UCS, A*/ALT, greedy e bidirecional, não tem uma versão sobre
+os arrays do GrafoCompacto: o estado (g, rhs) fica por id de nó entre chamadas
+e os custos são lidos com get_aresta, que no GrafoCompacto é uma procura
+binária nas arestas do nó.
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from modelo.grafo import Grafo
+
+
+def indice_predecessores(grafo: Grafo) -> Dict[str, List[str]]:
+    """v → nós u com aresta u→v (sem repetidos). Pode ser partilhado entre planeadores."""
+    predecessores: Dict[str, List[str]] = {no_id: [] for no_id in grafo.nos}
+    for origem, arestas in grafo.adjacentes.items():
+        for aresta in arestas:
+            if origem not in predecessores[aresta.no_destino]:
+                predecessores[aresta.no_destino].append(origem)
+    return predecessores
+
+
+class PlaneadorDStarLite:
+    """
+    Caminho de menor tempo origem → destino, reparado incrementalmente.
+
+    Uso:
+        planeador = PlaneadorDStarLite(grafo, origem, destino)
+        planeador.caminho()
+        planeador.mover_origem(novo_no)          # veículo avançou
+        planeador.atualizar_arestas(alteradas)   # trânsito mudou
+        planeador.caminho()
+    """
+
+    def __init__(self, grafo: Grafo, origem: str, destino: str,
+                 heuristica: Optional[Callable[[str, str], float]] = None,
+                 predecessores: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            heuristica: h(a, b), limite inferior do custo a → b (por omissão 0)
+            predecessores: índice de indice_predecessores(grafo), se já existir
+        """
+        self.grafo = grafo
+        self.origem = origem
+        self.destino = destino
+        self.heuristica = heuristica or (lambda a, b: 0.0)
+        self.predecessores = predecessores if predecessores is not None else indice_predecessores(grafo)
+
+        self.g: Dict[str, float] = {}
+        self.rhs: Dict[str, float] = {destino: 0.0}
+        self.km = 0.0
+        self._ultima_origem = origem
+
+        self._fila: List[Tuple[Tuple[float, float], str]] = []
+        self._na_fila: Dict[str, Tuple[float, float]] = {}
+        self._inserir(destino, self._chave(destino))
+
+        self.expansoes = 0  # nós expandidos (para medir o custo das reparações)
+        self._calcular_caminho_mais_curto()
+
+    # ==========================================================
+    # Estrutura interna
+    # ==========================================================
+
+    def _custo(self, u: str, v: str) -> float:
+        """tempo_real() da aresta u→v (a que grafo.get_aresta indexa, como Veiculo.mover_um_passo), ou inf."""
+        try:
+            return self.grafo.get_aresta(u, v).tempo_real()
+        except ValueError:
+            return math.inf
+
+    def _chave(self, no: str) -> Tuple[float, float]:
+        valor = min(self.g.get(no, math.inf), self.rhs.get(no, math.inf))
+        return (valor + self.heuristica(self.origem, no) + self.km, valor)
+
+    def _inserir(self, no: str, chave: Tuple[float, float]):
+        self._na_fila[no] = chave
+        heapq.heappush(self._fila, (chave, no))
+
+    def _topo(self) -> Tuple[Tuple[float, float], Optional[str]]:
+        """Menor chave válida da fila (descarta entradas desatualizadas)."""
+        while self._fila:
+            chave, no = self._fila[0]
+            if self._na_fila.get(no) == chave:
+                return chave, no
+            heapq.heappop(self._fila)
+        return (math.inf, math.inf), None
+
+    def _atualizar_no(self, u: str):
+        if u != self.destino:
+            self.rhs[u] = min(
+                (self._custo(u, aresta.no_destino) + self.g.get(aresta.no_destino, math.inf)
+                 for aresta in self.grafo.vizinhos(u)),
+                default=math.inf
+            )
+        self._na_fila.pop(u, None)
+        if self.g.get(u, math.inf) != self.rhs.get(u, math.inf):
+            self._inserir(u, self._chave(u))
+
+    def _calcular_caminho_mais_curto(self):
+        while True:
+            chave_topo, u = self._topo()
+            if u is None:
+                break
+            if not (chave_topo < self._chave(self.origem)
+                    or self.rhs.get(self.origem, math.inf) != self.g.get(self.origem, math.inf)):
+                break
+
+            heapq.heappop(self._fila)
+            del self._na_fila[u]
+            self.expansoes += 1
+
+            chave_nova = self._chave(u)
+            if chave_topo < chave_nova:
+                self._inserir(u, chave_nova)
+            elif self.g.get(u, math.inf) > self.rhs.get(u, math.inf):
+                self.g[u] = self.rhs[u]
+                for s in self.predecessores.get(u, ()):
+                    self._atualizar_no(s)
+            else:
+                self.g[u] = math.inf
+                self._atualizar_no(u)
+                for s in self.predecessores.get(u, ()):
+                    self._atualizar_no(s)
+
+    # ==========================================================
+    # Interface pública
+    # ==========================================================
+
+    def mover_origem(self, nova_origem: str):
+        """O veículo avançou: muda a origem sem refazer a procura."""
+        if nova_origem == self.origem:
+            return
+        self.km += self.heuristica(self._ultima_origem, nova_origem)
+        self._ultima_origem = nova_origem
+        self.origem = nova_origem
+        self._calcular_caminho_mais_curto()
+
+    def atualizar_arestas(self, arestas: Iterable[Tuple[str, str]]):
+        """Repara a procura depois de mudarem os custos das arestas (u, v) indicadas."""
+        afetados = {u for u, _ in arestas if u in self.predecessores}
+        if not afetados:
+            return
+        for u in afetados:
+            self._atualizar_no(u)
+        self._calcular_caminho_mais_curto()
+
+    def custo(self) -> float:
+        """Menor tempo atual da origem ao destino."""
+        return self.g.get(self.origem, math.inf)
+
+    def caminho(self) -> List[str]:
+        """Caminho origem → destino (vazio se não existir)."""
+        if self.custo() == math.inf:
+            return []
+
+        caminho = [self.origem]
+        no = self.origem
+        while no != self.destino:
+            proximo = min(
+                (aresta.no_destino for aresta in self.grafo.vizinhos(no)),
+                key=lambda v: self._custo(no, v) + self.g.get(v, math.inf),
+                default=None
+            )
+            if proximo is None or proximo in caminho:
+                return []
+            caminho.append(proximo)
+            no = proximo
+        return caminho
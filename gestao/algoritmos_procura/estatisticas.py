@@ -0,0 +1,41 @@
+"""
+Contadores de esforço de procura.
+
+Os algoritmos (bfs, dfs, ucs, greedy, a_star_search) aceitam um argumento
+opcional estatisticas. Quando é None (omissão) o único custo é uma
+comparação com None por operação; quando é passado, regista o trabalho real
+feito, em vez de estimativas a partir do caminho.
+"""
+
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class EstatisticasProcura:
+    """
+    - pops: remoções da fronteira (inclui entradas desatualizadas)
+    - pushes: inserções na fronteira
+    - expansoes: nós cujos sucessores foram gerados
+    - relaxacoes: arestas avaliadas a partir de nós expandidos
+    - pico_fronteira: maior tamanho da fronteira (heap/fila/pilha)
+    - pico_fechados: maior tamanho do conjunto de nós visitados/com custo conhecido
+    """
+    pops: int = 0
+    pushes: int = 0
+    expansoes: int = 0
+    relaxacoes: int = 0
+    pico_fronteira: int = 0
+    pico_fechados: int = 0
+
+    def registar_push(self, tamanho_fronteira: int):
+        self.pushes += 1
+        if tamanho_fronteira > self.pico_fronteira:
+            self.pico_fronteira = tamanho_fronteira
+
+    def registar_expansao(self, tamanho_fechados: int):
+        self.expansoes += 1
+        if tamanho_fechados > self.pico_fechados:
+            self.pico_fechados = tamanho_fechados
+
+    def como_dict(self) -> dict:
+        return asdict(self)
@@ -6,24 +6,40 @@ Retorna (tempo_total_min, [lista_de_nós]).
 """
 
 import heapq
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from modelo.grafo import Grafo
+from modelo.grafo_compacto import GrafoCompacto
 from gestao.algoritmos_procura.uteis import dist_euclidiana
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
 
 
-def greedy(grafo: Grafo, start_id: str, goal_id: str) -> Tuple[float, List[str]]:
+def greedy(grafo: Grafo, start_id: str, goal_id: str,
+           heuristica: Optional[Callable[[str, str], float]] = None,
+           estatisticas: Optional[EstatisticasProcura] = None) -> Tuple[float, List[str]]:
     if start_id == goal_id:
         return 0.0, [start_id]
 
+    # heurística por omissão: distância euclidiana (pode ser substituída, ex: ALT)
+    if heuristica is None:
+        heuristica = lambda no_id, objetivo: dist_euclidiana(grafo.nos[no_id], grafo.nos[objetivo])
+
+    # Grafo CSR: procura sobre os arrays
+    if isinstance(grafo, GrafoCompacto):
+        return greedy_compacto(grafo, start_id, goal_id, heuristica, estatisticas)
+
     # heap de (h, node_id)
     open_set: List[Tuple[float, str]] = []
-    heapq.heappush(open_set, (dist_euclidiana(grafo.nos[start_id], grafo.nos[goal_id]), start_id))
+    heapq.heappush(open_set, (heuristica(start_id, goal_id), start_id))
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
 
     came_from: Dict[str, Optional[str]] = {start_id: None}
     visited: set[str] = set()
 
     while open_set:
         _, current = heapq.heappop(open_set)
+        if estatisticas is not None:
+            estatisticas.pops += 1
 
         if current in visited:
             continue
@@ -48,9 +64,13 @@ def greedy(grafo: Grafo, start_id: str, goal_id: str) -> Tuple[float, List[str]]
 
             return tempo_total, path
 
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(visited))
         for aresta in grafo.vizinhos(current):
             no_destino = aresta.no_destino
             custo = aresta.tempo_real()
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
 
             # ignora arestas bloqueadas
             if custo == float("inf"):
@@ -63,8 +83,75 @@ def greedy(grafo: Grafo, start_id: str, goal_id: str) -> Tuple[float, List[str]]
             if no_destino not in came_from:
                 came_from[no_destino] = current
 
-            h = dist_euclidiana(grafo.nos[no_destino], grafo.nos[goal_id])
+            h = heuristica(no_destino, goal_id)
             heapq.heappush(open_set, (h, no_destino))
+            if estatisticas is not None:
+                estatisticas.registar_push(len(open_set))
+
+    return float("inf"), []
+
+
+def greedy_compacto(grafo: GrafoCompacto, start_id: str, goal_id: str,
+                    heuristica: Callable[[str, str], float],
+                    estatisticas: Optional[EstatisticasProcura] = None) -> Tuple[float, List[str]]:
+    """Greedy sobre a representação CSR: índices inteiros e arrays em vez de objetos Aresta."""
+    inicio = grafo.indice[start_id]
+    objetivo = grafo.indice[goal_id]
+    ids = grafo.ids
+    offsets, destinos, bloqueadas = grafo.offsets, grafo.destinos, grafo.bloqueadas
+
+    # heap de (h, id, índice): o id desempata como na versão sobre Grafo
+    open_set: List[Tuple[float, str, int]] = [(heuristica(start_id, goal_id), start_id, inicio)]
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
+
+    came_from: Dict[int, int] = {inicio: -1}
+    visited: set[int] = set()
+
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if estatisticas is not None:
+            estatisticas.pops += 1
+
+        if current in visited:
+            continue
+        visited.add(current)
+
+        if current == objetivo:
+            path: List[int] = []
+            node = current
+            while node != -1:
+                path.append(node)
+                node = came_from[node]
+            path.reverse()
+
+            tempo_total = 0.0
+            for a, b in zip(path, path[1:]):
+                custo_ab = grafo.custo_aresta(grafo.indice_aresta_indices(a, b))
+                if custo_ab == float("inf"):
+                    return float("inf"), []
+                tempo_total += custo_ab
+
+            return tempo_total, [ids[i] for i in path]
+
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(visited))
+        for e in range(offsets[current], offsets[current + 1]):
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
+            if bloqueadas[e]:
+                continue
+
+            no_destino = destinos[e]
+            if no_destino in visited:
+                continue
+            if no_destino not in came_from:
+                came_from[no_destino] = current
+
+            id_destino = ids[no_destino]
+            heapq.heappush(open_set, (heuristica(id_destino, goal_id), id_destino, no_destino))
+            if estatisticas is not None:
+                estatisticas.registar_push(len(open_set))
 
     return float("inf"), []
 
@@ -72,11 +159,9 @@ def greedy(grafo: Grafo, start_id: str, goal_id: str) -> Tuple[float, List[str]]
 def _tempo_aresta(grafo: Grafo, a: str, b: str) -> float:
     """
     Devolve o tempo_real da aresta entre a e b num grafo não dirigido.
-    Procura em ambos os sentidos.
+    Usa o índice de arestas do grafo (O(1)).
     """
-    # procurar a -> b
-    for aresta in grafo.vizinhos(a):
-        if aresta.no_destino == b:
-            return aresta.tempo_real()
-
-    return float("inf")
+    try:
+        return grafo.get_aresta(a, b).tempo_real()
+    except ValueError:
+        return float("inf")
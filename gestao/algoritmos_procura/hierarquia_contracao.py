@@ -0,0 +1,429 @@
+"""
+Contraction Hierarchies "customizáveis" (CCH) para consultas de menor tempo.
+
+Três fases:
+1. Contração (só depende da topologia): ordena os nós por grau mínimo e,
+   ao contrair cada nó, liga entre si todos os vizinhos ainda não contraídos
+   (atalhos). Não usa custos, por isso nunca precisa de ser repetida quando
+   o trânsito muda. Como não há witness search (um atalho dispensável com
+   um custo pode deixar de o ser com outro), o número de atalhos é limitado
+   por grau_maximo: os nós que só se contrairiam com mais vizinhos ficam
+   num núcleo por contrair, ligado pelas arestas e atalhos já existentes.
+2. Customização (depende dos custos): percorre os nós por ordem de contração
+   e, para cada triângulo inferior v-u-w, melhora o atalho u↔w com u→v→w.
+   É o passo repetido quando GestorTransito altera congestionamento/bloqueios;
+   se mudaram poucas arestas (ex: um bloqueio) só se recalculam os arcos que
+   dependem delas.
+3. Consulta: Dijkstra bidirecional que só sobe na hierarquia (origem pelos
+   arcos ascendentes, destino pelos arcos descendentes) e, dentro do núcleo,
+   segue qualquer arco; seguido de desempacotamento dos atalhos.
+"""
+
+import heapq
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+from modelo.grafo import Grafo
+
+
+class HierarquiaContracao:
+    """
+    Motor de consultas sobre uma hierarquia de contração do grafo.
+
+    Cada arco liga um nó inferior a um superior (por ordem de contração) e
+    guarda dois custos: a subir (inferior→superior) e a descer (superior→inferior),
+    mais o nó intermédio usado por cada um (-1 se for uma aresta original).
+    """
+
+    # Acima desta fração de arcos alterados compensa customizar tudo de novo
+    FRACAO_CUSTOMIZACAO_PARCIAL = 0.05
+
+    def __init__(self, grafo: Grafo, grau_maximo: Optional[int] = None):
+        """
+        Args:
+            grau_maximo: Só se contraem nós com até este número de vizinhos por
+                contrair (no máximo grau*(grau-1)/2 atalhos cada); None contrai todos
+        """
+        self.grafo = grafo
+        self.grau_maximo = grau_maximo
+        self.ids: List[str] = list(grafo.nos)
+        self.indice: Dict[str, int] = {id_no: i for i, id_no in enumerate(self.ids)}
+
+        self.ordem: List[int] = []        # nós por ordem de contração (o núcleo no fim)
+        self.rank: List[int] = []         # posição de cada nó na ordem
+        self.nucleo: List[bool] = []      # nós que ficaram por contrair
+        self.num_arestas = 0
+        self.superiores: List[List[Tuple[int, int]]] = []  # v → [(u, arco)] com rank[u] > rank[v]
+        self.inferiores: List[List[Tuple[int, int]]] = []  # u → [(v, arco)] com rank[v] < rank[u]
+        self.inferiores_nucleo: List[List[Tuple[int, int]]] = []  # só os v do núcleo (consulta)
+        self._arco: Dict[Tuple[int, int], int] = {}        # (inferior, superior) → arco
+        self._pares: List[Tuple[int, int]] = []            # arco → (inferior, superior)
+
+        inicio = time.perf_counter()
+        self._contrair()
+        self.tempo_contracao = time.perf_counter() - inicio
+
+        num_arcos = len(self._arco)
+        self.custo_sobe = array('d', [float('inf')]) * num_arcos
+        self.custo_desce = array('d', [float('inf')]) * num_arcos
+        self.meio_sobe = array('i', [-1]) * num_arcos
+        self.meio_desce = array('i', [-1]) * num_arcos
+        # Custos das arestas originais por arco (inf nos atalhos), da última customização
+        self.base_sobe = array('d', [float('inf')]) * num_arcos
+        self.base_desce = array('d', [float('inf')]) * num_arcos
+
+        # Estatísticas
+        self.customizacoes_completas = 0
+        self.customizacoes_parciais = 0
+        self.arcos_recalculados = 0
+        self.tempo_customizacao = 0.0
+
+        self._epoca_customizada = None
+        self.customizar()
+
+    # ==========================================================
+    # Fase 1: contração (independente dos custos)
+    # ==========================================================
+
+    def _contrair(self):
+        n = len(self.ids)
+        vizinhos: List[set] = [set() for _ in range(n)]
+        for origem, arestas in self.grafo.adjacentes.items():
+            i = self.indice[origem]
+            for aresta in arestas:
+                j = self.indice[aresta.no_destino]
+                if i != j:
+                    vizinhos[i].add(j)
+                    vizinhos[j].add(i)
+
+        self.num_arestas = sum(len(vs) for vs in vizinhos) // 2  # pares ligados no grafo original
+
+        self.rank = [-1] * n
+        fila = [(len(vizinhos[v]), v) for v in range(n)]
+        heapq.heapify(fila)
+
+        while fila:
+            grau, v = heapq.heappop(fila)
+            if self.rank[v] != -1:
+                continue
+            # Grau desatualizado: volta à fila com o valor correto
+            if grau != len(vizinhos[v]):
+                heapq.heappush(fila, (len(vizinhos[v]), v))
+                continue
+            # Todos os restantes têm grau acima do limite: ficam no núcleo
+            if self.grau_maximo is not None and grau > self.grau_maximo:
+                break
+
+            self.rank[v] = len(self.ordem)
+            self.ordem.append(v)
+
+            restantes = list(vizinhos[v])
+            for u in restantes:
+                vizinhos[u].discard(v)
+            # Liga todos os vizinhos restantes (atalhos possíveis através de v)
+            for a in range(len(restantes)):
+                u = restantes[a]
+                vizinhos_u = vizinhos[u]
+                for b in range(a + 1, len(restantes)):
+                    w = restantes[b]
+                    if w not in vizinhos_u:
+                        vizinhos_u.add(w)
+                        vizinhos[w].add(u)
+            # O grau dos vizinhos mudou: entradas antigas ficam desatualizadas
+            for u in restantes:
+                heapq.heappush(fila, (len(vizinhos[u]), u))
+
+            vizinhos[v] = set(restantes)  # ficam só os vizinhos superiores de v
+
+        # Núcleo: os nós por contrair ficam no topo da ordem, ligados só aos
+        # vizinhos do núcleo com rank superior (sem atalhos novos entre eles)
+        self.nucleo = [False] * n
+        for v in range(n):
+            if self.rank[v] == -1:
+                self.rank[v] = len(self.ordem)
+                self.ordem.append(v)
+                self.nucleo[v] = True
+        for v in range(n):
+            if self.nucleo[v]:
+                vizinhos[v] = {u for u in vizinhos[v] if self.rank[u] > self.rank[v]}
+
+        self.superiores = [[] for _ in range(n)]
+        self.inferiores = [[] for _ in range(n)]
+        self.inferiores_nucleo = [[] for _ in range(n)]
+        for v in self.ordem:
+            for u in sorted(vizinhos[v], key=lambda x: self.rank[x]):
+                arco = len(self._arco)
+                self._arco[(v, u)] = arco
+                self._pares.append((v, u))
+                self.superiores[v].append((u, arco))
+                self.inferiores[u].append((v, arco))
+                if self.nucleo[v]:
+                    self.inferiores_nucleo[u].append((v, arco))
+
+    # ==========================================================
+    # Fase 2: customização (repetida quando o trânsito muda)
+    # ==========================================================
+
+    def _custos_base(self) -> Tuple[array, array]:
+        """Custos das arestas originais por arco (com arestas repetidas fica a de menor custo)."""
+        inf = float('inf')
+        base_sobe = array('d', [inf]) * len(self._arco)
+        base_desce = array('d', [inf]) * len(self._arco)
+        rank = self.rank
+
+        for origem, arestas in self.grafo.adjacentes.items():
+            i = self.indice[origem]
+            for aresta in arestas:
+                j = self.indice[aresta.no_destino]
+                if i == j:
+                    continue
+                custo = aresta.tempo_real()
+                if rank[i] < rank[j]:
+                    arco = self._arco[(i, j)]
+                    if custo < base_sobe[arco]:
+                        base_sobe[arco] = custo
+                else:
+                    arco = self._arco[(j, i)]
+                    if custo < base_desce[arco]:
+                        base_desce[arco] = custo
+        return base_sobe, base_desce
+
+    def customizar(self):
+        """Recalcula os custos de todos os arcos a partir do estado atual do grafo."""
+        inicio = time.perf_counter()
+        self.base_sobe, self.base_desce = self._custos_base()
+        self.custo_sobe = array('d', self.base_sobe)
+        self.custo_desce = array('d', self.base_desce)
+        custo_sobe, custo_desce = self.custo_sobe, self.custo_desce
+        meio_sobe, meio_desce = self.meio_sobe, self.meio_desce
+
+        for arco in range(len(meio_sobe)):
+            meio_sobe[arco] = -1
+            meio_desce[arco] = -1
+
+        # Triângulos inferiores, por ordem de contração (os superiores de um nó do
+        # núcleo não formam um clique, por isso não há triângulos a partir dele)
+        for v in self.ordem:
+            if self.nucleo[v]:
+                continue
+            sup = self.superiores[v]
+            for a in range(len(sup)):
+                u, arco_vu = sup[a]
+                for b in range(a + 1, len(sup)):
+                    w, arco_vw = sup[b]
+                    # rank[u] < rank[w] (superiores ordenados por rank)
+                    arco_uw = self._arco[(u, w)]
+
+                    via = custo_desce[arco_vu] + custo_sobe[arco_vw]   # u → v → w
+                    if via < custo_sobe[arco_uw]:
+                        custo_sobe[arco_uw] = via
+                        meio_sobe[arco_uw] = v
+
+                    via = custo_desce[arco_vw] + custo_sobe[arco_vu]   # w → v → u
+                    if via < custo_desce[arco_uw]:
+                        custo_desce[arco_uw] = via
+                        meio_desce[arco_uw] = v
+
+        self._epoca_customizada = self.grafo.epoca_transito
+        self.customizacoes_completas += 1
+        self.tempo_customizacao += time.perf_counter() - inicio
+
+    def customizar_parcial(self) -> bool:
+        """
+        Recalcula só os arcos cujas arestas originais mudaram de custo e os que
+        dependem deles (triângulos acima). Se mudou mais do que
+        FRACAO_CUSTOMIZACAO_PARCIAL dos arcos, faz a customização completa.
+
+        Returns:
+            True se bastou a customização parcial
+        """
+        inicio = time.perf_counter()
+        base_sobe, base_desce = self._custos_base()
+        alterados = [arco for arco in range(len(base_sobe))
+                     if base_sobe[arco] != self.base_sobe[arco] or base_desce[arco] != self.base_desce[arco]]
+        if len(alterados) > self.FRACAO_CUSTOMIZACAO_PARCIAL * len(base_sobe):
+            self.customizar()
+            return False
+        self.base_sobe, self.base_desce = base_sobe, base_desce
+
+        # Cada arco depende só de arcos com nó inferior de rank menor: processa
+        # por rank do nó inferior para que as dependências já estejam atualizadas
+        fila = [(self.rank[self._pares[arco][0]], arco) for arco in alterados]
+        heapq.heapify(fila)
+        na_fila = set(alterados)
+
+        while fila:
+            _, arco = heapq.heappop(fila)
+            na_fila.discard(arco)
+            u, w = self._pares[arco]
+            if not self._recalcular_arco(u, w, arco):
+                continue
+            # O arco u→w entra nos triângulos com vértice inferior u
+            if self.nucleo[u]:
+                continue
+            for x, _ in self.superiores[u]:
+                if x == w:
+                    continue
+                par = (w, x) if self.rank[w] < self.rank[x] else (x, w)
+                dependente = self._arco[par]
+                if dependente not in na_fila:
+                    na_fila.add(dependente)
+                    heapq.heappush(fila, (self.rank[par[0]], dependente))
+
+        self._epoca_customizada = self.grafo.epoca_transito
+        self.customizacoes_parciais += 1
+        self.tempo_customizacao += time.perf_counter() - inicio
+        return True
+
+    def _recalcular_arco(self, u: int, w: int, arco: int) -> bool:
+        """Custos do arco u→w (rank[u] < rank[w]) pelos triângulos inferiores. Devolve True se mudaram."""
+        self.arcos_recalculados += 1
+        sobe, desce = self.base_sobe[arco], self.base_desce[arco]
+        meio_sobe = meio_desce = -1
+        for v, arco_vu in self.inferiores[u]:
+            if self.nucleo[v]:
+                continue
+            arco_vw = self._arco.get((v, w))
+            if arco_vw is None:
+                continue
+            via = self.custo_desce[arco_vu] + self.custo_sobe[arco_vw]   # u → v → w
+            if via < sobe:
+                sobe, meio_sobe = via, v
+            via = self.custo_desce[arco_vw] + self.custo_sobe[arco_vu]   # w → v → u
+            if via < desce:
+                desce, meio_desce = via, v
+
+        mudou = sobe != self.custo_sobe[arco] or desce != self.custo_desce[arco]
+        self.custo_sobe[arco], self.custo_desce[arco] = sobe, desce
+        self.meio_sobe[arco], self.meio_desce[arco] = meio_sobe, meio_desce
+        return mudou
+
+    def atualizar_se_necessario(self):
+        """Volta a customizar (só o necessário) se o GestorTransito alterou o grafo desde a última vez."""
+        if self._epoca_customizada != self.grafo.epoca_transito:
+            self.customizar_parcial()
+
+    # ==========================================================
+    # Fase 3: consulta
+    # ==========================================================
+
+    def procurar(self, start_id: str, goal_id: str) -> Tuple[float, List[str]]:
+        """
+        Menor tempo entre dois nós.
+
+        Returns:
+            (custo_total_min, caminho)
+        """
+        if start_id == goal_id:
+            return 0.0, [start_id]
+
+        self.atualizar_se_necessario()
+
+        inf = float('inf')
+        s = self.indice[start_id]
+        t = self.indice[goal_id]
+
+        dist_frente = {s: 0.0}
+        dist_tras = {t: 0.0}
+        pred_frente = {s: -1}
+        pred_tras = {t: -1}
+        fila_frente = [(0.0, s)]
+        fila_tras = [(0.0, t)]
+
+        melhor = inf
+        encontro = -1
+
+        while fila_frente or fila_tras:
+            topo_frente = fila_frente[0][0] if fila_frente else inf
+            topo_tras = fila_tras[0][0] if fila_tras else inf
+            if min(topo_frente, topo_tras) >= melhor:
+                break
+
+            # No núcleo também se desce: u → v (v inferior) custa custo_desce na frente
+            if topo_frente <= topo_tras:
+                fila, dist, pred, outra = fila_frente, dist_frente, pred_frente, dist_tras
+                custos, custos_nucleo = self.custo_sobe, self.custo_desce
+            else:
+                fila, dist, pred, outra = fila_tras, dist_tras, pred_tras, dist_frente
+                custos, custos_nucleo = self.custo_desce, self.custo_sobe
+
+            custo, v = heapq.heappop(fila)
+            if custo > dist[v]:
+                continue
+
+            if v in outra and custo + outra[v] < melhor:
+                melhor = custo + outra[v]
+                encontro = v
+
+            for u, arco in self.superiores[v]:
+                novo = custo + custos[arco]
+                if novo < dist.get(u, inf):
+                    dist[u] = novo
+                    pred[u] = v
+                    heapq.heappush(fila, (novo, u))
+            for u, arco in self.inferiores_nucleo[v]:
+                novo = custo + custos_nucleo[arco]
+                if novo < dist.get(u, inf):
+                    dist[u] = novo
+                    pred[u] = v
+                    heapq.heappush(fila, (novo, u))
+
+        if encontro == -1:
+            return inf, []
+
+        # Sequência na hierarquia: s ↑ ... encontro ... ↓ t
+        subida = []
+        v = encontro
+        while v != -1:
+            subida.append(v)
+            v = pred_frente[v]
+        subida.reverse()
+
+        descida = []
+        v = pred_tras[encontro]
+        while v != -1:
+            descida.append(v)
+            v = pred_tras[v]
+
+        sequencia = subida + descida
+        caminho = [sequencia[0]]
+        for a, b in zip(sequencia, sequencia[1:]):
+            caminho.extend(self._desempacotar(a, b)[1:])
+
+        return melhor, [self.ids[i] for i in caminho]
+
+    def _desempacotar(self, a: int, b: int) -> List[int]:
+        """Expande o arco a→b (possivelmente um atalho) nas arestas originais."""
+        resultado = [a]
+        pilha = [(a, b)]
+        while pilha:
+            x, y = pilha.pop()
+            if self.rank[x] < self.rank[y]:
+                meio = self.meio_sobe[self._arco[(x, y)]]
+            else:
+                meio = self.meio_desce[self._arco[(y, x)]]
+
+            if meio == -1:
+                resultado.append(y)
+            else:
+                # Processa x→meio antes de meio→y
+                pilha.append((meio, y))
+                pilha.append((x, meio))
+        return resultado
+
+    def num_atalhos(self) -> int:
+        """Número de arcos na hierarquia (arestas originais + atalhos)."""
+        return len(self._arco)
+
+    def estatisticas(self) -> dict:
+        """Tamanho da hierarquia e custo das customizações."""
+        return {
+            "arcos": len(self._arco),
+            "atalhos": len(self._arco) - self.num_arestas,
+            "nucleo": sum(self.nucleo),
+            "tempo_contracao": round(self.tempo_contracao, 3),
+            "customizacoes_completas": self.customizacoes_completas,
+            "customizacoes_parciais": self.customizacoes_parciais,
+            "arcos_recalculados": self.arcos_recalculados,
+            "tempo_customizacao": round(self.tempo_customizacao, 3),
+        }
@@ -0,0 +1,139 @@
+"""
+Heurística ALT (A*, Landmarks, Triangle inequality).
+
+Pré-processamento: escolhe alguns nós de referência (landmarks) e calcula,
+para cada um, o custo mínimo de/para todos os outros nós. Durante a procura,
+a desigualdade triangular dá um limite inferior do custo até ao destino:
+
+    h(n) = max_L  max( d(L, t) - d(L, n),  d(n, L) - d(t, L) )
+
+As tabelas usam tempoViagem_min × factor_minimo e ignoram bloqueios. Como o
+GestorTransito nunca aplica um factor abaixo de factor_minimo e um bloqueio só
+aumenta custos, a heurística continua admissível (e consistente) com qualquer
+estado de trânsito, sem ser preciso reconstruir as tabelas.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+from modelo.grafo import Grafo, TipoNo
+
+
+class Landmarks:
+    """
+    Tabelas de distâncias para a heurística ALT.
+
+    Escolha dos landmarks (se não forem indicados):
+    - Candidatos: estações de recarga e postos (hubs na periferia da cidade)
+    - Seleção "farthest-point": cada novo landmark é o candidato mais
+      afastado dos já escolhidos
+    """
+
+    def __init__(self, grafo: Grafo, landmarks: Optional[List[str]] = None,
+                 num_landmarks: int = 4, factor_minimo: float = 0.8):
+        """
+        Args:
+            grafo: Grafo da cidade
+            landmarks: Nós a usar como landmarks (opcional)
+            num_landmarks: Número de landmarks a escolher automaticamente
+            factor_minimo: Menor factor de congestionamento possível
+                           (0.8 = madrugada no GestorTransito)
+        """
+        self.grafo = grafo
+        self.factor_minimo = factor_minimo
+
+        # Adjacência inversa com custos mínimos (v → [(u, custo u→v)])
+        self._reversa: Dict[str, List[Tuple[str, float]]] = {no_id: [] for no_id in grafo.nos}
+        for origem, arestas in grafo.adjacentes.items():
+            for aresta in arestas:
+                self._reversa[aresta.no_destino].append((origem, aresta.tempoViagem_min * factor_minimo))
+
+        self.dist_de: Dict[str, Dict[str, float]] = {}    # d(L, n)
+        self.dist_para: Dict[str, Dict[str, float]] = {}  # d(n, L)
+
+        if landmarks is None:
+            landmarks = self.escolher_landmarks(num_landmarks)
+
+        for landmark in landmarks:
+            self._adicionar_landmark(landmark)
+
+        self.landmarks: List[str] = list(landmarks)
+
+    # ==========================================================
+    # Pré-processamento
+    # ==========================================================
+
+    def escolher_landmarks(self, num_landmarks: int) -> List[str]:
+        """Escolhe landmarks entre os hubs (recarga/postos) por farthest-point."""
+        candidatos = [
+            no_id for no_id, no in self.grafo.nos.items()
+            if no.tipo in (TipoNo.ESTACAO_RECARGA, TipoNo.POSTO_ABASTECIMENTO)
+        ]
+        if len(candidatos) < num_landmarks:
+            candidatos = list(self.grafo.nos)
+        if not candidatos:
+            return []
+
+        # Primeiro landmark: candidato mais afastado de um nó arbitrário
+        distancias = self._dijkstra_base(next(iter(self.grafo.nos)), reverso=False)
+        escolhidos = [max(candidatos, key=lambda c: distancias.get(c, -1.0))]
+        dist_min = dict(self._dijkstra_base(escolhidos[0], reverso=False))
+
+        while len(escolhidos) < min(num_landmarks, len(candidatos)):
+            proximo = max(
+                (c for c in candidatos if c not in escolhidos),
+                key=lambda c: dist_min.get(c, float('inf'))
+            )
+            escolhidos.append(proximo)
+            for no_id, d in self._dijkstra_base(proximo, reverso=False).items():
+                if d < dist_min.get(no_id, float('inf')):
+                    dist_min[no_id] = d
+
+        return escolhidos
+
+    def _adicionar_landmark(self, landmark: str):
+        if landmark not in self.grafo.nos:
+            raise ValueError(f"Landmark '{landmark}' não existe no grafo")
+        self.dist_de[landmark] = self._dijkstra_base(landmark, reverso=False)
+        self.dist_para[landmark] = self._dijkstra_base(landmark, reverso=True)
+
+    def _dijkstra_base(self, origem: str, reverso: bool) -> Dict[str, float]:
+        """Dijkstra um-para-todos com custos mínimos (tempo base × factor_minimo)."""
+        dist: Dict[str, float] = {origem: 0.0}
+        fila = [(0.0, origem)]
+
+        while fila:
+            custo, atual = heapq.heappop(fila)
+            if custo > dist[atual]:
+                continue
+
+            if reverso:
+                vizinhos = self._reversa[atual]
+            else:
+                vizinhos = [(a.no_destino, a.tempoViagem_min * self.factor_minimo)
+                            for a in self.grafo.vizinhos(atual)]
+
+            for vizinho, custo_aresta in vizinhos:
+                novo_custo = custo + custo_aresta
+                if novo_custo < dist.get(vizinho, float('inf')):
+                    dist[vizinho] = novo_custo
+                    heapq.heappush(fila, (novo_custo, vizinho))
+
+        return dist
+
+    # ==========================================================
+    # Heurística
+    # ==========================================================
+
+    def heuristica(self, no_atual_id: str, no_destino_id: str) -> float:
+        """Limite inferior (min) do custo de no_atual até no_destino."""
+        melhor = 0.0
+        for landmark in self.landmarks:
+            de = self.dist_de[landmark]
+            para = self.dist_para[landmark]
+
+            if no_destino_id in de and no_atual_id in de:
+                melhor = max(melhor, de[no_destino_id] - de[no_atual_id])
+            if no_atual_id in para and no_destino_id in para:
+                melhor = max(melhor, para[no_atual_id] - para[no_destino_id])
+
+        return melhor
@@ -0,0 +1,129 @@
+"""
+Caminho mais rápido com restrição de autonomia e paragens para recarga.
+
+Procura de custo uniforme multicritério sobre rótulos (nó, fase, tempo, autonomia):
+- fase 0 = ainda não passou no pickup, fase 1 = já passou
+- em cada (nó, fase) guardam-se todos os rótulos não dominados: um rótulo só
+  é descartado se outro chegar lá em tempo menor ou igual com autonomia maior
+  ou igual (fronteira de Pareto), por isso a procura é exata
+- em estações/postos compatíveis e disponíveis o veículo pode recarregar
+  (autonomia volta ao máximo, custa o tempo de recarga do veículo)
+
+Substitui "para cada estação, três procuras" por uma única procura, que
+também admite zero ou várias paragens.
+"""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+from modelo.grafo import Grafo
+from modelo.veiculos import Veiculo
+
+
+def tempo_reposicao(veiculo: Veiculo) -> float:
+    """Minutos de uma recarga/abastecimento completo (como em Veiculo.repor_autonomia)."""
+    if veiculo.tipo_veiculo() == "eletrico":
+        return veiculo.tempo_recarregamento_min
+    return veiculo.tempo_reabastecimento_min
+
+
+def procura_com_recarga(grafo: Grafo, veiculo: Veiculo, origem: str, destino: str,
+                        pickup: Optional[str] = None) -> Tuple[float, List[str], List[str]]:
+    """
+    Returns:
+        (custo_tempo_min, caminho, paragens_recarga). Sem rota viável: (inf, [], [])
+    """
+    custo, caminho, paragens = procura_com_recarga_paragens(grafo, veiculo, origem, destino, pickup)
+    return custo, caminho, [no for no, recarga in paragens if recarga]
+
+
+def procura_com_recarga_paragens(grafo: Grafo, veiculo: Veiculo, origem: str, destino: str,
+                                 pickup: Optional[str] = None) -> Tuple[float, List[str], List[Tuple[str, bool]]]:
+    """
+    Args:
+        grafo: Grafo da cidade
+        veiculo: Veículo (autonomia atual/máxima e tipo de recarga)
+        origem: Posição de partida
+        destino: Destino final (drop-off)
+        pickup: (Opcional) Nó por onde a rota tem de passar antes do destino
+
+    Returns:
+        (custo_tempo_min, caminho, paragens). paragens são pares (nó, é_recarga) pela
+        ordem da rota: recargas, pickup (se indicado) e destino. Sem rota viável: (inf, [], [])
+    """
+    inf = math.inf
+    autonomia_max = veiculo.autonomiaMax_km
+    duracao_recarga = tempo_reposicao(veiculo)
+
+    def pode_recarregar(no_id: str) -> bool:
+        no = grafo.nos[no_id]
+        return no.disponivel and veiculo.pode_carregar_abastecer(no.tipo)
+
+    fase_inicial = 0 if pickup is not None and pickup != origem else 1
+
+    # rótulo = (nó, fase, tempo, autonomia exata, índice do rótulo anterior, recarregou?)
+    rotulos: List[tuple] = []
+    # (nó, fase) → pares (tempo, autonomia) não dominados
+    fronteiras: Dict[Tuple[str, int], List[Tuple[float, float]]] = {}
+    # (nó, fase) → maior autonomia já expandida (expandida antes = tempo menor ou igual)
+    melhor_fechada: Dict[Tuple[str, int], float] = {}
+    fila: List[Tuple[float, int]] = []
+
+    def relaxar(no, fase, tempo, autonomia, anterior, recarregou):
+        fronteira = fronteiras.setdefault((no, fase), [])
+        if any(t <= tempo and a >= autonomia for t, a in fronteira):
+            return
+        fronteira[:] = [(t, a) for t, a in fronteira if not (tempo <= t and autonomia >= a)]
+        fronteira.append((tempo, autonomia))
+        rotulos.append((no, fase, tempo, autonomia, anterior, recarregou))
+        heapq.heappush(fila, (tempo, len(rotulos) - 1))
+
+    relaxar(origem, fase_inicial, 0.0, veiculo.autonomia_km, -1, False)
+
+    while fila:
+        tempo, indice = heapq.heappop(fila)
+        no, fase, _, autonomia, _, _ = rotulos[indice]
+
+        # Dominado por um rótulo mais rápido com pelo menos a mesma autonomia
+        if melhor_fechada.get((no, fase), -1.0) >= autonomia:
+            continue
+        melhor_fechada[(no, fase)] = autonomia
+
+        if no == destino and fase == 1:
+            caminho, paragens = _reconstruir(rotulos, indice)
+            if pickup is not None and fase_inicial == 1:
+                paragens.insert(0, (pickup, False))  # pickup na origem
+            return tempo, caminho, paragens + [(destino, False)]
+
+        if autonomia < autonomia_max and pode_recarregar(no):
+            relaxar(no, fase, tempo + duracao_recarga, autonomia_max, indice, True)
+
+        for aresta in grafo.vizinhos(no):
+            custo = aresta.tempo_real()
+            if custo == inf or aresta.distancia_km > autonomia:
+                continue
+            vizinho = aresta.no_destino
+            nova_fase = 1 if fase == 1 or vizinho == pickup else 0
+            relaxar(vizinho, nova_fase, tempo + custo, autonomia - aresta.distancia_km, indice, False)
+
+    return inf, [], []
+
+
+def _reconstruir(rotulos, indice) -> Tuple[List[str], List[Tuple[str, bool]]]:
+    """Caminho e paragens intermédias (recargas e pickup, pela ordem da rota) até ao rótulo."""
+    caminho: List[str] = []
+    paragens: List[Tuple[str, bool]] = []
+    while indice >= 0:
+        no, fase, _, _, anterior, recarregou = rotulos[indice]
+        if recarregou:
+            paragens.append((no, True))
+        else:
+            if not caminho or caminho[-1] != no:
+                caminho.append(no)
+            # A fase passa a 1 no rótulo que chega ao pickup
+            if anterior >= 0 and fase == 1 and rotulos[anterior][1] == 0:
+                paragens.append((no, False))
+        indice = anterior
+    caminho.reverse()
+    paragens.reverse()
+    return caminho, paragens
@@ -6,20 +6,31 @@ Procura não informada: expande o nó com menor custo acumulado (g).
 import heapq
 from typing import Dict, List, Tuple, Optional
 from modelo.grafo import Grafo
+from modelo.grafo_compacto import GrafoCompacto
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
 
 
 # Calcula o caminho de menor custo (tempo total em minutos) entre dois nós. Retorna: (custo_total_min, caminho)
-def uniform_cost_search(graph: Grafo, start_id: str, goal_id: str) -> Tuple[float, List[str]]:
+def uniform_cost_search(graph: Grafo, start_id: str, goal_id: str,
+                        estatisticas: Optional[EstatisticasProcura] = None) -> Tuple[float, List[str]]:
     if start_id == goal_id:
         return 0.0, [start_id]
 
+    # Grafo CSR: procura diretamente sobre os arrays
+    if isinstance(graph, GrafoCompacto):
+        return uniform_cost_search_compacto(graph, start_id, goal_id, estatisticas)
+
     frontier = []
     heapq.heappush(frontier, (0.0, start_id))
     came_from: Dict[str, Optional[str]] = {start_id: None}
     cost_so_far: Dict[str, float] = {start_id: 0.0}
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
 
     while frontier:
         current_cost, current = heapq.heappop(frontier)
+        if estatisticas is not None:
+            estatisticas.pops += 1
 
         if current == goal_id:
             # Reconstrução do caminho
@@ -29,9 +40,13 @@ def uniform_cost_search(graph: Grafo, start_id: str, goal_id: str) -> Tuple[floa
                 current = came_from[current]
             return cost_so_far[goal_id], list(reversed(path))
 
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(cost_so_far))
         for aresta in graph.vizinhos(current):
             vizinho = aresta.no_destino
             custo = aresta.tempo_real()  # Usa tempo considerando trânsito
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
 
             # Ignora arestas bloqueadas
             if custo == float('inf'):
@@ -42,6 +57,64 @@ def uniform_cost_search(graph: Grafo, start_id: str, goal_id: str) -> Tuple[floa
                 cost_so_far[vizinho] = novo_custo
                 came_from[vizinho] = current
                 heapq.heappush(frontier, (novo_custo, vizinho))
+                if estatisticas is not None:
+                    estatisticas.registar_push(len(frontier))
+
+
+    return float('inf'), []
+
+
+def uniform_cost_search_compacto(graph: GrafoCompacto, start_id: str, goal_id: str,
+                                 estatisticas: Optional[EstatisticasProcura] = None) -> Tuple[float, List[str]]:
+    """
+    UCS sobre a representação CSR: trabalha só com índices inteiros e arrays,
+    sem criar objetos Aresta nem chamar tempo_real() por relaxação.
+    """
+    if start_id == goal_id:
+        return 0.0, [start_id]
+
+    inicio = graph.indice[start_id]
+    objetivo = graph.indice[goal_id]
+    offsets, destinos = graph.offsets, graph.destinos
+    tempos, congestion, bloqueadas = graph.tempos, graph.congestion, graph.bloqueadas
 
+    frontier = [(0.0, inicio)]
+    came_from: Dict[int, int] = {inicio: -1}
+    cost_so_far: Dict[int, float] = {inicio: 0.0}
+    if estatisticas is not None:
+        estatisticas.registar_push(1)
+
+    while frontier:
+        current_cost, current = heapq.heappop(frontier)
+        if estatisticas is not None:
+            estatisticas.pops += 1
+
+        if current == objetivo:
+            path = []
+            while current != -1:
+                path.append(graph.ids[current])
+                current = came_from[current]
+            return current_cost, list(reversed(path))
+
+        # Entrada desatualizada na heap
+        if current_cost > cost_so_far[current]:
+            continue
+
+        if estatisticas is not None:
+            estatisticas.registar_expansao(len(cost_so_far))
+        for e in range(offsets[current], offsets[current + 1]):
+            if estatisticas is not None:
+                estatisticas.relaxacoes += 1
+            if bloqueadas[e]:
+                continue
+
+            vizinho = destinos[e]
+            novo_custo = current_cost + tempos[e] * congestion[e]
+            if vizinho not in cost_so_far or novo_custo < cost_so_far[vizinho]:
+                cost_so_far[vizinho] = novo_custo
+                came_from[vizinho] = current
+                heapq.heappush(frontier, (novo_custo, vizinho))
+                if estatisticas is not None:
+                    estatisticas.registar_push(len(frontier))
 
     return float('inf'), []
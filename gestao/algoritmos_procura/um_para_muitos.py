@@ -0,0 +1,193 @@
+"""
+Dijkstra um-para-muitos (e muitos-para-um, em modo inverso).
+
+Uma única procura a partir de um nó calcula o menor tempo (e os km desse
+caminho) para todos os alvos pedidos. Em modo inverso a procura parte do
+destino e percorre as arestas ao contrário, dando o custo de cada alvo ATÉ
+esse destino: é o caso típico de avaliar vários veículos para o mesmo pickup.
+
+arvore_caminhos_minimos guarda o resultado de uma procura completa em arrays
+(custo, km e predecessor por nó): responde depois a qualquer caminho a partir
+da raiz, e a qualquer subcaminho de um caminho da árvore, sem nova procura.
+"""
+
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from modelo.grafo import Grafo
+
+
+def dijkstra_um_para_muitos(grafo: Grafo, origem: str, alvos: Optional[Iterable[str]] = None,
+                            reverso: bool = False) -> Dict[str, Tuple[float, float, List[str]]]:
+    """
+    Args:
+        grafo: Grafo da cidade
+        origem: Nó de partida da procura (o destino comum, se reverso=True)
+        alvos: Nós de interesse; a procura pára quando todos estiverem fechados.
+               Se None, calcula para todos os nós alcançáveis.
+        reverso: Se True, custos são alvo → origem (usa o custo da aresta u→v
+                 ao percorrer v→u, assumindo que a reversa existe)
+
+    Returns:
+        Dict alvo → (custo_tempo_min, distancia_km, caminho). O caminho está
+        sempre no sentido da viagem (alvo → origem quando reverso=True).
+        Alvos inalcançáveis não aparecem no resultado.
+    """
+    if alvos is not None:
+        alvos = list(alvos)
+    custo, km, ligacao, fechados = _dijkstra(grafo, origem, alvos, reverso)
+
+    resultado = {}
+    for alvo in (alvos if alvos is not None else fechados):
+        if alvo not in fechados:
+            continue
+
+        caminho = []
+        no = alvo
+        while no is not None:
+            caminho.append(no)
+            no = ligacao[no]
+        if not reverso:
+            caminho.reverse()
+
+        resultado[alvo] = (custo[alvo], km[alvo], caminho)
+
+    return resultado
+
+
+def _dijkstra(grafo: Grafo, origem: str, alvos: Optional[List[str]],
+              reverso: bool) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, Optional[str]], Set[str]]:
+    inf = float('inf')
+    por_fechar = set(alvos) if alvos is not None else None
+
+    custo: Dict[str, float] = {origem: 0.0}
+    km: Dict[str, float] = {origem: 0.0}
+    ligacao: Dict[str, Optional[str]] = {origem: None}  # predecessor (ou sucessor, se reverso)
+    fechados = set()
+    fila = [(0.0, origem)]
+
+    while fila:
+        custo_atual, atual = heapq.heappop(fila)
+        if atual in fechados:
+            continue
+        fechados.add(atual)
+
+        if por_fechar is not None:
+            por_fechar.discard(atual)
+            if not por_fechar:
+                break
+
+        for aresta in grafo.vizinhos(atual):
+            vizinho = aresta.no_destino
+            if reverso:
+                try:
+                    aresta = grafo.get_aresta(vizinho, atual)
+                except ValueError:
+                    continue
+
+            custo_aresta = aresta.tempo_real()
+            if custo_aresta == inf:  # Ignora arestas bloqueadas
+                continue
+
+            novo_custo = custo_atual + custo_aresta
+            if novo_custo < custo.get(vizinho, inf):
+                custo[vizinho] = novo_custo
+                km[vizinho] = km[atual] + aresta.distancia_km
+                ligacao[vizinho] = atual
+                heapq.heappush(fila, (novo_custo, vizinho))
+
+    return custo, km, ligacao, fechados
+
+
+class ArvoreCaminhos:
+    """
+    Árvore de caminhos mínimos com raiz num nó (ou, se reverso, de todos os nós
+    até à raiz), guardada em arrays indexados pela posição do nó em `ids`.
+    """
+
+    def __init__(self, raiz: str, reverso: bool, ids: List[str], indices: Mapping[str, int],
+                 custo: array, km: array, ligacao: array, epoca: int = 0):
+        self.raiz = raiz
+        self.reverso = reverso
+        self.ids = ids
+        self.indices = indices
+        self.custo = custo      # tempo mínimo raiz → nó (nó → raiz, se reverso); inf se inalcançável
+        self.km = km
+        self.ligacao = ligacao  # predecessor (sucessor, se reverso) na árvore; -1 na raiz
+        self.epoca = epoca      # grafo.epoca_transito quando foi calculada
+
+    def memoria_bytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.custo, self.km, self.ligacao))
+
+    def contem(self, no_id: str) -> bool:
+        i = self.indices.get(no_id)
+        return i is not None and self.custo[i] != float('inf')
+
+    def _ate_raiz(self, i: int, parar: int = -1) -> List[int]:
+        """Índices de i até à raiz (ou até `parar`, inclusive) seguindo as ligações."""
+        ligacao = self.ligacao
+        cadeia = [i]
+        while i != parar and ligacao[i] != -1:
+            i = ligacao[i]
+            cadeia.append(i)
+        return cadeia
+
+    def rota(self, origem: str, destino: str) -> Optional[Tuple[List[str], float, float]]:
+        """
+        (caminho, custo_tempo, distancia_km) de origem a destino, se o caminho
+        mínimo estiver contido na árvore; None caso contrário.
+
+        Serve a raiz → nó (reverso: nó → raiz) e também qualquer subcaminho:
+        um troço de um caminho mínimo é também mínimo.
+        """
+        # Na árvore direta os caminhos descem da raiz; na inversa sobem até ela
+        perto, longe = (destino, origem) if self.reverso else (origem, destino)
+        if not self.contem(longe) or not self.contem(perto):
+            return None
+
+        i_perto = self.indices[perto]
+        cadeia = self._ate_raiz(self.indices[longe], parar=i_perto)
+        if cadeia[-1] != i_perto:
+            return None
+
+        ids = self.ids
+        caminho = [ids[i] for i in cadeia]
+        i_longe = cadeia[0]
+        custo = self.custo[i_longe] - self.custo[i_perto]
+        km = self.km[i_longe] - self.km[i_perto]
+        if not self.reverso:
+            caminho.reverse()
+        return caminho, custo, km
+
+
+def arvore_caminhos_minimos(grafo: Grafo, raiz: str, reverso: bool = False,
+                            ids: Optional[List[str]] = None,
+                            indices: Optional[Mapping[str, int]] = None) -> ArvoreCaminhos:
+    """
+    Procura completa (sem alvos) a partir da raiz, guardada como ArvoreCaminhos.
+
+    Args:
+        ids / indices: Ordem dos nós a usar nos arrays; partilhar a mesma entre
+                       árvores evita uma cópia por árvore
+    """
+    if ids is None:
+        ids = list(grafo.nos)
+    if indices is None:
+        indices = {no_id: i for i, no_id in enumerate(ids)}
+
+    custo_no, km_no, ligacao_no, fechados = _dijkstra(grafo, raiz, None, reverso)
+
+    n = len(ids)
+    custo = array('d', [float('inf')]) * n
+    km = array('d', [float('inf')]) * n
+    ligacao = array('i', [-1]) * n
+    for no_id in fechados:
+        i = indices[no_id]
+        custo[i] = custo_no[no_id]
+        km[i] = km_no[no_id]
+        anterior = ligacao_no[no_id]
+        if anterior is not None:
+            ligacao[i] = indices[anterior]
+
+    return ArvoreCaminhos(raiz, reverso, ids, indices, custo, km, ligacao,
+                          epoca=getattr(grafo, "epoca_transito", 0))
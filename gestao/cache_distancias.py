@@ -3,90 +3,244 @@ Sistema de cache para otimizar cálculos repetidos de distâncias.
 Reduz complexidade computacional em operações frequentes.
 """
 
+import hashlib
+import json
 import math
-from typing import Dict, Tuple
+import sqlite3
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from modelo.grafo import Grafo
+from gestao.algoritmos_procura.um_para_muitos import ArvoreCaminhos, arvore_caminhos_minimos
 
 class CacheDistancias:
     """
-    Cache para distâncias euclidianas entre nós.
-    
+    Distâncias euclidianas entre nós, servidas a partir de arrays NumPy.
+
+    - As coordenadas dos nós ficam em dois arrays (índice = posição em `ids`)
+    - Grafos que cabem em max_bytes_matriz têm uma matriz densa float32 n×n,
+      preenchida por linhas: a primeira consulta que envolve um nó calcula a
+      sua linha inteira numa só operação vetorial (cache miss); as seguintes,
+      com qualquer outro nó, são lidas da matriz (cache hit)
+    - Grafos maiores calculam as distâncias na hora (vetorialmente para linhas
+      e blocos); pre_carregar_distancias_criticas guarda o bloco entre os nós
+      críticos, se couber no mesmo orçamento
+
     Justificação:
     - Distância euclidiana é calculada centenas de vezes (heurísticas A*)
-    - Cálculo envolve sqrt() que é custoso
     - Distâncias são simétricas: dist(A,B) = dist(B,A)
     - Grafo é estático durante simulação
-    
     """
-    
-    def __init__(self, grafo: Grafo):
+
+    def __init__(self, grafo: Grafo, max_bytes_matriz: int = 64 * 1024 * 1024):
         self.grafo = grafo
-        self._cache: Dict[Tuple[str, str], float] = {}
+        self.ids: List[str] = list(grafo.nos)
+        self.indice: Dict[str, int] = {id_no: i for i, id_no in enumerate(self.ids)}
+        nos = grafo.nos
+        self._x = np.fromiter((nos[id_no].posicaox for id_no in self.ids), dtype=np.float64, count=len(self.ids))
+        self._y = np.fromiter((nos[id_no].posicaoy for id_no in self.ids), dtype=np.float64, count=len(self.ids))
+
+        n = len(self.ids)
+        self.max_bytes_matriz = max_bytes_matriz
+        self.densa = n * n * 4 <= max_bytes_matriz
+        self._matriz: Optional[np.ndarray] = None       # n×n float32 (só se densa)
+        self._linha_calculada = np.zeros(n, dtype=bool)
+        self._bloco_criticos: Optional[np.ndarray] = None  # k×k float32 (grafos grandes)
+        self._indice_criticos: Dict[str, int] = {}
         self._hits = 0
         self._misses = 0
-    
+
+    def _distancias(self, linhas: np.ndarray, colunas: Optional[np.ndarray] = None) -> np.ndarray:
+        """Distâncias (float64) entre os nós das posições `linhas` e `colunas` (todos, se None)."""
+        x = self._x if colunas is None else self._x[colunas]
+        y = self._y if colunas is None else self._y[colunas]
+        return np.hypot(self._x[linhas, None] - x, self._y[linhas, None] - y)
+
+    def _calcular_linhas(self, linhas: np.ndarray):
+        """Preenche as linhas (e, por simetria, as colunas) da matriz densa."""
+        if self._matriz is None:
+            n = len(self.ids)
+            self._matriz = np.empty((n, n), dtype=np.float32)
+        bloco = self._distancias(linhas).astype(np.float32)
+        self._matriz[linhas] = bloco
+        self._matriz[:, linhas] = bloco.T
+        self._linha_calculada[linhas] = True
+        self._misses += len(linhas)
+
+    # ==========================================================
+    # Consultas
+    # ==========================================================
+
     def get_distancia_euclidiana(self, no1_id: str, no2_id: str) -> float:
+        i = self.indice[no1_id]
+        j = self.indice[no2_id]
 
-        # Cria chave simétrica (ordem alfabética)
-        key = tuple(sorted([no1_id, no2_id]))
-        
-        if key in self._cache:
+        if self.densa:
+            if self._linha_calculada[i] or self._linha_calculada[j]:
+                self._hits += 1
+            else:
+                self._calcular_linhas(np.array([i]))
+            return float(self._matriz[i, j])
+
+        criticos = self._indice_criticos
+        if no1_id in criticos and no2_id in criticos:
             self._hits += 1
-            return self._cache[key]
-        
-        # Cache miss - calcula
+            return float(self._bloco_criticos[criticos[no1_id], criticos[no2_id]])
+
         self._misses += 1
-        no1 = self.grafo.nos[no1_id]
-        no2 = self.grafo.nos[no2_id]
-        
-        distancia = math.hypot(
-            no1.posicaox - no2.posicaox,
-            no1.posicaoy - no2.posicaoy
-        )
-        
-        self._cache[key] = distancia
-        return distancia
-    
+        return math.hypot(self._x[i] - self._x[j], self._y[i] - self._y[j])
+
+    def distancias_de(self, no_id: str) -> np.ndarray:
+        """Distâncias de no_id a todos os nós (ordem de `ids`). Não alterar o array devolvido."""
+        i = self.indice[no_id]
+        if not self.densa:
+            self._misses += 1
+            return self._distancias(np.array([i]))[0]
+
+        if self._linha_calculada[i]:
+            self._hits += 1
+        else:
+            self._calcular_linhas(np.array([i]))
+        return self._matriz[i]
+
+    def distancias_bloco(self, origens: Sequence[str], destinos: Sequence[str]) -> np.ndarray:
+        """Matriz len(origens) × len(destinos) de distâncias."""
+        linhas = np.fromiter((self.indice[o] for o in origens), dtype=np.intp, count=len(origens))
+        colunas = np.fromiter((self.indice[d] for d in destinos), dtype=np.intp, count=len(destinos))
+        if not self.densa:
+            self._misses += len(linhas)
+            return self._distancias(linhas, colunas)
+
+        em_falta = np.unique(linhas[~self._linha_calculada[linhas]])
+        self._hits += len(linhas) - len(em_falta)
+        if len(em_falta):
+            self._calcular_linhas(em_falta)
+        return self._matriz[np.ix_(linhas, colunas)]
+
     def pre_carregar_distancias_criticas(self, nos_criticos: list[str]):
         """
-        Pré-carrega distâncias entre nós mais usados (ex: estações).
-        Chamado uma vez na inicialização.
+        Pré-carrega distâncias a partir dos nós mais usados (ex: estações), numa
+        só operação vetorial. Chamado uma vez na inicialização.
         """
-        for i, no1 in enumerate(nos_criticos):
-            for no2 in nos_criticos[i+1:]:
-                self.get_distancia_euclidiana(no1, no2)
+        if not nos_criticos:
+            return
+        linhas = np.unique(np.fromiter((self.indice[n] for n in nos_criticos), dtype=np.intp))
+
+        if self.densa:
+            em_falta = linhas[~self._linha_calculada[linhas]]
+            if len(em_falta):
+                self._calcular_linhas(em_falta)
+            return
+
+        # Grafo grande: guarda só o bloco críticos × críticos, se couber
+        if len(linhas) ** 2 * 4 <= self.max_bytes_matriz:
+            self._bloco_criticos = self._distancias(linhas, linhas).astype(np.float32)
+            self._indice_criticos = {self.ids[i]: k for k, i in enumerate(linhas)}
+            self._misses += len(linhas)
     
     def limpar_cache(self):
-        self._cache.clear()
+        self._matriz = None
+        self._linha_calculada[:] = False
+        self._bloco_criticos = None
+        self._indice_criticos = {}
         self._hits = 0
         self._misses = 0
     
     def estatisticas(self) -> dict:
-        """Retorna estatísticas de uso do cache."""
+        """Retorna estatísticas de uso do cache (um miss = uma linha calculada)."""
         total = self._hits + self._misses
         taxa_acerto = (self._hits / total * 100) if total > 0 else 0
         
+        if self.densa:
+            tamanho = int(self._linha_calculada.sum())
+            memoria = self._matriz.nbytes if self._matriz is not None else 0
+        else:
+            tamanho = len(self._indice_criticos)
+            memoria = self._bloco_criticos.nbytes if self._bloco_criticos is not None else 0
+
         return {
             "cache_hits": self._hits,
             "cache_misses": self._misses,
             "taxa_acerto": round(taxa_acerto, 1),
-            "tamanho_cache": len(self._cache)
+            "tamanho_cache": tamanho,
+            "modo": "matriz" if self.densa else "vetorial",
+            "bytes": memoria
         }
 
 
+def impressao_grafo(grafo: Grafo) -> str:
+    """Identifica a cidade (nós, posições e arestas com custos base), independentemente do trânsito."""
+    h = hashlib.sha1()
+    for no_id, no in grafo.nos.items():
+        h.update(f"{no_id}\x1f{no.posicaox!r}\x1f{no.posicaoy!r}\x1f{no.tipo.name}\x1e".encode())
+    for no_origem, arestas in grafo.adjacentes.items():
+        for aresta in arestas:
+            h.update(f"{no_origem}\x1f{aresta.no_destino}\x1f{aresta.distancia_km!r}"
+                     f"\x1f{aresta.tempoViagem_min!r}\x1e".encode())
+    return h.hexdigest()
+
+
+def impressao_transito(grafo: Grafo) -> str:
+    """Identifica o estado de trânsito (congestion e bloqueios de todas as arestas)."""
+    h = hashlib.sha1()
+    for arestas in grafo.adjacentes.values():
+        for aresta in arestas:
+            h.update(f"{aresta.congestion!r}{'b' if aresta.blocked else ''}\x1e".encode())
+    return h.hexdigest()
+
+
 class CacheRotas:
     """
-    Cache para rotas completas calculadas.
-    
-    Só funciona se trânsito for estático.
-    Se usar trânsito dinâmico, este cache deve ser invalidado periodicamente.
+    Cache LRU para rotas completas calculadas.
+
+    - Limitada em número de rotas (capacidade) e, opcionalmente, em bytes
+      (max_bytes); ao exceder, sai a rota usada há mais tempo.
+    - Com grafo, cada rota fica associada ao regime de trânsito em que foi
+      calculada: a impressão dos factores e bloqueios de todas as arestas
+      (ver impressao_transito), recalculada só quando grafo.epoca_transito
+      muda. Como o GestorTransito só altera os factores na mudança de hora, uma
+      rota serve até o regime mudar (hora com outros factores ou bloqueio), e
+      volta a servir se o regime regressar (ex: desbloqueio, noite seguinte).
+    - validade_minutos acrescenta expiração por idade (None = sem expiração;
+      sem grafo, é o único critério de validade).
+    - Com partilhada (cache_partilhada.TabelaRotasPartilhada), as falhas são
+      procuradas na tabela comum aos processos de um pool e as rotas novas são
+      lá publicadas.
     """
+
+    # Tuplo da entrada, chave e custo (aproximados) que não dependem do caminho
+    BYTES_FIXOS_ENTRADA = 200
     
-    def __init__(self, validade_minutos: int = 10):
-        self._cache: Dict[Tuple[str, str, str], Tuple[list, float, int]] = {}
+    def __init__(self, validade_minutos: Optional[int] = 10, capacidade: int = 10000,
+                 max_bytes: Optional[int] = None, grafo: Optional[Grafo] = None,
+                 partilhada=None):
+        # (origem, destino, algoritmo, regime) → (caminho, custo, tempo_calculo, bytes)
+        self._cache: "OrderedDict[Tuple[str, str, str, str], Tuple[list, float, int, int]]" = OrderedDict()
         self.validade_minutos = validade_minutos
+        self.capacidade = capacidade
+        self.max_bytes = max_bytes
+        self.grafo = grafo
+        self.partilhada = partilhada
+        self._regime: Optional[Tuple[int, str]] = None  # (época, impressão do trânsito)
+        self._bytes = 0
         self._hits = 0
+        self._hits_partilhada = 0
         self._misses = 0
+        self._evicoes = 0
+
+    def regime_atual(self) -> str:
+        """Impressão do trânsito atual do grafo ("" sem grafo)."""
+        if self.grafo is None:
+            return ""
+        if self._regime is None or self._regime[0] != self.grafo.epoca_transito:
+            self._regime = (self.grafo.epoca_transito, impressao_transito(self.grafo))
+        return self._regime[1]
+
+    def _expirada(self, tempo_calculo: int, tempo_atual: int) -> bool:
+        return self.validade_minutos is not None and tempo_atual - tempo_calculo >= self.validade_minutos
     
     def get_rota(self, origem: str, destino: str, algoritmo: str, 
                  tempo_atual: int) -> Tuple[list, float] | None:
@@ -94,49 +248,334 @@ class CacheRotas:
         Returns:
             (caminho, custo) se encontrado e válido, None caso contrário
         """
-        key = (origem, destino, algoritmo)
+        key = (origem, destino, algoritmo, self.regime_atual())
+        entrada = self._cache.get(key)
         
-        if key in self._cache:
-            caminho, custo, tempo_calculo = self._cache[key]
-            
-            # Verifica validade (importante com trânsito dinâmico)
-            if tempo_atual - tempo_calculo < self.validade_minutos:
+        if entrada is not None:
+            caminho, custo, tempo_calculo, _ = entrada
+            if not self._expirada(tempo_calculo, tempo_atual):
+                self._cache.move_to_end(key)
                 self._hits += 1
                 return caminho, custo
+
+        if self.partilhada is not None:
+            rota = self.partilhada.get_rota(origem, destino, algoritmo)
+            if rota is not None:
+                self._guardar(key, *rota, tempo_atual)
+                self._hits += 1
+                self._hits_partilhada += 1
+                return rota
         
         self._misses += 1
         return None
     
     def armazenar_rota(self, origem: str, destino: str, algoritmo: str,
-                       caminho: list, custo: float, tempo_atual: int):
-        """Armazena rota calculada no cache."""
-        key = (origem, destino, algoritmo)
-        self._cache[key] = (caminho, custo, tempo_atual)
+                       caminho: list, custo: float, tempo_atual: int, regime: Optional[str] = None):
+        """
+        Armazena rota calculada no cache.
+            -regime: regime de trânsito em que foi calculada, se não for o atual
+                     (ex: pré-aquecimento da hora seguinte)
+        """
+        if regime is not None:
+            self._guardar((origem, destino, algoritmo, regime), caminho, custo, tempo_atual)
+            return
+        self._guardar((origem, destino, algoritmo, self.regime_atual()), caminho, custo, tempo_atual)
+        if self.partilhada is not None:
+            self.partilhada.armazenar_rota(origem, destino, algoritmo, caminho, custo)
+
+    def _guardar(self, key: Tuple[str, str, str, str], caminho: list, custo: float, tempo_atual: int):
+        if key in self._cache:
+            self._remover(key)
+
+        tamanho = self.BYTES_FIXOS_ENTRADA + sys.getsizeof(caminho)
+        self._cache[key] = (caminho, custo, tempo_atual, tamanho)
+        self._bytes += tamanho
+
+        while self._cache and (len(self._cache) > self.capacidade
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            self._remover(next(iter(self._cache)))
+            self._evicoes += 1
+
+    def _remover(self, key: Tuple[str, str, str, str]):
+        self._bytes -= self._cache.pop(key)[3]
+
+    def rotas_do_regime(self, algoritmo: str, regime: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Pares (origem → destinos) guardados para o algoritmo no regime (atual, por
+        omissão), da origem usada mais recentemente para a menos recente.
+        """
+        regime = self.regime_atual() if regime is None else regime
+        por_origem: Dict[str, List[str]] = {}
+        for origem, destino, alg, regime_rota in reversed(self._cache):
+            if alg == algoritmo and regime_rota == regime:
+                por_origem.setdefault(origem, []).append(destino)
+        return por_origem
     
     def invalidar_por_tempo(self, tempo_atual: int):
         """Remove rotas expiradas."""
         keys_remover = [
-            key for key, (_, _, tempo_calc) in self._cache.items()
-            if tempo_atual - tempo_calc >= self.validade_minutos
+            key for key, (_, _, tempo_calc, _) in self._cache.items()
+            if self._expirada(tempo_calc, tempo_atual)
         ]
         
         for key in keys_remover:
-            del self._cache[key]
+            self._remover(key)
     
     def limpar_cache(self):
         """Limpa cache completamente."""
         self._cache.clear()
+        self._bytes = 0
         self._hits = 0
+        self._hits_partilhada = 0
         self._misses = 0
+        self._evicoes = 0
     
     def estatisticas(self) -> dict:
         """Retorna estatísticas de uso."""
         total = self._hits + self._misses
         taxa_acerto = (self._hits / total * 100) if total > 0 else 0
         
+        estatisticas = {
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+            "taxa_acerto": round(taxa_acerto, 1),
+            "rotas_cacheadas": len(self._cache),
+            "regimes": len({key[3] for key in self._cache}),
+            "evicoes": self._evicoes,
+            "bytes": self._bytes
+        }
+        if self.partilhada is not None:
+            estatisticas["hits_partilhada"] = self._hits_partilhada
+        return estatisticas
+
+
+class CacheArvores:
+    """
+    Cache de árvores de caminhos mínimos (ver um_para_muitos.ArvoreCaminhos).
+
+    Uma árvore por (raiz, sentido), marcada com grafo.epoca_transito: serve
+    todas as rotas a partir da raiz (ou até ela, no sentido inverso) e os
+    subcaminhos dos seus caminhos. Limitada por max_bytes; ao exceder, sai a
+    árvore cuja raiz foi pedida menos vezes (LFU). As contagens sobrevivem à
+    remoção, por isso as zonas de pickup frequentes tendem a ficar na cache.
+    """
+
+    def __init__(self, grafo: Grafo, max_bytes: int = 64 * 1024 * 1024):
+        self.grafo = grafo
+        self.max_bytes = max_bytes
+        self._arvores: Dict[Tuple[str, bool], ArvoreCaminhos] = {}
+        self._usos: Dict[Tuple[str, bool], int] = {}
+        self._bytes = 0
+        self._ids: list = []
+        self._indices: Dict[str, int] = {}
+        self._hits = 0
+        self._hits_subcaminho = 0
+        self._misses = 0
+        self._evicoes = 0
+
+    def _validar(self, chave: Tuple[str, bool]) -> Optional[ArvoreCaminhos]:
+        arvore = self._arvores.get(chave)
+        if arvore is not None and arvore.epoca != self.grafo.epoca_transito:
+            self._remover(chave)
+            return None
+        return arvore
+
+    def arvore(self, raiz: str, reverso: bool = False) -> ArvoreCaminhos:
+        """Árvore com raiz em `raiz` (calculada e guardada se não existir)."""
+        chave = (raiz, reverso)
+        self._usos[chave] = self._usos.get(chave, 0) + 1
+
+        arvore = self._validar(chave)
+        if arvore is not None:
+            self._hits += 1
+            return arvore
+
+        self._misses += 1
+        if len(self._ids) != len(self.grafo.nos):
+            self._ids = list(self.grafo.nos)
+            self._indices = {no_id: i for i, no_id in enumerate(self._ids)}
+        arvore = arvore_caminhos_minimos(self.grafo, raiz, reverso, self._ids, self._indices)
+        self._guardar(chave, arvore)
+        return arvore
+
+    def rota_em_cache(self, origem: str, destino: str) -> Optional[Tuple[list, float, float]]:
+        """
+        (caminho, custo_tempo, distancia_km) se alguma árvore guardada já contiver
+        o caminho mínimo origem → destino; None caso contrário (sem procurar).
+        """
+        for chave in ((origem, False), (destino, True)):
+            arvore = self._validar(chave)
+            if arvore is not None:
+                rota = arvore.rota(origem, destino)
+                if rota is not None:
+                    self._usos[chave] += 1
+                    self._hits += 1
+                    return rota
+
+        # Subcaminho de uma árvore com outra raiz (as mais usadas primeiro)
+        for chave in sorted(self._arvores, key=self._usos.__getitem__, reverse=True):
+            arvore = self._validar(chave)
+            if arvore is None:
+                continue
+            rota = arvore.rota(origem, destino)
+            if rota is not None:
+                self._usos[chave] += 1
+                self._hits_subcaminho += 1
+                return rota
+        return None
+
+    def rota(self, origem: str, destino: str) -> Optional[Tuple[list, float, float]]:
+        """Como rota_em_cache, mas calcula a árvore de origem se nenhuma servir."""
+        rota = self.rota_em_cache(origem, destino)
+        if rota is None:
+            rota = self.arvore(origem).rota(origem, destino)
+        return rota
+
+    @property
+    def procuras(self) -> int:
+        """Árvores calculadas (uma procura completa cada)."""
+        return self._misses
+
+    def _guardar(self, chave: Tuple[str, bool], arvore: ArvoreCaminhos):
+        self._arvores[chave] = arvore
+        self._bytes += arvore.memoria_bytes()
+
+        while self._bytes > self.max_bytes and len(self._arvores) > 1:
+            menos_usada = min((c for c in self._arvores if c != chave), key=self._usos.__getitem__)
+            self._remover(menos_usada)
+            self._evicoes += 1
+
+    def _remover(self, chave: Tuple[str, bool]):
+        self._bytes -= self._arvores.pop(chave).memoria_bytes()
+
+    def limpar_cache(self):
+        self._arvores.clear()
+        self._usos.clear()
+        self._bytes = 0
+        self._hits = self._hits_subcaminho = self._misses = self._evicoes = 0
+
+    def estatisticas(self) -> dict:
+        """Retorna estatísticas de uso."""
+        hits = self._hits + self._hits_subcaminho
+        total = hits + self._misses
+        taxa_acerto = (hits / total * 100) if total > 0 else 0
+
+        return {
+            "cache_hits": self._hits,
+            "hits_subcaminho": self._hits_subcaminho,
+            "cache_misses": self._misses,
+            "taxa_acerto": round(taxa_acerto, 1),
+            "arvores_cacheadas": len(self._arvores),
+            "evicoes": self._evicoes,
+            "bytes": self._bytes
+        }
+
+
+class CachePersistente:
+    """
+    Cache de rotas em disco (SQLite), partilhada entre execuções sobre a mesma cidade.
+
+    Cada rota é guardada com a chave (impressão do grafo, algoritmo, impressão
+    do trânsito, origem, destino). A impressão do trânsito resume os factores
+    de todas as arestas: horas do perfil com os mesmos factores (ex: toda a
+    madrugada) partilham as rotas, e bloqueios dão um trânsito diferente.
+
+    - As rotas de um (algoritmo, trânsito) são lidas de uma só vez na primeira
+      consulta (ou em aquecer) e servidas de memória a partir daí
+    - As rotas novas são escritas em lotes de tamanho_lote, numa transação;
+      gravar() escreve o que faltar (chamar no fim da execução)
+    - Vários processos podem usar o mesmo ficheiro (modo WAL)
+    """
+
+    def __init__(self, caminho: str, grafo: Grafo, tamanho_lote: int = 500):
+        self.caminho = caminho
+        self.grafo = grafo
+        self.tamanho_lote = tamanho_lote
+        self.impressao_grafo = impressao_grafo(grafo)
+
+        self._conexao = sqlite3.connect(caminho, timeout=30)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS rotas ("
+            " grafo TEXT, algoritmo TEXT, transito TEXT, origem TEXT, destino TEXT,"
+            " caminho TEXT, custo REAL,"
+            " PRIMARY KEY (grafo, algoritmo, transito, origem, destino)) WITHOUT ROWID"
+        )
+        self._conexao.commit()
+
+        self._transito: Optional[Tuple[int, str]] = None   # (época, impressão)
+        self._particao: Optional[Tuple[str, str]] = None   # (algoritmo, impressão do trânsito) em memória
+        self._rotas: Dict[Tuple[str, str], Tuple[list, float]] = {}
+        self._pendentes: list = []
+        self._hits = 0
+        self._misses = 0
+        self._lidas = 0
+        self._gravadas = 0
+
+    def _impressao_transito(self) -> str:
+        # Só se recalcula quando o GestorTransito altera o grafo
+        if self._transito is None or self._transito[0] != self.grafo.epoca_transito:
+            self._transito = (self.grafo.epoca_transito, impressao_transito(self.grafo))
+        return self._transito[1]
+
+    def aquecer(self, algoritmo: str) -> int:
+        """Carrega para memória as rotas guardadas do algoritmo, no trânsito atual. Retorna quantas."""
+        particao = (algoritmo, self._impressao_transito())
+        if particao != self._particao:
+            self._particao = particao
+            cursor = self._conexao.execute(
+                "SELECT origem, destino, caminho, custo FROM rotas"
+                " WHERE grafo = ? AND algoritmo = ? AND transito = ?",
+                (self.impressao_grafo, *particao)
+            )
+            self._rotas = {(o, d): (json.loads(c), custo) for o, d, c, custo in cursor}
+            self._lidas += len(self._rotas)
+            # Rotas ainda não escritas desta partição
+            for _, alg, transito, o, d, c, custo in self._pendentes:
+                if (alg, transito) == particao:
+                    self._rotas[(o, d)] = (json.loads(c), custo)
+        return len(self._rotas)
+
+    def get_rota(self, origem: str, destino: str, algoritmo: str) -> Tuple[list, float] | None:
+        self.aquecer(algoritmo)
+        rota = self._rotas.get((origem, destino))
+        if rota is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return rota
+
+    def armazenar_rota(self, origem: str, destino: str, algoritmo: str, caminho: list, custo: float):
+        self.aquecer(algoritmo)
+        if (origem, destino) in self._rotas:
+            return
+        self._rotas[(origem, destino)] = (caminho, custo)
+        self._pendentes.append((self.impressao_grafo, algoritmo, self._particao[1],
+                                origem, destino, json.dumps(caminho), custo))
+        if len(self._pendentes) >= self.tamanho_lote:
+            self.gravar()
+
+    def gravar(self):
+        """Escreve as rotas pendentes numa única transação."""
+        if not self._pendentes:
+            return
+        with self._conexao:
+            self._conexao.executemany("INSERT OR IGNORE INTO rotas VALUES (?, ?, ?, ?, ?, ?, ?)", self._pendentes)
+        self._gravadas += len(self._pendentes)
+        self._pendentes = []
+
+    def fechar(self):
+        self.gravar()
+        self._conexao.close()
+
+    def estatisticas(self) -> dict:
+        total = self._hits + self._misses
+        taxa_acerto = (self._hits / total * 100) if total > 0 else 0
         return {
             "cache_hits": self._hits,
             "cache_misses": self._misses,
             "taxa_acerto": round(taxa_acerto, 1),
-            "rotas_cacheadas": len(self._cache)
-        }
\ No newline at end of file
+            "rotas_lidas": self._lidas,
+            "rotas_gravadas": self._gravadas,
+            "pendentes": len(self._pendentes)
+        }
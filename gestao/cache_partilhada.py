@@ -0,0 +1,258 @@
+"""
+Tabela de rotas em memória partilhada, para vários processos do mesmo pool.
+
+Cada Simulador de um pool mantém a sua CacheRotas; com esta tabela por trás,
+uma rota calculada num processo fica disponível para todos os outros.
+
+- Tabela de endereçamento aberto com tamanho fixo (multiprocessing.shared_memory),
+  sondagem linear de até SONDAGENS posições; sem espaço, a rota substitui a da
+  posição inicial (é uma cache, não um dicionário)
+- Cada posição tem um número de sequência (seqlock): os escritores tornam-no
+  ímpar durante a escrita, os leitores não bloqueiam e tratam uma leitura em
+  que o número mudou como falha
+- Só as escritas passam por um multiprocessing.Lock
+- Os nós das rotas são guardados como índices (ordem de grafo.nos), por isso
+  todos os processos têm de usar a mesma cidade (verificado em associar)
+- A chave inclui a impressão do trânsito, já que as épocas de trânsito de
+  cada processo não são comparáveis
+
+Uso:
+    tabela = TabelaRotasPartilhada(capacidade=1 << 16)          # processo principal
+    with Pool(initializer=iniciar, initargs=(tabela,)) as pool:  # a tabela é enviada por nome
+        ...
+    # em cada processo: gestor.usar_tabela_partilhada(tabela)
+    tabela.destruir()
+"""
+
+import multiprocessing
+import struct
+import sys
+import zlib
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+from modelo.grafo import Grafo
+from gestao.cache_distancias import impressao_grafo, impressao_transito
+
+MAGIC = b"TXROTAS\0"
+VERSAO = 1
+
+# magic, versão, nº de posições, máximo de nós por rota, impressão do grafo (sha1)
+_CABECALHO = struct.Struct("<8sIIi20s")
+
+# seq, chave (0 = vazia), trânsito, origem, destino, algoritmo, nº de nós, custo
+_POSICAO = struct.Struct("<IxxxxQQiiIid")
+_SEQ = struct.Struct("<I")
+
+_MASCARA = (1 << 64) - 1
+
+
+def _misturar(*valores: int) -> int:
+    """Hash de 64 bits (igual em todos os processos, ao contrário de hash() de strings)."""
+    h = 0xcbf29ce484222325
+    for valor in valores:
+        h = ((h ^ valor) * 0x100000001b3) & _MASCARA
+        h ^= h >> 29
+    return h or 1
+
+
+class TabelaRotasPartilhada:
+
+    SONDAGENS = 8
+
+    def __init__(self, capacidade: int = 1 << 16, max_nos_rota: int = 64,
+                 nome: Optional[str] = None, lock=None, _criar: bool = True):
+        self.max_nos_rota = max_nos_rota
+        self.tamanho_posicao = (_POSICAO.size + 4 * max_nos_rota + 7) & ~7
+        self._inicio = (_CABECALHO.size + 7) & ~7
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        self.criador = _criar
+
+        if _criar:
+            self.capacidade = capacidade
+            # O bloco novo vem a zeros: todas as posições vazias
+            self._shm = shared_memory.SharedMemory(
+                name=nome, create=True, size=self._inicio + capacidade * self.tamanho_posicao)
+            _CABECALHO.pack_into(self._shm.buf, 0, MAGIC, VERSAO, capacidade, max_nos_rota, bytes(20))
+        else:
+            self._shm = _ligar(nome)
+            magic, versao, self.capacidade, max_nos, _ = _CABECALHO.unpack_from(self._shm.buf, 0)
+            if magic != MAGIC or versao != VERSAO or max_nos != max_nos_rota:
+                self._shm.close()
+                raise ValueError(f"Memória partilhada {nome} não é uma tabela de rotas compatível")
+
+        self.nome = self._shm.name
+        self._buf = self._shm.buf
+
+        # Preenchidos em associar()
+        self.grafo: Optional[Grafo] = None
+        self._ids: List[str] = []
+        self._indice: Dict[str, int] = {}
+        self._transito: Optional[Tuple[int, int]] = None  # (época local, impressão de 64 bits)
+
+        self._hits = 0
+        self._misses = 0
+        self._leituras_concorrentes = 0
+        self._escritas = 0
+        self._substituicoes = 0
+        self._rejeitadas = 0
+
+    @classmethod
+    def ligar(cls, nome: str, max_nos_rota: int = 64, lock=None) -> "TabelaRotasPartilhada":
+        """Liga-se a uma tabela já criada por outro processo."""
+        return cls(nome=nome, max_nos_rota=max_nos_rota, lock=lock, _criar=False)
+
+    def __reduce__(self):
+        # Enviada a outro processo (ex: initargs de um Pool) liga-se pelo nome
+        return TabelaRotasPartilhada.ligar, (self.nome, self.max_nos_rota, self.lock)
+
+    def associar(self, grafo: Grafo):
+        """
+        Indica a cidade deste processo. A primeira associação regista a impressão
+        do grafo na tabela; as seguintes têm de coincidir.
+        """
+        impressao = bytes.fromhex(impressao_grafo(grafo))
+        with self.lock:
+            registada = _CABECALHO.unpack_from(self._buf, 0)[4]
+            if registada == bytes(20):
+                _CABECALHO.pack_into(self._buf, 0, MAGIC, VERSAO, self.capacidade, self.max_nos_rota, impressao)
+            elif registada != impressao:
+                raise ValueError("A tabela partilhada pertence a outra cidade")
+        self.grafo = grafo
+        self._ids = list(grafo.nos)
+        self._indice = {id_no: i for i, id_no in enumerate(self._ids)}
+        self._transito = None
+
+    # ==========================================================
+    # Chaves e posições
+    # ==========================================================
+
+    def _impressao_transito(self) -> int:
+        if self._transito is None or self._transito[0] != self.grafo.epoca_transito:
+            self._transito = (self.grafo.epoca_transito, int(impressao_transito(self.grafo)[:16], 16))
+        return self._transito[1]
+
+    def _chave(self, origem: str, destino: str, algoritmo: str) -> Optional[Tuple[int, int, int, int, int]]:
+        """(chave, trânsito, origem, destino, algoritmo) em inteiros, ou None se algum nó não existir."""
+        i = self._indice.get(origem)
+        j = self._indice.get(destino)
+        if i is None or j is None:
+            return None
+        alg = zlib.crc32(algoritmo.encode())
+        transito = self._impressao_transito()
+        return _misturar(i, j, alg, transito), transito, i, j, alg
+
+    def _posicoes(self, chave: int):
+        inicio = chave % self.capacidade
+        for k in range(min(self.SONDAGENS, self.capacidade)):
+            yield self._inicio + ((inicio + k) % self.capacidade) * self.tamanho_posicao
+
+    # ==========================================================
+    # Leitura (sem lock) e escrita
+    # ==========================================================
+
+    def get_rota(self, origem: str, destino: str, algoritmo: str) -> Tuple[list, float] | None:
+        chave = self._chave(origem, destino, algoritmo)
+        if chave is None:
+            return None
+        buf = self._buf
+        for posicao in self._posicoes(chave[0]):
+            seq, chave_pos, transito, i, j, alg, n, custo = _POSICAO.unpack_from(buf, posicao)
+            if chave_pos == 0:
+                break
+            if (chave_pos, transito, i, j, alg) != chave:
+                continue
+            if seq & 1:
+                self._leituras_concorrentes += 1
+                break
+            inicio_nos = posicao + _POSICAO.size
+            nos = buf[inicio_nos:inicio_nos + 4 * n].cast("i").tolist()
+            if _SEQ.unpack_from(buf, posicao)[0] != seq:
+                # Reescrita a meio da leitura
+                self._leituras_concorrentes += 1
+                break
+            self._hits += 1
+            ids = self._ids
+            return [ids[k] for k in nos], custo
+
+        self._misses += 1
+        return None
+
+    def armazenar_rota(self, origem: str, destino: str, algoritmo: str, caminho: list, custo: float) -> bool:
+        """Publica uma rota. Retorna False se não couber (rota longa ou nós desconhecidos)."""
+        chave = self._chave(origem, destino, algoritmo)
+        if chave is None or len(caminho) > self.max_nos_rota:
+            self._rejeitadas += 1
+            return False
+        indice = self._indice
+        try:
+            nos = array("i", [indice[no] for no in caminho]).tobytes()
+        except KeyError:
+            self._rejeitadas += 1
+            return False
+
+        buf = self._buf
+        with self.lock:
+            escolhida = None
+            for posicao in self._posicoes(chave[0]):
+                chave_pos = _POSICAO.unpack_from(buf, posicao)[1]
+                if chave_pos == 0 or chave_pos == chave[0]:
+                    escolhida = posicao
+                    break
+            if escolhida is None:
+                escolhida = next(self._posicoes(chave[0]))
+                self._substituicoes += 1
+
+            seq = _SEQ.unpack_from(buf, escolhida)[0]
+            _SEQ.pack_into(buf, escolhida, seq + 1)
+            _POSICAO.pack_into(buf, escolhida, seq + 1, *chave, len(caminho), custo)
+            inicio_nos = escolhida + _POSICAO.size
+            buf[inicio_nos:inicio_nos + len(nos)] = nos
+            _SEQ.pack_into(buf, escolhida, seq + 2)
+        self._escritas += 1
+        return True
+
+    # ==========================================================
+    # Ciclo de vida e estatísticas
+    # ==========================================================
+
+    def fechar(self):
+        """Desliga este processo da tabela."""
+        self._buf = None
+        self._shm.close()
+
+    def destruir(self):
+        """Liberta a memória partilhada (só o processo que a criou)."""
+        self.fechar()
+        if self.criador:
+            self._shm.unlink()
+
+    def ocupacao(self) -> int:
+        """Número de posições ocupadas (percorre a tabela)."""
+        return sum(
+            1 for k in range(self.capacidade)
+            if _POSICAO.unpack_from(self._buf, self._inicio + k * self.tamanho_posicao)[1] != 0
+        )
+
+    def estatisticas(self) -> dict:
+        total = self._hits + self._misses
+        taxa_acerto = (self._hits / total * 100) if total > 0 else 0
+        return {
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+            "taxa_acerto": round(taxa_acerto, 1),
+            "escritas": self._escritas,
+            "substituicoes": self._substituicoes,
+            "rejeitadas": self._rejeitadas,
+            "leituras_concorrentes": self._leituras_concorrentes
+        }
+
+
+def _ligar(nome: str) -> shared_memory.SharedMemory:
+    """Liga-se a um bloco existente sem o registar para remoção no fim deste processo."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nome, track=False)
+    shm = shared_memory.SharedMemory(name=nome)
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
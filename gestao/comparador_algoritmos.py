@@ -7,12 +7,19 @@ Testa e compara A*, UCS, BFS, DFS em diferentes cenários.
 - Considerar condições variáveis (trânsito, autonomia)
 """
 
-from typing import Dict, List, Tuple, Callable
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Callable
+from dataclasses import dataclass, field, asdict
+import gc
+import inspect
+import json
+import os
+import platform
 import time
 import statistics
+import tracemalloc
 from modelo.grafo import Grafo
 from modelo.veiculos import Veiculo
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
 
 
 @dataclass
@@ -25,7 +32,13 @@ class ResultadoAlgoritmo:
     tamanho_caminho: int
     caminho: List[str]
     sucesso: bool
-    memoria_pico_kb: float = 0.0  # Uso de memória estimado
+    memoria_pico_kb: float = 0.0  # Pico de memória alocada (tracemalloc)
+    pops: int = 0
+    pushes: int = 0
+    relaxacoes: int = 0
+    pico_fronteira: int = 0
+    pico_fechados: int = 0
+    instrumentado: bool = False  # False = nos_expandidos estimado pelo caminho
     
     def eficiencia_relativa(self, referencia: 'ResultadoAlgoritmo') -> float:
         """
@@ -46,6 +59,25 @@ class ResultadoAlgoritmo:
         return 0.4 * score_tempo + 0.3 * score_nos + 0.3 * score_custo
 
 
+@dataclass
+class ResultadoBenchmark:
+    """Distribuição de tempos de um algoritmo num cenário (modo benchmark)."""
+    nome_algoritmo: str
+    cenario: str
+    repeticoes: int
+    mediana_ms: float
+    p95_ms: float
+    iqr_ms: float
+    minimo_ms: float
+    mediana_sem_gc_ms: float = 0.0
+    p95_sem_gc_ms: float = 0.0
+    custo_solucao: float = float('inf')
+    sucesso: bool = False
+
+    def chave(self) -> Tuple[str, str]:
+        return (self.cenario, self.nome_algoritmo)
+
+
 @dataclass
 class CenarioTeste:
     """Cenário de teste para algoritmos."""
@@ -73,9 +105,50 @@ class ComparadorAlgoritmos:
         self.resultados: List[ResultadoAlgoritmo] = []
         self.historico: Dict[str, List[ResultadoAlgoritmo]] = {}
     
+    @staticmethod
+    def aceita_estatisticas(funcao_busca: Callable) -> bool:
+        """Verifica se o algoritmo aceita o argumento estatisticas."""
+        try:
+            return "estatisticas" in inspect.signature(funcao_busca).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def _executar(self, nome: str, funcao_busca: Callable, cenario: CenarioTeste, **extra):
+        if cenario.veiculo and "astar" in nome.lower():
+            # A* com contexto (veículo + tempo)
+            return funcao_busca(
+                self.grafo, cenario.origem, cenario.destino,
+                veiculo=cenario.veiculo,
+                tempo_atual=cenario.tempo_simulacao,
+                **extra
+            )
+        return funcao_busca(self.grafo, cenario.origem, cenario.destino, **extra)
+
+    def medir_memoria_pico(self, nome: str, funcao_busca: Callable, cenario: CenarioTeste) -> float:
+        """
+        Pico de memória (KB) alocada durante uma execução, medido com tracemalloc.
+        Execução separada da cronometrada, porque o tracemalloc atrasa o código.
+        """
+        ja_ativo = tracemalloc.is_tracing()
+        if not ja_ativo:
+            tracemalloc.start()
+        try:
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._executar(nome, funcao_busca, cenario)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            if not ja_ativo:
+                tracemalloc.stop()
+        return round(max(0, pico - base) / 1024, 2)
+
     def testar_algoritmo(self, nome: str, funcao_busca: Callable, cenario: CenarioTeste) -> ResultadoAlgoritmo:
         """
         Executa um algoritmo e registra métricas detalhadas.
+
+        Algoritmos que aceitam estatisticas (bfs, dfs, ucs, greedy, a_star_search)
+        reportam os nós realmente expandidos; os restantes ficam com a estimativa
+        len(caminho) e instrumentado=False.
         
         Args:
             nome: Nome do algoritmo
@@ -85,22 +158,15 @@ class ComparadorAlgoritmos:
         Returns:
             ResultadoAlgoritmo com todas as métricas
         """
+        estatisticas = EstatisticasProcura() if self.aceita_estatisticas(funcao_busca) else None
+        extra = {"estatisticas": estatisticas} if estatisticas is not None else {}
+
         inicio = time.perf_counter()
         nos_expandidos = 0
         
         try:
             # Executa algoritmo
-            if cenario.veiculo and "astar" in nome.lower():
-                # A* com contexto (veículo + tempo)
-                resultado = funcao_busca(
-                    self.grafo, cenario.origem, cenario.destino,
-                    veiculo=cenario.veiculo,
-                    tempo_atual=cenario.tempo_simulacao
-                )
-            else:
-                resultado = funcao_busca(
-                    self.grafo, cenario.origem, cenario.destino
-                )
+            resultado = self._executar(nome, funcao_busca, cenario, **extra)
             
             # Interpreta resultado
             if isinstance(resultado, tuple):
@@ -112,13 +178,16 @@ class ComparadorAlgoritmos:
             fim = time.perf_counter()
             tempo_ms = (fim - inicio) * 1000
             
-            # Estima nós expandidos (aproximação pelo tamanho do caminho)
-            nos_expandidos = len(caminho) if caminho else 0
+            if estatisticas is not None:
+                nos_expandidos = estatisticas.expansoes
+            else:
+                # Sem instrumentação: aproximação pelo tamanho do caminho
+                nos_expandidos = len(caminho) if caminho else 0
             
-            # Estima uso de memória (estruturas de dados típicas)
-            memoria_kb = self.estimar_memoria(caminho, nos_expandidos)
+            memoria_kb = self.medir_memoria_pico(nome, funcao_busca, cenario)
             
             sucesso = bool(caminho) and custo != float('inf')
+            contadores = estatisticas or EstatisticasProcura()
             
             return ResultadoAlgoritmo(
                 nome_algoritmo=nome,
@@ -128,7 +197,13 @@ class ComparadorAlgoritmos:
                 tamanho_caminho=len(caminho) if caminho else 0,
                 caminho=caminho if caminho else [],
                 sucesso=sucesso,
-                memoria_pico_kb=memoria_kb
+                memoria_pico_kb=memoria_kb,
+                pops=contadores.pops,
+                pushes=contadores.pushes,
+                relaxacoes=contadores.relaxacoes,
+                pico_fronteira=contadores.pico_fronteira,
+                pico_fechados=contadores.pico_fechados,
+                instrumentado=estatisticas is not None
             )
         
         except Exception as e:
@@ -164,7 +239,8 @@ class ComparadorAlgoritmos:
     
     def estimar_memoria(self, caminho: List[str], nos_expandidos: int) -> float:
         """
-        Estima uso de memória do algoritmo.
+        Estima uso de memória do algoritmo (modelo fixo; testar_algoritmo usa
+        medir_memoria_pico, que mede com tracemalloc).
         
         Baseado em:
         - Tamanho das estruturas (open_set, closed_set, etc.)
@@ -258,10 +334,11 @@ class ComparadorAlgoritmos:
             sucesso = "✓" if r.sucesso else "✗"
             custo_str = f"{r.custo_solucao:.1f}" if r.custo_solucao != float('inf') else "INF"
             
+            nos_str = str(r.nos_expandidos) if r.instrumentado else f"~{r.nos_expandidos}"
             linhas.append(
                 f"{r.nome_algoritmo:<15} "
                 f"{r.tempo_execucao_ms:<12.3f} "
-                f"{r.nos_expandidos:<8} "
+                f"{nos_str:<8} "
                 f"{custo_str:<10} "
                 f"{r.tamanho_caminho:<10} "
                 f"{r.memoria_pico_kb:<12.2f} "
@@ -269,6 +346,23 @@ class ComparadorAlgoritmos:
             )
         
         linhas.append("="*90)
+        if any(not r.instrumentado for r in self.resultados):
+            linhas.append("  ~ = nós estimados pelo tamanho do caminho (algoritmo sem estatisticas)")
+
+        # Esforço de procura medido
+        instrumentados = [r for r in self.resultados if r.instrumentado]
+        if instrumentados:
+            linhas.append("\nESFORÇO DE PROCURA:")
+            linhas.append("-"*90)
+            linhas.append(
+                f"{'Algoritmo':<15} {'Pops':<8} {'Pushes':<8} {'Relaxações':<12} "
+                f"{'Pico fronteira':<16} {'Pico fechados':<14}"
+            )
+            for r in instrumentados:
+                linhas.append(
+                    f"{r.nome_algoritmo:<15} {r.pops:<8} {r.pushes:<8} {r.relaxacoes:<12} "
+                    f"{r.pico_fronteira:<16} {r.pico_fechados:<14}"
+                )
         
         # Análise comparativa
         linhas.append("\nANÁLISE COMPARATIVA:")
@@ -348,5 +442,189 @@ class ComparadorAlgoritmos:
             linhas.append("")
         
         return "\n".join(linhas)
-    
-    
\ No newline at end of file
+
+    # ==========================================================
+    # Modo benchmark
+    # ==========================================================
+
+    @staticmethod
+    def fixar_cpu(cpus: Sequence[int]) -> bool:
+        """
+        Fixa o processo nos CPUs indicados (reduz ruído de migração entre núcleos).
+
+        Returns:
+            False se o sistema não suportar afinidade (ex: macOS/Windows)
+        """
+        if not hasattr(os, "sched_setaffinity"):
+            return False
+        try:
+            os.sched_setaffinity(0, set(cpus))
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _percentis(tempos: List[float]) -> Tuple[float, float, float]:
+        """(mediana, p95, IQR) de uma amostra de tempos."""
+        if len(tempos) == 1:
+            return tempos[0], tempos[0], 0.0
+        centis = statistics.quantiles(tempos, n=100, method="inclusive")
+        quartis = statistics.quantiles(tempos, n=4, method="inclusive")
+        return statistics.median(tempos), centis[94], quartis[2] - quartis[0]
+
+    def _cronometrar(self, nome: str, funcao_busca: Callable, cenario: CenarioTeste,
+                     repeticoes: int, sem_gc: bool) -> Tuple[List[float], object]:
+        tempos = []
+        resultado = None
+        gc_ativo = gc.isenabled()
+        if sem_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            for _ in range(repeticoes):
+                inicio = time.perf_counter_ns()
+                resultado = self._executar(nome, funcao_busca, cenario)
+                tempos.append((time.perf_counter_ns() - inicio) / 1e6)
+        finally:
+            if sem_gc and gc_ativo:
+                gc.enable()
+        return tempos, resultado
+
+    def benchmark_algoritmo(self, nome: str, funcao_busca: Callable, cenario: CenarioTeste,
+                            aquecimento: int = 3, repeticoes: int = 30,
+                            variante_sem_gc: bool = True) -> ResultadoBenchmark:
+        """
+        Executa o algoritmo várias vezes e resume a distribuição de tempos.
+
+        Args:
+            aquecimento: Execuções descartadas (caches, alocações iniciais)
+            repeticoes: Execuções cronometradas
+            variante_sem_gc: Se True, repete as medições com o garbage collector desligado
+        """
+        for _ in range(aquecimento):
+            self._executar(nome, funcao_busca, cenario)
+
+        tempos, resultado = self._cronometrar(nome, funcao_busca, cenario, repeticoes, sem_gc=False)
+        mediana, p95, iqr = self._percentis(tempos)
+
+        mediana_sem_gc = p95_sem_gc = 0.0
+        if variante_sem_gc:
+            tempos_sem_gc, _ = self._cronometrar(nome, funcao_busca, cenario, repeticoes, sem_gc=True)
+            mediana_sem_gc, p95_sem_gc, _ = self._percentis(tempos_sem_gc)
+
+        if isinstance(resultado, tuple):
+            custo, caminho = resultado
+        else:
+            caminho = resultado
+            custo = self.calcular_custo_caminho(caminho) if caminho else float('inf')
+
+        return ResultadoBenchmark(
+            nome_algoritmo=nome,
+            cenario=cenario.nome,
+            repeticoes=repeticoes,
+            mediana_ms=round(mediana, 4),
+            p95_ms=round(p95, 4),
+            iqr_ms=round(iqr, 4),
+            minimo_ms=round(min(tempos), 4),
+            mediana_sem_gc_ms=round(mediana_sem_gc, 4),
+            p95_sem_gc_ms=round(p95_sem_gc, 4),
+            custo_solucao=round(custo, 2),
+            sucesso=bool(caminho) and custo != float('inf')
+        )
+
+    def benchmark_matriz(self, algoritmos: Dict[str, Callable], cenarios: List[CenarioTeste],
+                         **opcoes) -> List[ResultadoBenchmark]:
+        """Benchmark de todos os algoritmos em todos os cenários (opções de benchmark_algoritmo)."""
+        return [
+            self.benchmark_algoritmo(nome, funcao, cenario, **opcoes)
+            for cenario in cenarios
+            for nome, funcao in algoritmos.items()
+        ]
+
+    @staticmethod
+    def guardar_benchmark(resultados: List[ResultadoBenchmark], caminho: str):
+        """Guarda os resultados (e o ambiente onde foram medidos) em JSON."""
+        afinidade = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+        dados = {
+            "ambiente": {
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "cpus": afinidade,
+            },
+            "resultados": [asdict(r) for r in resultados],
+        }
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def carregar_benchmark(caminho: str) -> List[ResultadoBenchmark]:
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+        return [ResultadoBenchmark(**r) for r in dados["resultados"]]
+
+    @staticmethod
+    def comparar_com_baseline(resultados: List[ResultadoBenchmark], baseline: List[ResultadoBenchmark],
+                              limiar: float = 0.10) -> List[dict]:
+        """
+        Compara medianas com uma execução guardada.
+
+        Args:
+            limiar: Aumento relativo da mediana a partir do qual é regressão (0.10 = 10%)
+
+        Returns:
+            Lista de regressões: {cenario, algoritmo, baseline_ms, atual_ms, variacao}
+        """
+        referencia = {r.chave(): r for r in baseline}
+        regressoes = []
+        for r in resultados:
+            base = referencia.get(r.chave())
+            if base is None or base.mediana_ms <= 0:
+                continue
+            variacao = (r.mediana_ms - base.mediana_ms) / base.mediana_ms
+            if variacao > limiar:
+                regressoes.append({
+                    "cenario": r.cenario,
+                    "algoritmo": r.nome_algoritmo,
+                    "baseline_ms": base.mediana_ms,
+                    "atual_ms": r.mediana_ms,
+                    "variacao": round(variacao, 3),
+                })
+        return regressoes
+
+    @staticmethod
+    def gerar_relatorio_benchmark(resultados: List[ResultadoBenchmark],
+                                  regressoes: Optional[List[dict]] = None) -> str:
+        """Tabela de medianas/p95/IQR por cenário, com regressões assinaladas."""
+        assinaladas = {(r["cenario"], r["algoritmo"]) for r in (regressoes or [])}
+
+        linhas = []
+        linhas.append("\n" + "="*100)
+        linhas.append("BENCHMARK DE ALGORITMOS DE PROCURA")
+        linhas.append("="*100)
+        linhas.append(
+            f"{'Cenário':<22} {'Algoritmo':<14} {'Mediana (ms)':<13} {'p95 (ms)':<10} "
+            f"{'IQR (ms)':<10} {'Sem GC (ms)':<12} {'Custo':<8} {'':<3}"
+        )
+        linhas.append("-"*100)
+
+        for r in resultados:
+            custo_str = f"{r.custo_solucao:.1f}" if r.sucesso else "INF"
+            marca = "⚠️" if r.chave() in assinaladas else ""
+            linhas.append(
+                f"{r.cenario:<22} {r.nome_algoritmo:<14} {r.mediana_ms:<13.4f} {r.p95_ms:<10.4f} "
+                f"{r.iqr_ms:<10.4f} {r.mediana_sem_gc_ms:<12.4f} {custo_str:<8} {marca:<3}"
+            )
+
+        linhas.append("="*100)
+        if regressoes:
+            linhas.append("\nREGRESSÕES:")
+            for reg in regressoes:
+                linhas.append(
+                    f"  {reg['cenario']} / {reg['algoritmo']}: {reg['baseline_ms']:.4f} → "
+                    f"{reg['atual_ms']:.4f} ms (+{reg['variacao'] * 100:.1f}%)"
+                )
+        elif regressoes is not None:
+            linhas.append("\nSem regressões face ao baseline.")
+
+        linhas.append("")
+        return "\n".join(linhas)
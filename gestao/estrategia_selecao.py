@@ -1,18 +1,30 @@
 """
 Padrão Strategy para seleção de veículos.
 Permite trocar critérios de seleção facilmente sem modificar GestorFrota.
+
+As estratégias de score (EstrategiaScore: menor distância, custo composto,
+dead mileage, equilibrada) têm um modo com poda (podar=True): os candidatos são avaliados por
+ordem crescente de um limite inferior do score (GestorFrota.limite_inferior_rota)
+e deixa de se calcular a rota exata de um veículo assim que o seu limite excede
+o melhor score já encontrado. A escolha é a mesma da avaliação completa.
 """
 
+import math
 from abc import ABC, abstractmethod
-from typing import List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from modelo.pedidos import Pedido
 from modelo.veiculos import Veiculo
 
 if TYPE_CHECKING:
     from gestao.gestor_frota import GestorFrota
 
+# (viavel, caminho, custo_tempo, distancia), como em GestorFrota.verificar_viabilidade_rota
+RotaPickup = Tuple[bool, List[str], float, float]
+
 class EstrategiaSelecao(ABC):
     """Interface base para estratégias de seleção de veículos."""
+
+    podar = False  # só as estratégias de score (EstrategiaScore) têm modo com poda
     
     @abstractmethod
     def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
@@ -25,203 +37,298 @@ class EstrategiaSelecao(ABC):
         pass
 
 
-class SelecaoMenorDistancia(EstrategiaSelecao):
+class EstrategiaScore(EstrategiaSelecao):
+    """
+    Base das estratégias que escolhem o candidato de menor score. As subclasses
+    definem _avaliar e, para o modo com poda, _limite_inferior.
+    """
+
+    def __init__(self, podar: bool = False):
+        self.podar = podar
+        # Candidatos avaliados/podados no modo com poda. Com algoritmos não ótimos cada um é
+        # uma procura de rota até ao pickup; com os ótimos as rotas saem de uma só procura
+        # e o que se evita é a avaliação do score
+        self.procuras_efetuadas = 0
+        self.procuras_evitadas = 0
+
+    def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+        return self._selecionar_menor_score(pedido, candidatos, gestor, tempo_atual)
+
+    # ==========================================================
+    # Seleção pelo menor score (com ou sem poda)
+    # ==========================================================
+
+    @abstractmethod
+    def _avaliar(self, pedido: Pedido, veiculo: Veiculo, rota_pickup: RotaPickup,
+                 gestor: 'GestorFrota', tempo_atual: int) -> Optional[float]:
+        """Score do veículo (menor é melhor), ou None se não puder servir o pedido."""
+
+    def _limite_inferior(self, pedido: Pedido, veiculo: Veiculo, tempo_min: float, km_min: float,
+                         dist_viagem: float, tempo_atual: int) -> float:
+        """
+        Limite inferior do score, dado que a rota até ao pickup demora pelo menos
+        tempo_min e tem pelo menos km_min. Por omissão não poda nada.
+        """
+        return -math.inf
+
+    def _selecionar_menor_score(self, pedido: Pedido, candidatos: List[Veiculo],
+                                gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+        """Veículo de menor score; em empate, o primeiro da lista de candidatos."""
+        if self.podar and candidatos:
+            return self._selecionar_com_poda(pedido, candidatos, gestor, tempo_atual)
+
+        melhor_veiculo = None
+        menor_score = float('inf')
+
+        # Rotas de todos os candidatos até ao pickup (uma só procura, se possível)
+        rotas_pickup = gestor.verificar_viabilidade_rotas_ate(candidatos, pedido.posicao_inicial)
+
+        for veiculo in candidatos:
+            score = self._avaliar(pedido, veiculo, rotas_pickup[veiculo.id_veiculo], gestor, tempo_atual)
+            if score is not None and score < menor_score:
+                menor_score = score
+                melhor_veiculo = veiculo
+
+        return melhor_veiculo
+
+    def _selecionar_com_poda(self, pedido: Pedido, candidatos: List[Veiculo],
+                             gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+        """
+        Branch-and-bound sobre os candidatos.
+
+        O limite inferior é monótono nas distâncias/tempos (custos por km não
+        negativos), por isso nenhum veículo podado podia ter score menor do que o
+        escolhido. Os empates desfazem-se pela posição na lista, como na avaliação
+        completa.
+        """
+        from gestao.gestor_frota import ALGORITMOS_OTIMOS
+
+        pickup = pedido.posicao_inicial
+
+        # A viagem pickup → destino é igual para todos (CacheRotas); calcula-se com o
+        # primeiro candidato, como acontece na avaliação completa
+        _, _, _, dist_viagem = gestor.verificar_viabilidade_rota(candidatos[0], pickup, pedido.posicao_destino)
+
+        ordem = []
+        for i, veiculo in enumerate(candidatos):
+            tempo_min, km_min = gestor.limite_inferior_rota(veiculo.posicao, pickup)
+            limite = self._limite_inferior(pedido, veiculo, tempo_min, km_min, dist_viagem, tempo_atual)
+            ordem.append((limite, i, veiculo))
+        ordem.sort(key=lambda e: (e[0], e[1]))
+
+        # Com algoritmos ótimos as rotas até ao pickup saem de uma só procura
+        rotas_pickup: Optional[Dict[str, RotaPickup]] = None
+        if gestor.algoritmo_procura in ALGORITMOS_OTIMOS:
+            rotas_pickup = gestor.verificar_viabilidade_rotas_ate(candidatos, pickup)
+
+        melhor_veiculo = None
+        menor_score = float('inf')
+        indice_melhor = -1
+
+        for posicao, (limite, i, veiculo) in enumerate(ordem):
+            # Folga relativa para arredondamentos no cálculo dos scores
+            if limite > menor_score + 1e-9 * (1 + abs(menor_score)):
+                self.procuras_evitadas += len(ordem) - posicao
+                break
+
+            if rotas_pickup is not None:
+                rota_pickup = rotas_pickup[veiculo.id_veiculo]
+            else:
+                rota_pickup = gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, pickup)
+            self.procuras_efetuadas += 1
+
+            score = self._avaliar(pedido, veiculo, rota_pickup, gestor, tempo_atual)
+            if score is not None and (score < menor_score or (score == menor_score and i < indice_melhor)):
+                menor_score = score
+                melhor_veiculo = veiculo
+                indice_melhor = i
+
+        return melhor_veiculo
+
+    def estatisticas_poda(self) -> dict:
+        """Candidatos avaliados e podados no modo com poda."""
+        total = self.procuras_efetuadas + self.procuras_evitadas
+        taxa_poda = (self.procuras_evitadas / total * 100) if total > 0 else 0
+
+        return {
+            "procuras_efetuadas": self.procuras_efetuadas,
+            "procuras_evitadas": self.procuras_evitadas,
+            "taxa_poda": round(taxa_poda, 1)
+        }
+
+
+class SelecaoMenorDistancia(EstrategiaScore):
     """
     Estratégia simples: seleciona veículo mais próximo.
     Critério: menor tempo até origem do pedido.
     """
     
-    def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+    def _avaliar(self, pedido, veiculo, rota_pickup, gestor, tempo_atual):
+        # Verifica viabilidade
+        viavel, caminho, custo, distancia = rota_pickup
         
-        melhor_veiculo = None
-        menor_custo = float('inf')
+        if not viavel:
+            return None
         
-        for veiculo in candidatos:
-            # Verifica viabilidade
-            viavel, caminho, custo, distancia = gestor.verificar_viabilidade_rota(
-                veiculo, veiculo.posicao, pedido.posicao_inicial
-            )
-            
-            if not viavel:
-                continue
-            
-            # Verifica autonomia para viagem completa
-            _, caminho_viagem, _, dist_viagem = gestor.verificar_viabilidade_rota(
-                veiculo, pedido.posicao_inicial, pedido.posicao_destino
-            )
-            
-            if not veiculo.consegue_percorrer(distancia + dist_viagem):
-                continue
-            
-            if custo < menor_custo:
-                menor_custo = custo
-                melhor_veiculo = veiculo
+        # Verifica autonomia para viagem completa
+        _, caminho_viagem, _, dist_viagem = gestor.verificar_viabilidade_rota(
+            veiculo, pedido.posicao_inicial, pedido.posicao_destino
+        )
         
-        return melhor_veiculo
+        if not veiculo.consegue_percorrer(distancia + dist_viagem):
+            return None
+        
+        return custo
 
+    def _limite_inferior(self, pedido, veiculo, tempo_min, km_min, dist_viagem, tempo_atual):
+        return tempo_min
 
-class SelecaoCustoComposto(EstrategiaSelecao):
+
+class SelecaoCustoComposto(EstrategiaScore):
     """
     Estratégia avançada: considera múltiplos objetivos.
     Usa função de custo composta (tempo, custo operacional, emissões).
+
+    A poda assume que a função de custo não diminui quando o tempo de resposta
+    ou a distância aumentam (é o caso de FuncaoCustoComposta).
     """
     
-    def __init__(self, funcao_custo):
+    def __init__(self, funcao_custo, podar: bool = False):
+        super().__init__(podar)
         self.funcao_custo = funcao_custo
     
-    def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+    def _avaliar(self, pedido, veiculo, rota_pickup, gestor, tempo_atual):
+        # Rota até pickup
+        viavel_pickup, caminho_pickup, custo_pickup, dist_pickup = rota_pickup
         
-        melhor_veiculo = None
-        menor_custo_composto = float('inf')
+        if not viavel_pickup:
+            return None
         
-        for veiculo in candidatos:
-            # Rota até pickup
-            viavel_pickup, caminho_pickup, custo_pickup, dist_pickup = \
-                gestor.verificar_viabilidade_rota(
-                    veiculo, veiculo.posicao, pedido.posicao_inicial
-                )
-            
-            if not viavel_pickup:
-                continue
-            
-            # Rota da viagem
-            viavel_viagem, caminho_viagem, custo_viagem, dist_viagem = \
-                gestor.verificar_viabilidade_rota(
-                    veiculo, pedido.posicao_inicial, pedido.posicao_destino
-                )
-            
-            if not viavel_viagem:
-                continue
-            
-            # Verifica autonomia total
-            distancia_total = dist_pickup + dist_viagem
-            if not veiculo.consegue_percorrer(distancia_total):
-                continue
-            
-            # Calcula tempo de resposta
-            tempo_resposta = tempo_atual - pedido.instante_pedido + custo_pickup
-            
-            # Calcula custo composto
-            custo_composto = self.funcao_custo.calcular_custo_atribuicao(
-                veiculo, pedido, tempo_resposta, distancia_total
+        # Rota da viagem
+        viavel_viagem, caminho_viagem, custo_viagem, dist_viagem = \
+            gestor.verificar_viabilidade_rota(
+                veiculo, pedido.posicao_inicial, pedido.posicao_destino
             )
-            
-            if custo_composto < menor_custo_composto:
-                menor_custo_composto = custo_composto
-                melhor_veiculo = veiculo
         
-        return melhor_veiculo
+        if not viavel_viagem:
+            return None
+        
+        # Verifica autonomia total
+        distancia_total = dist_pickup + dist_viagem
+        if not veiculo.consegue_percorrer(distancia_total):
+            return None
+        
+        # Calcula tempo de resposta
+        tempo_resposta = tempo_atual - pedido.instante_pedido + custo_pickup
+        
+        # Calcula custo composto
+        return self.funcao_custo.calcular_custo_atribuicao(
+            veiculo, pedido, tempo_resposta, distancia_total
+        )
+
+    def _limite_inferior(self, pedido, veiculo, tempo_min, km_min, dist_viagem, tempo_atual):
+        return self.funcao_custo.calcular_custo_atribuicao(
+            veiculo, pedido, tempo_atual - pedido.instante_pedido + tempo_min, km_min + dist_viagem
+        )
 
 
-class SelecaoDeadMileage(EstrategiaSelecao):
+class SelecaoDeadMileage(EstrategiaScore):
     """
     Estratégia focada em minimizar km sem passageiros.
     Penaliza veículos distantes do pedido.
     """
     
-    def __init__(self, penalizacao: float = 2.0):
+    def __init__(self, penalizacao: float = 2.0, podar: bool = False):
         """
         Args:
             penalizacao: Fator de penalização para dead mileage (default: 2x)
         """
+        super().__init__(podar)
         self.penalizacao = penalizacao
     
-    def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+    def _avaliar(self, pedido, veiculo, rota_pickup, gestor, tempo_atual):
+        # Distância até pickup (DEAD MILEAGE)
+        viavel_pickup, _, custo_pickup, dist_pickup = rota_pickup
         
-        melhor_veiculo = None
-        menor_custo_ponderado = float('inf')
+        if not viavel_pickup:
+            return None
         
-        for veiculo in candidatos:
-            # Distância até pickup (DEAD MILEAGE)
-            viavel_pickup, _, custo_pickup, dist_pickup = \
-                gestor.verificar_viabilidade_rota(
-                    veiculo, veiculo.posicao, pedido.posicao_inicial
-                )
-            
-            if not viavel_pickup:
-                continue
-            
-            # Distância da viagem (ÚTIL)
-            viavel_viagem, _, custo_viagem, dist_viagem = \
-                gestor.verificar_viabilidade_rota(
-                    veiculo, pedido.posicao_inicial, pedido.posicao_destino
-                )
-            
-            if not viavel_viagem:
-                continue
-            
-            # Verifica autonomia
-            if not veiculo.consegue_percorrer(dist_pickup + dist_viagem):
-                continue
-            
-            # Custo ponderado: PENALIZA dead mileage
-            custo_dead = dist_pickup * self.penalizacao  # 2x penalização
-            custo_util = dist_viagem * 1.0               # Normal
-            custo_ponderado = custo_dead + custo_util
-            
-            if custo_ponderado < menor_custo_ponderado:
-                menor_custo_ponderado = custo_ponderado
-                melhor_veiculo = veiculo
+        # Distância da viagem (ÚTIL)
+        viavel_viagem, _, custo_viagem, dist_viagem = \
+            gestor.verificar_viabilidade_rota(
+                veiculo, pedido.posicao_inicial, pedido.posicao_destino
+            )
         
-        return melhor_veiculo
+        if not viavel_viagem:
+            return None
+        
+        # Verifica autonomia
+        if not veiculo.consegue_percorrer(dist_pickup + dist_viagem):
+            return None
+        
+        # Custo ponderado: PENALIZA dead mileage
+        custo_dead = dist_pickup * self.penalizacao  # 2x penalização
+        custo_util = dist_viagem * 1.0               # Normal
+        return custo_dead + custo_util
 
+    def _limite_inferior(self, pedido, veiculo, tempo_min, km_min, dist_viagem, tempo_atual):
+        if self.penalizacao < 0:
+            return -math.inf
+        return km_min * self.penalizacao + dist_viagem * 1.0
 
-class SelecaoEquilibrada(EstrategiaSelecao):
+
+class SelecaoEquilibrada(EstrategiaScore):
     """
     Estratégia híbrida: equilibra distância, custo e sustentabilidade.
     Boa opção padrão para uso geral.
     """
+
+    # Normalização
+    MAX_DIST = 50.0  # km
+    MAX_CUSTO = 50.0  # €
+    MAX_EMISSAO = 5.0  # kg CO2
     
-    def __init__(self, peso_distancia: float = 0.5, peso_custo: float = 0.3, peso_emissao: float = 0.2):
+    def __init__(self, peso_distancia: float = 0.5, peso_custo: float = 0.3, peso_emissao: float = 0.2,
+                 podar: bool = False):
+        super().__init__(podar)
         self.peso_distancia = peso_distancia
         self.peso_custo = peso_custo
         self.peso_emissao = peso_emissao
     
-    def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
+    def _score(self, veiculo: Veiculo, distancia: float, dist_total: float) -> float:
+        # Métricas normalizadas
+        score_distancia = (distancia / self.MAX_DIST)
+        score_custo = (veiculo.custo_operacao(dist_total) / self.MAX_CUSTO)
+        score_emissao = (veiculo.calcula_emissao(dist_total) / self.MAX_EMISSAO)
         
-        melhor_veiculo = None
-        menor_score = float('inf')
+        # Score ponderado
+        return (
+            self.peso_distancia * score_distancia +
+            self.peso_custo * score_custo +
+            self.peso_emissao * score_emissao
+        )
+
+    def _avaliar(self, pedido, veiculo, rota_pickup, gestor, tempo_atual):
+        viavel, caminho, custo_tempo, distancia = rota_pickup
         
-        # Normalização
-        MAX_DIST = 50.0  # km
-        MAX_CUSTO = 50.0  # €
-        MAX_EMISSAO = 5.0  # kg CO2
+        if not viavel:
+            return None
         
-        for veiculo in candidatos:
-            viavel, caminho, custo_tempo, distancia = \
-                gestor.verificar_viabilidade_rota(
-                    veiculo, veiculo.posicao, pedido.posicao_inicial
-                )
-            
-            if not viavel:
-                continue
-            
-            # Viagem completa
-            _, _, _, dist_viagem = gestor.verificar_viabilidade_rota(
-                veiculo, pedido.posicao_inicial, pedido.posicao_destino
-            )
-            
-            dist_total = distancia + dist_viagem
-            if not veiculo.consegue_percorrer(dist_total):
-                continue
-            
-            # Métricas normalizadas
-            score_distancia = (distancia / MAX_DIST)
-            score_custo = (veiculo.custo_operacao(dist_total) / MAX_CUSTO)
-            score_emissao = (veiculo.calcula_emissao(dist_total) / MAX_EMISSAO)
-            
-            # Score ponderado
-            score = (
-                self.peso_distancia * score_distancia +
-                self.peso_custo * score_custo +
-                self.peso_emissao * score_emissao
-            )
-            
-            if score < menor_score:
-                menor_score = score
-                melhor_veiculo = veiculo
+        # Viagem completa
+        _, _, _, dist_viagem = gestor.verificar_viabilidade_rota(
+            veiculo, pedido.posicao_inicial, pedido.posicao_destino
+        )
         
-        return melhor_veiculo
+        dist_total = distancia + dist_viagem
+        if not veiculo.consegue_percorrer(dist_total):
+            return None
+        
+        return self._score(veiculo, distancia, dist_total)
+
+    def _limite_inferior(self, pedido, veiculo, tempo_min, km_min, dist_viagem, tempo_atual):
+        if min(self.peso_distancia, self.peso_custo, self.peso_emissao) < 0:
+            return -math.inf
+        return self._score(veiculo, km_min, km_min + dist_viagem)
 
 
 class SelecaoPriorizarEletricos(EstrategiaSelecao):
@@ -236,6 +343,14 @@ class SelecaoPriorizarEletricos(EstrategiaSelecao):
             estrategia_base: Estratégia a usar após filtrar por tipo
         """
         self.estrategia_base = estrategia_base or SelecaoMenorDistancia()
+
+    @property
+    def podar(self) -> bool:
+        """A poda é a da estratégia base (usada em cada grupo de veículos)."""
+        return self.estrategia_base.podar
+
+    def estatisticas_poda(self) -> dict:
+        return self.estrategia_base.estatisticas_poda()
     
     def selecionar(self, pedido: Pedido, candidatos: List[Veiculo], gestor: 'GestorFrota', tempo_atual: int) -> Optional[Veiculo]:
         
@@ -7,20 +7,37 @@ Responsabilidades:
 - Atribuição de veículos (delega às estratégias)
 """
 from __future__ import annotations
+import math
 from typing import Dict, List, Optional, Tuple
 from modelo.veiculos import Veiculo, EstadoVeiculo
 from modelo.pedidos import Pedido, EstadoPedido
 from modelo.grafo import Grafo, TipoNo
+from modelo.indice_espacial import IndiceEspacial, IndiceVeiculos
 from gestao.metricas import Metricas
-from gestao.cache_distancias import CacheDistancias, CacheRotas
+from gestao.cache_distancias import CacheArvores, CacheDistancias, CachePersistente, CacheRotas, impressao_transito
 from gestao.estrategia_selecao import (EstrategiaSelecao, SelecaoMenorDistancia, SelecaoCustoComposto)
 from gestao.reposicionamento import reposicionar_veiculo_proativo
+from gestao.matriz_tempos import ServicoMatrizTempos
 
 from gestao.algoritmos_procura.a_estrela import a_star_search
+from gestao.algoritmos_procura.a_estrela_td import PerfilTransito, a_star_tempo_dependente
 from gestao.algoritmos_procura.ucs import uniform_cost_search
 from gestao.algoritmos_procura.bfs import bfs
 from gestao.algoritmos_procura.dfs import dfs
 from gestao.algoritmos_procura.greedy import greedy
+from gestao.algoritmos_procura.bidirecional import bidirectional_search
+from gestao.algoritmos_procura.landmarks import Landmarks
+from gestao.algoritmos_procura.hierarquia_contracao import HierarquiaContracao
+from gestao.algoritmos_procura.um_para_muitos import dijkstra_um_para_muitos
+from gestao.algoritmos_procura.recarga import procura_com_recarga_paragens
+
+
+# Algoritmos que devolvem sempre o caminho de menor tempo: para estes, uma procura
+# um-para-muitos dá exatamente os mesmos custos que várias procuras individuais.
+ALGORITMOS_OTIMOS = ("ucs", "alt", "bidirecional", "ch")
+
+# Menor factor de congestionamento aplicado pelo GestorTransito (madrugada)
+FACTOR_MINIMO_TRANSITO = 0.8
 
 
 class GestorFrota:
@@ -32,9 +49,31 @@ class GestorFrota:
         self.pedidos_concluidos: List[Pedido] = []
         self.metricas = Metricas()
         self.algoritmo_procura = "astar"
-        
+        self.landmarks: Optional[Landmarks] = None  # tabelas ALT (criadas ao escolher "alt")
+        self.hierarquia: Optional[HierarquiaContracao] = None  # CH (criada ao escolher "ch")
+        self.servico_matriz: Optional[ServicoMatrizTempos] = None  # matrizes de tempos (opcional)
+        self.cache_arvores: Optional[CacheArvores] = None  # árvores de caminhos mínimos (opcional)
+        self.cache_persistente: Optional[CachePersistente] = None  # rotas em disco entre execuções (opcional)
+        self.perfil_transito: Optional[PerfilTransito] = None  # factores por hora (para "astar_td")
+        self._fatores_limite: Optional[Tuple[int, float, float]] = None  # (nº nós, min/km, km/km)
+        
+        self.indice_espacial = IndiceEspacial(grafo)
+        self.indice_veiculos = IndiceVeiculos(self.indice_espacial)
+        # Máximo de veículos próximos avaliados por pedido (None = todos)
+        self.limite_candidatos: Optional[int] = None
+        self.alargar_candidatos = True
         self.cache_distancias = CacheDistancias(grafo)
-        self.cache_rotas = CacheRotas(validade_minutos=10)
+        # Válidas enquanto o regime de trânsito não mudar (sem expiração por idade)
+        self.cache_rotas = CacheRotas(validade_minutos=None, grafo=grafo)
+        # Pré-aquecimento da hora seguinte: ((hora, época, algoritmo), grafo da hora, regime, origens por tratar)
+        self._aquecimento: Optional[Tuple[Tuple[int, int, str], Grafo, str, List[Tuple[str, List[str]]]]] = None
+
+        # Memo de rotas de um ciclo de atribuição (ver iniciar_ciclo_atribuicao)
+        self._memo_rotas: Optional[Dict[Tuple[str, str, str], Tuple[List[str], float, float]]] = None
+        self._memo_epoca = 0
+        self._memo_hits = 0
+        self._memo_misses = 0
+        self.procuras_rota = 0  # procuras efetivamente feitas (falhas de cache/memo)
         
         # Estratégia de seleção (padrão: menor distância)
         self.estrategia_selecao = estrategia_selecao or SelecaoMenorDistancia()
@@ -56,12 +95,79 @@ class GestorFrota:
     # ==========================================================
 
     def definir_algoritmo_procura(self, nome: str):
-        """Escolhe qual algoritmo de procura usar: astar, ucs, bfs ou dfs"""
-        if nome.lower() in ("astar", "greedy", "ucs", "bfs", "dfs"):
+        """Escolhe qual algoritmo de procura usar: astar, astar_td, alt, greedy, ucs, bidirecional, ch, bfs ou dfs"""
+        if nome.lower() in ("astar", "astar_td", "alt", "greedy", "ucs", "bidirecional", "ch", "bfs", "dfs"):
             self.algoritmo_procura = nome.lower()
+            if self.algoritmo_procura == "alt" and self.landmarks is None:
+                self.preparar_landmarks()
+            if self.algoritmo_procura == "ch" and self.hierarquia is None:
+                self.hierarquia = HierarquiaContracao(self.grafo)
         else:
-            raise ValueError("Algoritmo desconhecido. Use: astar, greedy, ucs, bfs ou dfs.")
+            raise ValueError("Algoritmo desconhecido. Use: astar, astar_td, alt, greedy, ucs, bidirecional, ch, bfs ou dfs.")
+
+    def preparar_landmarks(self, landmarks: List[str] = None, num_landmarks: int = 4):
+        """
+        Pré-calcula as tabelas ALT. Só é preciso repetir se a estrutura do grafo mudar:
+        alterações de trânsito e bloqueios mantêm a heurística admissível.
+        """
+        self.landmarks = Landmarks(self.grafo, landmarks=landmarks, num_landmarks=num_landmarks)
     
+    def definir_perfil_transito(self, transito):
+        """
+        Pré-calcula a tabela (aresta, hora) → factor do GestorTransito, usada
+        pelo modo "astar_td" para avaliar cada aresta à hora de chegada.
+        """
+        self.perfil_transito = PerfilTransito(transito)
+
+    def ativar_matriz_tempos(self) -> ServicoMatrizTempos:
+        """Cria (uma vez) o serviço de matrizes de tempos usado no reposicionamento."""
+        if self.servico_matriz is None:
+            self.servico_matriz = ServicoMatrizTempos(self.grafo)
+        return self.servico_matriz
+
+    def ativar_cache_arvores(self, max_bytes: int = 64 * 1024 * 1024) -> CacheArvores:
+        """
+        Passa a responder às rotas dos algoritmos ótimos a partir de árvores de
+        caminhos mínimos completas (uma procura por origem/pickup, reutilizada).
+        """
+        if self.cache_arvores is None:
+            self.cache_arvores = CacheArvores(self.grafo, max_bytes=max_bytes)
+        return self.cache_arvores
+
+    def ativar_cache_persistente(self, caminho: str, tamanho_lote: int = 500) -> CachePersistente:
+        """
+        Passa a guardar as rotas calculadas num ficheiro SQLite, partilhado por
+        execuções sobre a mesma cidade (ex: Monte Carlo, varrimentos de parâmetros).
+        Carrega logo as rotas do algoritmo atual no trânsito atual.
+        """
+        if self.cache_persistente is None:
+            self.cache_persistente = CachePersistente(caminho, self.grafo, tamanho_lote=tamanho_lote)
+            self.cache_persistente.aquecer(self.algoritmo_procura)
+        return self.cache_persistente
+
+    def gravar_cache_persistente(self):
+        """Escreve em disco as rotas ainda pendentes (fim da simulação)."""
+        if self.cache_persistente is not None:
+            self.cache_persistente.gravar()
+
+    def usar_tabela_partilhada(self, tabela):
+        """
+        Liga a CacheRotas a uma cache_partilhada.TabelaRotasPartilhada, para
+        reutilizar as rotas calculadas por outros processos do mesmo pool.
+        """
+        tabela.associar(self.grafo)
+        self.cache_rotas.partilhada = tabela
+
+    def definir_limite_candidatos(self, k: Optional[int], alargar: bool = True):
+        """
+        Limita a seleção aos k veículos compatíveis mais próximos do pickup.
+        Com alargar=True, se nenhum dos k servir, avalia os seguintes (2k, 4k, ...).
+        """
+        if k is not None and k <= 0:
+            raise ValueError("limite de candidatos deve ser > 0")
+        self.limite_candidatos = k
+        self.alargar_candidatos = alargar
+
     def definir_estrategia_selecao(self, estrategia: EstrategiaSelecao):
         """Troca estratégia de seleção de veículos."""
         self.estrategia_selecao = estrategia
@@ -70,6 +176,38 @@ class GestorFrota:
     # CÁLCULO DE ROTAS (OTIMIZADO)
     # ==========================================================
 
+    def iniciar_ciclo_atribuicao(self):
+        """
+        Ativa o memo de rotas para um ciclo de atribuição (um tick do simulador).
+
+        Dentro do ciclo cada troço (origem, destino) é calculado uma só vez e
+        partilhado pelas estratégias, por todos os candidatos e por atribuir_pedido.
+        O memo é descartado se o trânsito mudar (grafo.epoca_transito) e no fim do ciclo.
+        """
+        self._memo_rotas = {}
+        self._memo_epoca = self.grafo.epoca_transito
+
+    def terminar_ciclo_atribuicao(self):
+        self._memo_rotas = None
+
+    def _consultar_memo(self, origem: str, destino: str) -> Optional[Tuple[List[str], float, float]]:
+        if self._memo_rotas is None:
+            return None
+        if self._memo_epoca != self.grafo.epoca_transito:
+            self._memo_rotas.clear()
+            self._memo_epoca = self.grafo.epoca_transito
+
+        rota = self._memo_rotas.get((origem, destino, self.algoritmo_procura))
+        if rota is None:
+            self._memo_misses += 1
+        else:
+            self._memo_hits += 1
+        return rota
+
+    def _guardar_memo(self, origem: str, destino: str, caminho: List[str], custo: float, distancia: float):
+        if self._memo_rotas is not None:
+            self._memo_rotas[(origem, destino, self.algoritmo_procura)] = (caminho, custo, distancia)
+
     def calcular_rota(self, origem: str, destino: str, 
                      veiculo: Veiculo = None, tempo_atual: int = 0) -> Tuple[List[str], float]:
         """
@@ -84,6 +222,15 @@ class GestorFrota:
         
         if origem not in self.grafo.nos or destino not in self.grafo.nos:
             return [], float('inf')
+
+        # Dependente do tempo: o custo depende do instante de partida, que a cache não distingue
+        if self.algoritmo_procura == "astar_td" and self.perfil_transito is not None:
+            self.procuras_rota += 1
+            partida = tempo_atual or self.perfil_transito.transito.minuto_atual
+            custo, caminho = a_star_tempo_dependente(self.perfil_transito, origem, destino, instante_partida=partida)
+            if caminho and custo != float('inf'):
+                return caminho, custo
+            return [], float('inf')
         
         # Tenta buscar no cache
         resultado_cache = self.cache_rotas.get_rota(
@@ -91,13 +238,42 @@ class GestorFrota:
         )
         if resultado_cache:
             return resultado_cache
+
+        if self.cache_persistente is not None:
+            rota = self.cache_persistente.get_rota(origem, destino, self.algoritmo_procura)
+            if rota is not None:
+                caminho, custo = rota
+                self.cache_rotas.armazenar_rota(origem, destino, self.algoritmo_procura, caminho, custo, tempo_atual)
+                return caminho, custo
         
+        # Árvores de caminhos mínimos (só algoritmos ótimos: dão os mesmos custos)
+        if self.cache_arvores is not None and self.algoritmo_procura in ALGORITMOS_OTIMOS:
+            procuras = self.cache_arvores.procuras
+            rota = self.cache_arvores.rota(origem, destino)
+            self.procuras_rota += self.cache_arvores.procuras - procuras
+            if rota is None:
+                return [], float('inf')
+            caminho, custo, _ = rota
+            self._armazenar_rota(origem, destino, caminho, custo, tempo_atual)
+            return caminho, custo
+
         # Cache miss - calcula rota
+        self.procuras_rota += 1
         try:
-            if self.algoritmo_procura == "astar":
+            if self.algoritmo_procura == "astar_td":
+                # Sem perfil horário (sem GestorTransito): só há o snapshot atual
+                custo, caminho = a_star_search(self.grafo, origem, destino, usar_heuristica_avancada=False)
+            elif self.algoritmo_procura == "astar":
                 custo, caminho = a_star_search(self.grafo, origem, destino, veiculo=veiculo, tempo_atual=tempo_atual, usar_heuristica_avancada=True)
+            elif self.algoritmo_procura == "alt":
+                custo, caminho = a_star_search(self.grafo, origem, destino, heuristica=self.landmarks.heuristica)
             elif self.algoritmo_procura == "ucs":
                 custo, caminho = uniform_cost_search(self.grafo, origem, destino)
+            elif self.algoritmo_procura == "bidirecional":
+                custo, caminho = bidirectional_search(self.grafo, origem, destino)
+            elif self.algoritmo_procura == "ch":
+                # Recustomiza sozinha se o trânsito mudou (epoca_transito)
+                custo, caminho = self.hierarquia.procurar(origem, destino)
             elif self.algoritmo_procura == "bfs":
                 caminho = bfs(self.grafo, origem, destino)
                 custo = self.calcular_custo_caminho(caminho) if caminho else float('inf')
@@ -110,11 +286,7 @@ class GestorFrota:
                 return [], float('inf')
             
             if caminho and custo != float('inf'):
-                # Armazena no cache
-                self.cache_rotas.armazenar_rota(
-                    origem, destino, self.algoritmo_procura, 
-                    caminho, custo, tempo_atual
-                )
+                self._armazenar_rota(origem, destino, caminho, custo, tempo_atual)
                 return caminho, custo
             
             return [], float('inf')
@@ -123,6 +295,87 @@ class GestorFrota:
             print(f"Erro ao calcular rota {origem}→{destino}: {e}")
             return [], float('inf')
 
+    def aquecer_proximo_regime(self, transito, tempo_atual: int, max_origens: int = 10) -> int:
+        """
+        Calcula, com os factores da hora seguinte, as rotas guardadas no regime
+        atual, para a CacheRotas já as ter quando a hora mudar. Pensado para ser
+        chamado a cada minuto nos últimos minutos da hora: cada chamada trata até
+        max_origens origens (as usadas mais recentemente primeiro), com uma
+        procura um-para-muitos por origem num grafo à parte.
+
+        Só para algoritmos ótimos, que dão os mesmos custos que a procura usada.
+        Retorna o nº de rotas calculadas nesta chamada.
+        """
+        if self.algoritmo_procura not in ALGORITMOS_OTIMOS:
+            return 0
+
+        hora = (transito.hora_inicial + tempo_atual // 60 + 1) % 24
+        chave = (hora, self.grafo.epoca_transito, self.algoritmo_procura)
+        if self._aquecimento is None or self._aquecimento[0] != chave:
+            grafo_hora = transito.grafo_na_hora(hora)
+            regime = impressao_transito(grafo_hora)
+            origens = []
+            if regime != self.cache_rotas.regime_atual():
+                # pop() tira do fim: a origem usada mais recentemente fica no fim
+                origens = list(self.cache_rotas.rotas_do_regime(self.algoritmo_procura).items())[::-1]
+            self._aquecimento = (chave, grafo_hora, regime, origens)
+
+        _, grafo_hora, regime, origens = self._aquecimento
+        calculadas = 0
+        for _ in range(min(max_origens, len(origens))):
+            origem, destinos = origens.pop()
+            self.procuras_rota += 1
+            for destino, (custo, _, caminho) in dijkstra_um_para_muitos(grafo_hora, origem, destinos).items():
+                self.cache_rotas.armazenar_rota(origem, destino, self.algoritmo_procura,
+                                                caminho, custo, tempo_atual, regime=regime)
+                calculadas += 1
+        return calculadas
+
+    def _armazenar_rota(self, origem: str, destino: str, caminho: List[str], custo: float, tempo_atual: int):
+        """Guarda uma rota calculada na cache em memória e, se ativa, na persistente."""
+        self.cache_rotas.armazenar_rota(origem, destino, self.algoritmo_procura, caminho, custo, tempo_atual)
+        if self.cache_persistente is not None:
+            self.cache_persistente.armazenar_rota(origem, destino, self.algoritmo_procura, caminho, custo)
+
+
+    def limite_inferior_rota(self, origem: str, destino: str) -> Tuple[float, float]:
+        """
+        Limites inferiores (tempo_min, distancia_km) de QUALQUER caminho entre dois nós,
+        sem fazer procura.
+
+        Cada aresta custa pelo menos fator × distância euclidiana entre os seus extremos
+        (fatores mínimos do grafo), logo, pela desigualdade triangular, um caminho
+        custa pelo menos fator × distância euclidiana entre origem e destino. Com
+        landmarks (ALT) o limite de tempo é o maior dos dois.
+        """
+        fatores = self._fatores_limite
+        if fatores is None or fatores[0] != len(self.grafo.nos):
+            fatores = self._fatores_limite = self._calcular_fatores_limite()
+        _, minutos_por_km, km_por_km = fatores
+
+        euclidiana = math.dist(self.indice_espacial.posicao(origem), self.indice_espacial.posicao(destino))
+        tempo_min = minutos_por_km * euclidiana
+        if self.landmarks is not None:
+            tempo_min = max(tempo_min, self.landmarks.heuristica(origem, destino))
+        return tempo_min, km_por_km * euclidiana
+
+    def _calcular_fatores_limite(self) -> Tuple[int, float, float]:
+        nos = self.grafo.nos
+        minutos_por_km = km_por_km = float('inf')
+        for origem in nos:
+            no = nos[origem]
+            for aresta in self.grafo.vizinhos(origem):
+                vizinho = nos[aresta.no_destino]
+                euclidiana = math.hypot(no.posicaox - vizinho.posicaox, no.posicaoy - vizinho.posicaoy)
+                if euclidiana > 0:
+                    minutos_por_km = min(minutos_por_km, aresta.tempoViagem_min * FACTOR_MINIMO_TRANSITO / euclidiana)
+                    km_por_km = min(km_por_km, aresta.distancia_km / euclidiana)
+
+        # Folga para erros de arredondamento (o limite tem de ficar abaixo da soma das arestas)
+        folga = 1 - 1e-9
+        if minutos_por_km == float('inf'):
+            minutos_por_km = km_por_km = 0.0
+        return len(nos), max(0.0, minutos_por_km * folga), max(0.0, km_por_km * folga)
 
     def calcular_metricas_rota(self, caminho: List[str]) -> Tuple[float, float]:
         """
@@ -159,15 +412,82 @@ class GestorFrota:
         Returns:
             (viavel, caminho, custo_tempo, distancia)
         """
-        caminho, custo = self.calcular_rota(origem, destino, veiculo=veiculo)
+        rota = self._consultar_memo(origem, destino)
+        if rota is None:
+            caminho, custo = self.calcular_rota(origem, destino, veiculo=veiculo)
+            distancia = float('inf')
+            if caminho and custo != float('inf'):
+                _, distancia = self.calcular_metricas_rota(caminho)
+            self._guardar_memo(origem, destino, caminho, custo, distancia)
+        else:
+            caminho, custo, distancia = rota
         
         if not caminho or custo == float('inf'):
             return False, [], float('inf'), float('inf')
         
-        _, distancia = self.calcular_metricas_rota(caminho)
         viavel = veiculo.consegue_percorrer(distancia)
         
         return viavel, caminho, custo, distancia
+
+    def verificar_viabilidade_rotas_ate(self, veiculos: List[Veiculo], destino: str) -> Dict[str, Tuple[bool, List[str], float, float]]:
+        """
+        Equivalente a verificar_viabilidade_rota(v, v.posicao, destino) para vários veículos.
+
+        Com algoritmos ótimos faz UMA procura inversa (muitos-para-um) a partir do
+        destino, em vez de uma procura por veículo. Com astar/greedy/bfs/dfs o caminho
+        escolhido não é necessariamente o de menor tempo, por isso mantém-se uma
+        procura por veículo para não alterar resultados.
+
+        Returns:
+            Dict id_veiculo → (viavel, caminho, custo_tempo, distancia)
+        """
+        if self.algoritmo_procura not in ALGORITMOS_OTIMOS or destino not in self.grafo.nos:
+            return {
+                v.id_veiculo: self.verificar_viabilidade_rota(v, v.posicao, destino)
+                for v in veiculos
+            }
+
+        # Origens já calculadas neste ciclo não entram na procura
+        rotas = {}
+        for origem in {v.posicao for v in veiculos}:
+            rota = self._consultar_memo(origem, destino)
+            if rota is not None:
+                caminho, custo, distancia = rota
+                rotas[origem] = (custo, distancia, caminho)
+        em_falta = {v.posicao for v in veiculos} - rotas.keys()
+        if em_falta:
+            if self.cache_arvores is not None:
+                # Árvore inversa do pickup: pickups frequentes já a têm em cache
+                procuras = self.cache_arvores.procuras
+                arvore = self.cache_arvores.arvore(destino, reverso=True)
+                self.procuras_rota += self.cache_arvores.procuras - procuras
+                novas = {}
+                for origem in em_falta:
+                    rota = arvore.rota(origem, destino)
+                    if rota is not None:
+                        caminho, custo, distancia = rota
+                        novas[origem] = (custo, distancia, caminho)
+            else:
+                self.procuras_rota += 1
+                novas = dijkstra_um_para_muitos(self.grafo, destino, em_falta, reverso=True)
+
+            for origem in em_falta:
+                if origem in novas:
+                    custo, distancia, caminho = novas[origem]
+                    rotas[origem] = novas[origem]
+                    self._guardar_memo(origem, destino, caminho, custo, distancia)
+                else:
+                    self._guardar_memo(origem, destino, [], float('inf'), float('inf'))
+
+        resultados = {}
+        for v in veiculos:
+            custo, distancia, caminho = rotas.get(v.posicao, (float('inf'), float('inf'), []))
+            if not caminho:
+                resultados[v.id_veiculo] = (False, [], float('inf'), float('inf'))
+                continue
+            resultados[v.id_veiculo] = (v.consegue_percorrer(distancia), caminho, custo, distancia)
+
+        return resultados
     
 
     # ==========================================================
@@ -180,6 +500,8 @@ class GestorFrota:
             raise ValueError(f"Veículo {v.id_veiculo}: autonomia deve ser > 0")
         
         self.veiculos[v.id_veiculo] = v
+        v.observador_posicao = self.indice_veiculos.atualizar
+        self.indice_veiculos.atualizar(v)
 
     def veiculos_disponiveis(self, tempo_atual: int = 0) -> List[Veiculo]:
         return [
@@ -208,7 +530,8 @@ class GestorFrota:
         reposicionamentos = []
         for veiculo in veiculos_ociosos:
             zona_alvo = reposicionar_veiculo_proativo(
-                veiculo, pedidos_futuros, tempo_atual, self.grafo, janela_previsao=10
+                veiculo, pedidos_futuros, tempo_atual, self.grafo, janela_previsao=10,
+                servico_matriz=self.servico_matriz
             )
 
             # Se zona alvo é diferente da posição atual
@@ -218,8 +541,7 @@ class GestorFrota:
                 # Calcula rota para zona alvo
                 viavel, rota, _, _ = self.verificar_viabilidade_rota(veiculo, veiculo.posicao, zona_alvo)
                 if viavel and len(rota) > 1:
-                    veiculo.rota = rota
-                    veiculo.indice_rota = 0
+                    veiculo.definir_rota(rota)
 
         return reposicionamentos
 
@@ -251,6 +573,9 @@ class GestorFrota:
         """
         Seleciona veículo para pedido usando estratégia configurada.
         """
+        if self.limite_candidatos is not None:
+            return self._selecionar_entre_proximos(pedido, tempo_atual)
+
         # Filtra candidatos básicos
         candidatos = [
             v for v in self.veiculos_disponiveis(tempo_atual)
@@ -266,6 +591,41 @@ class GestorFrota:
         return self.estrategia_selecao.selecionar(pedido, candidatos, self, tempo_atual)
 
 
+    def _selecionar_entre_proximos(self, pedido: Pedido, tempo_atual: int) -> Optional[Veiculo]:
+        """
+        Igual a selecionar_veiculo_pedido, mas a estratégia só avalia os
+        limite_candidatos veículos compatíveis mais próximos (IndiceVeiculos).
+        """
+        def compativel(v: Veiculo) -> bool:
+            return (v.estado == EstadoVeiculo.DISPONIVEL and tempo_atual >= v.tempo_ocupado_ate
+                    and v.pode_transportar(pedido.passageiros))
+
+        x, y = self.indice_espacial.posicao(pedido.posicao_inicial)
+        filtro = compativel
+
+        # Mesma regra de filtrar_veiculos_por_preferencia: só o tipo preferido, se existir algum
+        if pedido.pref_ambiental in ("eletrico", "combustao"):
+            def preferido(v: Veiculo) -> bool:
+                return v.tipo_veiculo() == pedido.pref_ambiental and compativel(v)
+            if self.indice_veiculos.k_mais_proximos(x, y, 1, preferido):
+                filtro = preferido
+
+        k = self.limite_candidatos
+        avaliados = set()
+        while True:
+            proximos = self.indice_veiculos.k_mais_proximos(x, y, k, filtro)
+            novos = [v for _, v in proximos if v.id_veiculo not in avaliados]
+            if not novos:
+                return None
+
+            escolhido = self.estrategia_selecao.selecionar(pedido, novos, self, tempo_atual)
+            if escolhido is not None or len(proximos) < k or not self.alargar_candidatos:
+                return escolhido
+
+            # Nenhum dos mais próximos serve (autonomia, rota): alarga a procura
+            avaliados.update(v.id_veiculo for v in novos)
+            k *= 2
+
     def atribuir_pedido(self, pedido: Pedido, tempo_atual: int) -> Optional[Veiculo]:
         """Atribui veículo a pedido."""
         # Não reatribui pedidos já atribuídos
@@ -301,45 +661,23 @@ class GestorFrota:
         pedido.estado = EstadoPedido.ATRIBUIDO
         pedido.instante_atendimento = tempo_atual
         
-        veiculo.definir_rota(rota_filtrada)
+        veiculo.definir_rota(rota_filtrada, paragens=[pedido.posicao_inicial, pedido.posicao_destino])
         veiculo.estado = EstadoVeiculo.EM_DESLOCACAO
         veiculo.id_pedido_atual = pedido.id_pedido
         
         return veiculo
 
 
-    # Tenta atribuir pedido incluindo paragem para recarga
+    # Tenta atribuir pedido incluindo paragens para recarga
     def atribuir_com_recarga(self, pedido: Pedido, veiculo: Veiculo, tempo_atual: int) -> Optional[Veiculo]:
+        """
+        Uma única procura (nó × autonomia) pela rota mais rápida posição → pickup → destino,
+        com zero ou mais paragens em estações/postos disponíveis e o tempo de recarga incluído.
+        """
+        _, melhor_rota, paragens = procura_com_recarga_paragens(
+            self.grafo, veiculo, veiculo.posicao, pedido.posicao_destino, pickup=pedido.posicao_inicial
+        )
 
-        # Encontra estação de recarga mais próxima (que esteja disponível)
-        estacoes = [
-            no_id for no_id, no in self.grafo.nos.items()
-            if veiculo.pode_carregar_abastecer(no.tipo) and no.disponivel]
-        
-        if not estacoes:
-            pedido.estado = EstadoPedido.REJEITADO
-            self.metricas.pedidos_rejeitados += 1
-            return None
-        
-        melhor_estacao = None
-        melhor_rota = None
-        menor_custo = float('inf')
-        
-        for estacao in estacoes:
-            # Rota: posição atual → estação → origem pedido → destino pedido
-            viavel1, r1, c1, _ = self.verificar_viabilidade_rota(veiculo, veiculo.posicao, estacao)
-            viavel2, r2, c2, _ = self.verificar_viabilidade_rota(veiculo, estacao, pedido.posicao_inicial)
-            viavel3, r3, c3, _ = self.verificar_viabilidade_rota(veiculo, pedido.posicao_inicial, pedido.posicao_destino )
-            
-            if not all([viavel1, viavel2, viavel3]):
-                continue
-            
-            custo_total = c1 + c2 + c3
-            if custo_total < menor_custo:
-                menor_custo = custo_total
-                melhor_estacao = estacao
-                melhor_rota = r1 + r2[1:] + r3[1:]
-        
         if not melhor_rota:
             pedido.estado = EstadoPedido.REJEITADO
             self.metricas.pedidos_rejeitados += 1
@@ -350,7 +688,9 @@ class GestorFrota:
         pedido.estado = EstadoPedido.ATRIBUIDO
         pedido.instante_atendimento = tempo_atual
         
-        veiculo.definir_rota(melhor_rota)
+        # Paragens pela ordem da rota (a recarga pode ser antes ou depois do pickup)
+        veiculo.definir_rota(melhor_rota, paragens=[no for no, _ in paragens],
+                             recargas=[recarga for _, recarga in paragens])
         veiculo.estado = EstadoVeiculo.EM_DESLOCACAO
         veiculo.id_pedido_atual = pedido.id_pedido
         
@@ -401,8 +741,23 @@ class GestorFrota:
     
     def obter_estatisticas_cache(self) -> dict:
         """Retorna estatísticas dos caches."""
-        return {
+        estatisticas = {
             "cache_distancias": self.cache_distancias.estatisticas(),
             "cache_rotas": self.cache_rotas.estatisticas()
         }
+        if self.cache_arvores is not None:
+            estatisticas["cache_arvores"] = self.cache_arvores.estatisticas()
+        if self.cache_rotas.partilhada is not None:
+            estatisticas["tabela_partilhada"] = self.cache_rotas.partilhada.estatisticas()
+        if self.cache_persistente is not None:
+            estatisticas["cache_persistente"] = self.cache_persistente.estatisticas()
+        if self._memo_hits + self._memo_misses:
+            estatisticas["memo_rotas"] = {
+                "memo_hits": self._memo_hits,
+                "memo_misses": self._memo_misses,
+                "procuras_rota": self.procuras_rota
+            }
+        if self.estrategia_selecao.podar:
+            estatisticas["poda_selecao"] = self.estrategia_selecao.estatisticas_poda()
+        return estatisticas
     
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Serviço de matrizes de tempos/distâncias (muitos-para-muitos).
+
+Ride-sharing, reposicionamento e atribuição em lote precisam de tempos de
+viagem entre conjuntos de nós. Em vez de várias procuras individuais (ou de
+aproximações euclidianas), cada linha da matriz é um Dijkstra um-para-todos,
+guardado em cache enquanto o estado do trânsito não mudar.
+"""
+
+import heapq
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from modelo.grafo import Grafo
+
+
+class ServicoMatrizTempos:
+    """
+    Calcula matrizes origens × destinos de tempo (min) e distância (km).
+
+    - Cada linha (um nó → todos) é um Dijkstra sobre tempo_real()
+    - As linhas ficam em cache com a chave (nó, sentido); a cache é descartada
+      quando grafo.epoca_transito muda (GestorTransito alterou o grafo)
+    - Se houver menos destinos do que origens, calcula colunas com procuras
+      inversas (todos → destino), reduzindo o número de procuras
+    - Pares inalcançáveis ficam com inf
+    """
+
+    def __init__(self, grafo: Grafo):
+        self.grafo = grafo
+        self.ids: List[str] = list(grafo.nos)
+        self.indice: Dict[str, int] = {id_no: i for i, id_no in enumerate(self.ids)}
+
+        self._linhas: Dict[Tuple[str, bool], Tuple[np.ndarray, np.ndarray]] = {}
+        self._epoca = grafo.epoca_transito
+
+        self._hits = 0
+        self._misses = 0
+
+    # ==========================================================
+    # Linhas (um-para-todos)
+    # ==========================================================
+
+    def _validar_epoca(self):
+        if self._epoca != self.grafo.epoca_transito:
+            self._linhas.clear()
+            self._epoca = self.grafo.epoca_transito
+
+    def _linha(self, no_id: str, reverso: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tempos e km de no_id para todos os nós (ou de todos para no_id, se reverso).
+        Os arrays devolvidos são partilhados com a cache: não devem ser alterados.
+        """
+        chave = (no_id, reverso)
+        linha = self._linhas.get(chave)
+        if linha is not None:
+            self._hits += 1
+            return linha
+
+        self._misses += 1
+        linha = self._dijkstra(no_id, reverso)
+        self._linhas[chave] = linha
+        return linha
+
+    def _dijkstra(self, origem: str, reverso: bool) -> Tuple[np.ndarray, np.ndarray]:
+        inf = float('inf')
+        tempos = np.full(len(self.ids), inf)
+        kms = np.full(len(self.ids), inf)
+
+        custo: Dict[str, float] = {origem: 0.0}
+        km: Dict[str, float] = {origem: 0.0}
+        fechados = set()
+        fila = [(0.0, origem)]
+
+        while fila:
+            custo_atual, atual = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            fechados.add(atual)
+
+            i = self.indice[atual]
+            tempos[i] = custo_atual
+            kms[i] = km[atual]
+
+            for aresta in self.grafo.vizinhos(atual):
+                vizinho = aresta.no_destino
+                if reverso:
+                    try:
+                        aresta = self.grafo.get_aresta(vizinho, atual)
+                    except ValueError:
+                        continue
+
+                custo_aresta = aresta.tempo_real()
+                if custo_aresta == inf:  # Ignora arestas bloqueadas
+                    continue
+
+                novo_custo = custo_atual + custo_aresta
+                if novo_custo < custo.get(vizinho, inf):
+                    custo[vizinho] = novo_custo
+                    km[vizinho] = km[atual] + aresta.distancia_km
+                    heapq.heappush(fila, (novo_custo, vizinho))
+
+        return tempos, kms
+
+    # ==========================================================
+    # Consultas
+    # ==========================================================
+
+    def matriz(self, origens: Sequence[str], destinos: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Matrizes origens × destinos.
+
+        Returns:
+            (tempos_min, distancias_km), ambas com forma (len(origens), len(destinos))
+        """
+        self._validar_epoca()
+
+        origens = list(origens)
+        destinos = list(destinos)
+        for no_id in origens + destinos:
+            if no_id not in self.indice:
+                raise ValueError(f"Nó '{no_id}' não existe no grafo")
+
+        tempos = np.empty((len(origens), len(destinos)))
+        kms = np.empty((len(origens), len(destinos)))
+
+        # Procura no sentido com menos nós distintos
+        if len(set(destinos)) < len(set(origens)):
+            colunas = [self.indice[o] for o in origens]
+            for j, destino in enumerate(destinos):
+                linha_t, linha_km = self._linha(destino, reverso=True)
+                tempos[:, j] = linha_t[colunas]
+                kms[:, j] = linha_km[colunas]
+        else:
+            colunas = [self.indice[d] for d in destinos]
+            for i, origem in enumerate(origens):
+                linha_t, linha_km = self._linha(origem)
+                tempos[i, :] = linha_t[colunas]
+                kms[i, :] = linha_km[colunas]
+
+        return tempos, kms
+
+    def tempo(self, origem: str, destino: str) -> float:
+        """Tempo mínimo (min) de origem até destino."""
+        return float(self.matriz([origem], [destino])[0][0, 0])
+
+    def distancia(self, origem: str, destino: str) -> float:
+        """Km do caminho de menor tempo entre origem e destino."""
+        return float(self.matriz([origem], [destino])[1][0, 0])
+
+    # ==========================================================
+    # Gestão da cache
+    # ==========================================================
+
+    def limpar_cache(self):
+        self._linhas.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def estatisticas(self) -> dict:
+        """Retorna estatísticas de uso da cache de linhas."""
+        total = self._hits + self._misses
+        taxa_acerto = (self._hits / total * 100) if total > 0 else 0
+
+        return {
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+            "taxa_acerto": round(taxa_acerto, 1),
+            "linhas_cacheadas": len(self._linhas)
+        }
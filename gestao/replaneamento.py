@@ -0,0 +1,159 @@
+"""
+Replaneamento incremental de veículos em movimento.
+
+Cada veículo com rota ativa tem um planeador D* Lite por troço (posição →
+paragem, paragem → paragem seguinte, ...). Quando o GestorTransito altera
+arestas, os planeadores reparam só a parte afetada da procura e a rota do
+veículo é substituída se deixar de ser a melhor.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from modelo.grafo import Grafo
+from modelo.veiculos import Veiculo
+from gestao.algoritmos_procura.dstar_lite import PlaneadorDStarLite, indice_predecessores
+
+
+class GestorReplaneamento:
+    """
+    Mantém o estado de procura de cada veículo entre alterações de trânsito.
+
+    - acompanhar(): cria os planeadores quando o veículo recebe uma rota nova
+    - replanear(): aplica as alterações e reencaminha quem tiver melhor rota
+    """
+
+    def __init__(self, grafo: Grafo, heuristica=None):
+        self.grafo = grafo
+        self.heuristica = heuristica
+        self.predecessores = indice_predecessores(grafo)
+
+        # id_veiculo → (rota acompanhada, planeadores por troço)
+        self._estado: Dict[str, Tuple[List[str], List[PlaneadorDStarLite]]] = {}
+
+        # Estatísticas
+        self.replaneamentos = 0
+        self.expansoes = 0
+
+    # ==========================================================
+    # Acompanhamento de veículos
+    # ==========================================================
+
+    def _paragens(self, veiculo: Veiculo) -> List[str]:
+        """Paragens ainda por visitar, terminando sempre no fim da rota."""
+        paragens = [p for p in (veiculo.paragens or []) if p != veiculo.posicao]
+        if not paragens or paragens[-1] != veiculo.rota[-1]:
+            paragens = [veiculo.rota[-1]]
+        return paragens
+
+    def acompanhar(self, veiculo: Veiculo):
+        """Cria planeadores para a rota atual do veículo (se ainda não existirem)."""
+        estado = self._estado.get(veiculo.id_veiculo)
+        if estado is not None and estado[0] is veiculo.rota:
+            return
+
+        planeadores = []
+        origem = veiculo.posicao
+        for paragem in self._paragens(veiculo):
+            planeador = PlaneadorDStarLite(self.grafo, origem, paragem, heuristica=self.heuristica,
+                                           predecessores=self.predecessores)
+            self.expansoes += planeador.expansoes
+            planeadores.append(planeador)
+            origem = paragem
+
+        self._estado[veiculo.id_veiculo] = (veiculo.rota, planeadores)
+
+    def esquecer(self, id_veiculo: str):
+        self._estado.pop(id_veiculo, None)
+
+    # ==========================================================
+    # Replaneamento
+    # ==========================================================
+
+    def _custo_rota(self, rota: List[str]) -> float:
+        custo = 0.0
+        for u, v in zip(rota, rota[1:]):
+            try:
+                custo += self.grafo.get_aresta(u, v).tempo_real()
+            except ValueError:
+                return float('inf')
+        return custo
+
+    def replanear(self, veiculos: Iterable[Veiculo], alteracoes: Set[Tuple[str, str]]) -> List[str]:
+        """
+        Aplica alterações de arestas aos veículos em movimento.
+
+        Args:
+            veiculos: Veículos com rota ativa
+            alteracoes: Arestas (origem, destino) alteradas (GestorTransito.consumir_alteracoes)
+
+        Returns:
+            IDs dos veículos cuja rota foi substituída
+        """
+        ativos = set()
+        reencaminhados = []
+
+        for veiculo in veiculos:
+            if not veiculo.rota or veiculo.indice_rota >= len(veiculo.rota) - 1:
+                continue
+            ativos.add(veiculo.id_veiculo)
+
+            novo = self._estado.get(veiculo.id_veiculo) is None or self._estado[veiculo.id_veiculo][0] is not veiculo.rota
+            self.acompanhar(veiculo)
+            if novo or not alteracoes:
+                continue
+
+            _, planeadores = self._estado[veiculo.id_veiculo]
+
+            # Descarta os troços das paragens já visitadas (mesmo que o veículo
+            # já tenha passado delas) e avança a origem do troço atual
+            del planeadores[:max(0, len(planeadores) - len(self._paragens(veiculo)))]
+            antes = sum(p.expansoes for p in planeadores)
+            planeadores[0].mover_origem(veiculo.posicao)
+            for planeador in planeadores:
+                planeador.atualizar_arestas(alteracoes)
+            self.expansoes += sum(p.expansoes for p in planeadores) - antes
+
+            nova_rota = self._montar_rota(planeadores)
+            if not nova_rota:
+                continue  # sem alternativa: mantém a rota
+
+            restante = veiculo.rota[veiculo.indice_rota:]
+            if (nova_rota != restante
+                    and sum(p.custo() for p in planeadores) < self._custo_rota(restante) - 1e-9
+                    and self._autonomia_suficiente(veiculo, nova_rota)):
+                veiculo.definir_rota(nova_rota, paragens=veiculo.paragens, recargas=veiculo.paragens_recarga)
+                self._estado[veiculo.id_veiculo] = (veiculo.rota, planeadores)
+                self.replaneamentos += 1
+                reencaminhados.append(veiculo.id_veiculo)
+
+        # Veículos que já não estão em movimento deixam de ser acompanhados
+        for id_veiculo in list(self._estado):
+            if id_veiculo not in ativos:
+                del self._estado[id_veiculo]
+
+        return reencaminhados
+
+    def _autonomia_suficiente(self, veiculo: Veiculo, rota: List[str]) -> bool:
+        """A rota cabe na autonomia atual até à primeira recarga planeada e na máxima entre recargas."""
+        recargas = {p for p, recarga in zip(veiculo.paragens or [], veiculo.paragens_recarga or []) if recarga}
+        trocos = [0.0]
+        for u, v in zip(rota, rota[1:]):
+            if u in recargas:
+                trocos.append(0.0)
+            trocos[-1] += self.grafo.get_aresta(u, v).distancia_km
+        return veiculo.consegue_percorrer(trocos[0]) and all(t <= veiculo.autonomiaMax_km for t in trocos[1:])
+
+    def _montar_rota(self, planeadores: List[PlaneadorDStarLite]) -> Optional[List[str]]:
+        rota: List[str] = []
+        for planeador in planeadores:
+            troco = planeador.caminho()
+            if not troco:
+                return None
+            rota.extend(troco if not rota else troco[1:])
+        return rota
+
+    def estatisticas(self) -> dict:
+        return {
+            "veiculos_acompanhados": len(self._estado),
+            "replaneamentos": self.replaneamentos,
+            "expansoes": self.expansoes
+        }
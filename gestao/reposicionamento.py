@@ -2,19 +2,24 @@
 Gestão de reposicionamento proativo de veículos.
 """
 
-from typing import List
+from typing import List, Optional
 from modelo.veiculos import Veiculo
 from modelo.pedidos import Pedido
 from modelo.grafo import Grafo
+from gestao.matriz_tempos import ServicoMatrizTempos
 
 
-def reposicionar_veiculo_proativo(veiculo: Veiculo, pedidos_futuros: List[Pedido], tempo_atual: int, grafo: Grafo, janela_previsao: int = 10) -> str:
+def reposicionar_veiculo_proativo(veiculo: Veiculo, pedidos_futuros: List[Pedido], tempo_atual: int, grafo: Grafo, janela_previsao: int = 10,
+                                  servico_matriz: Optional[ServicoMatrizTempos] = None) -> str:
     """
     Sugere zona para reposicionar veículo ocioso.
     
     Analisa pedidos esperados nos próximos N minutos
     e retorna zona de maior procura.
 
+    Com servico_matriz, ignora zonas inalcançáveis a partir da posição do
+    veículo e, em caso de empate na procura, escolhe a mais rápida de alcançar.
+
     Returns:
         ID da zona alvo
     """
@@ -29,6 +34,15 @@ def reposicionar_veiculo_proativo(veiculo: Veiculo, pedidos_futuros: List[Pedido
     if not zonas_procura:
         return veiculo.posicao  # Fica onde está
     
+    if servico_matriz is not None:
+        zonas = list(zonas_procura)
+        tempos, _ = servico_matriz.matriz([veiculo.posicao], zonas)
+        candidatas = [(zonas_procura[z], -tempos[0, j], z) for j, z in enumerate(zonas)
+                      if tempos[0, j] < float('inf')]
+        if not candidatas:
+            return veiculo.posicao
+        return max(candidatas)[2]
+
     # Zona de maior procura
     zona_alvo = max(zonas_procura, key=zonas_procura.get)
     return zona_alvo
\ No newline at end of file
@@ -7,13 +7,15 @@ Sistema de Ride-Sharing para otimizar ocupação de veículos.
 - Respeitar restrições de capacidade e tempo
 """
 
-from typing import List, Tuple, Optional, Set
+from typing import Callable, Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass
 import math
 from modelo.pedidos import Pedido
 from modelo.veiculos import Veiculo
 from modelo.grafo import Grafo
+from modelo.indice_espacial import IndiceEspacial
 from gestao.algoritmos_procura.uteis import dist_euclidiana
+from gestao.matriz_tempos import ServicoMatrizTempos
 
 @dataclass
 class GrupoPedidos:
@@ -43,20 +45,39 @@ class GestorRideSharing:
     2. Janela temporal compatível
     3. Capacidade do veículo
     4. Desvio aceitável de rota
+
+    Com servico_matriz, as distâncias passam a ser km pela rede (caminho de
+    menor tempo) em vez de distância euclidiana. Com indice_espacial (e sem
+    servico_matriz), a proximidade é consultada no índice em vez de calculada
+    par a par. obter_servico_matriz permite ir buscar o serviço só quando é
+    usado (ex: ao GestorFrota, que o pode ativar depois).
     """
     
-    def __init__(self, grafo: Grafo, raio_agrupamento_km: float = 5.0, janela_temporal_min: int = 10, desvio_maximo_km: float = 8.0):
+    def __init__(self, grafo: Grafo, raio_agrupamento_km: float = 5.0, janela_temporal_min: int = 10, desvio_maximo_km: float = 8.0,
+                 servico_matriz: Optional[ServicoMatrizTempos] = None,
+                 indice_espacial: Optional[IndiceEspacial] = None,
+                 obter_servico_matriz: Optional[Callable[[], Optional[ServicoMatrizTempos]]] = None):
 
         self.grafo = grafo
         self.raio_agrupamento = raio_agrupamento_km
         self.janela_temporal = janela_temporal_min
         self.desvio_maximo = desvio_maximo_km
+        self._servico_matriz = servico_matriz
+        self._obter_servico_matriz = obter_servico_matriz
+        self.indice_espacial = indice_espacial
+        self._vizinhanca: Dict[str, Set[str]] = {}  # nó → nós a <= raio_agrupamento (euclidiana)
         
         # Estatísticas
         self.grupos_criados = 0
         self.pedidos_agrupados = 0
         self.economia_total_km = 0.0
     
+    @property
+    def servico_matriz(self) -> Optional[ServicoMatrizTempos]:
+        if self._obter_servico_matriz is not None:
+            return self._obter_servico_matriz()
+        return self._servico_matriz
+
     def distancia_euclidiana(self, no1_id: str, no2_id: str) -> float:
         """
         Wrapper que chama a função importada dist_euclidiana.
@@ -65,7 +86,21 @@ class GestorRideSharing:
         no1 = self.grafo.nos[no1_id]
         no2 = self.grafo.nos[no2_id]
         return dist_euclidiana(no1, no2)
+
+    def distancia_km(self, no1_id: str, no2_id: str) -> float:
+        """Distância usada nos critérios: pela rede se houver servico_matriz, senão euclidiana."""
+        if self.servico_matriz is not None:
+            return self.servico_matriz.distancia(no1_id, no2_id)
+        return self.distancia_euclidiana(no1_id, no2_id)
     
+    def zonas_proximas(self, no_id: str) -> Set[str]:
+        """Nós a distância euclidiana <= raio_agrupamento (consultados uma vez por nó)."""
+        vizinhanca = self._vizinhanca.get(no_id)
+        if vizinhanca is None:
+            vizinhanca = {v for _, v in self.indice_espacial.no_raio_do_no(no_id, self.raio_agrupamento)}
+            self._vizinhanca[no_id] = vizinhanca
+        return vizinhanca
+
     def pedidos_compativel_temporal(self, p1: Pedido, p2: Pedido) -> bool:
         """Verifica se pedidos são compatíveis temporalmente."""
         diff = abs(p1.instante_pedido - p2.instante_pedido)
@@ -76,8 +111,12 @@ class GestorRideSharing:
         Verifica se pedidos são compatíveis espacialmente.
         Critério: Origens E destinos devem estar próximos.
         """
-        dist_origem = self.distancia_euclidiana(p1.posicao_inicial, p2.posicao_inicial)
-        dist_destino = self.distancia_euclidiana(p1.posicao_destino, p2.posicao_destino)
+        if self.servico_matriz is None and self.indice_espacial is not None:
+            return (p2.posicao_inicial in self.zonas_proximas(p1.posicao_inicial) and
+                    p2.posicao_destino in self.zonas_proximas(p1.posicao_destino))
+
+        dist_origem = self.distancia_km(p1.posicao_inicial, p2.posicao_inicial)
+        dist_destino = self.distancia_km(p1.posicao_destino, p2.posicao_destino)
         
         return (dist_origem <= self.raio_agrupamento and 
                 dist_destino <= self.raio_agrupamento)
@@ -180,10 +219,30 @@ class GestorRideSharing:
         if len(zonas) == 1:
             return zonas[0]
         
+        if self.servico_matriz is not None:
+            # Uma matriz candidatas × zonas em vez de várias procuras
+            candidatas = list(dict.fromkeys(zonas))
+            _, kms = self.servico_matriz.matriz(candidatas, zonas)
+            totais = kms.sum(axis=1)
+            melhor = int(totais.argmin())
+            return candidatas[melhor] if totais[melhor] < float('inf') else None
+
+        # Candidatas por ordem de distância ao centróide: a soma das distâncias de c
+        # às zonas é >= len(zonas) × dist(c, centróide), por isso pode-se parar cedo
+        nos = [self.grafo.nos[z] for z in zonas]
+        cx = sum(no.posicaox for no in nos) / len(nos)
+        cy = sum(no.posicaoy for no in nos) / len(nos)
+        candidatas = sorted(
+            (math.hypot(no.posicaox - cx, no.posicaoy - cy), no.id_no)
+            for no in {no.id_no: no for no in nos}.values()  # Remove duplicadas
+        )
+
         menor_dist_total = float('inf')
         zona_central = None
         
-        for candidata in set(zonas):  # Remove duplicadas
+        for dist_centroide, candidata in candidatas:
+            if len(zonas) * dist_centroide >= menor_dist_total:
+                break
             dist_total = sum(
                 self.distancia_euclidiana(candidata, z) 
                 for z in zonas if z != candidata
@@ -203,8 +262,8 @@ class GestorRideSharing:
         desvio_total = 0.0
         
         for pedido in pedidos:
-            desvio_origem = self.distancia_euclidiana(pedido.posicao_inicial, origem_comum)
-            desvio_destino = self.distancia_euclidiana(pedido.posicao_destino, destino_comum)
+            desvio_origem = self.distancia_km(pedido.posicao_inicial, origem_comum)
+            desvio_destino = self.distancia_km(pedido.posicao_destino, destino_comum)
 
             desvio_total += desvio_origem + desvio_destino
         
@@ -217,12 +276,12 @@ class GestorRideSharing:
         """
         # Distância se fossem viagens individuais
         # (assumindo veículos começam na mesma posição)
-        km_individuais = len(pedidos) * self.distancia_euclidiana(
+        km_individuais = len(pedidos) * self.distancia_km(
             origem_comum, destino_comum
         )
         
         # Distância agrupada (uma única viagem)
-        km_agrupados = self.distancia_euclidiana(origem_comum, destino_comum)
+        km_agrupados = self.distancia_km(origem_comum, destino_comum)
         
         return km_individuais - km_agrupados
     
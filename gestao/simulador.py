@@ -8,9 +8,13 @@ from gestao.gestor_frota import GestorFrota
 from gestao.transito_dinamico import GestorTransito
 from gestao.gestor_falhas import GestorFalhas
 from gestao.ride_sharing import GestorRideSharing
+from gestao.replaneamento import GestorReplaneamento
 from modelo.veiculos import Veiculo, EstadoVeiculo
 from modelo.pedidos import Pedido, EstadoPedido
 
+# Minutos antes da mudança de hora em que se calculam as rotas da hora seguinte
+MINUTOS_PRE_AQUECIMENTO = 5
+
 """
 Responsável por gerir o tempo e os eventos dinâmicos da simulação.
       - chegada de pedidos no tempo correto;
@@ -21,7 +25,7 @@ Responsável por gerir o tempo e os eventos dinâmicos da simulação.
 class Simulador:
     def __init__(self, gestor: GestorFrota, duracao_total: int = 120, interface=None,
              usar_transito: bool = True, usar_falhas: bool = True, prob_falha: float = 0.15,
-             usar_ride_sharing: bool = True, velocidade: int = 1):
+             usar_ride_sharing: bool = True, velocidade: int = 1, usar_replaneamento: bool = True):
         self.gestor = gestor
         self.duracao_total = duracao_total          # em minutos
         self.tempo_atual = 0
@@ -30,8 +34,16 @@ class Simulador:
         self.interface = interface
 
         self.gestor_transito = GestorTransito(gestor.grafo) if usar_transito else None
+        if self.gestor_transito:
+            gestor.definir_perfil_transito(self.gestor_transito)
+        # Reencaminha veículos em movimento quando o trânsito muda (D* Lite)
+        self.replaneamento = (GestorReplaneamento(gestor.grafo)
+                              if self.gestor_transito and usar_replaneamento else None)
         self.gestor_falhas = GestorFalhas(gestor.grafo, prob_falha) if usar_falhas else None
-        self.gestor_ride_sharing = GestorRideSharing(gestor.grafo) if usar_ride_sharing else None
+        # O serviço de matrizes é lido do gestor a cada uso (pode ser ativado depois)
+        self.gestor_ride_sharing = GestorRideSharing(gestor.grafo, indice_espacial=gestor.indice_espacial,
+                                                     obter_servico_matriz=lambda: gestor.servico_matriz
+                                                     ) if usar_ride_sharing else None
 
         # Para feedback na interface
         self.num_pedidos_pendentes_atual = 0
@@ -78,6 +90,10 @@ class Simulador:
             # Atualiza trânsito a cada minuto
             if self.gestor_transito:
                 self.gestor_transito.atualizar_transito(self.tempo_atual)
+                if self.replaneamento:
+                    self.replanear_veiculos()
+                if self.tempo_atual % 60 >= 60 - MINUTOS_PRE_AQUECIMENTO:
+                    self.gestor.aquecer_proximo_regime(self.gestor_transito, self.tempo_atual)
 
             self.processar_pedidos_novos()
             self.atribuir_pedidos_pendentes()
@@ -100,6 +116,7 @@ class Simulador:
             if self.interface:
                 time.sleep(1.0 / self.velocidade)
             
+        self.gestor.gravar_cache_persistente()
 
         print("\n" + "="*60)
         print("Simulação terminada.\n")
@@ -132,6 +149,14 @@ class Simulador:
         Tenta atribuir pedidos pendentes a veículos disponíveis por prioridade. 
         Aplica lógica de ride sharing se ativo.
         """
+        # Troços calculados neste tick são partilhados por estratégias e atribuições
+        self.gestor.iniciar_ciclo_atribuicao()
+        try:
+            self._atribuir_pedidos_pendentes()
+        finally:
+            self.gestor.terminar_ciclo_atribuicao()
+
+    def _atribuir_pedidos_pendentes(self):
         pendentes = [p for p in self.gestor.pedidos_pendentes
                      if p.estado == EstadoPedido.PENDENTE]
 
@@ -244,6 +269,23 @@ class Simulador:
                     self.gestor.metricas.pedidos_rejeitados += 1
 
 
+    def replanear_veiculos(self):
+        """
+        Aplica as alterações de trânsito às rotas dos veículos em movimento.
+        Só a parte afetada de cada procura é refeita.
+        """
+        alteracoes = self.gestor_transito.consumir_alteracoes()
+        em_movimento = [
+            v for v in self.gestor.veiculos.values()
+            if v.rota and v.indice_rota < len(v.rota) - 1
+        ]
+
+        for id_veiculo in self.replaneamento.replanear(em_movimento, alteracoes):
+            if self.interface:
+                self.interface.registar_evento(
+                    f"[t={self.tempo_atual}] Veículo {id_veiculo} reencaminhado (trânsito alterado)")
+
+
     def mover_veiculos(self):
         """
         Move apenas veículos que têm rota ativa. 
@@ -274,6 +316,34 @@ class Simulador:
             # Verifica se chegou ao destino
             if chegou:
                 self.processar_chegada_destino(v)
+            else:
+                self.recarregar_em_rota(v)
+
+
+    def recarregar_em_rota(self, veiculo: Veiculo):
+        """
+        Paragem de recarga a meio da rota (planeada por procura_com_recarga):
+        recarrega só quando o veículo acabou de chegar a uma paragem marcada para recarga.
+        """
+        if not veiculo.recarga_pendente:
+            return
+        veiculo.recarga_pendente = False
+
+        no = self.gestor.grafo.nos[veiculo.posicao]
+        if not (veiculo.pode_carregar_abastecer(no.tipo) and no.disponivel):
+            return
+
+        estado = veiculo.estado
+        chegada = veiculo.tempo_ocupado_ate  # a recarga começa quando chega ao nó
+        sucesso, custo_recarga, tempo = veiculo.repor_autonomia(no.tipo, self.tempo_atual)
+        if sucesso:
+            veiculo.tempo_ocupado_ate = max(chegada, self.tempo_atual) + tempo
+            veiculo.estado_apos_recarga = estado
+            self.gestor.metricas.custo_total += custo_recarga
+
+            if self.interface:
+                self.interface.registar_evento(
+                    f"[t={self.tempo_atual}] Veículo {veiculo.id_veiculo} "f"parou para recarregar em {veiculo.posicao} (custo: €{custo_recarga:.2f})")
 
 
     def processar_chegada_destino(self, veiculo: Veiculo):
@@ -3,9 +3,9 @@ Sistema de gestão de trânsito dinâmico.
 Simula variação de congestionamento por hora do dia e zona.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple
 import random
-from modelo.grafo import Grafo
+from modelo.grafo import Aresta, Grafo
 
 
 class GestorTransito:
@@ -24,6 +24,9 @@ class GestorTransito:
         # Hora inicial aleatória se não especificada (0-23h)
         self.hora_inicial = hora_inicial if hora_inicial is not None else random.randint(0, 23)
         self.hora_atual = self.hora_inicial
+        self.minuto_atual = 0  # minutos de simulação da última atualização
+        # Arestas (origem, destino) alteradas desde a última chamada a consumir_alteracoes()
+        self._alteracoes: Set[Tuple[str, str]] = set()
 
         # Zonas com maior congestionamento
         self.zonas_centro = [
@@ -77,6 +80,69 @@ class GestorTransito:
         return any(zona in no_id for zona in self.zonas_comerciais)
 
 
+    def factor_aresta(self, no_origem: str, no_destino: str, hora: int, factor_base: float = None) -> float:
+        """
+        Factor de congestionamento de uma aresta a uma dada hora.
+
+        Args:
+            factor_base: calcular_factor_hora(hora), se já tiver sido calculado
+        """
+        # Reinicia factor (não acumula)
+        factor = factor_base if factor_base is not None else self.calcular_factor_hora(hora)
+
+        # Aumenta congestionamento em zonas centrais durante rush hour
+        if (self.eh_zona_central(no_origem) or self.eh_zona_central(no_destino)):
+            if factor > 1.0:  # Só aumenta se já houver trânsito
+                factor *= 1.2
+
+        # Aeroporto/zonas comerciais têm pico ao fim do dia
+        if (self.eh_zona_comercial(no_origem) or self.eh_zona_comercial(no_destino)):
+            if 17 <= hora <= 19:
+                factor *= 1.15
+
+        return round(factor, 2)
+
+
+    def tabela_factores(self) -> Dict[Tuple[str, str], Tuple[float, ...]]:
+        """
+        Pré-calcula o factor de cada aresta para as 24 horas do dia.
+
+        Returns:
+            Dict (no_origem, no_destino) → 24 factores (índice = hora)
+        """
+        factores_base = [self.calcular_factor_hora(hora) for hora in range(24)]
+        tabela = {}
+        for no_origem, arestas in self.grafo.adjacentes.items():
+            for aresta in arestas:
+                chave = (no_origem, aresta.no_destino)
+                if chave not in tabela:
+                    tabela[chave] = tuple(
+                        self.factor_aresta(no_origem, aresta.no_destino, hora, factores_base[hora])
+                        for hora in range(24)
+                    )
+        return tabela
+
+
+    def grafo_na_hora(self, hora: int) -> Grafo:
+        """
+        Cópia do grafo com os factores da hora dada e os bloqueios atuais, sem
+        alterar o original (os nós são partilhados). Permite calcular rotas de
+        uma hora antes de ela chegar.
+        """
+        copia = Grafo()
+        copia.nos = self.grafo.nos
+        factor_base = self.calcular_factor_hora(hora)
+        for no_origem, arestas in self.grafo.adjacentes.items():
+            copia.adjacentes[no_origem] = []
+            for aresta in arestas:
+                copia.regista_aresta(no_origem, Aresta(
+                    aresta.no_destino, aresta.distancia_km, aresta.tempoViagem_min,
+                    congestion=self.factor_aresta(no_origem, aresta.no_destino, hora, factor_base),
+                    blocked=aresta.blocked
+                ))
+        return copia
+
+
     def atualizar_transito(self, tempo_simulacao: int = 0):
         """
         Atualiza congestionamento de todas as arestas com base na hora atual.
@@ -85,27 +151,21 @@ class GestorTransito:
             tempo_simulacao: Minutos desde início da simulação
         """
         self.atualizar_hora(tempo_simulacao)
+        self.minuto_atual = tempo_simulacao
         factor_base = self.calcular_factor_hora(self.hora_atual)
+        alterou = False
 
         for no_origem, arestas in self.grafo.adjacentes.items():
             for aresta in arestas:
-                no_destino = aresta.no_destino
-
-                # Reinicia factor (não acumula)
-                factor = factor_base
-
-                # Aumenta congestionamento em zonas centrais durante rush hour
-                if (self.eh_zona_central(no_origem) or self.eh_zona_central(no_destino)):
-                    if factor > 1.0:  # Só aumenta se já houver trânsito
-                        factor *= 1.2
-
-                # Aeroporto/zonas comerciais têm pico ao fim do dia
-                if (self.eh_zona_comercial(no_origem) or self.eh_zona_comercial(no_destino)):
-                    if 17 <= self.hora_atual <= 19:
-                        factor *= 1.15
-
                 # SUBSTITUI congestionamento (não multiplica o anterior)
-                aresta.congestion = round(factor, 2)
+                factor = self.factor_aresta(no_origem, aresta.no_destino, self.hora_atual, factor_base)
+                if aresta.congestion != factor:
+                    aresta.congestion = factor
+                    self._alteracoes.add((no_origem, aresta.no_destino))
+                    alterou = True
+
+        if alterou:
+            self.grafo.marcar_alteracao_transito()
 
 
     def simular_bloqueio(self, no_origem: str, no_destino: str, bloquear: bool = True):
@@ -121,11 +181,23 @@ class GestorTransito:
             aresta_reversa = self.grafo.get_aresta(no_destino, no_origem)
             aresta_reversa.blocked = bloquear
 
+            self._alteracoes.add((no_origem, no_destino))
+            self._alteracoes.add((no_destino, no_origem))
+            self.grafo.marcar_alteracao_transito()
             return True
         except ValueError:
             return False
 
 
+    def consumir_alteracoes(self) -> Set[Tuple[str, str]]:
+        """
+        Devolve (e esquece) as arestas cujo custo mudou desde a última chamada.
+        Usado pelo replaneamento incremental para reparar só o que mudou.
+        """
+        alteracoes, self._alteracoes = self._alteracoes, set()
+        return alteracoes
+
+
     def obter_estado_transito(self) -> Dict:
         """Retorna snapshot do estado atual do trânsito"""
         total_arestas = sum(len(adj) for adj in self.grafo.adjacentes.values())
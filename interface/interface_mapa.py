@@ -1,5 +1,6 @@
 import tkinter as tk
 from modelo.grafo import Grafo, TipoNo
+from modelo.indice_espacial import IndiceEspacial
 
 NODE_RADIUS = 10
 VEHICLE_SIZE = 8
@@ -22,6 +23,7 @@ class InterfaceMapa(tk.Canvas):
         self.rotas_pedidos = {}
         self.cores_pedidos = {}
         self.pos_cache = {}
+        self.indice_espacial = IndiceEspacial(grafo)  # hit-testing dos nós sob o rato
         self.grafo_desenhado = False
         self.tooltip = None
 
@@ -541,12 +543,15 @@ class InterfaceMapa(tk.Canvas):
                     self.mostrar_tooltip_veiculo(x, y, v)
                     return
 
-        # Verifica nós
-        for no_id, no in self.grafo.nos.items():
-            nx, ny = self._pos(no_id)
-            if ((x - nx) ** 2 + (y - ny) ** 2) ** 0.5 <= NODE_RADIUS + 2:
-                self.mostrar_tooltip_no(x, y, no)
-                return
+        # Verifica nós (pixel → coordenadas do grafo → nó mais próximo)
+        if self.scale > 0:
+            no_id = self.indice_espacial.mais_proximo((x - self.offset_x) / self.scale,
+                                                      (y - self.offset_y) / self.scale)
+            if no_id is not None:
+                nx, ny = self._pos(no_id)
+                if ((x - nx) ** 2 + (y - ny) ** 2) ** 0.5 <= NODE_RADIUS + 2:
+                    self.mostrar_tooltip_no(x, y, self.grafo.nos[no_id])
+                    return
 
     def distancia_ponto_linha(self, px, py, x1, y1, x2, y2):
         linha_len_sq = (x2 - x1) ** 2 + (y2 - y1) ** 2
@@ -307,13 +307,17 @@ class JanelaConfiguracao:
         self.algoritmo_var = tk.StringVar(value="astar")
         self._algoritmos = [
             ("A* (A-Estrela) — ótimo e eficiente", "astar"),
+            ("A* dependente do tempo — trânsito à hora de chegada", "astar_td"),
+            ("A* com landmarks (ALT) — heurística mais forte", "alt"),
             ("Greedy — rápido, mas não ótimo", "greedy"),
             ("UCS — ótimo, mas mais lento", "ucs"),
+            ("Dijkstra bidirecional — ótimo, menos nós", "bidirecional"),
+            ("Contraction Hierarchies — consultas muito rápidas", "ch"),
             ("BFS — não considera custos", "bfs"),
             ("DFS — exploratório", "dfs"),
         ]
         self._algoritmo_display = [t for (t, _) in self._algoritmos]
-        self.cb_algoritmo = ttk.Combobox(left, values=self._algoritmo_display, state="readonly", height=6)
+        self.cb_algoritmo = ttk.Combobox(left, values=self._algoritmo_display, state="readonly", height=10)
         self.cb_algoritmo.pack(fill="x", pady=(6, 0))
         self.cb_algoritmo.current(0)
 
@@ -5,7 +5,7 @@ Cada aresta tem distância e tempo associados.
 """
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from enum import Enum
 
 class TipoNo(Enum):
@@ -39,6 +39,14 @@ class Grafo:
     def __init__(self):
         self.nos: Dict[str, No] = {}
         self.adjacentes: Dict[str, List[Aresta]] = {}
+        # Índice (origem, destino) → aresta, para get_aresta/distancia em O(1)
+        self._indice_arestas: Dict[Tuple[str, str], Aresta] = {}
+        # Incrementado sempre que o trânsito (congestion/blocked) muda via GestorTransito
+        self.epoca_transito = 0
+
+    def marcar_alteracao_transito(self):
+        """Assinala que os custos das arestas mudaram (invalida estruturas que dependem deles)."""
+        self.epoca_transito += 1
 
     def adiciona_no(self, no: No):
         if no.id_no not in self.nos:
@@ -51,22 +59,38 @@ class Grafo:
     def adiciona_aresta(self, no_origem: str, no_destino: str, distancia_km: float, tempoViagem_min: float):
         if no_origem not in self.nos or no_destino not in self.nos:
             raise ValueError("Nós devem ser adicionados antes das arestas.")
-        self.adjacentes[no_origem].append(Aresta(no_destino, distancia_km, tempoViagem_min))
-        self.adjacentes[no_destino].append(Aresta(no_origem, distancia_km, tempoViagem_min))
+        self.regista_aresta(no_origem, Aresta(no_destino, distancia_km, tempoViagem_min))
+        self.regista_aresta(no_destino, Aresta(no_origem, distancia_km, tempoViagem_min))
+
+    def regista_aresta(self, no_origem: str, aresta: Aresta):
+        """Acrescenta uma aresta dirigida já construída, mantendo o índice atualizado."""
+        self.adjacentes[no_origem].append(aresta)
+        # Com arestas repetidas fica indexada a primeira (mesmo resultado da procura linear)
+        self._indice_arestas.setdefault((no_origem, aresta.no_destino), aresta)
 
     # Devolve a aresta entre dois nodos, se existir.
     def get_aresta(self, no_origem: str, no_dest: str) -> Aresta:
-        for e in self.adjacentes[no_origem]:
-            if e.no_destino == no_dest:
-                return e
-        raise ValueError(f"Não existe aresta de {no_origem} para {no_dest}")
+        aresta = self._indice_arestas.get((no_origem, no_dest))
+        if aresta is None:
+            raise ValueError(f"Não existe aresta de {no_origem} para {no_dest}")
+        return aresta
     
     def vizinhos(self, id_no: str) -> List[Aresta]:
         return self.adjacentes.get(id_no, [])
 
     # Retorna a distância entre dois nós conectados.
     def distancia(self, origem: str, destino: str) -> float:
-        for aresta in self.adjacentes.get(origem, []):
-            if aresta.no_destino == destino:
-                return aresta.distancia_km
-        raise ValueError(f"Nós {origem} e {destino} não estão conectados.")
\ No newline at end of file
+        aresta = self._indice_arestas.get((origem, destino))
+        if aresta is not None:
+            return aresta.distancia_km
+        raise ValueError(f"Nós {origem} e {destino} não estão conectados.")
+
+    def compactar(self):
+        """Devolve uma cópia deste grafo em formato CSR (ver modelo.grafo_compacto)."""
+        from modelo.grafo_compacto import GrafoCompacto
+        return GrafoCompacto.de_grafo(self)
+
+    def guardar_binario(self, caminho: str):
+        """Guarda o grafo no formato binário mapeável (ver modelo.grafo_binario)."""
+        from modelo.grafo_binario import guardar_grafo
+        guardar_grafo(self, caminho)
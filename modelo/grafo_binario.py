@@ -0,0 +1,223 @@
+"""
+Formato binário do grafo da cidade, para carregar por memory-map.
+
+Um ficheiro guarda a tabela de nós, os arrays CSR do GrafoCompacto e uma
+tabela de strings com os ids. Ao carregar, nada é convertido: os arrays são
+vistas (memoryview) sobre o ficheiro mapeado e os nós só são criados quando
+são pedidos. Vários processos que carregam o mesmo ficheiro partilham as
+páginas através da cache do sistema operativo.
+
+O mapeamento é privado (copy-on-write): alterações de trânsito (congestion,
+bloqueadas) e de disponibilidade ficam no processo que as fez e nunca são
+escritas no ficheiro.
+
+Layout (secções alinhadas a 8 bytes, pela ordem de _seccoes):
+    cabeçalho | pos_x pos_y tipos disponivel | offsets_ids ids_utf8 ordem_ids |
+    offsets destinos distancias tempos congestion bloqueadas
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, List, Tuple, Union
+from modelo.grafo import Grafo, No, TipoNo
+from modelo.grafo_compacto import GrafoCompacto
+
+MAGIC = b"TXGRAFO\0"
+VERSAO = 1
+
+# magic, versão, little-endian?, nº nós, nº arestas, bytes da tabela de ids
+_CABECALHO = struct.Struct("<8sIBxxxqqq")
+
+_TIPOS = list(TipoNo)
+
+
+def _seccoes(n_nos: int, n_arestas: int, bytes_ids: int) -> Dict[str, Tuple[int, str, int]]:
+    """nome → (posição no ficheiro, formato, nº de elementos)."""
+    especificacao = [
+        ("pos_x", "d", n_nos),
+        ("pos_y", "d", n_nos),
+        ("tipos", "B", n_nos),
+        ("disponivel", "B", n_nos),
+        ("offsets_ids", "q", n_nos + 1),
+        ("ids_utf8", "B", bytes_ids),
+        ("ordem_ids", "i", n_nos),
+        ("offsets", "i", n_nos + 1),
+        ("destinos", "i", n_arestas),
+        ("distancias", "d", n_arestas),
+        ("tempos", "d", n_arestas),
+        ("congestion", "d", n_arestas),
+        ("bloqueadas", "B", n_arestas),
+    ]
+    seccoes = {}
+    posicao = _CABECALHO.size
+    for nome, formato, contagem in especificacao:
+        posicao = (posicao + 7) & ~7
+        seccoes[nome] = (posicao, formato, contagem)
+        posicao += struct.calcsize(formato) * contagem
+    return seccoes
+
+
+# ==========================================================
+# Escrita
+# ==========================================================
+
+def guardar_grafo(grafo: Union[Grafo, GrafoCompacto], caminho: str):
+    """Escreve o grafo (incluindo congestionamento e bloqueios atuais) no formato binário."""
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = GrafoCompacto.de_grafo(grafo)
+
+    ids = list(grafo.ids)
+    ids_bytes = [id_no.encode("utf-8") for id_no in ids]
+    offsets_ids = array("q", [0])
+    for b in ids_bytes:
+        offsets_ids.append(offsets_ids[-1] + len(b))
+    nos = [grafo.nos[id_no] for id_no in ids]
+
+    dados = {
+        "pos_x": array("d", (no.posicaox for no in nos)),
+        "pos_y": array("d", (no.posicaoy for no in nos)),
+        "tipos": bytes(_TIPOS.index(no.tipo) for no in nos),
+        "disponivel": bytes(1 if no.disponivel else 0 for no in nos),
+        "offsets_ids": offsets_ids,
+        "ids_utf8": b"".join(ids_bytes),
+        "ordem_ids": array("i", sorted(range(len(ids)), key=ids_bytes.__getitem__)),
+        "offsets": array("i", grafo.offsets),
+        "destinos": array("i", grafo.destinos),
+        "distancias": array("d", grafo.distancias),
+        "tempos": array("d", grafo.tempos),
+        "congestion": array("d", grafo.congestion),
+        "bloqueadas": bytes(grafo.bloqueadas),
+    }
+
+    seccoes = _seccoes(len(ids), grafo.num_arestas(), offsets_ids[-1])
+    with open(caminho, "wb") as f:
+        f.write(_CABECALHO.pack(MAGIC, VERSAO, sys.byteorder == "little",
+                                len(ids), grafo.num_arestas(), offsets_ids[-1]))
+        for nome, (posicao, _, _) in seccoes.items():
+            f.write(b"\0" * (posicao - f.tell()))
+            f.write(bytes(dados[nome]))
+
+
+# ==========================================================
+# Leitura
+# ==========================================================
+
+class _IdsBinarios(Sequence):
+    """ids[i] lido da tabela de strings (imita GrafoCompacto.ids)."""
+
+    def __init__(self, offsets_ids: memoryview, ids_utf8: memoryview):
+        self._offsets = offsets_ids
+        self._utf8 = ids_utf8
+
+    def bytes_id(self, i: int) -> bytes:
+        return self._utf8[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.bytes_id(i).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class _IndiceBinario(Mapping):
+    """id → índice por procura binária na ordem guardada (imita GrafoCompacto.indice)."""
+
+    def __init__(self, ids: _IdsBinarios, ordem: memoryview):
+        self._ids = ids
+        self._ordem = ordem
+
+    def __getitem__(self, id_no: str) -> int:
+        if not isinstance(id_no, str):
+            raise KeyError(id_no)
+        alvo = id_no.encode("utf-8")
+        ordem = self._ordem
+        k = bisect_left(range(len(ordem)), alvo, key=lambda k: self._ids.bytes_id(ordem[k]))
+        if k < len(ordem) and self._ids.bytes_id(ordem[k]) == alvo:
+            return ordem[k]
+        raise KeyError(id_no)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class _NosBinarios(Mapping):
+    """
+    id → No criado na primeira consulta e reutilizado depois
+    (alterações a No.disponivel persistem durante a execução).
+    """
+
+    def __init__(self, ids: _IdsBinarios, indice: _IndiceBinario, secoes: Dict[str, memoryview]):
+        self._ids = ids
+        self._indice = indice
+        self._secoes = secoes
+        self._criados: Dict[int, No] = {}
+
+    def _no(self, i: int) -> No:
+        no = self._criados.get(i)
+        if no is None:
+            s = self._secoes
+            no = No(self._ids[i], s["pos_x"][i], s["pos_y"][i],
+                    _TIPOS[s["tipos"][i]], bool(s["disponivel"][i]))
+            self._criados[i] = no
+        return no
+
+    def __getitem__(self, id_no: str) -> No:
+        return self._no(self._indice[id_no])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # Iteração completa por posição (evita uma procura binária por id)
+    def values(self) -> List[No]:
+        return [self._no(i) for i in range(len(self._ids))]
+
+    def items(self) -> List[Tuple[str, No]]:
+        return [(no.id_no, no) for no in self.values()]
+
+
+def carregar_grafo(caminho: str) -> GrafoCompacto:
+    """
+    Mapeia um ficheiro escrito por guardar_grafo e devolve um GrafoCompacto
+    cujos arrays apontam diretamente para o ficheiro.
+    """
+    with open(caminho, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if len(mapa) < _CABECALHO.size:
+        raise ValueError(f"Ficheiro de grafo inválido: {caminho}")
+    magic, versao, little_endian, n_nos, n_arestas, bytes_ids = _CABECALHO.unpack_from(mapa)
+    if magic != MAGIC:
+        raise ValueError(f"Ficheiro de grafo inválido: {caminho}")
+    if versao != VERSAO:
+        raise ValueError(f"Versão do formato não suportada: {versao} (esperada {VERSAO})")
+    if bool(little_endian) != (sys.byteorder == "little"):
+        raise ValueError("Ficheiro de grafo escrito numa máquina com outra ordem de bytes")
+
+    vista = memoryview(mapa)
+    secoes: Dict[str, memoryview] = {}
+    for nome, (posicao, formato, contagem) in _seccoes(n_nos, n_arestas, bytes_ids).items():
+        tamanho = struct.calcsize(formato) * contagem
+        secoes[nome] = vista[posicao:posicao + tamanho].cast(formato)
+
+    ids = _IdsBinarios(secoes["offsets_ids"], secoes["ids_utf8"])
+    indice = _IndiceBinario(ids, secoes["ordem_ids"])
+    nos = _NosBinarios(ids, indice, secoes)
+
+    grafo = GrafoCompacto(nos, ids, secoes["offsets"], secoes["destinos"], secoes["distancias"],
+                          secoes["tempos"], secoes["congestion"], secoes["bloqueadas"], indice=indice)
+    grafo._mapa = mapa  # mantém o mapeamento vivo enquanto o grafo existir
+    return grafo
@@ -0,0 +1,261 @@
+"""
+Representação compacta (CSR) do grafo da cidade.
+
+Os ids dos nós são convertidos em inteiros e as arestas ficam guardadas em
+arrays contíguos (offsets, destinos, distância, tempo base, congestionamento e
+bloqueio), em vez de listas de objetos Aresta.
+
+Mantém a interface de Grafo (nos, adjacentes, vizinhos, get_aresta, distancia),
+por isso GestorFrota, GestorTransito e a interface funcionam sem alterações.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+from modelo.grafo import Grafo, No, Aresta
+
+
+class ArestaCompacta:
+    """
+    Vista sobre uma aresta guardada nos arrays do GrafoCompacto.
+    Tem os mesmos atributos de Aresta; congestion e blocked escrevem nos arrays.
+    """
+
+    __slots__ = ("_grafo", "_indice")
+
+    def __init__(self, grafo: "GrafoCompacto", indice: int):
+        self._grafo = grafo
+        self._indice = indice
+
+    @property
+    def no_destino(self) -> str:
+        return self._grafo.ids[self._grafo.destinos[self._indice]]
+
+    @property
+    def distancia_km(self) -> float:
+        return self._grafo.distancias[self._indice]
+
+    @property
+    def tempoViagem_min(self) -> float:
+        return self._grafo.tempos[self._indice]
+
+    @property
+    def congestion(self) -> float:
+        return self._grafo.congestion[self._indice]
+
+    @congestion.setter
+    def congestion(self, valor: float):
+        self._grafo.congestion[self._indice] = valor
+
+    @property
+    def blocked(self) -> bool:
+        return bool(self._grafo.bloqueadas[self._indice])
+
+    @blocked.setter
+    def blocked(self, valor: bool):
+        self._grafo.bloqueadas[self._indice] = 1 if valor else 0
+
+    def tempo_real(self) -> float:
+        """Retorna tempo de viagem considerando congestionamento"""
+        return self._grafo.custo_aresta(self._indice)
+
+    def __eq__(self, outra) -> bool:
+        return (isinstance(outra, ArestaCompacta)
+                and outra._grafo is self._grafo and outra._indice == self._indice)
+
+    def __hash__(self) -> int:
+        return hash((id(self._grafo), self._indice))
+
+    def __repr__(self) -> str:
+        return (f"ArestaCompacta(no_destino={self.no_destino!r}, distancia_km={self.distancia_km}, "
+                f"tempoViagem_min={self.tempoViagem_min}, congestion={self.congestion}, "
+                f"blocked={self.blocked})")
+
+
+class _AdjacentesCompactos(Mapping):
+    """Vista só de leitura que imita Grafo.adjacentes (id_no → lista de arestas)."""
+
+    def __init__(self, grafo: "GrafoCompacto"):
+        self._grafo = grafo
+
+    def __getitem__(self, id_no: str) -> List[ArestaCompacta]:
+        return self._grafo.vizinhos_indice(self._grafo.indice[id_no])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._grafo.ids)
+
+    def __len__(self) -> int:
+        return len(self._grafo.ids)
+
+
+class GrafoCompacto:
+    """
+    Grafo em formato CSR (Compressed Sparse Row).
+
+    As arestas que saem do nó i ocupam as posições offsets[i]..offsets[i+1]-1
+    dos arrays destinos/distancias/tempos/congestion/bloqueadas.
+
+    Justificação:
+    - Cada Aresta (dataclass) custa centenas de bytes; aqui custa ~29 bytes
+    - Algoritmos podem trabalhar sobre índices inteiros e arrays planos
+    - A estrutura é estática: é construída a partir de um Grafo já montado
+    """
+
+    def __init__(self, nos: Dict[str, No], ids: List[str], offsets: array, destinos: array,
+                 distancias: array, tempos: array, congestion: array = None, bloqueadas: bytearray = None,
+                 indice: Mapping = None):
+        """
+        Os arrays podem ser array/bytearray ou memoryview (ver modelo.grafo_binario);
+        indice (id → posição) é construído a partir de ids se não for dado.
+        """
+        self.nos = nos
+        self.ids = ids
+        self.indice: Dict[str, int] = indice if indice is not None else {id_no: i for i, id_no in enumerate(ids)}
+
+        self.offsets = offsets
+        self.destinos = destinos
+        self.distancias = distancias
+        self.tempos = tempos
+        num_arestas = len(destinos)
+        self.congestion = congestion if congestion is not None else array('d', [1.0]) * num_arestas
+        self.bloqueadas = bloqueadas if bloqueadas is not None else bytearray(num_arestas)
+
+        self.adjacentes = _AdjacentesCompactos(self)
+        self.epoca_transito = 0
+        # Posições das arestas de cada nó ordenadas por destino (criado no primeiro indice_aresta)
+        self._ordem_destinos: array = None
+        self._reversas: array = None  # aresta i→j → primeira aresta j→i (ver arestas_reversas)
+
+    def marcar_alteracao_transito(self):
+        """Assinala que os custos das arestas mudaram (ver Grafo.marcar_alteracao_transito)."""
+        self.epoca_transito += 1
+
+    @classmethod
+    def de_grafo(cls, grafo: Grafo) -> "GrafoCompacto":
+        """Converte um Grafo (listas de Aresta) para CSR, preservando congestionamento e bloqueios."""
+        ids = list(grafo.nos.keys())
+        indice = {id_no: i for i, id_no in enumerate(ids)}
+
+        offsets = array('i', [0])
+        destinos = array('i')
+        distancias = array('d')
+        tempos = array('d')
+        congestion = array('d')
+        bloqueadas = bytearray()
+
+        for id_no in ids:
+            for aresta in grafo.adjacentes.get(id_no, []):
+                destinos.append(indice[aresta.no_destino])
+                distancias.append(aresta.distancia_km)
+                tempos.append(aresta.tempoViagem_min)
+                congestion.append(aresta.congestion)
+                bloqueadas.append(1 if aresta.blocked else 0)
+            offsets.append(len(destinos))
+
+        return cls(dict(grafo.nos), ids, offsets, destinos, distancias, tempos, congestion, bloqueadas)
+
+    def para_grafo(self) -> Grafo:
+        """Reconstrói um Grafo clássico (útil para edição ou exportação)."""
+        g = Grafo()
+        for id_no in self.ids:
+            g.adiciona_no(self.nos[id_no])
+        for i, id_no in enumerate(self.ids):
+            for e in range(self.offsets[i], self.offsets[i + 1]):
+                g.regista_aresta(id_no, Aresta(
+                    self.ids[self.destinos[e]], self.distancias[e], self.tempos[e],
+                    self.congestion[e], bool(self.bloqueadas[e])
+                ))
+        return g
+
+    # ==========================================================
+    # Interface compatível com Grafo
+    # ==========================================================
+
+    def get_no(self, id_no: str) -> No:
+        return self.nos[id_no]
+
+    def vizinhos(self, id_no: str) -> List[ArestaCompacta]:
+        i = self.indice.get(id_no)
+        if i is None:
+            return []
+        return self.vizinhos_indice(i)
+
+    def vizinhos_indice(self, i: int) -> List[ArestaCompacta]:
+        return [ArestaCompacta(self, e) for e in range(self.offsets[i], self.offsets[i + 1])]
+
+    # Devolve a aresta entre dois nodos, se existir.
+    def get_aresta(self, no_origem: str, no_dest: str) -> ArestaCompacta:
+        e = self.indice_aresta(no_origem, no_dest)
+        if e < 0:
+            raise ValueError(f"Não existe aresta de {no_origem} para {no_dest}")
+        return ArestaCompacta(self, e)
+
+    # Retorna a distância entre dois nós conectados.
+    def distancia(self, origem: str, destino: str) -> float:
+        e = self.indice_aresta(origem, destino)
+        if e < 0:
+            raise ValueError(f"Nós {origem} e {destino} não estão conectados.")
+        return self.distancias[e]
+
+    # ==========================================================
+    # Acesso por índices (usado pelos algoritmos)
+    # ==========================================================
+
+    def indice_aresta(self, origem: str, destino: str) -> int:
+        """Posição da primeira aresta origem→destino nos arrays, ou -1 se não existir."""
+        i = self.indice.get(origem)
+        j = self.indice.get(destino)
+        if i is None or j is None:
+            return -1
+        return self.indice_aresta_indices(i, j)
+
+    def indice_aresta_indices(self, i: int, j: int) -> int:
+        """Como indice_aresta, com índices: procura binária nas arestas de i ordenadas por destino."""
+        ordem = self._ordem_destinos if self._ordem_destinos is not None else self._ordenar_destinos()
+        fim = self.offsets[i + 1]
+        k = bisect_left(ordem, j, self.offsets[i], fim, key=self.destinos.__getitem__)
+        if k < fim and self.destinos[ordem[k]] == j:
+            return ordem[k]
+        return -1
+
+    def _ordenar_destinos(self) -> array:
+        """Para cada nó, as posições das suas arestas por ordem de destino (arestas repetidas pela posição)."""
+        destinos = self.destinos
+        ordem = array('i')
+        for i in range(len(self.ids)):
+            ordem.extend(sorted(range(self.offsets[i], self.offsets[i + 1]), key=destinos.__getitem__))
+        self._ordem_destinos = ordem
+        return ordem
+
+    def arestas_reversas(self) -> array:
+        """Para cada aresta i→j, a posição da primeira aresta j→i (-1 se não existir); calculado uma vez."""
+        if self._reversas is None:
+            self._reversas = array('i', (self.indice_aresta_indices(j, i) for i, j, _ in self.arestas_indices()))
+        return self._reversas
+
+    def custo_aresta(self, e: int) -> float:
+        """Tempo real (min) da aresta e, inf se bloqueada."""
+        if self.bloqueadas[e]:
+            return float('inf')
+        return self.tempos[e] * self.congestion[e]
+
+    def num_arestas(self) -> int:
+        return len(self.destinos)
+
+    def memoria_arrays_bytes(self) -> int:
+        """Memória ocupada pelos arrays CSR (sem contar os objetos No)."""
+        return (self.offsets.itemsize * len(self.offsets)
+                + self.destinos.itemsize * len(self.destinos)
+                + self.distancias.itemsize * len(self.distancias)
+                + self.tempos.itemsize * len(self.tempos)
+                + self.congestion.itemsize * len(self.congestion)
+                + len(self.bloqueadas))
+
+    def arestas_indices(self) -> Iterator[Tuple[int, int, int]]:
+        """Itera (origem, destino, posição) sobre todas as arestas, em índices."""
+        offsets = self.offsets
+        destinos = self.destinos
+        for i in range(len(self.ids)):
+            for e in range(offsets[i], offsets[i + 1]):
+                yield i, destinos[e], e
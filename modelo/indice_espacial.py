@@ -0,0 +1,274 @@
+"""
+Índice espacial (grelha uniforme) sobre as posições dos nós do grafo.
+
+Substitui percursos lineares por todos os nós em consultas geométricas:
+- k nós mais próximos de um ponto
+- nós dentro de um raio
+- nó mais próximo de um tipo (ex: estação de recarga disponível)
+
+Cada tipo de nó tem a sua própria grelha, com células do tamanho adequado à
+sua densidade (estações são muito mais raras que zonas de recolha). O índice
+é estático: deve ser recriado se forem acrescentados nós ao grafo.
+A disponibilidade (No.disponivel) é verificada no momento da consulta.
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+from modelo.grafo import Grafo, TipoNo
+
+Ponto = Tuple[float, float, str]  # (x, y, id_no)
+
+
+class _Grelha:
+    """Pontos agrupados em células quadradas de lado tamanho_celula."""
+
+    def __init__(self, pontos: List[Ponto], tamanho_celula: Optional[float] = None):
+        self.celulas: Dict[Tuple[int, int], List[Ponto]] = {}
+        self.total = len(pontos)
+        if not pontos:
+            self.tamanho = 1.0
+            self.limites = (0, 0, 0, 0)
+            return
+
+        xs = [p[0] for p in pontos]
+        ys = [p[1] for p in pontos]
+        if tamanho_celula is None:
+            # ~2 pontos por célula
+            area = max((max(xs) - min(xs)) * (max(ys) - min(ys)), 1e-9)
+            tamanho_celula = math.sqrt(2 * area / len(pontos)) or 1.0
+        self.tamanho = tamanho_celula
+
+        for p in pontos:
+            self.celulas.setdefault(self.celula(p[0], p[1]), []).append(p)
+        cxs = [c[0] for c in self.celulas]
+        cys = [c[1] for c in self.celulas]
+        self.limites = (min(cxs), max(cxs), min(cys), max(cys))
+
+    def celula(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.tamanho)), int(math.floor(y / self.tamanho))
+
+    def anel(self, cx: int, cy: int, r: int):
+        """Pontos das células à distância de Chebyshev r da célula (cx, cy)."""
+        celulas = self.celulas
+        if r == 0:
+            yield from celulas.get((cx, cy), ())
+            return
+        for i in range(cx - r, cx + r + 1):
+            yield from celulas.get((i, cy - r), ())
+            yield from celulas.get((i, cy + r), ())
+        for j in range(cy - r + 1, cy + r):
+            yield from celulas.get((cx - r, j), ())
+            yield from celulas.get((cx + r, j), ())
+
+    def k_mais_proximos(self, x: float, y: float, k: int,
+                        filtro: Optional[Callable[[str], bool]] = None) -> List[Tuple[float, str]]:
+        if k <= 0 or not self.total:
+            return []
+        cx, cy = self.celula(x, y)
+        min_cx, max_cx, min_cy, max_cy = self.limites
+        ultimo_anel = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy)
+
+        melhores: List[Tuple[float, str]] = []  # heap de máximo (-distância, id)
+        for r in range(ultimo_anel + 1):
+            for px, py, id_no in self.anel(cx, cy, r):
+                if filtro is not None and not filtro(id_no):
+                    continue
+                d = math.hypot(px - x, py - y)
+                if len(melhores) < k:
+                    heapq.heappush(melhores, (-d, id_no))
+                elif d < -melhores[0][0]:
+                    heapq.heapreplace(melhores, (-d, id_no))
+            # Qualquer ponto fora dos anéis 0..r está a pelo menos r × tamanho
+            if len(melhores) == k and -melhores[0][0] <= r * self.tamanho:
+                break
+
+        return sorted((-d, id_no) for d, id_no in melhores)
+
+    def no_raio(self, x: float, y: float, raio: float) -> List[Tuple[float, str]]:
+        if not self.total or raio < 0:
+            return []
+        cx, cy = self.celula(x, y)
+        alcance = int(math.ceil(raio / self.tamanho))
+
+        if (2 * alcance + 1) ** 2 > len(self.celulas):
+            candidatos = (p for pontos in self.celulas.values() for p in pontos)
+        else:
+            candidatos = (p for i in range(cx - alcance, cx + alcance + 1)
+                          for j in range(cy - alcance, cy + alcance + 1)
+                          for p in self.celulas.get((i, j), ()))
+
+        resultado = []
+        for px, py, id_no in candidatos:
+            d = math.hypot(px - x, py - y)
+            if d <= raio:
+                resultado.append((d, id_no))
+        resultado.sort()
+        return resultado
+
+
+class IndiceEspacial:
+    """
+    Uso:
+        indice = IndiceEspacial(grafo)
+        indice.k_mais_proximos(x, y, k=3)
+        indice.no_raio_do_no("Centro", 2.0)
+        indice.mais_proximo(x, y, tipo=TipoNo.ESTACAO_RECARGA, apenas_disponiveis=True)
+    """
+
+    def __init__(self, grafo: Grafo, tamanho_celula: Optional[float] = None):
+        self.grafo = grafo
+        pontos = [(no.posicaox, no.posicaoy, no_id) for no_id, no in grafo.nos.items()]
+        self._todos = _Grelha(pontos, tamanho_celula)
+
+        por_tipo: Dict[TipoNo, List[Ponto]] = {}
+        for x, y, no_id in pontos:
+            por_tipo.setdefault(grafo.nos[no_id].tipo, []).append((x, y, no_id))
+        self._por_tipo = {tipo: _Grelha(p) for tipo, p in por_tipo.items()}
+
+    def _grelha(self, tipo: Optional[TipoNo]) -> Optional[_Grelha]:
+        return self._todos if tipo is None else self._por_tipo.get(tipo)
+
+    def _filtro(self, apenas_disponiveis: bool, excluir: Optional[str]) -> Optional[Callable[[str], bool]]:
+        if not apenas_disponiveis and excluir is None:
+            return None
+        nos = self.grafo.nos
+        return lambda no_id: no_id != excluir and (not apenas_disponiveis or nos[no_id].disponivel)
+
+    # ==========================================================
+    # Consultas por coordenadas
+    # ==========================================================
+
+    def k_mais_proximos(self, x: float, y: float, k: int = 1, tipo: Optional[TipoNo] = None,
+                        apenas_disponiveis: bool = False,
+                        excluir: Optional[str] = None) -> List[Tuple[float, str]]:
+        """Até k pares (distância_km, id_no), do mais próximo para o mais afastado."""
+        grelha = self._grelha(tipo)
+        if grelha is None:
+            return []
+        return grelha.k_mais_proximos(x, y, k, self._filtro(apenas_disponiveis, excluir))
+
+    def mais_proximo(self, x: float, y: float, tipo: Optional[TipoNo] = None,
+                     apenas_disponiveis: bool = False, excluir: Optional[str] = None) -> Optional[str]:
+        """Id do nó mais próximo (opcionalmente de um tipo e disponível), ou None."""
+        resultado = self.k_mais_proximos(x, y, 1, tipo, apenas_disponiveis, excluir)
+        return resultado[0][1] if resultado else None
+
+    def no_raio(self, x: float, y: float, raio_km: float,
+                tipo: Optional[TipoNo] = None) -> List[Tuple[float, str]]:
+        """Pares (distância_km, id_no) a distância <= raio_km, ordenados por distância."""
+        grelha = self._grelha(tipo)
+        if grelha is None:
+            return []
+        return grelha.no_raio(x, y, raio_km)
+
+    # ==========================================================
+    # Consultas a partir de um nó
+    # ==========================================================
+
+    def posicao(self, no_id: str) -> Tuple[float, float]:
+        no = self.grafo.nos[no_id]
+        return no.posicaox, no.posicaoy
+
+    def no_raio_do_no(self, no_id: str, raio_km: float, tipo: Optional[TipoNo] = None) -> List[Tuple[float, str]]:
+        return self.no_raio(*self.posicao(no_id), raio_km, tipo)
+
+    def mais_proximo_do_no(self, no_id: str, tipo: Optional[TipoNo] = None,
+                           apenas_disponiveis: bool = False) -> Optional[str]:
+        """Nó mais próximo de no_id (excluindo o próprio)."""
+        return self.mais_proximo(*self.posicao(no_id), tipo, apenas_disponiveis, excluir=no_id)
+
+
+class _Candidato(tuple):
+    """(distância, id_veiculo, veículo) com ordem invertida, para usar heapq como heap de máximo."""
+
+    def __lt__(self, outro):
+        return (self[0], self[1]) > (outro[0], outro[1])
+
+
+class IndiceVeiculos:
+    """
+    Posições atuais dos veículos numa grelha, atualizada a cada movimento
+    (Veiculo.move chama atualizar através de Veiculo.observador_posicao).
+
+    Os veículos estão sempre em nós do grafo, por isso as coordenadas vêm do
+    IndiceEspacial dos nós. As células são maiores que as dos nós porque há
+    muito menos veículos do que nós.
+    """
+
+    def __init__(self, indice_nos: IndiceEspacial, tamanho_celula: Optional[float] = None):
+        self.indice_nos = indice_nos
+        self.tamanho = tamanho_celula or 4 * indice_nos._todos.tamanho
+        self._celulas: Dict[Tuple[int, int], Dict[str, object]] = {}
+        self._celula_de: Dict[str, Tuple[int, int]] = {}
+
+        nos = indice_nos.grafo.nos.values()
+        if nos:
+            xs = [no.posicaox for no in nos]
+            ys = [no.posicaoy for no in nos]
+            self.limites = (*self._celula(min(xs), min(ys)), *self._celula(max(xs), max(ys)))
+        else:
+            self.limites = (0, 0, 0, 0)
+
+    def _celula(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.tamanho)), int(math.floor(y / self.tamanho))
+
+    def atualizar(self, veiculo):
+        """Regista (ou move) o veículo para a célula da sua posição atual."""
+        celula = self._celula(*self.indice_nos.posicao(veiculo.posicao))
+        anterior = self._celula_de.get(veiculo.id_veiculo)
+        if anterior == celula:
+            return
+        if anterior is not None:
+            self._retirar(veiculo.id_veiculo, anterior)
+        self._celulas.setdefault(celula, {})[veiculo.id_veiculo] = veiculo
+        self._celula_de[veiculo.id_veiculo] = celula
+
+    def remover(self, id_veiculo: str):
+        celula = self._celula_de.pop(id_veiculo, None)
+        if celula is not None:
+            self._retirar(id_veiculo, celula)
+
+    def _retirar(self, id_veiculo: str, celula: Tuple[int, int]):
+        veiculos = self._celulas[celula]
+        del veiculos[id_veiculo]
+        if not veiculos:
+            del self._celulas[celula]
+
+    def __len__(self) -> int:
+        return len(self._celula_de)
+
+    def k_mais_proximos(self, x: float, y: float, k: int,
+                        filtro: Optional[Callable[[object], bool]] = None) -> List[Tuple[float, object]]:
+        """
+        Até k pares (distância_km, veículo) que passam o filtro, do mais próximo
+        para o mais afastado (distância euclidiana da posição atual).
+        """
+        if k <= 0 or not self._celula_de:
+            return []
+        cx, cy = self._celula(x, y)
+        min_cx, min_cy, max_cx, max_cy = self.limites
+        ultimo_anel = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy, 0)
+
+        melhores: List[_Candidato] = []  # o pior (mais afastado, maior id) no topo
+        for r in range(ultimo_anel + 1):
+            if r == 0:
+                celulas = [(cx, cy)]
+            else:
+                celulas = [(i, j) for i in range(cx - r, cx + r + 1) for j in (cy - r, cy + r)]
+                celulas += [(i, j) for i in (cx - r, cx + r) for j in range(cy - r + 1, cy + r)]
+            for celula in celulas:
+                for veiculo in self._celulas.get(celula, {}).values():
+                    if filtro is not None and not filtro(veiculo):
+                        continue
+                    px, py = self.indice_nos.posicao(veiculo.posicao)
+                    entrada = _Candidato((math.hypot(px - x, py - y), veiculo.id_veiculo, veiculo))
+                    if len(melhores) < k:
+                        heapq.heappush(melhores, entrada)
+                    elif melhores[0] < entrada:
+                        heapq.heapreplace(melhores, entrada)
+            # Em empate de distância ganha o menor id, por isso só se pára com folga estrita
+            if len(melhores) == k and melhores[0][0] < r * self.tamanho:
+                break
+
+        return [(d, v) for d, _, v in sorted(melhores, reverse=True)]
@@ -3,8 +3,9 @@ Modelo de veículo (elétrico ou a combustão).
 Contém propriedades de autonomia, consumo e custo por km.
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Callable, Optional
 from modelo.grafo import Grafo, TipoNo
 
 class EstadoVeiculo(Enum):
@@ -30,6 +31,12 @@ class Veiculo(ABC):
     tempo_ocupado_ate: int = 0              # tempo até ficar disponível (minutos simulação)
     id_pedido_atual: str = None             # id do pedido que está a servir atualmente
     rota: list[str] = None                  # rota atual (lista de nós)
+    paragens: list[str] = None              # paragens obrigatórias ainda por visitar (ex: estação, pickup, destino)
+    paragens_recarga: list[bool] = None     # paralela a paragens: True nas paragens para recarregar
+    recarga_pendente: bool = False          # chegou a uma paragem de recarga planeada
+    estado_apos_recarga: EstadoVeiculo = None  # estado a retomar após recarga a meio da rota
+    # chamado após cada mudança de posição (ex: IndiceVeiculos.atualizar)
+    observador_posicao: Optional[Callable[["Veiculo"], None]] = field(default=None, repr=False, compare=False)
            
     def consegue_percorrer(self, distancia_km: float) -> bool:
         return self.autonomia_km >= distancia_km
@@ -42,6 +49,8 @@ class Veiculo(ABC):
         self.autonomia_km = max(0.0, self.autonomia_km - distancia_km)
         self.posicao = no_destino
         self.km_total += distancia_km
+        if self.observador_posicao is not None:
+            self.observador_posicao(self)
 
         if not com_passageiros:
             self.km_sem_passageiros += distancia_km
@@ -75,9 +84,13 @@ class Veiculo(ABC):
 
         return True, custo_recarga, tempo_ocupacao
     
-    def definir_rota(self, rota: list[str]):
+    def definir_rota(self, rota: list[str], paragens: list[str] = None, recargas: list[bool] = None):
         self.rota = rota
         self.indice_rota = 0
+        # Sem paragens explícitas, a única obrigatória é o fim da rota
+        self.paragens = list(paragens) if paragens else ([rota[-1]] if rota else [])
+        self.paragens_recarga = list(recargas) if recargas else [False] * len(self.paragens)
+        self.recarga_pendente = False
 
     # Move veículo um passo na rota com gestão correta de estados - Retorna: (moveu_com_sucesso, chegou_ao_destino)
     def mover_um_passo(self, grafo: Grafo, tempo_atual: int):
@@ -86,7 +99,8 @@ class Veiculo(ABC):
             return False, False
         
         if self.estado in (EstadoVeiculo.A_CARREGAR, EstadoVeiculo.A_ABASTECER):
-            self.estado = EstadoVeiculo.DISPONIVEL
+            self.estado = self.estado_apos_recarga or EstadoVeiculo.DISPONIVEL
+            self.estado_apos_recarga = None
             return False, False
         
         if not self.rota or self.indice_rota >= len(self.rota) - 1:
@@ -100,6 +114,10 @@ class Veiculo(ABC):
 
         self.move(aresta.distancia_km, prox_no, com_passageiros)
         self.indice_rota += 1
+        while self.paragens and self.posicao == self.paragens[0]:
+            self.paragens.pop(0)
+            if self.paragens_recarga and self.paragens_recarga.pop(0):
+                self.recarga_pendente = True
 
         # Define tempo ocupado até o veículo chegar ao próximo nó
         tempo_viagem = int(aresta.tempo_real())
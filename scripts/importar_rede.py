@@ -0,0 +1,49 @@
+"""
+Importa uma rede viária real e guarda-a no formato binário.
+
+Uso:
+    python3 scripts/importar_rede.py zona.osm zona.bin
+    python3 scripts/importar_rede.py zona.geojsonl.gz zona.bin
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Adiciona raiz ao path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fabrica.importador_osm import ImportadorRede
+from modelo.grafo import TipoNo
+from modelo.grafo_binario import guardar_grafo
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        return 2
+
+    origem, destino = sys.argv[1], sys.argv[2]
+
+    inicio = time.perf_counter()
+    grafo = ImportadorRede.importar(origem, compacto=True)
+    duracao = time.perf_counter() - inicio
+
+    tipos = {}
+    for no in grafo.nos.values():
+        tipos[no.tipo] = tipos.get(no.tipo, 0) + 1
+
+    print(f"Rede importada em {duracao:.1f}s:")
+    print(f"  {tipos.get(TipoNo.RECOLHA_PASSAGEIROS, 0)} cruzamentos")
+    print(f"  {tipos.get(TipoNo.ESTACAO_RECARGA, 0)} estações de recarga")
+    print(f"  {tipos.get(TipoNo.POSTO_ABASTECIMENTO, 0)} postos de abastecimento")
+    print(f"  {grafo.num_arestas()} arestas")
+
+    guardar_grafo(grafo, destino)
+    print(f"Grafo guardado em {destino}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
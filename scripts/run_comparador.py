@@ -1,4 +1,24 @@
+"""
+Compara algoritmos de procura.
+
+Uso:
+    python3 scripts/run_comparador.py                       # comparação simples (1 execução)
+    python3 scripts/run_comparador.py --benchmark           # mediana/p95/IQR numa matriz de cenários
+    python3 scripts/run_comparador.py --benchmark --guardar base.json
+    python3 scripts/run_comparador.py --benchmark --baseline base.json --limiar 0.15
+    python3 scripts/run_comparador.py --benchmark --cidade grelha --nos 10000  # cidade sintética
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Adiciona raiz ao path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
 from fabrica.grafo_demo import GrafoDemo
+from fabrica.cidade_sintetica import CidadeSintetica, TIPOS_CIDADE
 from gestao.algoritmos_procura.bfs import bfs
 from gestao.algoritmos_procura.dfs import dfs
 from gestao.algoritmos_procura.ucs import uniform_cost_search
@@ -6,32 +26,89 @@ from gestao.algoritmos_procura.a_estrela import a_star_search
 from gestao.algoritmos_procura.greedy import greedy
 from gestao.comparador_algoritmos import ComparadorAlgoritmos, CenarioTeste
 
-# 1. Carregar ou montar o grafo
-g = GrafoDemo.criar_grafo_demo()# caso não exista, usar carregamento real
 
-# 2. Instanciar comparador
-comparador = ComparadorAlgoritmos(g)
+# Matriz de cenários do modo benchmark (curta, média e longa distância)
+CENARIOS_BENCHMARK = [
+    CenarioTeste("Centro → Shopping", "Centro", "Shopping", "Curta distância"),
+    CenarioTeste("Centro → Aeroporto", "Centro", "Aeroporto", "Trajeto comum"),
+    CenarioTeste("Porto → Escola_Norte", "Porto", "Escola_Norte", "Atravessa a cidade"),
+    CenarioTeste("Suburbio_Oeste2 → Aeroporto", "Suburbio_Oeste2", "Aeroporto", "Extremos opostos"),
+]
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Comparação de algoritmos de procura")
+    parser.add_argument("--benchmark", action="store_true", help="Modo benchmark (várias execuções por cenário)")
+    parser.add_argument("--repeticoes", type=int, default=30, help="Execuções cronometradas por algoritmo")
+    parser.add_argument("--aquecimento", type=int, default=3, help="Execuções descartadas antes de medir")
+    parser.add_argument("--sem-variante-gc", action="store_true", help="Não repetir medições com o GC desligado")
+    parser.add_argument("--cpu", type=int, nargs="+", help="Fixar o processo nestes CPUs (Linux)")
+    parser.add_argument("--guardar", help="Guardar resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--limiar", type=float, default=0.10, help="Aumento relativo da mediana que conta como regressão")
+    parser.add_argument("--cidade", choices=TIPOS_CIDADE, help="Usar uma cidade sintética em vez do grafo demo")
+    parser.add_argument("--nos", type=int, default=10_000, help="Número de nós da cidade sintética")
+    parser.add_argument("--pares", type=int, default=4, help="Cenários (origem, destino) na cidade sintética")
+    parser.add_argument("--semente", type=int, default=0, help="Semente da cidade sintética")
+    return parser.parse_args()
+
+
+def main():
+    args = ler_argumentos()
+
+    # 1. Carregar ou montar o grafo
+    if args.cidade:
+        g = CidadeSintetica.criar(args.cidade, args.nos, semente=args.semente)
+        cenarios = [
+            CenarioTeste(f"{origem} → {destino}", origem, destino, f"{args.cidade} {args.nos} nós")
+            for origem, destino in CidadeSintetica.pares_aleatorios(g, args.pares, semente=args.semente)
+        ]
+    else:
+        g = GrafoDemo.criar_grafo_demo()
+        cenarios = CENARIOS_BENCHMARK
+
+    # 2. Instanciar comparador
+    comparador = ComparadorAlgoritmos(g)
+
+    # 3. Registrar algoritmos
+    algos = {
+        "BFS": bfs,
+        "DFS": dfs,
+        "UCS": uniform_cost_search,
+        "A*": a_star_search,
+        'Greedy': greedy
+    }
+
+    if not args.benchmark:
+        # Comparação simples
+        resultados = comparador.comparar_multiplos(algos, cenarios[1 if len(cenarios) > 1 else 0])
+        print(comparador.gerar_relatorio_texto())
+        return 0
+
+    if args.cpu and not comparador.fixar_cpu(args.cpu):
+        print("Aviso: afinidade de CPU não suportada neste sistema.")
+
+    resultados = comparador.benchmark_matriz(
+        algos, cenarios,
+        aquecimento=args.aquecimento,
+        repeticoes=args.repeticoes,
+        variante_sem_gc=not args.sem_variante_gc
+    )
+
+    regressoes = None
+    if args.baseline:
+        baseline = comparador.carregar_benchmark(args.baseline)
+        regressoes = comparador.comparar_com_baseline(resultados, baseline, limiar=args.limiar)
 
-# 3. Definir cenário
-cenario = CenarioTeste(
-    nome="Centro → Aeroporto",
-    origem="Centro",
-    destino="Aeroporto",
-    descricao="Trajeto comum"
-)
+    print(comparador.gerar_relatorio_benchmark(resultados, regressoes))
 
+    if args.guardar:
+        comparador.guardar_benchmark(resultados, args.guardar)
+        print(f"Resultados guardados em {args.guardar}")
 
-# 4. Registrar algoritmos
-algos = {
-    "BFS": bfs,
-    "DFS": dfs,
-    "UCS": uniform_cost_search,
-    "A*": a_star_search,
-    'Greedy': greedy
-}
+    # Código de saída != 0 permite usar o script como verificação de desempenho
+    return 1 if regressoes else 0
 
-# 5. Rodar
-resultados = comparador.comparar_multiplos(algos, cenario)
 
-# 6. Mostrar relatório
-print(comparador.gerar_relatorio_texto())
+if __name__ == "__main__":
+    sys.exit(main())
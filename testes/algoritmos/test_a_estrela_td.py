@@ -0,0 +1,93 @@
+"""
+Testes de Algoritmos de Procura - A* dependente do tempo
+"""
+
+import unittest
+from gestao.algoritmos_procura.a_estrela_td import PerfilTransito, a_star_tempo_dependente
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+from gestao.gestor_frota import GestorFrota
+from testes.test_config import ConfigTestes
+
+
+class TestAEstrelaTempoDependente(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+
+    def test_tabela_igual_atualizar_transito(self):
+        """Testa que a tabela horária dá os mesmos factores que atualizar_transito."""
+        transito = GestorTransito(self.grafo, hora_inicial=0)
+        tabela = transito.tabela_factores()
+
+        for hora in (3, 8, 12, 18):
+            transito.atualizar_transito(hora * 60)
+            for origem, arestas in self.grafo.adjacentes.items():
+                for aresta in arestas:
+                    self.assertEqual(tabela[(origem, aresta.no_destino)][hora], aresta.congestion)
+
+    def test_travessia_muda_de_hora(self):
+        """Testa aresta que começa às 16h (factor 1.0) e acaba no rush (2.0)."""
+        perfil = PerfilTransito(GestorTransito(self.grafo, hora_inicial=16))
+        aresta = self.grafo.get_aresta("Industrial", "Porto")  # 2.0 min base
+
+        self.assertAlmostEqual(perfil.tempo_travessia("Industrial", aresta, 10), 2.0)
+        # 1 min a 1.0 (metade da aresta) + metade a 2.0 (2 min)
+        self.assertAlmostEqual(perfil.tempo_travessia("Industrial", aresta, 59), 3.0)
+        self.assertAlmostEqual(perfil.tempo_travessia("Industrial", aresta, 60), 4.0)
+
+    def test_fifo(self):
+        """Testa que sair mais tarde nunca faz chegar mais cedo."""
+        perfil = PerfilTransito(GestorTransito(self.grafo, hora_inicial=15))
+        chegadas = [
+            t + a_star_tempo_dependente(perfil, "Suburbio_Oeste2", "Aeroporto", instante_partida=t)[0]
+            for t in range(0, 180, 3)
+        ]
+        self.assertEqual(chegadas, sorted(chegadas))
+
+    def test_hora_constante_igual_ucs(self):
+        """Sem mudança de factor durante a viagem, dá o mesmo que UCS sobre o snapshot."""
+        transito = GestorTransito(self.grafo, hora_inicial=14)
+        transito.atualizar_transito(0)
+        perfil = PerfilTransito(transito)
+
+        for origem, destino in [("Centro", "Aeroporto"), ("Porto", "Escola_Norte")]:
+            custo, _ = uniform_cost_search(self.grafo, origem, destino)
+            custo_td, caminho = a_star_tempo_dependente(perfil, origem, destino)
+            self.assertAlmostEqual(custo, custo_td)
+            self.assertEqual((caminho[0], caminho[-1]), (origem, destino))
+
+    def test_gestor_frota_entra_no_rush(self):
+        """Testa que astar_td custa mais do que o snapshot numa viagem que entra no rush."""
+        transito = GestorTransito(self.grafo, hora_inicial=16)
+        transito.atualizar_transito(50)
+
+        gestor = GestorFrota(self.grafo)
+        gestor.definir_algoritmo_procura("ucs")
+        _, custo_snapshot = gestor.calcular_rota("Suburbio_Oeste2", "Aeroporto")
+
+        gestor.definir_perfil_transito(transito)
+        gestor.definir_algoritmo_procura("astar_td")
+        caminho, custo_td = gestor.calcular_rota("Suburbio_Oeste2", "Aeroporto")
+
+        self.assertTrue(caminho)
+        self.assertGreater(custo_td, custo_snapshot)
+
+    def test_hora_inicial_reconfigurada(self):
+        """Testa que o perfil segue hora_inicial alterada depois de criado (Simulador.configurar)."""
+        from gestao.simulador import Simulador
+
+        gestor = GestorFrota(self.grafo)
+        simulador = Simulador(gestor, usar_falhas=False, usar_ride_sharing=False)
+        simulador.configurar({'hora_inicial': 8})
+
+        perfil = gestor.perfil_transito
+        self.assertEqual(perfil.hora(0), 8)
+        self.assertEqual(perfil.hora(125), 10)
+        aresta = self.grafo.get_aresta("Industrial", "Porto")
+        self.assertAlmostEqual(perfil.tempo_travessia("Industrial", aresta, 0),
+                               aresta.tempoViagem_min * perfil.factores[("Industrial", "Porto")][8])
+
+
+if __name__ == '__main__':
+    unittest.main()
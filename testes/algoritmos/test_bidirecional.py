@@ -0,0 +1,69 @@
+"""
+Testes de Algoritmos de Procura - Dijkstra bidirecional
+"""
+
+import unittest
+from gestao.algoritmos_procura.bidirecional import bidirectional_search
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+
+class TestBidirecional(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+
+    def test_otimalidade_todos_pares(self):
+        """Testa que o custo é igual ao do UCS para todos os pares."""
+        nos = list(self.grafo.nos)
+        for origem in nos:
+            for destino in nos:
+                custo_ucs, _ = uniform_cost_search(self.grafo, origem, destino)
+                custo, caminho = bidirectional_search(self.grafo, origem, destino)
+
+                self.assertAlmostEqual(custo, custo_ucs, places=6, msg=f"{origem}→{destino}")
+                self.assertEqual(caminho[0], origem)
+                self.assertEqual(caminho[-1], destino)
+
+    def test_caminho_consistente_com_custo(self):
+        """Testa que o custo devolvido corresponde ao caminho."""
+        custo, caminho = bidirectional_search(self.grafo, "Suburbio_Oeste2", "Aeroporto")
+        soma = sum(self.grafo.get_aresta(a, b).tempo_real() for a, b in zip(caminho, caminho[1:]))
+        self.assertAlmostEqual(custo, soma)
+
+    def test_respeita_bloqueios_e_transito(self):
+        """Testa que arestas bloqueadas e congestionamento são considerados."""
+        transito = GestorTransito(self.grafo, hora_inicial=8)
+        transito.atualizar_transito(0)
+        transito.simular_bloqueio("Estação_Metro", "Bairro_Este")
+
+        custo, caminho = bidirectional_search(self.grafo, "Centro", "Aeroporto")
+        custo_ucs, _ = uniform_cost_search(self.grafo, "Centro", "Aeroporto")
+
+        self.assertAlmostEqual(custo, custo_ucs)
+        pares = list(zip(caminho, caminho[1:]))
+        self.assertNotIn(("Estação_Metro", "Bairro_Este"), pares)
+
+    def test_sem_caminho(self):
+        """Testa nó isolado por bloqueios."""
+        for aresta in self.grafo.vizinhos("Porto"):
+            GestorTransito(self.grafo, hora_inicial=12).simular_bloqueio("Porto", aresta.no_destino)
+
+        custo, caminho = bidirectional_search(self.grafo, "Centro", "Porto")
+        self.assertEqual(custo, float('inf'))
+        self.assertEqual(caminho, [])
+
+    def test_selecionavel_no_gestor(self):
+        """Testa seleção via GestorFrota.definir_algoritmo_procura."""
+        gestor = GestorFrota(self.grafo)
+        gestor.definir_algoritmo_procura("bidirecional")
+
+        caminho, custo = gestor.calcular_rota("Suburbio_Oeste2", "Aeroporto")
+        custo_ucs, _ = uniform_cost_search(self.grafo, "Suburbio_Oeste2", "Aeroporto")
+        self.assertAlmostEqual(custo, custo_ucs)
+
+
+if __name__ == '__main__':
+    unittest.main()
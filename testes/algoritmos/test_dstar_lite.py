@@ -0,0 +1,77 @@
+"""
+Testes de Algoritmos de Procura - D* Lite (replaneamento incremental)
+"""
+
+import unittest
+from gestao.algoritmos_procura.dstar_lite import PlaneadorDStarLite
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+
+class TestDStarLite(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.transito = GestorTransito(self.grafo, hora_inicial=8)
+        self.transito.atualizar_transito(0)
+        self.transito.consumir_alteracoes()
+
+    def test_igual_ucs(self):
+        """Testa custo e caminho iniciais."""
+        for origem, destino in [("Centro", "Aeroporto"), ("Porto", "Escola_Norte"), ("Suburbio_Oeste2", "Hospital")]:
+            planeador = PlaneadorDStarLite(self.grafo, origem, destino)
+            custo, _ = uniform_cost_search(self.grafo, origem, destino)
+            caminho = planeador.caminho()
+
+            self.assertAlmostEqual(planeador.custo(), custo)
+            self.assertEqual((caminho[0], caminho[-1]), (origem, destino))
+
+    def test_bloqueio_e_desbloqueio(self):
+        """Testa reparação após bloquear e desbloquear uma aresta do caminho."""
+        planeador = PlaneadorDStarLite(self.grafo, "Porto", "Hospital")
+        caminho = planeador.caminho()
+        u, v = caminho[1], caminho[2]
+
+        self.transito.simular_bloqueio(u, v)
+        planeador.atualizar_arestas(self.transito.consumir_alteracoes())
+        custo, _ = uniform_cost_search(self.grafo, "Porto", "Hospital")
+        self.assertAlmostEqual(planeador.custo(), custo)
+        novo = planeador.caminho()
+        self.assertNotIn((u, v), list(zip(novo, novo[1:])))
+
+        self.transito.simular_bloqueio(u, v, bloquear=False)
+        planeador.atualizar_arestas(self.transito.consumir_alteracoes())
+        self.assertEqual(planeador.caminho(), caminho)
+
+    def test_mover_origem(self):
+        """Testa avanço do veículo sem refazer a procura."""
+        planeador = PlaneadorDStarLite(self.grafo, "Porto", "Hospital")
+        caminho = planeador.caminho()
+        expansoes = planeador.expansoes
+
+        planeador.mover_origem(caminho[1])
+        self.assertEqual(planeador.caminho(), caminho[1:])
+        self.assertEqual(planeador.expansoes, expansoes)
+
+    def test_reparacao_local_mais_barata(self):
+        """Testa que uma alteração longe do caminho custa menos que a procura inicial."""
+        planeador = PlaneadorDStarLite(self.grafo, "Porto", "Industrial")
+        expansoes_iniciais = planeador.expansoes
+
+        self.transito.simular_bloqueio("Posto_Norte", "Escola_Norte")
+        planeador.atualizar_arestas(self.transito.consumir_alteracoes())
+
+        self.assertLess(planeador.expansoes - expansoes_iniciais, expansoes_iniciais)
+        self.assertEqual(planeador.caminho(), ["Porto", "Industrial"])
+
+    def test_sem_caminho(self):
+        """Testa destino isolado."""
+        for aresta in self.grafo.vizinhos("Porto"):
+            self.transito.simular_bloqueio("Porto", aresta.no_destino)
+        planeador = PlaneadorDStarLite(self.grafo, "Centro", "Porto")
+        self.assertEqual(planeador.caminho(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
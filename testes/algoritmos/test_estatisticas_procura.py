@@ -0,0 +1,84 @@
+"""
+Testes de Algoritmos de Procura - Instrumentação (EstatisticasProcura)
+"""
+
+import unittest
+from gestao.algoritmos_procura.estatisticas import EstatisticasProcura
+from gestao.algoritmos_procura.a_estrela import a_star_search
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.algoritmos_procura.bfs import bfs
+from gestao.algoritmos_procura.dfs import dfs
+from gestao.algoritmos_procura.greedy import greedy
+from gestao.comparador_algoritmos import ComparadorAlgoritmos, CenarioTeste
+from modelo.grafo_compacto import GrafoCompacto
+from testes.test_config import ConfigTestes
+
+
+class TestEstatisticasProcura(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.algoritmos = {
+            "A*": a_star_search,
+            "Greedy": greedy,
+            "UCS": uniform_cost_search,
+            "BFS": bfs,
+            "DFS": dfs
+        }
+
+    def test_resultado_nao_muda(self):
+        """Testa que passar estatisticas não altera o caminho devolvido."""
+        for nome, funcao in self.algoritmos.items():
+            with self.subTest(algoritmo=nome):
+                sem = funcao(self.grafo, "Centro", "Aeroporto")
+                com = funcao(self.grafo, "Centro", "Aeroporto", estatisticas=EstatisticasProcura())
+                self.assertEqual(sem, com)
+
+    def test_contadores_coerentes(self):
+        """Testa relações entre contadores."""
+        for nome, funcao in self.algoritmos.items():
+            with self.subTest(algoritmo=nome):
+                est = EstatisticasProcura()
+                funcao(self.grafo, "Centro", "Aeroporto", estatisticas=est)
+
+                self.assertGreater(est.expansoes, 0)
+                self.assertGreaterEqual(est.pops, est.expansoes)
+                self.assertGreaterEqual(est.pushes, est.pops)
+                self.assertGreaterEqual(est.relaxacoes, est.expansoes)
+                self.assertLessEqual(est.pico_fronteira, est.pushes)
+                self.assertLessEqual(est.pico_fechados, len(self.grafo.nos))
+
+    def test_ucs_compacto_igual(self):
+        """Testa a versão CSR do UCS (descarta entradas desatualizadas da heap)."""
+        est = EstatisticasProcura()
+        est_c = EstatisticasProcura()
+        uniform_cost_search(self.grafo, "Centro", "Aeroporto", estatisticas=est)
+        uniform_cost_search(GrafoCompacto.de_grafo(self.grafo), "Centro", "Aeroporto", estatisticas=est_c)
+        self.assertGreater(est_c.expansoes, 0)
+        self.assertLessEqual(est_c.expansoes, est.expansoes)
+        self.assertEqual(est_c.pico_fechados, est.pico_fechados)
+
+    def test_comparador_usa_medicoes_reais(self):
+        """Testa nós expandidos reais e memória medida com tracemalloc."""
+        comparador = ComparadorAlgoritmos(self.grafo)
+        cenario = CenarioTeste("Longa", "Centro", "Aeroporto", "teste")
+
+        resultado = comparador.testar_algoritmo("UCS", uniform_cost_search, cenario)
+        est = EstatisticasProcura()
+        uniform_cost_search(self.grafo, "Centro", "Aeroporto", estatisticas=est)
+
+        self.assertTrue(resultado.instrumentado)
+        self.assertEqual(resultado.nos_expandidos, est.expansoes)
+        self.assertNotEqual(resultado.nos_expandidos, resultado.tamanho_caminho)
+        self.assertGreater(resultado.memoria_pico_kb, 0)
+
+        # Função sem o argumento: continua a funcionar, marcada como estimativa
+        sem_instrumentacao = lambda g, o, d: uniform_cost_search(g, o, d)
+        resultado = comparador.testar_algoritmo("UCS simples", sem_instrumentacao, cenario)
+        self.assertTrue(resultado.sucesso)
+        self.assertFalse(resultado.instrumentado)
+        self.assertEqual(resultado.nos_expandidos, resultado.tamanho_caminho)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Testes de Algoritmos de Procura - Contraction Hierarchies
+"""
+
+import unittest
+from gestao.algoritmos_procura.hierarquia_contracao import HierarquiaContracao
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+from gestao.gestor_frota import GestorFrota
+from testes.test_config import ConfigTestes
+
+
+class TestHierarquiaContracao(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.ch = HierarquiaContracao(self.grafo)
+
+    def _verificar_todos_pares(self):
+        for origem in self.grafo.nos:
+            for destino in self.grafo.nos:
+                custo_ucs, _ = uniform_cost_search(self.grafo, origem, destino)
+                custo, caminho = self.ch.procurar(origem, destino)
+                self.assertAlmostEqual(custo, custo_ucs, msg=f"{origem}→{destino}")
+
+                # Caminho desempacotado usa apenas arestas reais
+                soma = sum(self.grafo.get_aresta(a, b).tempo_real() for a, b in zip(caminho, caminho[1:]))
+                self.assertAlmostEqual(soma, custo)
+                self.assertEqual((caminho[0], caminho[-1]), (origem, destino))
+
+    def test_otimalidade(self):
+        """Testa que todas as consultas dão o custo ótimo."""
+        self._verificar_todos_pares()
+
+    def test_ordem_completa(self):
+        """Testa que todos os nós foram contraídos uma vez."""
+        self.assertEqual(sorted(self.ch.ordem), list(range(len(self.grafo.nos))))
+        self.assertGreaterEqual(self.ch.num_atalhos(), 54)
+
+    def test_recustomiza_com_transito(self):
+        """Testa que alterações do GestorTransito re-pesam a hierarquia sem recontrair."""
+        atalhos = self.ch.num_atalhos()
+        transito = GestorTransito(self.grafo, hora_inicial=18)
+        transito.atualizar_transito(0)
+        transito.simular_bloqueio("Estação_Metro", "Bairro_Este")
+
+        self._verificar_todos_pares()
+        self.assertEqual(self.ch.num_atalhos(), atalhos)
+
+    def test_bloqueio_customizacao_parcial(self):
+        """Testa que um bloqueio só recalcula os arcos afetados."""
+        transito = GestorTransito(self.grafo, hora_inicial=12)
+        transito.simular_bloqueio("Estação_Metro", "Bairro_Este")
+
+        self._verificar_todos_pares()
+        estatisticas = self.ch.estatisticas()
+        self.assertEqual(estatisticas["customizacoes_completas"], 1)
+        self.assertEqual(estatisticas["customizacoes_parciais"], 1)
+        self.assertLess(estatisticas["arcos_recalculados"], estatisticas["arcos"])
+
+        transito.simular_bloqueio("Estação_Metro", "Bairro_Este", bloquear=False)
+        self._verificar_todos_pares()
+
+    def test_nucleo_com_grau_maximo(self):
+        """Testa que limitar os atalhos deixa um núcleo e mantém as consultas ótimas."""
+        self.ch = HierarquiaContracao(self.grafo, grau_maximo=3)
+        estatisticas = self.ch.estatisticas()
+        self.assertGreater(estatisticas["nucleo"], 0)
+        self.assertLess(estatisticas["atalhos"], HierarquiaContracao(self.grafo).estatisticas()["atalhos"])
+
+        self._verificar_todos_pares()
+        transito = GestorTransito(self.grafo, hora_inicial=18)
+        transito.atualizar_transito(0)
+        transito.simular_bloqueio("Estação_Metro", "Bairro_Este")
+        self._verificar_todos_pares()
+
+    def test_selecionavel_no_gestor(self):
+        """Testa seleção de 'ch' no GestorFrota."""
+        gestor = GestorFrota(self.grafo)
+        gestor.definir_algoritmo_procura("ch")
+
+        caminho, custo = gestor.calcular_rota("Suburbio_Oeste2", "Aeroporto")
+        custo_ucs, _ = uniform_cost_search(self.grafo, "Suburbio_Oeste2", "Aeroporto")
+        self.assertAlmostEqual(custo, custo_ucs)
+
+
+if __name__ == '__main__':
+    unittest.main()
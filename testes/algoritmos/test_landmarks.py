@@ -0,0 +1,76 @@
+"""
+Testes de Algoritmos de Procura - Heurística ALT (landmarks)
+"""
+
+import unittest
+from gestao.algoritmos_procura.landmarks import Landmarks
+from gestao.algoritmos_procura.a_estrela import a_star_search
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.algoritmos_procura.greedy import greedy
+from gestao.transito_dinamico import GestorTransito
+from gestao.gestor_frota import GestorFrota
+from modelo.grafo import TipoNo
+from testes.test_config import ConfigTestes
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.landmarks = Landmarks(self.grafo, num_landmarks=4)
+
+    def _verificar_admissivel(self):
+        for destino in self.grafo.nos:
+            for origem in self.grafo.nos:
+                custo, _ = uniform_cost_search(self.grafo, origem, destino)
+                h = self.landmarks.heuristica(origem, destino)
+                self.assertLessEqual(h, custo + 1e-9, f"h({origem}, {destino}) não admissível")
+
+    def test_escolhe_hubs(self):
+        """Testa que os landmarks automáticos são estações/postos distintos."""
+        self.assertEqual(len(self.landmarks.landmarks), 4)
+        self.assertEqual(len(set(self.landmarks.landmarks)), 4)
+        for l in self.landmarks.landmarks:
+            self.assertIn(self.grafo.nos[l].tipo, (TipoNo.ESTACAO_RECARGA, TipoNo.POSTO_ABASTECIMENTO))
+
+    def test_admissivel_madrugada_e_rush(self):
+        """Testa admissibilidade com factores de trânsito mínimos e máximos."""
+        transito = GestorTransito(self.grafo, hora_inicial=0)
+        for hora in (3, 8, 18):
+            transito.atualizar_transito(hora * 60)
+            self._verificar_admissivel()
+
+    def test_admissivel_com_bloqueio(self):
+        """Testa que bloqueios não invalidam as tabelas."""
+        GestorTransito(self.grafo, hora_inicial=12).simular_bloqueio("Estação_Metro", "Bairro_Este")
+        self._verificar_admissivel()
+
+    def test_astar_alt_otimo(self):
+        """Testa que A* com ALT encontra o custo ótimo."""
+        GestorTransito(self.grafo, hora_inicial=18).atualizar_transito(0)
+        for origem, destino in [("Suburbio_Oeste2", "Aeroporto"), ("Porto", "Escola_Norte")]:
+            custo, caminho = a_star_search(self.grafo, origem, destino, heuristica=self.landmarks.heuristica)
+            custo_ucs, _ = uniform_cost_search(self.grafo, origem, destino)
+            self.assertAlmostEqual(custo, custo_ucs)
+            self.assertEqual(caminho[-1], destino)
+
+    def test_greedy_com_alt(self):
+        """Testa greedy com heurística ALT."""
+        custo, caminho = greedy(self.grafo, "Suburbio_Oeste2", "Aeroporto", heuristica=self.landmarks.heuristica)
+        self.assertEqual(caminho[0], "Suburbio_Oeste2")
+        self.assertEqual(caminho[-1], "Aeroporto")
+        self.assertLess(custo, float('inf'))
+
+    def test_gestor_alt(self):
+        """Testa seleção de 'alt' no GestorFrota."""
+        gestor = GestorFrota(self.grafo)
+        gestor.definir_algoritmo_procura("alt")
+        self.assertIsNotNone(gestor.landmarks)
+
+        caminho, custo = gestor.calcular_rota("Porto", "Escola_Norte")
+        custo_ucs, _ = uniform_cost_search(self.grafo, "Porto", "Escola_Norte")
+        self.assertAlmostEqual(custo, custo_ucs)
+
+
+if __name__ == '__main__':
+    unittest.main()
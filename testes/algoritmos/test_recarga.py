@@ -0,0 +1,137 @@
+"""
+Testes de Algoritmos de Procura - Caminho com restrição de autonomia e recargas
+"""
+
+import unittest
+from gestao.algoritmos_procura.recarga import procura_com_recarga, procura_com_recarga_paragens
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from modelo.grafo import Grafo, No, TipoNo
+from modelo.pedidos import Pedido, EstadoPedido
+from testes.test_config import ConfigTestes
+
+
+class TestProcuraComRecarga(unittest.TestCase):
+
+    def setUp(self):
+        self.gestor = ConfigTestes.criar_gestor_teste()
+        self.grafo = self.gestor.grafo
+        self.eletrico = self.gestor.veiculos["E1"]
+        self.combustao = self.gestor.veiculos["C1"]
+
+    def verificar_viavel(self, veiculo, caminho, recargas):
+        """Percorre o caminho e confirma que a autonomia nunca fica negativa."""
+        autonomia = veiculo.autonomia_km
+        pendentes = list(recargas)
+        for u, v in zip(caminho, caminho[1:]):
+            if pendentes and u == pendentes[0]:
+                autonomia = veiculo.autonomiaMax_km
+                pendentes.pop(0)
+            autonomia -= self.grafo.distancia(u, v)
+            self.assertGreaterEqual(autonomia, 0)
+        self.assertEqual(pendentes, [])
+
+    def test_sem_recarga_igual_ucs(self):
+        """Com autonomia suficiente, é o caminho pickup + viagem de menor tempo."""
+        custo, caminho, recargas = procura_com_recarga(
+            self.grafo, self.eletrico, "Centro", "Aeroporto", pickup="Porto")
+
+        c1, _ = uniform_cost_search(self.grafo, "Centro", "Porto")
+        c2, _ = uniform_cost_search(self.grafo, "Porto", "Aeroporto")
+        self.assertAlmostEqual(custo, c1 + c2)
+        self.assertEqual(recargas, [])
+        self.assertIn("Porto", caminho)
+
+    def test_recarga_inclui_tempo(self):
+        """Com pouca autonomia, para numa estação e soma o tempo de recarga."""
+        self.eletrico.autonomia_km = 5
+        custo, caminho, recargas = procura_com_recarga(
+            self.grafo, self.eletrico, "Centro", "Aeroporto", pickup="Porto")
+
+        self.assertEqual(len(recargas), 1)
+        self.assertEqual(self.grafo.nos[recargas[0]].tipo, TipoNo.ESTACAO_RECARGA)
+        self.assertGreaterEqual(custo, self.eletrico.tempo_recarregamento_min)
+        self.verificar_viavel(self.eletrico, caminho, recargas)
+
+    def test_combustao_usa_postos(self):
+        self.combustao.autonomia_km = 5
+        _, caminho, recargas = procura_com_recarga(
+            self.grafo, self.combustao, "Shopping", "Aeroporto", pickup="Porto")
+
+        self.assertTrue(recargas)
+        for no in recargas:
+            self.assertEqual(self.grafo.nos[no].tipo, TipoNo.POSTO_ABASTECIMENTO)
+        self.verificar_viavel(self.combustao, caminho, recargas)
+
+    def test_estacoes_indisponiveis(self):
+        """Sem estações disponíveis e sem autonomia não há rota."""
+        self.eletrico.autonomia_km = 5
+        for no in self.grafo.nos.values():
+            if no.tipo == TipoNo.ESTACAO_RECARGA:
+                no.disponivel = False
+
+        custo, caminho, _ = procura_com_recarga(
+            self.grafo, self.eletrico, "Centro", "Aeroporto", pickup="Porto")
+        self.assertEqual(custo, float('inf'))
+        self.assertEqual(caminho, [])
+
+    def test_mais_rapido_com_menos_autonomia_nao_elimina(self):
+        """Um rótulo mais rápido com menos autonomia não pode substituir um mais lento com mais."""
+        grafo = Grafo()
+        for i, no_id in enumerate(["S", "B", "M", "T"]):
+            grafo.adiciona_no(No(no_id, float(i), 0.0, TipoNo.RECOLHA_PASSAGEIROS))
+        grafo.adiciona_aresta("S", "M", 5.0, 1.0)   # rápido: chega a M com 5.0 km
+        grafo.adiciona_aresta("S", "B", 2.0, 1.5)   # lento: chega a M com 5.9 km
+        grafo.adiciona_aresta("B", "M", 2.1, 1.5)
+        grafo.adiciona_aresta("M", "T", 5.5, 1.0)   # só alcançável pelo lento
+        self.eletrico.autonomia_km = 10.0
+
+        custo, caminho, recargas = procura_com_recarga(grafo, self.eletrico, "S", "T")
+
+        self.assertAlmostEqual(custo, 4.0)
+        self.assertEqual(caminho, ["S", "B", "M", "T"])
+        self.assertEqual(recargas, [])
+
+    def test_recarga_depois_do_pickup(self):
+        """As paragens seguem a ordem da rota quando a recarga é depois do pickup."""
+        grafo = Grafo()
+        grafo.adiciona_no(No("A", 0.0, 0.0, TipoNo.RECOLHA_PASSAGEIROS))
+        grafo.adiciona_no(No("P", 1.0, 0.0, TipoNo.RECOLHA_PASSAGEIROS))
+        grafo.adiciona_no(No("S", 2.0, 0.0, TipoNo.ESTACAO_RECARGA))
+        grafo.adiciona_no(No("D", 3.0, 0.0, TipoNo.RECOLHA_PASSAGEIROS))
+        grafo.adiciona_aresta("A", "P", 3.0, 1.0)
+        grafo.adiciona_aresta("P", "S", 3.0, 1.0)
+        grafo.adiciona_aresta("S", "D", 3.0, 1.0)
+        self.eletrico.observador_posicao = None  # o índice do gestor é de outro grafo
+        self.eletrico.posicao = "A"
+        self.eletrico.autonomia_km = 7.0
+
+        _, caminho, paragens = procura_com_recarga_paragens(grafo, self.eletrico, "A", "D", pickup="P")
+        self.assertEqual(caminho, ["A", "P", "S", "D"])
+        self.assertEqual(paragens, [("P", False), ("S", True), ("D", False)])
+
+        self.eletrico.definir_rota(caminho, paragens=[n for n, _ in paragens], recargas=[r for _, r in paragens])
+        for tempo in range(3):
+            self.eletrico.tempo_ocupado_ate = 0
+            self.eletrico.mover_um_passo(grafo, tempo)
+            if self.eletrico.posicao == "S":
+                self.assertEqual(self.eletrico.paragens, ["D"])
+                self.eletrico.autonomia_km = self.eletrico.autonomiaMax_km
+        self.assertEqual(self.eletrico.posicao, "D")
+        self.assertEqual(self.eletrico.paragens, [])
+
+    def test_atribuir_com_recarga(self):
+        """Testa que o GestorFrota usa a procura e regista as paragens."""
+        self.eletrico.autonomia_km = 5
+        pedido = Pedido("P1", "Porto", "Aeroporto", 1, 0, 1, "qualquer", EstadoPedido.PENDENTE, None)
+
+        veiculo = self.gestor.atribuir_com_recarga(pedido, self.eletrico, 0)
+
+        self.assertIs(veiculo, self.eletrico)
+        self.assertEqual(pedido.estado, EstadoPedido.ATRIBUIDO)
+        self.assertEqual(veiculo.paragens[-2:], ["Porto", "Aeroporto"])
+        self.assertEqual(len(veiculo.paragens), 3)
+        self.assertEqual(veiculo.paragens_recarga, [True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
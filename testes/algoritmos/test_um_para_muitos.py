@@ -0,0 +1,82 @@
+"""
+Testes de Algoritmos de Procura - Dijkstra um-para-muitos
+"""
+
+import unittest
+from gestao.algoritmos_procura.um_para_muitos import arvore_caminhos_minimos, dijkstra_um_para_muitos
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+
+class TestUmParaMuitos(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        GestorTransito(self.grafo, hora_inicial=8).atualizar_transito(0)
+
+    def test_direto_igual_ucs(self):
+        """Testa custos origem → todos iguais ao UCS."""
+        resultados = dijkstra_um_para_muitos(self.grafo, "Centro")
+
+        self.assertEqual(set(resultados), set(self.grafo.nos))
+        for destino, (custo, _, caminho) in resultados.items():
+            custo_ucs, _ = uniform_cost_search(self.grafo, "Centro", destino)
+            self.assertAlmostEqual(custo, custo_ucs)
+            self.assertEqual((caminho[0], caminho[-1]), ("Centro", destino))
+
+    def test_inverso_igual_ucs(self):
+        """Testa custos vários → pickup (procura inversa)."""
+        posicoes = ["Aeroporto", "Porto", "Suburbio_Oeste2", "Escola_Norte"]
+        resultados = dijkstra_um_para_muitos(self.grafo, "Hospital", posicoes, reverso=True)
+
+        for origem in posicoes:
+            custo, km, caminho = resultados[origem]
+            custo_ucs, _ = uniform_cost_search(self.grafo, origem, "Hospital")
+            self.assertAlmostEqual(custo, custo_ucs)
+            self.assertEqual((caminho[0], caminho[-1]), (origem, "Hospital"))
+
+            km_caminho = sum(self.grafo.distancia(a, b) for a, b in zip(caminho, caminho[1:]))
+            self.assertAlmostEqual(km, km_caminho)
+
+    def test_alvo_inalcancavel(self):
+        """Testa que alvos isolados não aparecem no resultado."""
+        transito = GestorTransito(self.grafo, hora_inicial=12)
+        for aresta in self.grafo.vizinhos("Porto"):
+            transito.simular_bloqueio("Porto", aresta.no_destino)
+
+        resultados = dijkstra_um_para_muitos(self.grafo, "Centro", ["Porto", "Praça"], reverso=True)
+        self.assertNotIn("Porto", resultados)
+        self.assertIn("Praça", resultados)
+
+    def test_arvore_igual_ucs(self):
+        """Testa rotas da árvore (direta e inversa) contra o UCS."""
+        direta = arvore_caminhos_minimos(self.grafo, "Centro")
+        inversa = arvore_caminhos_minimos(self.grafo, "Hospital", reverso=True)
+
+        for no in self.grafo.nos:
+            caminho, custo, km = direta.rota("Centro", no)
+            self.assertAlmostEqual(custo, uniform_cost_search(self.grafo, "Centro", no)[0])
+            self.assertEqual((caminho[0], caminho[-1]), ("Centro", no))
+
+            caminho, custo, km = inversa.rota(no, "Hospital")
+            self.assertAlmostEqual(custo, uniform_cost_search(self.grafo, no, "Hospital")[0])
+            self.assertEqual((caminho[0], caminho[-1]), (no, "Hospital"))
+            km_caminho = sum(self.grafo.distancia(a, b) for a, b in zip(caminho, caminho[1:]))
+            self.assertAlmostEqual(km, km_caminho)
+
+    def test_arvore_subcaminhos(self):
+        """Testa que os troços de um caminho da árvore são servidos (e só esses)."""
+        arvore = arvore_caminhos_minimos(self.grafo, "Centro")
+        caminho, _, _ = max((arvore.rota("Centro", no) for no in self.grafo.nos), key=lambda r: len(r[0]))
+        a, b = caminho[1], caminho[-1]
+
+        sub, custo, _ = arvore.rota(a, b)
+        self.assertEqual(sub, caminho[1:])
+        self.assertAlmostEqual(custo, uniform_cost_search(self.grafo, a, b)[0])
+        self.assertIsNone(arvore.rota(b, a))
+        self.assertGreater(arvore.memoria_bytes(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Testes de Desempenho - Modo benchmark do ComparadorAlgoritmos
+"""
+
+import gc
+import os
+import tempfile
+import unittest
+from gestao.algoritmos_procura.a_estrela import a_star_search
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.comparador_algoritmos import ComparadorAlgoritmos, CenarioTeste, ResultadoBenchmark
+from testes.test_config import ConfigTestes
+
+
+def resultado(nome, cenario, mediana):
+    return ResultadoBenchmark(nome_algoritmo=nome, cenario=cenario, repeticoes=10,
+                              mediana_ms=mediana, p95_ms=mediana, iqr_ms=0.0, minimo_ms=mediana)
+
+
+class TestBenchmarkComparador(unittest.TestCase):
+
+    def setUp(self):
+        self.comparador = ComparadorAlgoritmos(ConfigTestes.criar_grafo_teste())
+        self.cenario = CenarioTeste("Centro → Aeroporto", "Centro", "Aeroporto", "")
+
+    def test_percentis(self):
+        """Testa mediana, p95 e IQR numa amostra conhecida."""
+        mediana, p95, iqr = ComparadorAlgoritmos._percentis([float(i) for i in range(1, 101)])
+        self.assertAlmostEqual(mediana, 50.5)
+        self.assertAlmostEqual(p95, 95.05)
+        self.assertAlmostEqual(iqr, 49.5)
+
+    def test_benchmark_algoritmo(self):
+        """Testa que o resumo é coerente e o custo é o do algoritmo."""
+        r = self.comparador.benchmark_algoritmo("UCS", uniform_cost_search, self.cenario,
+                                                aquecimento=1, repeticoes=5)
+        custo, _ = uniform_cost_search(self.comparador.grafo, "Centro", "Aeroporto")
+
+        self.assertTrue(r.sucesso)
+        self.assertEqual(r.repeticoes, 5)
+        self.assertAlmostEqual(r.custo_solucao, round(custo, 2))
+        self.assertLessEqual(r.minimo_ms, r.mediana_ms)
+        self.assertLessEqual(r.mediana_ms, r.p95_ms)
+        self.assertGreater(r.mediana_sem_gc_ms, 0)
+
+    def test_gc_reposto(self):
+        """Testa que a variante sem GC volta a ligar o garbage collector."""
+        self.comparador.benchmark_algoritmo("A*", a_star_search, self.cenario, aquecimento=0, repeticoes=2)
+        self.assertTrue(gc.isenabled())
+
+    def test_benchmark_matriz(self):
+        """Testa que a matriz cobre todos os pares cenário × algoritmo."""
+        cenarios = [self.cenario, CenarioTeste("Centro → Shopping", "Centro", "Shopping", "")]
+        algoritmos = {"UCS": uniform_cost_search, "A*": a_star_search}
+        resultados = self.comparador.benchmark_matriz(algoritmos, cenarios, aquecimento=0,
+                                                      repeticoes=2, variante_sem_gc=False)
+        self.assertEqual({r.chave() for r in resultados},
+                         {(c.nome, a) for c in cenarios for a in algoritmos})
+
+    def test_guardar_carregar(self):
+        """Testa o ciclo guardar → carregar em JSON."""
+        resultados = [resultado("UCS", "A", 1.5), resultado("A*", "A", 0.75)]
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "benchmark.json")
+            ComparadorAlgoritmos.guardar_benchmark(resultados, caminho)
+            self.assertEqual(ComparadorAlgoritmos.carregar_benchmark(caminho), resultados)
+
+    def test_comparar_com_baseline(self):
+        """Testa que só aumentos acima do limiar contam como regressão."""
+        baseline = [resultado("UCS", "A", 1.0), resultado("A*", "A", 1.0), resultado("BFS", "A", 1.0)]
+        atuais = [resultado("UCS", "A", 1.05), resultado("A*", "A", 1.30), resultado("DFS", "A", 9.0)]
+
+        regressoes = ComparadorAlgoritmos.comparar_com_baseline(atuais, baseline, limiar=0.10)
+
+        self.assertEqual(len(regressoes), 1)
+        self.assertEqual(regressoes[0]["algoritmo"], "A*")
+        self.assertAlmostEqual(regressoes[0]["variacao"], 0.3)
+
+        relatorio = ComparadorAlgoritmos.gerar_relatorio_benchmark(atuais, regressoes)
+        self.assertIn("REGRESSÕES", relatorio)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Testes de Desempenho - Contraction Hierarchies numa cidade sintética grande
+"""
+
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
+from gestao.algoritmos_procura.hierarquia_contracao import HierarquiaContracao
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+
+
+class TestEscalaHierarquia(unittest.TestCase):
+
+    N_NOS = 10000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.grafo = CidadeSintetica.grelha(cls.N_NOS, semente=1)
+        cls.pares = CidadeSintetica.pares_aleatorios(cls.grafo, 15, semente=2)
+
+    def _verificar_pares(self, ch):
+        for origem, destino in self.pares:
+            custo_ucs, _ = uniform_cost_search(self.grafo, origem, destino)
+            custo, caminho = ch.procurar(origem, destino)
+            self.assertAlmostEqual(custo, custo_ucs, msg=f"{origem}→{destino}")
+            self.assertEqual((caminho[0], caminho[-1]), (origem, destino))
+
+    def test_atalhos_limitados(self):
+        """Testa que o grau_maximo limita os atalhos e as consultas continuam ótimas."""
+        ch = HierarquiaContracao(self.grafo, grau_maximo=32)
+        estatisticas = ch.estatisticas()
+
+        self.assertEqual(len(ch.ordem), self.N_NOS)
+        # Cada nó contraído cria no máximo 32*31/2 atalhos; na grelha ficam muito abaixo
+        self.assertLess(estatisticas["arcos"], 15 * self.N_NOS)
+        self.assertLess(estatisticas["nucleo"], self.N_NOS // 4)
+        self._verificar_pares(ch)
+
+    def test_bloqueio_nao_recustomiza_tudo(self):
+        """Testa que um bloqueio numa cidade grande só recalcula uma pequena parte dos arcos."""
+        ch = HierarquiaContracao(self.grafo, grau_maximo=32)
+        origem, destino = self.pares[0]
+        _, caminho = ch.procurar(origem, destino)
+        meio = len(caminho) // 2
+
+        transito = GestorTransito(self.grafo, hora_inicial=12)
+        transito.simular_bloqueio(caminho[meio], caminho[meio + 1])
+        try:
+            self._verificar_pares(ch)
+            estatisticas = ch.estatisticas()
+            self.assertEqual(estatisticas["customizacoes_completas"], 1)
+            self.assertEqual(estatisticas["customizacoes_parciais"], 1)
+            self.assertLess(estatisticas["arcos_recalculados"], estatisticas["arcos"] // 100)
+        finally:
+            transito.simular_bloqueio(caminho[meio], caminho[meio + 1], bloquear=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Testes de Integração - Tabela de rotas em memória partilhada entre processos
+"""
+
+import multiprocessing
+import unittest
+from gestao.cache_partilhada import TabelaRotasPartilhada
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+PARES = [("Centro", "Aeroporto"), ("Hospital", "Porto"), ("Shopping", "Universidade"),
+         ("Aeroporto", "Centro"), ("Porto", "Shopping")]
+
+_tabela_processo = None
+
+
+def _iniciar_processo(tabela):
+    global _tabela_processo
+    _tabela_processo = tabela
+
+
+def _calcular_no_processo(pares):
+    """Executado num processo do pool: calcula rotas com a tabela partilhada."""
+    gestor = GestorFrota(ConfigTestes.criar_grafo_teste())
+    gestor.definir_algoritmo_procura("ucs")
+    gestor.usar_tabela_partilhada(_tabela_processo)
+    rotas = [gestor.calcular_rota(o, d) for o, d in pares]
+    return rotas, gestor.procuras_rota
+
+
+class TestTabelaRotasPartilhada(unittest.TestCase):
+
+    def setUp(self):
+        self.tabela = TabelaRotasPartilhada(capacidade=256, max_nos_rota=32)
+
+    def tearDown(self):
+        self.tabela.destruir()
+
+    def criar_gestor(self, tabela=None):
+        gestor = GestorFrota(ConfigTestes.criar_grafo_teste())
+        gestor.definir_algoritmo_procura("ucs")
+        gestor.usar_tabela_partilhada(tabela or self.tabela)
+        return gestor
+
+    def test_reutiliza_rotas_de_outro_gestor(self):
+        """Testa que um segundo gestor (outra cópia da cidade) não faz procuras."""
+        primeiro = self.criar_gestor()
+        rotas = [primeiro.calcular_rota(o, d) for o, d in PARES]
+        self.assertEqual(primeiro.procuras_rota, len(PARES))
+
+        segundo = self.criar_gestor()
+        self.assertEqual([segundo.calcular_rota(o, d) for o, d in PARES], rotas)
+        self.assertEqual(segundo.procuras_rota, 0)
+        self.assertEqual(segundo.cache_rotas.estatisticas()["hits_partilhada"], len(PARES))
+
+    def test_transito_diferente_nao_reutiliza(self):
+        """Testa que a chave inclui o trânsito (as épocas de cada processo não contam)."""
+        self.criar_gestor().calcular_rota("Centro", "Aeroporto")
+
+        segundo = self.criar_gestor()
+        GestorTransito(segundo.grafo, hora_inicial=8).atualizar_transito(0)
+        segundo.calcular_rota("Centro", "Aeroporto")
+        self.assertEqual(segundo.procuras_rota, 1)
+
+    def test_outra_cidade_rejeitada(self):
+        """Testa que a tabela só aceita a cidade com que foi associada."""
+        self.criar_gestor()
+        grafo = ConfigTestes.criar_grafo_teste()
+        grafo.adiciona_aresta("Centro", "Porto", 1.0, 1.0)
+        with self.assertRaises(ValueError):
+            GestorFrota(grafo).usar_tabela_partilhada(self.tabela)
+
+    def test_tabela_cheia_substitui(self):
+        """Testa que, sem posições livres, as rotas novas substituem as antigas."""
+        tabela = TabelaRotasPartilhada(capacidade=4, max_nos_rota=8)
+        try:
+            tabela.associar(ConfigTestes.criar_grafo_teste())
+            nos = list(tabela.grafo.nos)
+            for i in range(10):
+                tabela.armazenar_rota(nos[i], nos[i + 1], "ucs", [nos[i], nos[i + 1]], float(i))
+            self.assertEqual(tabela.ocupacao(), 4)
+            self.assertEqual(tabela.estatisticas()["substituicoes"], 6)
+            self.assertEqual(tabela.get_rota(nos[9], nos[10], "ucs"), ([nos[9], nos[10]], 9.0))
+
+            longa = nos[:9]
+            self.assertFalse(tabela.armazenar_rota(longa[0], longa[-1], "ucs", longa, 1.0))
+        finally:
+            tabela.destruir()
+
+    def test_pool_de_processos(self):
+        """Testa que as rotas publicadas pelos processos do pool ficam visíveis para todos."""
+        self.criar_gestor()  # associa a cidade
+        contexto = multiprocessing.get_context("fork")
+        with contexto.Pool(2, initializer=_iniciar_processo, initargs=(self.tabela,)) as pool:
+            resultados = pool.map(_calcular_no_processo, [PARES[:3], PARES[2:]])
+        # PARES[2] é pedido pelos dois processos: calculado uma ou duas vezes, conforme a ordem
+        self.assertIn(sum(procuras for _, procuras in resultados), (len(PARES), len(PARES) + 1))
+        self.assertEqual(resultados[0][0][2], resultados[1][0][0])
+
+        gestor = self.criar_gestor()
+        for o, d in PARES:
+            gestor.calcular_rota(o, d)
+        self.assertEqual(gestor.procuras_rota, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
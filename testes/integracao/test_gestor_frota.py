@@ -43,6 +43,21 @@ class TestGestorFrota(unittest.TestCase):
         self.assertTrue(caminho)
         self.assertGreater(distancia, 0.0)
     
+    def test_viabilidade_varios_veiculos(self):
+        """Testa que a procura muitos-para-um dá o mesmo que procuras individuais."""
+        self.gestor.definir_algoritmo_procura("ucs")
+        veiculos = list(self.gestor.veiculos.values())
+
+        resultados = self.gestor.verificar_viabilidade_rotas_ate(veiculos, "Hospital")
+
+        for v in veiculos:
+            viavel, caminho, custo, distancia = resultados[v.id_veiculo]
+            viavel_i, _, custo_i, distancia_i = self.gestor.verificar_viabilidade_rota(v, v.posicao, "Hospital")
+            self.assertEqual(viavel, viavel_i)
+            self.assertAlmostEqual(custo, custo_i)
+            self.assertAlmostEqual(distancia, distancia_i)
+            self.assertEqual(caminho[0], v.posicao)
+
     def test_selecionar_veiculo_para_pedido(self):
         """Testa seleção de veículo."""
         pedido = Pedido(
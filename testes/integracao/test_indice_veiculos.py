@@ -0,0 +1,96 @@
+"""
+Testes de Integração - Índice de posições dos veículos
+"""
+
+import math
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
+from gestao.gestor_frota import GestorFrota
+from modelo.pedidos import Pedido, EstadoPedido
+from modelo.veiculos import EstadoVeiculo
+
+
+class TestIndiceVeiculos(unittest.TestCase):
+
+    def setUp(self):
+        grafo = CidadeSintetica.grelha(1000, semente=3)
+        self.gestor = GestorFrota(grafo)
+        self.frota = CidadeSintetica.criar_frota(self.gestor, n_veiculos=60, semente=3)
+        self.pedidos = CidadeSintetica.gerar_pedidos(grafo, n_pedidos=20, semente=3)
+
+    def forca_bruta(self, x, y, filtro=None):
+        posicao = self.gestor.indice_espacial.posicao
+        return sorted(
+            (math.dist(posicao(v.posicao), (x, y)), v.id_veiculo)
+            for v in self.gestor.veiculos.values() if filtro is None or filtro(v)
+        )
+
+    def test_k_mais_proximos(self):
+        """Testa que coincide com a ordenação por força bruta."""
+        indice = self.gestor.indice_veiculos
+        self.assertEqual(len(indice), 60)
+        eletrico = lambda v: v.tipo_veiculo() == "eletrico"
+        for pedido in self.pedidos:
+            x, y = self.gestor.indice_espacial.posicao(pedido.posicao_inicial)
+            for filtro in (None, eletrico):
+                obtido = [(d, v.id_veiculo) for d, v in indice.k_mais_proximos(x, y, 5, filtro)]
+                self.assertEqual(obtido, self.forca_bruta(x, y, filtro)[:5])
+
+    def test_atualiza_ao_mover(self):
+        """Testa que o índice acompanha os movimentos do veículo."""
+        veiculo = self.frota[0]
+        destino = self.pedidos[0].posicao_destino
+        _, rota, _, _ = self.gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, destino)
+        veiculo.definir_rota(rota)
+        chegou = False
+        while not chegou:
+            _, chegou = veiculo.mover_um_passo(self.gestor.grafo, veiculo.tempo_ocupado_ate)
+
+        x, y = self.gestor.indice_espacial.posicao(destino)
+        d, mais_proximo = self.gestor.indice_veiculos.k_mais_proximos(x, y, 1)[0]
+        self.assertEqual(d, 0.0)
+        self.assertEqual(mais_proximo.posicao, destino)
+
+    def test_selecao_limitada(self):
+        """Testa que os k mais próximos chegam para a estratégia por defeito."""
+        esperado = [self.gestor.selecionar_veiculo_pedido(p, 0) for p in self.pedidos]
+        self.gestor.definir_limite_candidatos(8)
+        obtido = [self.gestor.selecionar_veiculo_pedido(p, 0) for p in self.pedidos]
+        for e, o, pedido in zip(esperado, obtido, self.pedidos):
+            self.assertIsNotNone(o)
+            if e is not None and o is not e:
+                # Empate ou vencedor para lá dos k mais próximos: o escolhido tem de ser viável
+                viavel, _, _, _ = self.gestor.verificar_viabilidade_rota(o, o.posicao, pedido.posicao_inicial)
+                self.assertTrue(viavel)
+
+    def test_alarga_procura(self):
+        """Testa que, sem veículos viáveis perto, a procura é alargada."""
+        pedido = Pedido("P_LONGE", self.pedidos[0].posicao_inicial, self.pedidos[0].posicao_destino,
+                        passageiros=1, instante_pedido=0, prioridade=1, pref_ambiental="qualquer",
+                        estado=EstadoPedido.PENDENTE, veiculo_atribuido=None, tempo_max_espera=30)
+        x, y = self.gestor.indice_espacial.posicao(pedido.posicao_inicial)
+        proximos = [v for _, v in self.gestor.indice_veiculos.k_mais_proximos(x, y, 4)]
+        for v in proximos:
+            v.autonomia_km = 0.01
+
+        self.gestor.definir_limite_candidatos(4, alargar=False)
+        self.assertIsNone(self.gestor.selecionar_veiculo_pedido(pedido, 0))
+
+        self.gestor.definir_limite_candidatos(4)
+        escolhido = self.gestor.selecionar_veiculo_pedido(pedido, 0)
+        self.assertIsNotNone(escolhido)
+        self.assertNotIn(escolhido, proximos)
+
+    def test_ignora_indisponiveis(self):
+        """Testa que veículos ocupados não entram nos candidatos."""
+        pedido = self.pedidos[0]
+        x, y = self.gestor.indice_espacial.posicao(pedido.posicao_inicial)
+        _, primeiro = self.gestor.indice_veiculos.k_mais_proximos(x, y, 1)[0]
+        primeiro.estado = EstadoVeiculo.A_SERVICO
+
+        self.gestor.definir_limite_candidatos(1)
+        self.assertIsNot(self.gestor.selecionar_veiculo_pedido(pedido, 0), primeiro)
+
+
+if __name__ == '__main__':
+    unittest.main()
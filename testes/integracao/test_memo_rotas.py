@@ -0,0 +1,81 @@
+"""
+Testes de Integração - Memo de rotas por ciclo de atribuição
+"""
+
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
+from gestao.estrategia_selecao import SelecaoPriorizarEletricos
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+
+
+class TestMemoRotas(unittest.TestCase):
+
+    def criar_gestor(self, algoritmo):
+        grafo = CidadeSintetica.planar_aleatoria(500, semente=21)
+        gestor = GestorFrota(grafo, estrategia_selecao=SelecaoPriorizarEletricos())
+        transito = GestorTransito(grafo, hora_inicial=8)
+        transito.atualizar_transito(0)
+        gestor.definir_perfil_transito(transito)
+        gestor.definir_algoritmo_procura(algoritmo)
+        CidadeSintetica.criar_frota(gestor, n_veiculos=20, semente=21)
+        return gestor
+
+    def atribuir(self, gestor, com_memo):
+        pedidos = CidadeSintetica.gerar_pedidos(gestor.grafo, n_pedidos=12, semente=21)
+        if com_memo:
+            gestor.iniciar_ciclo_atribuicao()
+        atribuicoes = []
+        for pedido in pedidos:
+            veiculo = gestor.atribuir_pedido(pedido, 0)
+            atribuicoes.append((veiculo.id_veiculo, veiculo.rota) if veiculo else None)
+        gestor.terminar_ciclo_atribuicao()
+        return atribuicoes
+
+    def test_reduz_procuras(self):
+        """Testa que o memo corta procuras sem mudar atribuições."""
+        # astar_td não usa CacheRotas: sem memo refaz a viagem para cada candidato.
+        # Com ucs a CacheRotas já poupa a viagem; o memo poupa o troço até ao pickup.
+        for algoritmo, fracao in (("astar_td", 0.5), ("ucs", 0.75)):
+            with self.subTest(algoritmo=algoritmo):
+                sem_memo = self.criar_gestor(algoritmo)
+                com_memo = self.criar_gestor(algoritmo)
+
+                esperado = self.atribuir(sem_memo, com_memo=False)
+                obtido = self.atribuir(com_memo, com_memo=True)
+
+                self.assertEqual(obtido, esperado)
+                self.assertTrue(any(esperado))
+                self.assertLess(com_memo.procuras_rota, sem_memo.procuras_rota * fracao)
+                self.assertGreater(com_memo.obter_estatisticas_cache()["memo_rotas"]["memo_hits"], 0)
+
+    def test_invalida_com_transito(self):
+        """Testa que uma alteração de trânsito descarta o memo."""
+        gestor = self.criar_gestor("astar_td")
+        veiculo = next(iter(gestor.veiculos.values()))
+        destino = CidadeSintetica.zonas_recolha(gestor.grafo)[-1]
+
+        gestor.iniciar_ciclo_atribuicao()
+        gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, destino)
+        gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, destino)
+        self.assertEqual(gestor.procuras_rota, 1)
+
+        gestor.grafo.marcar_alteracao_transito()
+        gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, destino)
+        self.assertEqual(gestor.procuras_rota, 2)
+        gestor.terminar_ciclo_atribuicao()
+
+    def test_fora_do_ciclo(self):
+        """Testa que fora de um ciclo de atribuição não há memo."""
+        gestor = self.criar_gestor("astar_td")
+        veiculo = next(iter(gestor.veiculos.values()))
+        destino = CidadeSintetica.zonas_recolha(gestor.grafo)[-1]
+
+        gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, destino)
+        gestor.verificar_viabilidade_rota(veiculo, veiculo.posicao, destino)
+        self.assertEqual(gestor.procuras_rota, 2)
+        self.assertNotIn("memo_rotas", gestor.obter_estatisticas_cache())
+
+
+if __name__ == '__main__':
+    unittest.main()
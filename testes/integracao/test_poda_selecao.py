@@ -0,0 +1,107 @@
+"""
+Testes de Integração - Seleção de veículos com poda por limite inferior
+"""
+
+import random
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
+from gestao.estrategia_selecao import (EstrategiaScore, SelecaoMenorDistancia, SelecaoCustoComposto,
+                                       SelecaoDeadMileage, SelecaoEquilibrada, SelecaoPriorizarEletricos)
+from gestao.funcao_custo import FuncaoCustoComposta
+from gestao.gestor_frota import GestorFrota
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from testes.test_config import ConfigTestes
+
+
+def criar_estrategias(podar):
+    return [
+        SelecaoMenorDistancia(podar=podar),
+        SelecaoCustoComposto(FuncaoCustoComposta(), podar=podar),
+        SelecaoDeadMileage(penalizacao=2.0, podar=podar),
+        SelecaoEquilibrada(podar=podar),
+    ]
+
+
+class TestPodaSelecao(unittest.TestCase):
+
+    def criar_gestor(self, algoritmo):
+        grafo = CidadeSintetica.planar_aleatoria(600, semente=11)
+        gestor = GestorFrota(grafo)
+        gestor.definir_algoritmo_procura(algoritmo)
+        CidadeSintetica.criar_frota(gestor, n_veiculos=30, semente=11)
+        return gestor
+
+    def escolhas(self, algoritmo, podar):
+        gestor = self.criar_gestor(algoritmo)
+        pedidos = CidadeSintetica.gerar_pedidos(gestor.grafo, n_pedidos=15, semente=11)
+        candidatos = gestor.veiculos_disponiveis()
+        resultado = []
+        for estrategia in criar_estrategias(podar):
+            for pedido in pedidos:
+                escolhido = estrategia.selecionar(pedido, candidatos, gestor, pedido.instante_pedido)
+                resultado.append(escolhido.id_veiculo if escolhido else None)
+        return resultado, gestor
+
+    def test_mesmas_escolhas(self):
+        """Testa que a poda não altera o veículo escolhido."""
+        for algoritmo in ("astar", "ucs", "alt"):
+            with self.subTest(algoritmo=algoritmo):
+                completo, _ = self.escolhas(algoritmo, podar=False)
+                podado, _ = self.escolhas(algoritmo, podar=True)
+                self.assertEqual(podado, completo)
+                self.assertTrue(any(completo))
+
+    def test_procuras_evitadas(self):
+        """Testa que a poda evita procuras e as reporta."""
+        gestor = self.criar_gestor("astar")
+        estrategia = SelecaoMenorDistancia(podar=True)
+        gestor.definir_estrategia_selecao(estrategia)
+        for pedido in CidadeSintetica.gerar_pedidos(gestor.grafo, n_pedidos=10, semente=2):
+            gestor.selecionar_veiculo_pedido(pedido, pedido.instante_pedido)
+
+        poda = gestor.obter_estatisticas_cache()["poda_selecao"]
+        self.assertGreater(poda["procuras_evitadas"], poda["procuras_efetuadas"])
+        # Uma procura por candidato (feita ou evitada); a preferência ambiental pode reduzir os candidatos
+        self.assertLessEqual(poda["procuras_efetuadas"] + poda["procuras_evitadas"],
+                             10 * len(gestor.veiculos_disponiveis()))
+
+    def test_limite_inferior_admissivel(self):
+        """Testa que os limites inferiores nunca excedem o custo real (grafo demo e sintético)."""
+        for grafo in (ConfigTestes.criar_grafo_teste(), CidadeSintetica.grelha(400, semente=4)):
+            gestor = GestorFrota(grafo)
+            rng = random.Random(4)
+            nos = list(grafo.nos)
+            for _ in range(40):
+                origem, destino = rng.sample(nos, 2)
+                tempo, caminho = uniform_cost_search(grafo, origem, destino)
+                _, distancia = gestor.calcular_metricas_rota(caminho)
+                tempo_min, km_min = gestor.limite_inferior_rota(origem, destino)
+                self.assertLessEqual(tempo_min, tempo)
+                # A distância do caminho mais rápido não é a mínima, mas nenhum caminho fica abaixo do limite
+                self.assertLessEqual(km_min, distancia)
+
+    def test_score_obrigatorio(self):
+        """Testa que uma estratégia de score sem _avaliar não pode ser criada."""
+        class SemScore(EstrategiaScore):
+            pass
+
+        with self.assertRaises(TypeError):
+            SemScore()
+        self.assertFalse(isinstance(SelecaoPriorizarEletricos(), EstrategiaScore))
+
+    def test_poda_com_prioridade_eletricos(self):
+        """Testa que a poda da estratégia base é reportada através de SelecaoPriorizarEletricos."""
+        for algoritmo in ("astar", "ucs"):
+            with self.subTest(algoritmo=algoritmo):
+                gestor = self.criar_gestor(algoritmo)
+                gestor.definir_estrategia_selecao(SelecaoPriorizarEletricos(SelecaoMenorDistancia(podar=True)))
+                for pedido in CidadeSintetica.gerar_pedidos(gestor.grafo, n_pedidos=10, semente=2):
+                    gestor.selecionar_veiculo_pedido(pedido, pedido.instante_pedido)
+
+                poda = gestor.obter_estatisticas_cache()["poda_selecao"]
+                self.assertGreater(poda["procuras_evitadas"], 0)
+        self.assertFalse(SelecaoPriorizarEletricos().podar)
+
+
+if __name__ == '__main__':
+    unittest.main()
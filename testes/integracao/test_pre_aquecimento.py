@@ -0,0 +1,67 @@
+"""
+Testes de Integração - Pré-aquecimento da cache de rotas para a hora seguinte
+"""
+
+import unittest
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+PARES = [("Centro", "Aeroporto"), ("Hospital", "Porto"), ("Shopping", "Universidade"),
+         ("Centro", "Porto"), ("Aeroporto", "Hospital")]
+
+
+class TestPreAquecimento(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.transito = GestorTransito(self.grafo, hora_inicial=9)  # 10h tem outros factores
+        self.gestor = GestorFrota(self.grafo)
+        self.gestor.definir_algoritmo_procura("ucs")
+
+    def test_grafo_na_hora_nao_altera_original(self):
+        """Testa que a cópia tem os factores da hora pedida e o original fica igual."""
+        self.transito.atualizar_transito(0)
+        epoca = self.grafo.epoca_transito
+        copia = self.transito.grafo_na_hora(10)
+
+        self.assertEqual(self.grafo.epoca_transito, epoca)
+        aresta = self.grafo.adjacentes["Centro"][0]
+        self.assertEqual(copia.adjacentes["Centro"][0].congestion,
+                         self.transito.factor_aresta("Centro", aresta.no_destino, 10))
+        self.assertNotEqual(copia.adjacentes["Centro"][0].congestion, aresta.congestion)
+
+    def test_rotas_prontas_na_mudanca_de_hora(self):
+        """Testa que, após o pré-aquecimento, a nova hora não precisa de procuras."""
+        self.transito.atualizar_transito(50)
+        for o, d in PARES:
+            self.gestor.calcular_rota(o, d, tempo_atual=50)
+
+        for minuto in range(55, 60):
+            self.transito.atualizar_transito(minuto)
+            self.gestor.aquecer_proximo_regime(self.transito, minuto, max_origens=1)
+
+        self.transito.atualizar_transito(60)
+        procuras = self.gestor.procuras_rota
+        for o, d in PARES:
+            caminho, custo = self.gestor.calcular_rota(o, d, tempo_atual=60)
+            self.assertAlmostEqual(custo, uniform_cost_search(self.grafo, o, d)[0])
+        self.assertEqual(self.gestor.procuras_rota, procuras)
+
+    def test_sem_aquecimento_se_regime_igual(self):
+        """Testa que nada é calculado quando a hora seguinte tem os mesmos factores."""
+        transito = GestorTransito(self.grafo, hora_inicial=8)
+        transito.atualizar_transito(0)
+        self.gestor.calcular_rota("Centro", "Aeroporto")
+        self.assertEqual(self.gestor.aquecer_proximo_regime(transito, 55), 0)
+
+    def test_algoritmo_nao_otimo_ignorado(self):
+        self.gestor.definir_algoritmo_procura("astar")
+        self.transito.atualizar_transito(0)
+        self.gestor.calcular_rota("Centro", "Aeroporto")
+        self.assertEqual(self.gestor.aquecer_proximo_regime(self.transito, 55), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
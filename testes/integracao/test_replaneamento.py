@@ -0,0 +1,116 @@
+"""
+Testes de Replaneamento Incremental de veículos em movimento
+"""
+
+import unittest
+from gestao.replaneamento import GestorReplaneamento
+from gestao.transito_dinamico import GestorTransito
+from modelo.grafo import Grafo, No, TipoNo
+from modelo.veiculos import VeiculoEletrico, EstadoVeiculo
+from testes.test_config import ConfigTestes
+
+
+class TestReplaneamento(unittest.TestCase):
+
+    def setUp(self):
+        self.gestor = ConfigTestes.criar_gestor_teste()
+        self.gestor.definir_algoritmo_procura("ucs")
+        self.grafo = self.gestor.grafo
+        self.transito = GestorTransito(self.grafo, hora_inicial=12)
+        self.transito.atualizar_transito(0)
+        self.transito.consumir_alteracoes()
+        self.replaneamento = GestorReplaneamento(self.grafo)
+
+        self.veiculo = self.gestor.veiculos["E1"]
+        self.veiculo.posicao = "Porto"
+        _, pickup, _, _ = self.gestor.verificar_viabilidade_rota(self.veiculo, "Porto", "Hospital")
+        _, viagem, _, _ = self.gestor.verificar_viabilidade_rota(self.veiculo, "Hospital", "Universidade")
+        self.veiculo.definir_rota(pickup + viagem[1:], paragens=["Hospital", "Universidade"])
+
+    def test_reencaminha_com_bloqueio(self):
+        """Testa que o veículo evita a estrada bloqueada e mantém as paragens."""
+        rota = list(self.veiculo.rota)
+        self.assertEqual(self.replaneamento.replanear([self.veiculo], set()), [])
+
+        self.transito.simular_bloqueio(rota[1], rota[2])
+        reencaminhados = self.replaneamento.replanear([self.veiculo], self.transito.consumir_alteracoes())
+
+        self.assertEqual(reencaminhados, ["E1"])
+        nova = self.veiculo.rota
+        self.assertNotIn((rota[1], rota[2]), list(zip(nova, nova[1:])))
+        self.assertEqual((nova[0], nova[-1]), ("Porto", "Universidade"))
+        self.assertIn("Hospital", nova)
+        self.assertEqual(self.veiculo.paragens, ["Hospital", "Universidade"])
+
+    def test_alteracao_irrelevante(self):
+        """Testa que uma alteração fora da rota não muda nada."""
+        rota = self.veiculo.rota
+        self.replaneamento.replanear([self.veiculo], set())
+
+        self.transito.simular_bloqueio("Posto_Norte", "Posto_Este")
+        self.assertEqual(self.replaneamento.replanear([self.veiculo], self.transito.consumir_alteracoes()), [])
+        self.assertIs(self.veiculo.rota, rota)
+
+    def test_veiculo_a_meio_da_rota(self):
+        """Testa replaneamento depois de o veículo já ter avançado."""
+        self.replaneamento.replanear([self.veiculo], set())
+        self.veiculo.mover_um_passo(self.grafo, 0)
+        rota = list(self.veiculo.rota)
+        i = self.veiculo.indice_rota
+
+        self.transito.simular_bloqueio(rota[i + 1], rota[i + 2])
+        self.replaneamento.replanear([self.veiculo], self.transito.consumir_alteracoes())
+
+        self.assertEqual(self.veiculo.rota[0], self.veiculo.posicao)
+        self.assertEqual(self.veiculo.indice_rota, 0)
+
+    def criar_desvio(self, autonomia_km: float):
+        """Grafo A-P-Q-D com desvio Q-X-D; veículo em Q depois de passar a paragem P."""
+        grafo = Grafo()
+        for i, no_id in enumerate(["A", "P", "Q", "D", "X"]):
+            grafo.adiciona_no(No(no_id, float(i), 0.0, TipoNo.RECOLHA_PASSAGEIROS))
+        for u, v in [("A", "P"), ("P", "Q"), ("Q", "D")]:
+            grafo.adiciona_aresta(u, v, 1.0, 1.0)
+        grafo.adiciona_aresta("Q", "X", 2.0, 2.0)
+        grafo.adiciona_aresta("X", "D", 2.0, 2.0)
+
+        veiculo = VeiculoEletrico("V", "A", autonomia_km, 80.0, 4, 0.1, EstadoVeiculo.A_SERVICO,
+                                  0.0, 0.0, 0, tempo_recarregamento_min=30,
+                                  capacidade_bateria_kWh=60, consumo_kWh_km=0.15)
+        veiculo.definir_rota(["A", "P", "Q", "D"], paragens=["P", "D"])
+        replaneamento = GestorReplaneamento(grafo)
+        replaneamento.replanear([veiculo], set())
+        for tempo in range(2):
+            veiculo.tempo_ocupado_ate = 0
+            veiculo.mover_um_passo(grafo, tempo)
+        self.assertEqual((veiculo.posicao, veiculo.paragens), ("Q", ["D"]))
+
+        transito = GestorTransito(grafo, hora_inicial=12)
+        transito.simular_bloqueio("Q", "D")
+        return veiculo, replaneamento, transito.consumir_alteracoes()
+
+    def test_paragem_passada_e_bloqueio(self):
+        """Testa que o veículo não volta a uma paragem por onde já passou."""
+        veiculo, replaneamento, alteracoes = self.criar_desvio(autonomia_km=60.0)
+
+        self.assertEqual(replaneamento.replanear([veiculo], alteracoes), ["V"])
+        self.assertEqual(veiculo.rota, ["Q", "X", "D"])
+
+    def test_desvio_sem_autonomia(self):
+        """Testa que o desvio não é aceite se exceder a autonomia do veículo."""
+        veiculo, replaneamento, alteracoes = self.criar_desvio(autonomia_km=5.0)  # 2 km já gastos
+
+        self.assertEqual(replaneamento.replanear([veiculo], alteracoes), [])
+        self.assertEqual(veiculo.rota, ["A", "P", "Q", "D"])
+
+    def test_alteracoes_do_transito(self):
+        """Testa que o GestorTransito regista e esquece alterações."""
+        self.transito.atualizar_transito(60)  # 13h: mesmo factor
+        self.assertEqual(self.transito.consumir_alteracoes(), set())
+        self.transito.atualizar_transito(120)  # 14h: factor muda
+        self.assertTrue(self.transito.consumir_alteracoes())
+        self.assertEqual(self.transito.consumir_alteracoes(), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -96,5 +96,28 @@ class TestSimulador(unittest.TestCase):
         total_pedidos = metricas['pedidos_servicos'] + metricas['pedidos_rejeitados']
         self.assertEqual(total_pedidos, 3)
 
+    def test_recarga_so_em_paragem_planeada(self):
+        """Testa que o veículo só recarrega nas paragens de recarga da rota."""
+        veiculo = self.gestor.veiculos["E1"]
+        veiculo.posicao = "Centro"
+        veiculo.autonomia_km = 1.0
+        rota = ["Centro", "Recarga_Centro", "Shopping"]
+
+        # Estação no caminho mas não planeada: segue viagem
+        veiculo.definir_rota(rota)
+        veiculo.mover_um_passo(self.gestor.grafo, 0)
+        autonomia = veiculo.autonomia_km
+        self.simulador.recarregar_em_rota(veiculo)
+        self.assertEqual(veiculo.autonomia_km, autonomia)
+
+        # Paragem de recarga planeada: recarrega
+        veiculo.posicao = "Centro"
+        veiculo.tempo_ocupado_ate = 0
+        veiculo.definir_rota(rota, paragens=["Recarga_Centro", "Shopping"], recargas=[True, False])
+        veiculo.mover_um_passo(self.gestor.grafo, 0)
+        self.simulador.recarregar_em_rota(veiculo)
+        self.assertEqual(veiculo.autonomia_km, veiculo.autonomiaMax_km)
+        self.assertFalse(veiculo.recarga_pendente)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
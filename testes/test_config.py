@@ -2,6 +2,7 @@
 Configurações e fixtures compartilhadas entre testes.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -11,6 +12,7 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from fabrica.grafo_demo import GrafoDemo
 from fabrica.veiculos_demo import VeiculosDemo
+from fabrica.cidade_sintetica import CidadeSintetica
 from gestao.gestor_frota import GestorFrota
 
 
@@ -27,6 +29,10 @@ class ConfigTestes:
     # Parâmetros de simulação padrão
     DURACAO_SIMULACAO_DEFAULT = 30  # minutos
     NUM_PEDIDOS_TESTE = 10
+
+    # Tamanhos das cidades sintéticas nos testes de escala
+    # (ex: TAXIGREEN_TAMANHOS=1000,10000,100000 python -m pytest testes/desempenho)
+    TAMANHOS_CIDADE = [int(n) for n in os.environ.get("TAXIGREEN_TAMANHOS", "1000").split(",")]
     
     @staticmethod
     def criar_grafo_teste():
@@ -39,4 +45,9 @@ class ConfigTestes:
         grafo = ConfigTestes.criar_grafo_teste()
         gestor = GestorFrota(grafo)
         VeiculosDemo.criar_frota_demo(gestor)
-        return gestor
\ No newline at end of file
+        return gestor
+
+    @staticmethod
+    def criar_cidade_teste(n_nos: int, tipo: str = "grelha", semente: int = 0):
+        """Cria cidade sintética (ver fabrica.cidade_sintetica)."""
+        return CidadeSintetica.criar(tipo, n_nos, semente=semente)
@@ -0,0 +1,81 @@
+"""
+Testes Unitários - Cache de árvores de caminhos mínimos
+"""
+
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
+from gestao.cache_distancias import CacheArvores
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+
+class TestCacheArvores(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+
+    def test_reutiliza_arvore(self):
+        """Testa que rotas da mesma origem e subcaminhos não geram procuras."""
+        cache = CacheArvores(self.grafo)
+        caminho, _, _ = cache.rota("Centro", "Aeroporto")
+        for no in self.grafo.nos:
+            self.assertIsNotNone(cache.rota("Centro", no))
+        self.assertIsNotNone(cache.rota_em_cache(caminho[1], "Aeroporto"))
+
+        stats = cache.estatisticas()
+        self.assertEqual(stats['cache_misses'], 1)
+        self.assertEqual(stats['hits_subcaminho'], 1)
+
+    def test_lfu_com_limite_memoria(self):
+        """Testa que, sem espaço, sai a árvore menos pedida."""
+        tamanho = CacheArvores(self.grafo).arvore("Centro").memoria_bytes()
+        cache = CacheArvores(self.grafo, max_bytes=2 * tamanho)
+        for _ in range(3):
+            cache.arvore("Centro")
+        cache.arvore("Hospital")
+        cache.arvore("Aeroporto")  # não cabe: sai Hospital (1 pedido)
+
+        self.assertEqual(cache.estatisticas()['evicoes'], 1)
+        self.assertLessEqual(cache.estatisticas()['bytes'], 2 * tamanho)
+        self.assertIsNotNone(cache.rota_em_cache("Centro", "Porto"))
+        misses = cache.estatisticas()['cache_misses']
+        cache.arvore("Hospital")
+        self.assertEqual(cache.estatisticas()['cache_misses'], misses + 1)
+
+    def test_invalidacao_por_transito(self):
+        """Testa que árvores de épocas de trânsito anteriores não são usadas."""
+        cache = CacheArvores(self.grafo)
+        self.assertIsNotNone(cache.rota("Centro", "Porto"))
+
+        # Isola o Porto
+        transito = GestorTransito(self.grafo)
+        for aresta in self.grafo.vizinhos("Porto"):
+            transito.simular_bloqueio("Porto", aresta.no_destino)
+
+        self.assertIsNone(cache.rota_em_cache("Centro", "Porto"))
+        self.assertEqual(cache.estatisticas()['arvores_cacheadas'], 0)
+        self.assertIsNone(cache.rota("Centro", "Porto"))
+
+    def test_pickups_frequentes(self):
+        """Testa a taxa de acerto das árvores inversas dos pickups no centro."""
+        grafo = CidadeSintetica.radial(800, semente=9)
+        gestor = GestorFrota(grafo)
+        gestor.definir_algoritmo_procura("ucs")
+        gestor.ativar_cache_arvores()
+        CidadeSintetica.criar_frota(gestor, n_veiculos=25, semente=9)
+
+        # 200 pedidos repartidos por 5 zonas de recolha frequentes
+        hotspots = CidadeSintetica.zonas_recolha(grafo)[:5]
+        candidatos = gestor.veiculos_disponiveis()
+        for i in range(200):
+            gestor.verificar_viabilidade_rotas_ate(candidatos, hotspots[i % 5])
+
+        stats = gestor.obter_estatisticas_cache()['cache_arvores']
+        self.assertEqual(stats['cache_misses'], 5)
+        self.assertGreaterEqual(stats['taxa_acerto'], 97.5)
+        self.assertEqual(gestor.procuras_rota, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
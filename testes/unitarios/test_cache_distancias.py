@@ -2,7 +2,9 @@
 Testes unitários do sistema de cache de distâncias.
 """
 
+import math
 import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
 from gestao.cache_distancias import CacheDistancias
 from testes.test_config import ConfigTestes
 
@@ -47,7 +49,7 @@ class TestCacheDistancias(unittest.TestCase):
         self.cache.pre_carregar_distancias_criticas(nos_criticos)
         
         stats = self.cache.estatisticas()
-        # 3 nós = 3 pares (Centro-Aeroporto, Centro-Hospital, Aeroporto-Hospital)
+        # 3 nós = 3 linhas da matriz, calculadas numa só operação
         self.assertEqual(stats['cache_misses'], 3)
     
     def test_limpar_cache(self):
@@ -60,6 +62,74 @@ class TestCacheDistancias(unittest.TestCase):
         self.assertEqual(stats['cache_misses'], 0)
         self.assertEqual(stats['tamanho_cache'], 0)
 
+    def test_pre_carregamento_serve_consultas(self):
+        """Testa que, após o pré-carregamento, consultas a partir dos nós críticos são hits."""
+        self.cache.pre_carregar_distancias_criticas(["Centro", "Aeroporto"])
+        for destino in self.grafo.nos:
+            self.cache.get_distancia_euclidiana(destino, "Centro")
+            self.cache.get_distancia_euclidiana("Aeroporto", destino)
+
+        stats = self.cache.estatisticas()
+        self.assertEqual(stats['cache_misses'], 2)
+        self.assertEqual(stats['cache_hits'], 2 * len(self.grafo.nos))
+        self.assertEqual(stats['tamanho_cache'], 2)
+
+
+class TestMatrizDistancias(unittest.TestCase):
+    """Testa a matriz densa e o modo vetorial (grafo demasiado grande para a matriz)."""
+
+    def setUp(self):
+        self.grafo = CidadeSintetica.planar_aleatoria(300, semente=3)
+        self.ids = list(self.grafo.nos)
+
+    def distancia(self, a, b):
+        na, nb = self.grafo.nos[a], self.grafo.nos[b]
+        return math.hypot(na.posicaox - nb.posicaox, na.posicaoy - nb.posicaoy)
+
+    def verificar_consultas(self, cache):
+        origens, destinos = self.ids[:7], self.ids[100:140]
+        for a in origens:
+            for b in destinos:
+                self.assertAlmostEqual(cache.get_distancia_euclidiana(a, b), self.distancia(a, b), places=4)
+
+        linha = cache.distancias_de(self.ids[5])
+        self.assertEqual(len(linha), len(self.ids))
+        for j in range(0, len(self.ids), 17):
+            self.assertAlmostEqual(float(linha[j]), self.distancia(self.ids[5], self.ids[j]), places=4)
+
+        bloco = cache.distancias_bloco(destinos, origens)
+        self.assertEqual(bloco.shape, (len(destinos), len(origens)))
+        for i, a in enumerate(destinos):
+            for j, b in enumerate(origens):
+                self.assertAlmostEqual(float(bloco[i, j]), self.distancia(a, b), places=4)
+
+    def test_matriz_densa(self):
+        """Testa distâncias individuais, linhas e blocos servidos pela matriz."""
+        cache = CacheDistancias(self.grafo)
+        self.assertEqual(cache.estatisticas()['modo'], "matriz")
+        self.verificar_consultas(cache)
+        self.assertEqual(cache.estatisticas()['bytes'], len(self.ids) ** 2 * 4)
+
+    def test_modo_vetorial(self):
+        """Testa que um orçamento pequeno dispensa a matriz e dá os mesmos resultados."""
+        cache = CacheDistancias(self.grafo, max_bytes_matriz=10_000)
+        self.assertEqual(cache.estatisticas()['modo'], "vetorial")
+        self.verificar_consultas(cache)
+        self.assertEqual(cache.estatisticas()['bytes'], 0)
+
+    def test_modo_vetorial_guarda_bloco_critico(self):
+        """Testa que, sem matriz, o pré-carregamento guarda só o bloco entre nós críticos."""
+        cache = CacheDistancias(self.grafo, max_bytes_matriz=10_000)
+        criticos = self.ids[:20]
+        cache.pre_carregar_distancias_criticas(criticos)
+
+        self.assertAlmostEqual(cache.get_distancia_euclidiana(criticos[3], criticos[11]),
+                               self.distancia(criticos[3], criticos[11]), places=4)
+        cache.get_distancia_euclidiana(criticos[3], self.ids[200])
+        stats = cache.estatisticas()
+        self.assertEqual((stats['cache_hits'], stats['cache_misses']), (1, 21))
+        self.assertEqual(stats['tamanho_cache'], 20)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
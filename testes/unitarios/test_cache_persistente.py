@@ -0,0 +1,86 @@
+"""
+Testes unitários da cache persistente de rotas (SQLite).
+"""
+
+import os
+import tempfile
+import unittest
+from gestao.cache_distancias import CachePersistente
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+
+class TestCachePersistente(unittest.TestCase):
+    """Testa a partilha de rotas entre execuções através do ficheiro."""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, "rotas.sqlite")
+        self.pares = [("Centro", "Aeroporto"), ("Hospital", "Porto"), ("Shopping", "Universidade")]
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def executar(self, algoritmo="ucs", transito=None):
+        """Uma 'execução': gestor novo sobre um grafo novo da mesma cidade."""
+        grafo = ConfigTestes.criar_grafo_teste()
+        if transito is not None:
+            GestorTransito(grafo, hora_inicial=transito).atualizar_transito(0)
+        gestor = GestorFrota(grafo)
+        gestor.definir_algoritmo_procura(algoritmo)
+        gestor.ativar_cache_persistente(self.caminho)
+        rotas = [gestor.calcular_rota(o, d) for o, d in self.pares]
+        gestor.cache_persistente.fechar()
+        return gestor, rotas
+
+    def test_segunda_execucao_sem_procuras(self):
+        """Testa que uma segunda execução reutiliza as rotas da primeira."""
+        primeiro, rotas = self.executar()
+        self.assertEqual(primeiro.procuras_rota, len(self.pares))
+        self.assertEqual(primeiro.obter_estatisticas_cache()["cache_persistente"]["rotas_gravadas"], len(self.pares))
+
+        segundo, rotas_lidas = self.executar()
+        self.assertEqual(segundo.procuras_rota, 0)
+        self.assertEqual(rotas_lidas, rotas)
+        stats = segundo.cache_persistente.estatisticas()
+        self.assertEqual(stats["rotas_lidas"], len(self.pares))
+        self.assertEqual(stats["cache_hits"], len(self.pares))
+
+    def test_chave_inclui_algoritmo_e_transito(self):
+        """Testa que outro algoritmo ou outro trânsito não reutilizam as rotas."""
+        self.executar(transito=3)
+        self.assertEqual(self.executar(algoritmo="bidirecional", transito=3)[0].procuras_rota, len(self.pares))
+        self.assertEqual(self.executar(transito=8)[0].procuras_rota, len(self.pares))
+        # Madrugada: horas com os mesmos factores partilham as rotas
+        self.assertEqual(self.executar(transito=4)[0].procuras_rota, 0)
+
+    def test_chave_inclui_grafo(self):
+        """Testa que uma cidade diferente não reutiliza as rotas."""
+        self.executar()
+        grafo = ConfigTestes.criar_grafo_teste()
+        grafo.adiciona_aresta("Centro", "Porto", 1.0, 1.0)
+        cache = CachePersistente(self.caminho, grafo)
+        self.assertIsNone(cache.get_rota("Centro", "Aeroporto", "ucs"))
+        cache.fechar()
+
+    def test_escrita_em_lotes(self):
+        """Testa que as rotas só são escritas ao completar um lote (ou em gravar)."""
+        grafo = ConfigTestes.criar_grafo_teste()
+        cache = CachePersistente(self.caminho, grafo, tamanho_lote=2)
+        cache.armazenar_rota("A", "B", "ucs", ["A", "B"], 1.0)
+        self.assertEqual(cache.estatisticas()["pendentes"], 1)
+        self.assertEqual(cache.get_rota("A", "B", "ucs"), (["A", "B"], 1.0))
+
+        cache.armazenar_rota("B", "C", "ucs", ["B", "C"], 2.0)
+        self.assertEqual(cache.estatisticas()["rotas_gravadas"], 2)
+        cache.armazenar_rota("C", "D", "ucs", ["C", "D"], 3.0)
+        cache.fechar()
+
+        outra = CachePersistente(self.caminho, ConfigTestes.criar_grafo_teste())
+        self.assertEqual(outra.aquecer("ucs"), 3)
+        outra.fechar()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -107,6 +107,68 @@ class TestCacheRotas(unittest.TestCase):
         self.assertEqual(stats['cache_hits'], 0)
         self.assertEqual(stats['cache_misses'], 0)
 
+    def test_lru_remove_menos_usada(self):
+        """Testa que, cheia, a cache descarta a rota usada há mais tempo."""
+        cache = CacheRotas(validade_minutos=10, capacidade=2)
+        cache.armazenar_rota("A", "B", "astar", ["A", "B"], 5.0, 0)
+        cache.armazenar_rota("B", "C", "astar", ["B", "C"], 6.0, 0)
+        cache.get_rota("A", "B", "astar", 1)  # A→B passa a mais recente
+        cache.armazenar_rota("C", "D", "astar", ["C", "D"], 7.0, 0)
+
+        self.assertIsNotNone(cache.get_rota("A", "B", "astar", 1))
+        self.assertIsNone(cache.get_rota("B", "C", "astar", 1))
+        self.assertEqual(cache.estatisticas()['evicoes'], 1)
+
+    def test_limite_bytes(self):
+        """Testa o limite de memória."""
+        cache = CacheRotas(validade_minutos=10, max_bytes=3000)
+        for i in range(50):
+            cache.armazenar_rota(f"O{i}", "D", "astar", [f"O{i}"] + ["X"] * 20 + ["D"], 1.0, 0)
+
+        stats = cache.estatisticas()
+        self.assertLessEqual(stats['bytes'], 3000)
+        self.assertGreater(stats['rotas_cacheadas'], 0)
+        self.assertEqual(stats['rotas_cacheadas'] + stats['evicoes'], 50)
+
+        cache.limpar_cache()
+        self.assertEqual(cache.estatisticas()['bytes'], 0)
+
+    def test_regime_de_transito(self):
+        """Testa que um bloqueio muda o regime e que, desbloqueado, as rotas antigas voltam a servir."""
+        from gestao.transito_dinamico import GestorTransito
+
+        grafo = ConfigTestes.criar_grafo_teste()
+        transito = GestorTransito(grafo)
+        cache = CacheRotas(validade_minutos=None, grafo=grafo)
+        cache.armazenar_rota("Centro", "Aeroporto", "astar", ["Centro", "Shopping", "Aeroporto"], 15.5, 0)
+        self.assertIsNotNone(cache.get_rota("Centro", "Aeroporto", "astar", 500))
+
+        transito.simular_bloqueio("Centro", "Shopping", bloquear=True)
+        self.assertIsNone(cache.get_rota("Centro", "Aeroporto", "astar", 1))
+        cache.armazenar_rota("Centro", "Aeroporto", "astar", ["Centro", "Praça", "Aeroporto"], 18.0, 1)
+        self.assertEqual(cache.estatisticas()['regimes'], 2)
+
+        transito.simular_bloqueio("Centro", "Shopping", bloquear=False)
+        self.assertEqual(cache.get_rota("Centro", "Aeroporto", "astar", 2),
+                         (["Centro", "Shopping", "Aeroporto"], 15.5))
+
+    def test_regime_sobrevive_atualizacoes_por_minuto(self):
+        """Testa que as rotas duram enquanto os factores da hora não mudam (8h05 → 9h59)."""
+        from gestao.transito_dinamico import GestorTransito
+
+        grafo = ConfigTestes.criar_grafo_teste()
+        transito = GestorTransito(grafo, hora_inicial=8)
+        cache = CacheRotas(validade_minutos=None, grafo=grafo)
+        transito.atualizar_transito(5)
+        cache.armazenar_rota("Centro", "Aeroporto", "ucs", ["Centro", "Aeroporto"], 20.0, 5)
+
+        for minuto in range(6, 120):
+            transito.atualizar_transito(minuto)
+            self.assertIsNotNone(cache.get_rota("Centro", "Aeroporto", "ucs", minuto))
+
+        transito.atualizar_transito(120)  # 10h: outro factor
+        self.assertIsNone(cache.get_rota("Centro", "Aeroporto", "ucs", 120))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Testes Unitários - Gerador de cidades sintéticas
+"""
+
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica, TIPOS_CIDADE
+from gestao.algoritmos_procura.um_para_muitos import dijkstra_um_para_muitos
+from gestao.gestor_frota import GestorFrota
+from gestao.transito_dinamico import GestorTransito
+from modelo.grafo import TipoNo
+from testes.test_config import ConfigTestes
+
+
+class TestCidadeSintetica(unittest.TestCase):
+
+    def test_tamanho_e_conectividade(self):
+        """Testa que cada tipo tem o número pedido de nós e é conexo."""
+        for tipo in TIPOS_CIDADE:
+            for n_nos in ConfigTestes.TAMANHOS_CIDADE:
+                with self.subTest(tipo=tipo, n_nos=n_nos):
+                    g = ConfigTestes.criar_cidade_teste(n_nos, tipo)
+                    self.assertEqual(len(g.nos), n_nos)
+                    alcancaveis = dijkstra_um_para_muitos(g, next(iter(g.nos)))
+                    self.assertEqual(len(alcancaveis), n_nos)
+
+    def test_determinismo(self):
+        """Testa que a mesma semente gera a mesma cidade."""
+        for tipo in TIPOS_CIDADE:
+            with self.subTest(tipo=tipo):
+                g1 = CidadeSintetica.criar(tipo, 500, semente=7)
+                g2 = CidadeSintetica.criar(tipo, 500, semente=7)
+                self.assertEqual(g1.nos, g2.nos)
+                self.assertEqual(g1.adjacentes, g2.adjacentes)
+
+    def test_proporcoes_estacoes(self):
+        """Testa proporções de estações de recarga e postos."""
+        g = CidadeSintetica.grelha(1000, semente=1)
+        tipos = [no.tipo for no in g.nos.values()]
+        self.assertEqual(tipos.count(TipoNo.ESTACAO_RECARGA), 50)
+        self.assertEqual(tipos.count(TipoNo.POSTO_ABASTECIMENTO), 20)
+
+    def test_zonas_reconhecidas_transito(self):
+        """Testa que o GestorTransito reconhece zonas centrais e comerciais."""
+        g = CidadeSintetica.radial(1000, semente=2)
+        transito = GestorTransito(g, hora_inicial=8)
+        self.assertTrue(any(transito.eh_zona_central(no_id) for no_id in g.nos))
+        self.assertTrue(any(transito.eh_zona_comercial(no_id) for no_id in g.nos))
+
+    def test_frota_proporcional(self):
+        """Testa frota proporcional ao tamanho e posições válidas."""
+        g = CidadeSintetica.grelha(1000, semente=3)
+        gestor = GestorFrota(g)
+        veiculos = CidadeSintetica.criar_frota(gestor, semente=3)
+
+        self.assertEqual(len(veiculos), 20)
+        self.assertEqual(len(gestor.veiculos), 20)
+        self.assertEqual(sum(v.tipo_veiculo() == "eletrico" for v in veiculos), 10)
+        for v in veiculos:
+            self.assertEqual(g.nos[v.posicao].tipo, TipoNo.RECOLHA_PASSAGEIROS)
+
+    def test_pedidos(self):
+        """Testa fluxo de pedidos ordenado e dentro da duração."""
+        g = CidadeSintetica.planar_aleatoria(1000, semente=4)
+        pedidos = CidadeSintetica.gerar_pedidos(g, duracao_min=60, semente=4)
+
+        self.assertEqual(len(pedidos), 50)
+        instantes = [p.instante_pedido for p in pedidos]
+        self.assertEqual(instantes, sorted(instantes))
+        self.assertTrue(all(0 <= t < 60 for t in instantes))
+        self.assertTrue(all(p.posicao_inicial in g.nos and p.posicao_destino in g.nos for p in pedidos))
+
+    def test_tipo_invalido(self):
+        with self.assertRaises(ValueError):
+            CidadeSintetica.criar("hexagonal", 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
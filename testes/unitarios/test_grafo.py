@@ -70,5 +70,20 @@ class TestGrafo(unittest.TestCase):
         
         self.assertEqual(aresta.tempo_real(), float('inf'))
 
+    def test_indice_arestas_repetidas(self):
+        """Testa que o índice devolve a primeira aresta, como a procura linear."""
+        self.grafo.adiciona_aresta("A", "B", 5.0, 9.0)
+
+        self.assertEqual(len(self.grafo.vizinhos("A")), 2)
+        self.assertIs(self.grafo.get_aresta("A", "B"), self.grafo.vizinhos("A")[0])
+        self.assertEqual(self.grafo.distancia("A", "B"), 1.0)
+
+    def test_indice_atualizado_ao_adicionar(self):
+        """Testa que novas arestas ficam logo indexadas."""
+        self.grafo.adiciona_aresta("A", "C", 2.0, 4.0)
+
+        self.assertEqual(self.grafo.distancia("A", "C"), 2.0)
+        self.assertEqual(self.grafo.get_aresta("C", "A").tempo_real(), 4.0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Testes Unitários - Formato binário do grafo (memory-map)
+"""
+
+import os
+import tempfile
+import unittest
+from modelo.grafo_binario import guardar_grafo, carregar_grafo
+from modelo.grafo_compacto import GrafoCompacto
+from gestao.algoritmos_procura.a_estrela import a_star_search
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+from testes.test_config import ConfigTestes
+
+
+class TestGrafoBinario(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, "cidade.bin")
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.grafo.guardar_binario(self.caminho)
+        self.carregado = carregar_grafo(self.caminho)
+
+    def tearDown(self):
+        del self.carregado
+        self.pasta.cleanup()
+
+    def test_mesmos_nos_e_arestas(self):
+        """Testa que o ficheiro preserva nós, ids e arestas."""
+        self.assertIsInstance(self.carregado, GrafoCompacto)
+        self.assertEqual(list(self.carregado.nos), list(self.grafo.nos))
+        self.assertEqual(dict(self.carregado.nos.items()), self.grafo.nos)
+
+        for origem, arestas in self.grafo.adjacentes.items():
+            lidas = self.carregado.vizinhos(origem)
+            self.assertEqual([a.no_destino for a in lidas], [a.no_destino for a in arestas])
+            self.assertEqual([a.tempo_real() for a in lidas], [a.tempo_real() for a in arestas])
+
+    def test_indice_por_id(self):
+        """Testa procura de ids na tabela de strings (incluindo ids com acentos)."""
+        for i, id_no in enumerate(self.grafo.nos):
+            self.assertEqual(self.carregado.indice[id_no], i)
+        self.assertIn("Estação_Metro", self.carregado.nos)
+        self.assertNotIn("Inexistente", self.carregado.nos)
+        self.assertEqual(self.carregado.vizinhos("Inexistente"), [])
+
+    def test_mesmas_rotas(self):
+        """Testa que os algoritmos dão o mesmo resultado sobre o grafo mapeado."""
+        for origem, destino in [("Centro", "Aeroporto"), ("Porto", "Escola_Norte")]:
+            with self.subTest(origem=origem, destino=destino):
+                self.assertEqual(uniform_cost_search(self.carregado, origem, destino),
+                                 uniform_cost_search(self.grafo, origem, destino))
+                self.assertEqual(a_star_search(self.carregado, origem, destino),
+                                 a_star_search(self.grafo, origem, destino))
+
+    def test_transito_nao_altera_ficheiro(self):
+        """Testa que alterações de trânsito ficam no processo (mapeamento copy-on-write)."""
+        transito = GestorTransito(self.carregado, hora_inicial=8)
+        transito.simular_bloqueio("Centro", "Praça", bloquear=True)
+        transito.atualizar_transito(0)
+        self.assertTrue(self.carregado.get_aresta("Centro", "Praça").blocked)
+
+        self.carregado.nos["Recarga_Centro"].disponivel = False
+        self.assertFalse(self.carregado.nos["Recarga_Centro"].disponivel)
+
+        novo = carregar_grafo(self.caminho)
+        self.assertFalse(novo.get_aresta("Centro", "Praça").blocked)
+        self.assertEqual(novo.get_aresta("Centro", "Praça").congestion, 1.0)
+        self.assertTrue(novo.nos["Recarga_Centro"].disponivel)
+
+    def test_guarda_estado_transito(self):
+        """Testa que bloqueios presentes ao guardar são preservados."""
+        self.grafo.get_aresta("Centro", "Praça").blocked = True
+        guardar_grafo(self.grafo, self.caminho + ".2")
+        self.assertTrue(carregar_grafo(self.caminho + ".2").get_aresta("Centro", "Praça").blocked)
+
+    def test_ficheiro_invalido(self):
+        caminho = os.path.join(self.pasta.name, "invalido.bin")
+        with open(caminho, "wb") as f:
+            f.write(b"nao e um grafo" * 10)
+        with self.assertRaises(ValueError):
+            carregar_grafo(caminho)
+
+
+if __name__ == '__main__':
+    unittest.main()
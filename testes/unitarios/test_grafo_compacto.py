@@ -0,0 +1,122 @@
+"""
+Testes Unitários - Grafo Compacto (CSR)
+"""
+
+import unittest
+from modelo.grafo_compacto import GrafoCompacto
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.algoritmos_procura.a_estrela import a_star_search
+from gestao.algoritmos_procura.greedy import greedy
+from gestao.algoritmos_procura.bidirecional import bidirectional_search
+from gestao.algoritmos_procura.landmarks import Landmarks
+from gestao.transito_dinamico import GestorTransito
+from gestao.gestor_frota import GestorFrota
+from testes.test_config import ConfigTestes
+
+
+class TestGrafoCompacto(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.compacto = GrafoCompacto.de_grafo(self.grafo)
+
+    def test_mesmos_nos_e_arestas(self):
+        """Testa que a conversão preserva nós e arestas."""
+        self.assertEqual(set(self.compacto.nos), set(self.grafo.nos))
+        total = sum(len(adj) for adj in self.grafo.adjacentes.values())
+        self.assertEqual(self.compacto.num_arestas(), total)
+
+        for origem, arestas in self.grafo.adjacentes.items():
+            destinos = [a.no_destino for a in self.compacto.vizinhos(origem)]
+            self.assertEqual(destinos, [a.no_destino for a in arestas])
+
+    def test_get_aresta_e_distancia(self):
+        """Testa interface compatível com Grafo."""
+        original = self.grafo.get_aresta("Centro", "Praça")
+        aresta = self.compacto.get_aresta("Centro", "Praça")
+
+        self.assertEqual(aresta.distancia_km, original.distancia_km)
+        self.assertEqual(aresta.tempo_real(), original.tempo_real())
+        self.assertEqual(self.compacto.distancia("Centro", "Praça"), 0.8)
+
+        with self.assertRaises(ValueError):
+            self.compacto.get_aresta("Centro", "Aeroporto")
+
+    def test_escrita_congestionamento_e_bloqueio(self):
+        """Testa que alterações na vista escrevem nos arrays."""
+        aresta = self.compacto.get_aresta("Centro", "Praça")
+        aresta.congestion = 2.0
+        self.assertEqual(self.compacto.get_aresta("Centro", "Praça").tempo_real(),
+                         aresta.tempoViagem_min * 2.0)
+
+        aresta.blocked = True
+        self.assertEqual(aresta.tempo_real(), float('inf'))
+
+    def test_ucs_igual_ao_grafo_original(self):
+        """Testa que a procura sobre arrays dá o mesmo resultado."""
+        for origem, destino in [("Centro", "Aeroporto"), ("Suburbio_Oeste2", "Aeroporto"), ("Porto", "Escola_Norte")]:
+            custo, caminho = uniform_cost_search(self.grafo, origem, destino)
+            custo_c, caminho_c = uniform_cost_search(self.compacto, origem, destino)
+            self.assertAlmostEqual(custo, custo_c)
+            self.assertEqual(caminho, caminho_c)
+
+    def test_procuras_sobre_arrays(self):
+        """Testa que A*, ALT, greedy e bidirecional dão o mesmo resultado sobre os arrays."""
+        GestorTransito(self.grafo, hora_inicial=8).atualizar_transito(0)
+        self.grafo.get_aresta("Centro", "Praça").blocked = True
+        compacto = GrafoCompacto.de_grafo(self.grafo)
+        alt = Landmarks(self.grafo)
+        procuras = {
+            "A*": a_star_search,
+            "ALT": lambda g, o, d: a_star_search(g, o, d, heuristica=alt.heuristica),
+            "Greedy": greedy,
+            "Bidirecional": bidirectional_search
+        }
+
+        for nome, procura in procuras.items():
+            for origem, destino in [("Centro", "Aeroporto"), ("Suburbio_Oeste2", "Aeroporto"), ("Praia", "Centro")]:
+                with self.subTest(algoritmo=nome, origem=origem, destino=destino):
+                    custo, caminho = procura(self.grafo, origem, destino)
+                    custo_c, caminho_c = procura(compacto, origem, destino)
+                    self.assertAlmostEqual(custo, custo_c)
+                    self.assertEqual((caminho_c[0], caminho_c[-1]), (origem, destino))
+                    if nome == "Greedy":
+                        self.assertEqual(caminho, caminho_c)
+
+    def test_indice_aresta_primeira_repetida(self):
+        """Testa que a procura binária devolve a primeira de arestas repetidas, como Grafo.get_aresta."""
+        for origem, arestas in self.grafo.adjacentes.items():
+            for aresta in arestas:
+                e = self.compacto.indice_aresta(origem, aresta.no_destino)
+                primeira = next(a for a in arestas if a.no_destino == aresta.no_destino)
+                self.assertEqual(self.compacto.ids[self.compacto.destinos[e]], aresta.no_destino)
+                self.assertEqual(self.compacto.tempos[e], primeira.tempoViagem_min)
+                self.assertEqual(self.compacto.indice_aresta(aresta.no_destino, origem),
+                                 self.compacto.arestas_reversas()[e])
+        self.assertEqual(self.compacto.indice_aresta("Centro", "Aeroporto"), -1)
+
+    def test_transito_e_gestor_frota(self):
+        """Testa que GestorTransito e GestorFrota funcionam sobre o grafo compacto."""
+        transito = GestorTransito(self.compacto, hora_inicial=8)
+        transito.atualizar_transito(0)
+        self.assertGreater(self.compacto.get_aresta("Centro", "Praça").congestion, 1.0)
+
+        gestor = GestorFrota(self.compacto)
+        gestor.definir_algoritmo_procura("ucs")
+        caminho, custo = gestor.calcular_rota("Centro", "Aeroporto")
+        self.assertTrue(caminho)
+        self.assertLess(custo, float('inf'))
+
+    def test_ida_e_volta(self):
+        """Testa conversão CSR → Grafo."""
+        grafo = self.compacto.para_grafo()
+        self.assertEqual(grafo.distancia("Centro", "Praça"), self.grafo.distancia("Centro", "Praça"))
+
+    def test_memoria_arrays(self):
+        """Testa que cada aresta ocupa poucos bytes."""
+        por_aresta = self.compacto.memoria_arrays_bytes() / self.compacto.num_arestas()
+        self.assertLess(por_aresta, 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
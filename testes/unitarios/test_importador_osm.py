@@ -0,0 +1,174 @@
+"""
+Testes Unitários - Importador de redes viárias (OSM XML / GeoJSON)
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from fabrica.importador_osm import ImportadorRede, velocidade_via, sentido_via
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from modelo.grafo import TipoNo
+from modelo.grafo_compacto import GrafoCompacto
+
+# Rede em "T" com uma cadeia de grau 2 (1-2-3), uma via de sentido único (3→5),
+# um passeio (ignorado), uma via desligada (ignorada), uma estação e um posto.
+#
+#   4
+#   |
+#   1 --- 2 --- 3 ---> 5        8 --- 9 (desligada)
+#   |
+#   6 ... 7 (footway)
+OSM_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6">
+  <node id="1" lat="41.5500" lon="-8.4200"/>
+  <node id="2" lat="41.5500" lon="-8.4150"/>
+  <node id="3" lat="41.5500" lon="-8.4100"/>
+  <node id="4" lat="41.5550" lon="-8.4200"/>
+  <node id="5" lat="41.5500" lon="-8.4050"/>
+  <node id="6" lat="41.5450" lon="-8.4200"/>
+  <node id="7" lat="41.5400" lon="-8.4200"/>
+  <node id="8" lat="41.6000" lon="-8.3000"/>
+  <node id="9" lat="41.6000" lon="-8.2950"/>
+  <node id="20" lat="41.5502" lon="-8.4151">
+    <tag k="amenity" v="charging_station"/>
+  </node>
+  <node id="30" lat="41.5451" lon="-8.4201"/>
+  <node id="31" lat="41.5451" lon="-8.4199"/>
+  <node id="32" lat="41.5449" lon="-8.4199"/>
+  <way id="100">
+    <nd ref="1"/><nd ref="2"/><nd ref="3"/>
+    <tag k="highway" v="residential"/>
+  </way>
+  <way id="101">
+    <nd ref="4"/><nd ref="1"/><nd ref="6"/>
+    <tag k="highway" v="primary"/>
+    <tag k="maxspeed" v="50"/>
+  </way>
+  <way id="102">
+    <nd ref="3"/><nd ref="5"/>
+    <tag k="highway" v="tertiary"/>
+    <tag k="oneway" v="yes"/>
+  </way>
+  <way id="103">
+    <nd ref="5"/><nd ref="1"/>
+    <tag k="highway" v="service"/>
+  </way>
+  <way id="104">
+    <nd ref="6"/><nd ref="7"/>
+    <tag k="highway" v="footway"/>
+  </way>
+  <way id="105">
+    <nd ref="8"/><nd ref="9"/>
+    <tag k="highway" v="residential"/>
+  </way>
+  <way id="106">
+    <nd ref="30"/><nd ref="31"/><nd ref="32"/><nd ref="30"/>
+    <tag k="amenity" v="fuel"/>
+  </way>
+  <relation id="500">
+    <member type="way" ref="100" role=""/>
+  </relation>
+</osm>
+"""
+
+
+def via_geojson(pontos, **propriedades):
+    return {"type": "Feature", "properties": propriedades,
+            "geometry": {"type": "LineString", "coordinates": pontos}}
+
+
+class TestImportadorRede(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def escrever(self, nome: str, conteudo: str) -> str:
+        caminho = os.path.join(self.pasta.name, nome)
+        abrir = gzip.open if nome.endswith(".gz") else open
+        with abrir(caminho, "wt", encoding="utf-8") as f:
+            f.write(conteudo)
+        return caminho
+
+    def test_tags(self):
+        """Testa leitura de velocidades e sentidos."""
+        self.assertEqual(velocidade_via({"highway": "residential"}), 30)
+        self.assertEqual(velocidade_via({"highway": "primary", "maxspeed": "70"}), 70)
+        self.assertAlmostEqual(velocidade_via({"highway": "primary", "maxspeed": "30 mph"}), 48.27)
+        self.assertEqual(velocidade_via({"highway": "primary", "maxspeed": "PT:urban"}), 60)
+        self.assertIsNone(velocidade_via({"highway": "footway"}))
+        self.assertIsNone(velocidade_via({"highway": "service", "access": "private"}))
+        self.assertEqual(sentido_via({"oneway": "yes"}), 1)
+        self.assertEqual(sentido_via({"oneway": "-1"}), -1)
+        self.assertEqual(sentido_via({"junction": "roundabout"}), 1)
+        self.assertEqual(sentido_via({}), 0)
+
+    def test_osm_xml(self):
+        """Testa simplificação, sentidos, componente principal e amenidades."""
+        g = ImportadorRede.importar(self.escrever("zona.osm", OSM_XML))
+
+        cruzamentos = {n for n, no in g.nos.items() if no.tipo == TipoNo.RECOLHA_PASSAGEIROS}
+        # 2 é um nó de grau 2 (removido); 7 só está no passeio; 8-9 estão desligados
+        self.assertEqual(cruzamentos, {"osm_1", "osm_3", "osm_4", "osm_5", "osm_6"})
+
+        # Cadeia 1-2-3 passa a uma aresta com a soma das distâncias (~0.83 km a 30 km/h)
+        aresta = g.get_aresta("osm_1", "osm_3")
+        self.assertAlmostEqual(aresta.distancia_km, 0.834, places=2)
+        self.assertAlmostEqual(aresta.tempoViagem_min, aresta.distancia_km / 30 * 60, places=3)
+
+        # Sentido único
+        g.get_aresta("osm_3", "osm_5")
+        with self.assertRaises(ValueError):
+            g.get_aresta("osm_5", "osm_3")
+
+        # Estação e posto ligados ao cruzamento mais próximo
+        self.assertEqual(g.nos["Recarga_20"].tipo, TipoNo.ESTACAO_RECARGA)
+        self.assertEqual(g.nos["Posto_w106"].tipo, TipoNo.POSTO_ABASTECIMENTO)
+        self.assertEqual([a.no_destino for a in g.vizinhos("Posto_w106")], ["osm_6"])
+
+        # Todos os nós alcançáveis entre si
+        for destino in g.nos:
+            custo, _ = uniform_cost_search(g, "osm_4", destino)
+            self.assertNotEqual(custo, float('inf'), destino)
+
+    def test_osm_comprimido_e_compacto(self):
+        """Testa leitura de .osm.gz e saída em CSR."""
+        g = ImportadorRede.importar(self.escrever("zona.osm.gz", OSM_XML), compacto=True)
+        self.assertIsInstance(g, GrafoCompacto)
+        self.assertIn("osm_1", g.nos)
+
+    def test_geojson_por_linhas(self):
+        """Testa GeoJSON (uma Feature por linha) com nós partilhados por coordenadas."""
+        features = [
+            via_geojson([[-8.42, 41.55], [-8.415, 41.55], [-8.41, 41.55]], highway="residential"),
+            via_geojson([[-8.42, 41.555], [-8.42, 41.55], [-8.42, 41.545]], highway="primary"),
+            via_geojson([[-8.41, 41.55], [-8.42, 41.545]], highway="tertiary", oneway="no"),
+            via_geojson([[-8.41, 41.55], [-8.41, 41.54]], highway="footway"),
+            {"type": "Feature", "id": "ev1", "properties": {"amenity": "charging_station"},
+             "geometry": {"type": "Point", "coordinates": [-8.4151, 41.5502]}},
+        ]
+        caminho = self.escrever("zona.geojsonl", "\n".join(json.dumps(f) for f in features))
+        g = ImportadorRede.importar(caminho)
+
+        self.assertEqual(sum(no.tipo == TipoNo.RECOLHA_PASSAGEIROS for no in g.nos.values()), 4)
+        self.assertEqual(g.nos["Recarga_ev1"].tipo, TipoNo.ESTACAO_RECARGA)
+
+        # O mesmo conteúdo como FeatureCollection
+        colecao = self.escrever("zona.geojson", json.dumps({"type": "FeatureCollection", "features": features}))
+        self.assertEqual(set(ImportadorRede.importar(colecao).nos), set(g.nos))
+
+    def test_formatos_invalidos(self):
+        with self.assertRaises(ValueError):
+            ImportadorRede.importar(self.escrever("zona.osm.pbf", ""))
+        with self.assertRaises(ValueError):
+            ImportadorRede.importar(self.escrever("zona.csv", ""))
+        with self.assertRaises(ValueError):
+            ImportadorRede.importar(self.escrever("vazio.osm", "<osm></osm>"))
+
+
+if __name__ == '__main__':
+    unittest.main()
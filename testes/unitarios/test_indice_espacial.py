@@ -0,0 +1,86 @@
+"""
+Testes Unitários - Índice espacial (grelha uniforme)
+"""
+
+import math
+import random
+import unittest
+from fabrica.cidade_sintetica import CidadeSintetica
+from gestao.ride_sharing import GestorRideSharing
+from modelo.grafo import TipoNo
+from modelo.indice_espacial import IndiceEspacial
+from testes.test_config import ConfigTestes
+
+
+class TestIndiceEspacial(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = CidadeSintetica.planar_aleatoria(2000, semente=5)
+        self.indice = IndiceEspacial(self.grafo)
+        self.rng = random.Random(5)
+
+    def forca_bruta(self, x, y, tipo=None, apenas_disponiveis=False):
+        return sorted(
+            (math.hypot(no.posicaox - x, no.posicaoy - y), no_id)
+            for no_id, no in self.grafo.nos.items()
+            if (tipo is None or no.tipo == tipo) and (not apenas_disponiveis or no.disponivel)
+        )
+
+    def pontos_aleatorios(self, n=50):
+        # Inclui pontos fora da cidade
+        return [(self.rng.uniform(-5, 30), self.rng.uniform(-5, 30)) for _ in range(n)]
+
+    def test_k_mais_proximos(self):
+        """Testa que coincide com a ordenação por força bruta."""
+        for x, y in self.pontos_aleatorios():
+            esperado = self.forca_bruta(x, y)[:5]
+            obtido = self.indice.k_mais_proximos(x, y, k=5)
+            self.assertEqual([d for d, _ in obtido], [d for d, _ in esperado])
+
+    def test_no_raio(self):
+        """Testa consulta por raio."""
+        for x, y in self.pontos_aleatorios(20):
+            for raio in (0.3, 1.5, 50.0):
+                esperado = [p for p in self.forca_bruta(x, y) if p[0] <= raio]
+                self.assertEqual(self.indice.no_raio(x, y, raio), esperado)
+
+    def test_mais_proximo_do_tipo_disponivel(self):
+        """Testa estação mais próxima, ignorando estações fora de serviço."""
+        x, y = 10.0, 10.0
+        primeira = self.indice.mais_proximo(x, y, tipo=TipoNo.ESTACAO_RECARGA, apenas_disponiveis=True)
+        self.assertEqual(primeira, self.forca_bruta(x, y, TipoNo.ESTACAO_RECARGA)[0][1])
+
+        self.grafo.nos[primeira].disponivel = False
+        segunda = self.indice.mais_proximo(x, y, tipo=TipoNo.ESTACAO_RECARGA, apenas_disponiveis=True)
+        self.assertNotEqual(segunda, primeira)
+        self.assertEqual(segunda, self.forca_bruta(x, y, TipoNo.ESTACAO_RECARGA, True)[0][1])
+
+    def test_mais_proximo_do_no(self):
+        """Testa que o próprio nó é excluído."""
+        no_id = next(iter(self.grafo.nos))
+        vizinho = self.indice.mais_proximo_do_no(no_id)
+        self.assertNotEqual(vizinho, no_id)
+        no = self.grafo.nos[no_id]
+        self.assertEqual(vizinho, self.forca_bruta(no.posicaox, no.posicaoy)[1][1])
+
+    def test_ride_sharing_com_indice(self):
+        """Testa que o índice dá os mesmos grupos e zonas centrais que o cálculo direto."""
+        grafo = ConfigTestes.criar_grafo_teste()
+        direto = GestorRideSharing(grafo)
+        indexado = GestorRideSharing(grafo, indice_espacial=IndiceEspacial(grafo))
+        zonas = list(grafo.nos)
+
+        rng = random.Random(1)
+        for _ in range(50):
+            grupo = rng.sample(zonas, rng.randint(2, 4))
+            central = direto.encontrar_zona_central(grupo)
+            total = lambda c: sum(direto.distancia_euclidiana(c, z) for z in grupo)
+            self.assertAlmostEqual(total(central), min(total(c) for c in grupo))
+
+            a, b = rng.sample(zonas, 2)
+            self.assertEqual(b in indexado.zonas_proximas(a),
+                             direto.distancia_euclidiana(a, b) <= direto.raio_agrupamento)
+
+
+if __name__ == '__main__':
+    unittest.main()
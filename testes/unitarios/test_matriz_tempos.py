@@ -0,0 +1,86 @@
+"""
+Testes Unitários - Serviço de Matrizes de Tempos
+"""
+
+import unittest
+from gestao.matriz_tempos import ServicoMatrizTempos
+from gestao.algoritmos_procura.ucs import uniform_cost_search
+from gestao.transito_dinamico import GestorTransito
+from gestao.ride_sharing import GestorRideSharing
+from gestao.reposicionamento import reposicionar_veiculo_proativo
+from gestao.simulador import Simulador
+from modelo.pedidos import Pedido, EstadoPedido
+from testes.test_config import ConfigTestes
+
+
+class TestMatrizTempos(unittest.TestCase):
+
+    def setUp(self):
+        self.grafo = ConfigTestes.criar_grafo_teste()
+        self.servico = ServicoMatrizTempos(self.grafo)
+
+    def test_matriz_igual_ucs(self):
+        """Testa que cada entrada corresponde ao menor tempo (nos dois sentidos de procura)."""
+        origens = ["Centro", "Porto", "Aeroporto"]
+        destinos = ["Hospital", "Praça"]
+
+        for o, d in [(origens, destinos), (destinos, origens)]:
+            tempos, kms = self.servico.matriz(o, d)
+            self.assertEqual(tempos.shape, (len(o), len(d)))
+            for i, origem in enumerate(o):
+                for j, destino in enumerate(d):
+                    custo, caminho = uniform_cost_search(self.grafo, origem, destino)
+                    self.assertAlmostEqual(tempos[i, j], custo)
+                    km = sum(self.grafo.distancia(a, b) for a, b in zip(caminho, caminho[1:]))
+                    self.assertAlmostEqual(kms[i, j], km)
+
+    def test_cache_por_estado_transito(self):
+        """Testa que linhas são reutilizadas até o trânsito mudar."""
+        self.servico.matriz(["Centro"], ["Hospital", "Porto"])
+        self.servico.matriz(["Centro"], ["Aeroporto"])
+        self.assertEqual(self.servico.estatisticas()["cache_hits"], 1)
+
+        GestorTransito(self.grafo, hora_inicial=8).atualizar_transito(0)
+        tempos, _ = self.servico.matriz(["Centro"], ["Aeroporto"])
+        self.assertEqual(self.servico.estatisticas()["cache_misses"], 2)
+        self.assertAlmostEqual(tempos[0, 0], uniform_cost_search(self.grafo, "Centro", "Aeroporto")[0])
+
+    def test_no_invalido(self):
+        with self.assertRaises(ValueError):
+            self.servico.matriz(["Centro"], ["Inexistente"])
+
+    def test_ride_sharing_usa_matriz(self):
+        """Testa zona central e distâncias pela rede."""
+        rs = GestorRideSharing(self.grafo, servico_matriz=self.servico)
+        self.assertEqual(rs.encontrar_zona_central(["Centro", "Centro", "Praça"]), "Centro")
+        self.assertAlmostEqual(rs.distancia_km("Centro", "Praça"), self.servico.distancia("Centro", "Praça"))
+
+    def test_simulador_usa_matriz_ativada_depois(self):
+        """Testa que o ride-sharing do simulador vê a matriz ativada depois de ser criado."""
+        gestor = ConfigTestes.criar_gestor_teste()
+        simulador = Simulador(gestor, usar_transito=False, usar_falhas=False)
+        self.assertIsNone(simulador.gestor_ride_sharing.servico_matriz)
+
+        servico = gestor.ativar_matriz_tempos()
+        self.assertIs(simulador.gestor_ride_sharing.servico_matriz, servico)
+
+    def test_reposicionamento_ignora_inalcancaveis(self):
+        """Testa que o reposicionamento não escolhe zonas sem caminho."""
+        veiculo = ConfigTestes.criar_gestor_teste().veiculos["E1"]
+        pedidos = [
+            Pedido(f"P{i}", zona, "Centro", 1, 1, 1, "qualquer", EstadoPedido.PENDENTE, None)
+            for i, zona in enumerate(["Porto", "Porto", "Hospital"])
+        ]
+        transito = GestorTransito(self.grafo, hora_inicial=12)
+        for aresta in self.grafo.vizinhos("Porto"):
+            transito.simular_bloqueio(aresta.no_destino, "Porto")
+
+        self.assertEqual(reposicionar_veiculo_proativo(veiculo, pedidos, 0, self.grafo), "Porto")
+        self.assertEqual(
+            reposicionar_veiculo_proativo(veiculo, pedidos, 0, self.grafo, servico_matriz=self.servico),
+            "Hospital"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
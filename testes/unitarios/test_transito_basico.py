@@ -79,6 +79,23 @@ class TestTransitoBasico(unittest.TestCase):
         self.assertGreater(tempo2, tempo1, 
                           f"Rush ({tempo2:.2f}) deve ser > Madrugada ({tempo1:.2f})")
 
+    def test_epoca_transito(self):
+        """Testa que a época do grafo só avança quando os custos mudam."""
+        self.gestor.atualizar_transito(tempo_simulacao=0)
+        epoca = self.grafo.epoca_transito
+
+        # Mesma hora: nada muda
+        self.gestor.atualizar_transito(tempo_simulacao=30)
+        self.assertEqual(self.grafo.epoca_transito, epoca)
+
+        # Nova hora com outro factor
+        self.gestor.atualizar_transito(tempo_simulacao=480)
+        self.assertGreater(self.grafo.epoca_transito, epoca)
+
+        epoca = self.grafo.epoca_transito
+        self.gestor.simular_bloqueio("Centro", "Praça")
+        self.assertEqual(self.grafo.epoca_transito, epoca + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file